@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Benchmark restoring 60 files of the last session in an editorstack
+
+Each file is a Python module of about 1500 lines. All of them are loaded
+as the Editor plugin does at startup, once reading them right away and
+once lazily, reading only the first one. The time until the editorstack
+is ready is given for both, and for the lazy one also the time spent
+reading the other files in the background.
+
+Usage: python benchmarks/bench_editor_restore.py
+"""
+
+from __future__ import print_function
+
+import os.path as osp
+import shutil
+import tempfile
+import time
+
+try:
+    from unittest.mock import Mock
+except ImportError:
+    from mock import Mock  # Python 2
+
+from qtpy.QtGui import QFont
+
+from spyder.utils.qthelpers import qapplication
+from spyder.widgets.editor import EditorStack
+
+
+def make_module(index, functions=250):
+    """Return the source code of a module with many functions."""
+    lines = ['"""Module %d"""' % index, '', 'import os', '']
+    for i in range(functions):
+        lines += ['def function_%d(path, value=%d):' % (i, i),
+                  '    """Return the size of path plus value."""',
+                  '    return os.path.getsize(path) + value',
+                  '', '']
+    return '\n'.join(lines)
+
+
+def make_editorstack():
+    editorstack = EditorStack(None, [])
+    editorstack.set_introspector(Mock())
+    editorstack.set_find_widget(Mock())
+    editorstack.set_io_actions(Mock(), Mock(), Mock(), Mock())
+    editorstack.set_default_font(QFont())
+    editorstack.resize(800, 600)
+    editorstack.show()
+    return editorstack
+
+
+def restore(app, filenames, lazy):
+    editorstack = make_editorstack()
+    start = time.time()
+    for index, filename in enumerate(filenames):
+        editorstack.load(filename, set_current=index == 0,
+                         lazy=lazy and index > 0, line=100)
+    app.processEvents()
+    print('%-32s %10.1f ms' % ('lazy' if lazy else 'eager',
+                               (time.time() - start) * 1000))
+    if lazy:
+        start = time.time()
+        while any(finfo.is_pending() for finfo in editorstack.data):
+            app.processEvents()
+        print('%-32s %10.1f ms' % ('lazy: read all in background',
+                                   (time.time() - start) * 1000))
+    editorstack.close()
+
+
+def main():
+    app = qapplication()
+    directory = tempfile.mkdtemp()
+    try:
+        filenames = []
+        for index in range(60):
+            filename = osp.join(directory, 'module_%d.py' % index)
+            with open(filename, 'w') as module:
+                module.write(make_module(index))
+            filenames.append(filename)
+        restore(app, filenames, lazy=False)
+        restore(app, filenames, lazy=True)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
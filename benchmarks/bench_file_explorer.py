@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Benchmark the file explorer on a directory with 10000 entries
+
+The icons of all the entries are requested, as the view does when
+scrolling through the directory, then the view is painted page by page.
+The time spent by icon_manager.icon() alone is also given.
+
+Usage: python benchmarks/bench_file_explorer.py
+"""
+
+from __future__ import print_function
+
+import os.path as osp
+import shutil
+import tempfile
+import time
+
+from qtpy.QtCore import Qt
+from qtpy.QtGui import QPixmap
+
+from spyder.utils import icon_manager as ima
+from spyder.utils.qthelpers import qapplication
+from spyder.widgets.explorer import ExplorerWidget
+
+
+EXTENSIONS = ('.py', '.txt', '.csv', '.png', '.zip', '.docx', '.pdf', '')
+
+
+def make_directory(entries=10000):
+    """Create a temporary directory with many files and return its path."""
+    path = tempfile.mkdtemp()
+    for i in range(entries):
+        extension = EXTENSIONS[i % len(EXTENSIONS)]
+        open(osp.join(path, 'file_%05d%s' % (i, extension)), 'w').close()
+    return path
+
+
+def report(name, start):
+    print('%-28s %10.1f ms' % (name, (time.time() - start) * 1000))
+
+
+def main():
+    app = qapplication()
+    path = make_directory()
+    try:
+        widget = ExplorerWidget(show_all=True)
+        widget.resize(640, 480)
+        widget.show()
+        explorer = widget.treewidget
+
+        start = time.time()
+        explorer.chdir(path)
+        model = explorer.fsmodel
+        root = model.index(path)
+        while model.rowCount(root) < 10000:
+            app.processEvents()
+        report('load directory', start)
+
+        start = time.time()
+        for row in range(model.rowCount(root)):
+            model.data(model.index(row, 0, root), Qt.DecorationRole)
+        report('icons of all entries', start)
+
+        # The model only caches icons until it's reset, so ask again
+        explorer.reset_icon_provider()
+        pixmap = QPixmap(explorer.viewport().size())
+        scrollbar = explorer.verticalScrollBar()
+        start = time.time()
+        for value in range(0, scrollbar.maximum(), scrollbar.pageStep()):
+            scrollbar.setValue(value)
+            explorer.viewport().render(pixmap)
+        report('paint all pages', start)
+
+        start = time.time()
+        for _i in range(10000):
+            ima.icon('TextFileIcon')
+        report('10000 calls to ima.icon', start)
+    finally:
+        shutil.rmtree(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Benchmark opening a large generated Python file in an editorstack
+
+The file, of about 3.5 MB, is opened once as any other file and once in
+large file mode. The time until the editor is painted for the first time
+and the peak memory allocated by Python meanwhile are given for both, the
+latter in multiples of the size of the file. Memory allocated by Qt for
+the document isn't included.
+
+Usage: python benchmarks/bench_large_file.py
+"""
+
+from __future__ import print_function
+
+import os
+import os.path as osp
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+try:
+    from unittest.mock import Mock
+except ImportError:
+    from mock import Mock  # Python 2
+
+from qtpy.QtGui import QFont
+
+from spyder.utils.qthelpers import qapplication
+from spyder.widgets.editor import EditorStack
+
+
+def make_module(filename, functions=30000):
+    """Write a module with many functions to filename."""
+    with open(filename, 'w') as module:
+        module.write('"""Generated module"""\n\nimport os\n\n')
+        for i in range(functions):
+            module.write('def function_%d(path, value=%d):\n'
+                         '    """Return the size of path plus value."""\n'
+                         '    return os.path.getsize(path) + value\n\n\n'
+                         % (i, i))
+
+
+def make_editorstack(large_file_size):
+    editorstack = EditorStack(None, [])
+    editorstack.set_introspector(Mock())
+    editorstack.set_find_widget(Mock())
+    editorstack.set_io_actions(Mock(), Mock(), Mock(), Mock())
+    editorstack.set_default_font(QFont())
+    editorstack.set_large_file_size(large_file_size)
+    editorstack.resize(800, 600)
+    editorstack.show()
+    return editorstack
+
+
+def open_file(app, filename, large_file_size, name):
+    editorstack = make_editorstack(large_file_size)
+    app.processEvents()
+    tracemalloc.start()
+    start = time.time()
+    editor = editorstack.load(filename).editor
+    editor.viewport().repaint()
+    app.processEvents()
+    duration = time.time() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print('%-12s %10.1f ms %8.1fx memory' % (
+        name, duration * 1000, peak / float(osp.getsize(filename))))
+    editorstack.close()
+
+
+def main():
+    app = qapplication()
+    directory = tempfile.mkdtemp()
+    try:
+        filename = osp.join(directory, 'generated.py')
+        make_module(filename)
+        print('%.1f MB' % (os.path.getsize(filename) / 1024. ** 2))
+        open_file(app, filename, 1000, 'current')
+        open_file(app, filename, 1, 'large file')
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Compare the repr based transport of namespace views with namespace_codec
+
+Each round trip is what the kernel and the frontend do to send a view and
+the properties of its variables: repr + ast.literal_eval against
+encode_namespace_view + decode_namespace_view.
+
+Usage: python benchmarks/bench_namespace_codec.py
+"""
+
+from __future__ import print_function
+
+import ast
+import timeit
+
+from spyder.utils.ipython.namespace_codec import (decode_namespace_view,
+                                                  encode_namespace_view)
+
+
+def make_view(count):
+    """Return a namespace view and properties with count variables."""
+    view = {}
+    properties = {}
+    for i in range(count):
+        name = 'variable_%d' % i
+        if i % 3 == 0:
+            view[name] = {'type': 'float64', 'size': (100, 10),
+                          'color': '#ff00ff',
+                          'view': 'Min: %d.0\nMax: %d.5' % (i, i + 1)}
+            shape, ndim = (100, 10), 2
+        else:
+            view[name] = {'type': 'int', 'size': 1, 'color': '#0000ff',
+                          'view': str(i)}
+            shape, ndim = None, None
+        properties[name] = {'is_list': False, 'is_dict': False,
+                            'is_set': False, 'len': None,
+                            'is_array': shape is not None,
+                            'is_image': False, 'is_data_frame': False,
+                            'is_series': False, 'array_shape': shape,
+                            'array_ndim': ndim}
+    return view, properties
+
+
+def repr_roundtrip(view, properties):
+    ast.literal_eval(repr(view))
+    ast.literal_eval(repr(properties))
+
+
+def codec_roundtrip(view, properties):
+    header, buffers = encode_namespace_view(view, (), properties)
+    decode_namespace_view(header, buffers)
+
+
+def main():
+    print('%10s %12s %12s %8s %12s %12s' % ('variables', 'repr (ms)',
+                                            'codec (ms)', 'speedup',
+                                            'repr bytes', 'codec bytes'))
+    for count in (10, 1000, 10000):
+        view, properties = make_view(count)
+        number = max(1, 10000 // count)
+        results = []
+        for func in (repr_roundtrip, codec_roundtrip):
+            timer = timeit.Timer(lambda: func(view, properties))
+            results.append(min(timer.repeat(3, number)) / number * 1000)
+        repr_size = len(repr(view)) + len(repr(properties))
+        codec_size = sum(len(buf) for buf in
+                         encode_namespace_view(view, (), properties)[1])
+        print('%10d %12.3f %12.3f %7.1fx %12d %12d' % (
+            count, results[0], results[1], results[0] / results[1],
+            repr_size, codec_size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Benchmark marking the occurrences of a word used in every function of a
+generated module of 20000 lines
+
+The find path is what was done before the index of identifiers: search
+the whole document for the word, adding a decoration for each occurrence
+found, one at a time. The index path takes the lines of the occurrences
+from the highlighter, marks the visible ones and then the others by
+batches. For the latter, the time until the visible occurrences and the
+scroll flags are shown is given, as well as the time until all of them
+are marked.
+
+Usage: python benchmarks/bench_occurrences.py
+"""
+
+from __future__ import print_function
+
+import time
+
+from qtpy.QtCore import QRegExp, Qt
+from qtpy.QtGui import QFont, QTextCursor, QTextDocument
+
+from spyder.utils.qthelpers import qapplication
+from spyder.widgets.sourcecode.api.decoration import TextDecoration
+from spyder.widgets.sourcecode.codeeditor import CodeEditor
+
+
+def make_module(functions=5000):
+    """Return the source code of a module with many functions."""
+    lines = ['"""Generated module"""', '', 'value = 1', '']
+    for i in range(functions):
+        lines += ['def function_%d(path):' % i,
+                  '    return len(path) + value',
+                  '', '']
+    lines += ['print(value)']
+    return '\n'.join(lines)
+
+
+def make_editor(app):
+    editor = CodeEditor(None)
+    editor.setup_editor(language='Python', font=QFont(),
+                        occurrence_highlighting=False)
+    editor.set_text(make_module())
+    editor.resize(800, 600)
+    editor.show()
+    app.processEvents()
+    # Put the cursor on 'value' in the last line
+    cursor = editor.textCursor()
+    cursor.movePosition(QTextCursor.End)
+    cursor.movePosition(QTextCursor.Left, n=3)
+    editor.setTextCursor(cursor)
+    app.processEvents()
+    return editor
+
+
+def find_path(app):
+    editor = make_editor(app)
+    start = time.time()
+    flags = QTextDocument.FindCaseSensitively | QTextDocument.FindWholeWords
+    regexp = QRegExp(r"\bvalue\b", Qt.CaseSensitive)
+    cursor = editor.document().find(regexp, 0, flags)
+    occurrences = []
+    while not cursor.isNull():
+        occurrences.append(cursor.blockNumber())
+        selections = editor.get_extra_selections('occurrences')
+        selection = TextDecoration(cursor)
+        selection.format.setBackground(editor.occurrence_color)
+        selections.append(selection)
+        editor.set_extra_selections('occurrences', selections)
+        cursor = editor.document().find(regexp, cursor, flags)
+    editor.update_extra_selections()
+    editor.occurrences = occurrences
+    editor.sig_flags_changed.emit()
+    app.processEvents()
+    print('%-28s %10.1f ms (%d occurrences)' % (
+        'find', (time.time() - start) * 1000, len(occurrences)))
+    editor.close()
+
+
+def index_path(app):
+    editor = make_editor(app)
+    shown = []
+    editor.sig_flags_changed.connect(lambda: shown.append(time.time()))
+    start = time.time()
+    editor.set_occurrence_timeout(0)
+    editor.set_occurrence_highlighting(True)
+    editor.cursorPositionChanged.emit()
+    while len(shown) < 2 or editor.occurrence_batch_timer.isActive():
+        app.processEvents()
+    end = time.time()
+    print('%-28s %10.1f ms' % ('index: visible ones shown',
+                               (shown[1] - start) * 1000))
+    print('%-28s %10.1f ms (%d occurrences)' % (
+        'index: all marked', (end - start) * 1000,
+        len(editor.get_extra_selections('occurrences'))))
+    editor.close()
+
+
+def main():
+    app = qapplication()
+    find_path(app)
+    index_path(app)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Benchmark updates of the outline explorer on a large generated module
+
+The outline of a module of about 20000 lines is built, then updated after
+typical edits: typing in a function body, renaming a method and inserting
+a line at the top of the module. Each update is what the editor does after
+saving the file.
+
+Usage: python benchmarks/bench_outline_explorer.py
+"""
+
+from __future__ import print_function
+
+import time
+
+from qtpy.QtGui import QTextCursor
+
+from spyder.utils.qthelpers import qapplication
+from spyder.widgets.editortools import OutlineExplorerWidget
+from spyder.widgets.sourcecode.codeeditor import CodeEditor
+
+
+def make_module(classes=400, methods=8):
+    """Return the source code of a module with many classes and methods."""
+    lines = []
+    for i in range(classes):
+        lines += ['# ---- Section %d' % i, '', 'class Class%d(object):' % i,
+                  '']
+        for j in range(methods):
+            lines += ['    def method_%d(self, value):' % j,
+                      '        """Return value plus %d."""' % j,
+                      '        if value:',
+                      '            return value + %d' % j,
+                      '        return None',
+                      '']
+    return '\n'.join(lines)
+
+
+def insert_text(editor, line, column, text):
+    """Insert text at (line, column), counted from 0."""
+    cursor = QTextCursor(editor.document().findBlockByNumber(line))
+    cursor.movePosition(QTextCursor.Right, n=column)
+    cursor.insertText(text)
+
+
+def main():
+    app = qapplication()
+    source = make_module()
+    lines = source.splitlines()
+    middle = lines.index('class Class200(object):')
+    edits = [
+        ('type in a body', (middle + 5, 8, 'x = 1; ')),
+        ('rename a method', (middle + 2, 14, 'renamed_')),
+        ('insert a line on top', (0, 0, '\n')),
+    ]
+
+    editor = CodeEditor(None)
+    editor.set_language('py', 'generated.py')
+    editor.set_text(source)
+    app.processEvents()
+    explorer = OutlineExplorerWidget()
+    treewidget = explorer.treewidget
+
+    print('%d lines' % len(lines))
+    start = time.time()
+    explorer.set_current_editor(editor, 'generated.py', False, False)
+    print('%-24s %10.1f ms' % ('initial outline', (time.time() - start) * 1000))
+    for name, (line, column, text) in edits:
+        insert_text(editor, line, column, text)
+        start = time.time()
+        treewidget.update_all()
+        print('%-24s %10.1f ms' % (name, (time.time() - start) * 1000))
+    start = time.time()
+    treewidget.update_all()
+    print('%-24s %10.1f ms' % ('no change', (time.time() - start) * 1000))
+
+
+if __name__ == '__main__':
+    main()
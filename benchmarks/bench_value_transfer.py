@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Compare the ways of sending a value set in the Variable Explorer to the
+kernel, for a 100 MB array
+
+The source code path is what was done before value_transfer: pickle with
+protocol 2, write the pickle in the source of the code to run, then
+compile, run and unpickle it in the kernel. The comm path pickles with
+out-of-band buffers, splits them in chunks and rebuilds the value from
+them. Sending messages isn't included, only the work done on both sides.
+The peak memory allocated by each path is given in multiples of the size
+of the array.
+
+Usage: python benchmarks/bench_value_transfer.py
+"""
+
+from __future__ import print_function
+
+import time
+import tracemalloc
+
+import cloudpickle
+import numpy as np
+
+from spyder.py3compat import to_text_string
+from spyder.utils.ipython.value_transfer import (ChunkedValue, dump_value,
+                                                 get_pickle_protocol,
+                                                 split_chunks)
+
+
+def set_value(name, value, PY2_frontend):
+    """What the kernel's set_value does with the value"""
+    return cloudpickle.loads(value[0])
+
+
+def source_code_path(value):
+    svalue = [cloudpickle.dumps(value, protocol=2)]
+    code = u"set_value('%s', %s, %s)" % ('arr', to_text_string(svalue),
+                                         False)
+    del svalue
+    return eval(compile(code, '<string>', 'eval'))
+
+
+def comm_path(value):
+    buffers = dump_value(value, get_pickle_protocol())
+    upload = ChunkedValue([len(buf) for buf in buffers])
+    for chunk in split_chunks(buffers):
+        upload.add_chunk([(index, offset) for index, offset, view in chunk],
+                         [view for index, offset, view in chunk])
+    return upload.load()
+
+
+def main():
+    value = np.random.RandomState(0).randn(1250, 10000)
+    for name, path in [('source code', source_code_path),
+                       ('comm', comm_path)]:
+        tracemalloc.start()
+        start = time.time()
+        result = path(value)
+        duration = time.time() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert (result == value).all()
+        del result
+        print('%-12s %10.1f ms %8.1fx memory' % (name, duration * 1000,
+                                                 peak / float(value.nbytes)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Benchmark scrolling through the array and DataFrame editors
+
+A 1000x100 float array and DataFrame are shown with background colors,
+and their views are painted page by page, from top to bottom and then
+from left to right. The time spent by the data() method of the models
+alone, for all the cells of the first 1000x40 ones, is also given.
+
+Usage: python benchmarks/bench_variable_editors.py
+"""
+
+from __future__ import print_function
+
+import time
+
+import numpy as np
+from pandas import DataFrame
+from qtpy.QtCore import Qt
+from qtpy.QtGui import QPixmap
+
+from spyder.utils.qthelpers import qapplication
+from spyder.widgets.variableexplorer.arrayeditor import ArrayEditor
+from spyder.widgets.variableexplorer.dataframeeditor import DataFrameEditor
+
+
+ROLES = (Qt.DisplayRole, Qt.BackgroundColorRole, Qt.FontRole,
+         Qt.TextAlignmentRole)
+
+
+def report(name, start):
+    print('%-32s %10.1f ms' % (name, (time.time() - start) * 1000))
+
+
+def scroll(view):
+    """Paint all the pages of view, scrolling down and then right."""
+    pixmap = QPixmap(view.viewport().size())
+    for scrollbar in (view.verticalScrollBar(), view.horizontalScrollBar()):
+        for value in range(0, scrollbar.maximum(), scrollbar.pageStep()):
+            scrollbar.setValue(value)
+            view.viewport().render(pixmap)
+        scrollbar.setValue(0)
+
+
+def read_cells(model, rows, columns):
+    for i in range(rows):
+        for j in range(columns):
+            index = model.index(i, j)
+            for role in ROLES:
+                model.data(index, role)
+
+
+def main():
+    app = qapplication()
+    data = np.random.RandomState(0).randn(1000, 100)
+
+    editor = ArrayEditor()
+    editor.setup_and_check(data)
+    editor.resize(800, 600)
+    editor.show()
+    view = editor.arraywidget.view
+    model = view.model()
+    model.bgcolor(True)
+    app.processEvents()
+    start = time.time()
+    scroll(view)
+    report('array: paint all pages', start)
+    model.reset()
+    start = time.time()
+    read_cells(model, 1000, 40)
+    report('array: data() of 40000 cells', start)
+    editor.reject()
+
+    editor = DataFrameEditor()
+    editor.setup_and_check(DataFrame(data))
+    editor.resize(800, 600)
+    editor.show()
+    view = editor.dataTable
+    model = view.model()
+    model.bgcolor(True)
+    app.processEvents()
+    start = time.time()
+    scroll(view)
+    report('dataframe: paint all pages', start)
+    model.reset()
+    start = time.time()
+    read_cells(model, 1000, 40)
+    report('dataframe: data() of 40000 cells', start)
+    editor.reject()
+
+
+if __name__ == '__main__':
+    main()
@@ -38,6 +38,10 @@ def get_options(argv=None):
     parser.add_argument('--profile', action='store_true', default=False,
                       help="Profile mode (internal test, "
                            "not related with Python profiling)")
+    parser.add_argument('--startup-profile', action='store_true',
+                      default=False,
+                      help="Print how long it takes to import, create and "
+                           "register each plugin at startup")
     parser.add_argument('--window-title', type=str, default=None,
                       help="String to show in the main window title")
     parser.add_argument('-p', '--project', default=None, type=str,
@@ -23,6 +23,7 @@ from __future__ import print_function
 
 import atexit
 import errno
+import importlib
 import os
 import os.path as osp
 import re
@@ -32,6 +33,7 @@ import socket
 import subprocess
 import sys
 import threading
+import time
 import traceback
 
 
@@ -40,6 +42,9 @@ import traceback
 #==============================================================================
 ORIGINAL_SYS_EXIT = sys.exit
 
+# Origin of the startup profile (see --startup-profile)
+STARTUP_TIME = time.time()
+
 
 #==============================================================================
 # Check requirements
@@ -149,6 +154,7 @@ from spyder.config.base import (get_conf_path, get_module_data_path,
 from spyder.config.main import OPEN_FILES_PORT
 from spyder.config.utils import IMPORT_EXT, is_gtk_desktop
 from spyder.app.cli_options import get_options
+from spyder.app.startupprofile import StartupProfile
 from spyder import dependencies
 from spyder.py3compat import (is_text_string, to_text_string,
                               PY3, qbytearray_to_str, configparser as cp)
@@ -262,6 +268,7 @@ class MainWindow(QMainWindow):
     all_actions_defined = Signal()
     sig_pythonpath_changed = Signal()
     sig_open_external_file = Signal(str)
+    sig_dependencies_probed = Signal()
     sig_resized = Signal("QResizeEvent")  # related to interactive tour
     sig_moved = Signal("QMoveEvent")      # related to interactive tour
 
@@ -281,6 +288,8 @@ class MainWindow(QMainWindow):
         self.multithreaded = options.multithreaded
         self.new_instance = options.new_instance
         self.open_project = options.open_project
+        self.show_startup_profile = options.startup_profile
+        self.startup_profile = StartupProfile(STARTUP_TIME)
 
         self.debug_print("Start of MainWindow constructor")
 
@@ -348,6 +357,9 @@ class MainWindow(QMainWindow):
         self.variableexplorer = None
         self.findinfiles = None
         self.thirdparty_plugins = []
+        # Plugins created in idle time, once the main window is shown, as
+        # (attribute name, module name, class name) tuples
+        self.deferred_plugins = []
 
         # Tour  # TODO: Should I consider it a plugin?? or?
         self.tour = None
@@ -552,9 +564,27 @@ class MainWindow(QMainWindow):
         self.toolbarslist.append(toolbar)
         return toolbar
 
+    def create_plugin(self, attr, module_name, class_name, *args, **kwargs):
+        """
+        Import, create and register a plugin, which is set as attribute
+        attr of the main window before it's registered
+
+        The time taken by each step is recorded in the startup profile.
+        """
+        profile = self.startup_profile
+        with profile.measure(class_name, 'import'):
+            module = importlib.import_module(module_name)
+        with profile.measure(class_name, 'construction'):
+            plugin = getattr(module, class_name)(self, *args, **kwargs)
+        setattr(self, attr, plugin)
+        with profile.measure(class_name, 'registration'):
+            plugin.register_plugin()
+        return plugin
+
     def setup(self):
         """Setup main window"""
         self.debug_print("*** Start of MainWindow setup ***")
+        self.startup_profile.mark("Start of main window setup")
         self.debug_print("  ..core actions")
         self.close_dockwidget_action = create_action(self,
                                     icon=ima.icon('DialogCloseButton'),
@@ -821,8 +851,8 @@ class MainWindow(QMainWindow):
 
         # Internal console plugin
         self.debug_print("  ..plugin: internal console")
-        from spyder.plugins.console import Console
-        self.console = Console(self, namespace, exitfunc=self.closing,
+        self.create_plugin('console', 'spyder.plugins.console', 'Console',
+                            namespace, exitfunc=self.closing,
                             profile=self.profile,
                             multithreaded=self.multithreaded,
                             message=_("Spyder Internal Console\n\n"
@@ -831,36 +861,34 @@ class MainWindow(QMainWindow):
                                     "internals with the following commands:\n"
                                     "  spy.app, spy.window, dir(spy)\n\n"
                                     "Please don't use it to run your code\n\n"))
-        self.console.register_plugin()
 
         # Working directory plugin
         self.debug_print("  ..plugin: working directory")
-        from spyder.plugins.workingdirectory import WorkingDirectory
-        self.workingdirectory = WorkingDirectory(self, self.init_workdir, main=self)
-        self.workingdirectory.register_plugin()
+        self.create_plugin('workingdirectory',
+                           'spyder.plugins.workingdirectory',
+                           'WorkingDirectory', self.init_workdir, main=self)
         self.toolbarslist.append(self.workingdirectory.toolbar)
 
         # Help plugin
+        # It's tabified with other panes in the default layouts, so it's
+        # created once the main window is shown, like the other plugins of
+        # deferred_plugins (see create_next_deferred_plugin)
         if CONF.get('help', 'enable'):
-            self.set_splash(_("Loading help..."))
-            from spyder.plugins.help import Help
-            self.help = Help(self)
-            self.help.register_plugin()
+            self.deferred_plugins.append(('help', 'spyder.plugins.help',
+                                          'Help'))
 
         # Outline explorer widget
         if CONF.get('outline_explorer', 'enable'):
             self.set_splash(_("Loading outline explorer..."))
-            from spyder.plugins.outlineexplorer import OutlineExplorer
             fullpath_sorting = CONF.get('editor', 'fullpath_sorting', True)
-            self.outlineexplorer = OutlineExplorer(self,
-                                        fullpath_sorting=fullpath_sorting)
-            self.outlineexplorer.register_plugin()
+            self.create_plugin('outlineexplorer',
+                               'spyder.plugins.outlineexplorer',
+                               'OutlineExplorer',
+                               fullpath_sorting=fullpath_sorting)
 
         # Editor plugin
         self.set_splash(_("Loading editor..."))
-        from spyder.plugins.editor import Editor
-        self.editor = Editor(self)
-        self.editor.register_plugin()
+        self.create_plugin('editor', 'spyder.plugins.editor', 'Editor')
 
         # Populating file menu entries
         quit_action = create_action(self, _("&Quit"),
@@ -885,61 +913,71 @@ class MainWindow(QMainWindow):
 
         # Namespace browser
         self.set_splash(_("Loading namespace browser..."))
-        from spyder.plugins.variableexplorer import VariableExplorer
-        self.variableexplorer = VariableExplorer(self)
-        self.variableexplorer.register_plugin()
+        self.create_plugin('variableexplorer',
+                           'spyder.plugins.variableexplorer',
+                           'VariableExplorer')
 
         # History log widget
         if CONF.get('historylog', 'enable'):
             self.set_splash(_("Loading history plugin..."))
-            from spyder.plugins.history import HistoryLog
-            self.historylog = HistoryLog(self)
-            self.historylog.register_plugin()
+            self.create_plugin('historylog', 'spyder.plugins.history',
+                               'HistoryLog')
 
         # IPython console
         self.set_splash(_("Loading IPython console..."))
-        from spyder.plugins.ipythonconsole import IPythonConsole
-        self.ipyconsole = IPythonConsole(self)
-        self.ipyconsole.register_plugin()
+        self.create_plugin('ipyconsole', 'spyder.plugins.ipythonconsole',
+                           'IPythonConsole')
 
         # Explorer
+        # Also tabified with other panes in the default layouts
         if CONF.get('explorer', 'enable'):
-            self.set_splash(_("Loading file explorer..."))
-            from spyder.plugins.explorer import Explorer
-            self.explorer = Explorer(self)
-            self.explorer.register_plugin()
+            self.deferred_plugins.append(('explorer',
+                                          'spyder.plugins.explorer',
+                                          'Explorer'))
 
         # Online help widget
-        try:    # Qt >= v4.4
-            from spyder.plugins.onlinehelp import OnlineHelp
-        except ImportError:    # Qt < v4.4
-            OnlineHelp = None  # analysis:ignore
-        if CONF.get('onlinehelp', 'enable') and OnlineHelp is not None:
-            self.set_splash(_("Loading online help..."))
-            self.onlinehelp = OnlineHelp(self)
-            self.onlinehelp.register_plugin()
+        # Nothing else depends on it, so it's created once the main window
+        # is shown (see create_next_deferred_plugin)
+        if CONF.get('onlinehelp', 'enable'):
+            self.deferred_plugins.append(('onlinehelp',
+                                          'spyder.plugins.onlinehelp',
+                                          'OnlineHelp'))
 
         # Project explorer widget
-        self.set_splash(_("Loading project explorer..."))
-        from spyder.plugins.projects import Projects
-        self.projects = Projects(self)
-        self.projects.register_plugin()
-        self.project_path = self.projects.get_pythonpath(at_start=True)
+        # It's hidden in the default layouts while no project is open, so
+        # it's only created right away to open a project at startup
+        if (self.open_project or
+                CONF.get('project_explorer', 'current_project_path', None)):
+            self.set_splash(_("Loading project explorer..."))
+            self.create_plugin('projects', 'spyder.plugins.projects',
+                               'Projects')
+            self.project_path = self.projects.get_pythonpath(at_start=True)
+        else:
+            self.deferred_plugins.append(('projects',
+                                          'spyder.plugins.projects',
+                                          'Projects'))
 
         # Find in files
+        # Also created once the main window is shown
         if CONF.get('find_in_files', 'enable'):
-            from spyder.plugins.findinfiles import FindInFiles
-            self.findinfiles = FindInFiles(self)
-            self.findinfiles.register_plugin()
+            self.deferred_plugins.append(('findinfiles',
+                                          'spyder.plugins.findinfiles',
+                                          'FindInFiles'))
 
         # Third-party plugins
         self.set_splash(_("Loading third-party plugins..."))
-        for mod in get_spyderplugins_mods():
+        profile = self.startup_profile
+        with profile.measure("Third-party plugins", 'import'):
+            mods = get_spyderplugins_mods()
+        for mod in mods:
             try:
-                plugin = mod.PLUGIN_CLASS(self)
+                name = mod.PLUGIN_CLASS.__name__
+                with profile.measure(name, 'construction'):
+                    plugin = mod.PLUGIN_CLASS(self)
                 if plugin.check_compatibility()[0]:
                     self.thirdparty_plugins.append(plugin)
-                    plugin.register_plugin()
+                    with profile.measure(name, 'registration'):
+                        plugin.register_plugin()
             except Exception as error:
                 print("%s: %s" % (mod, str(error)), file=STDERR)
                 traceback.print_exc(file=STDERR)
@@ -988,9 +1026,11 @@ class MainWindow(QMainWindow):
         self.register_shortcut(doc_action, "_",
                                "spyder documentation")
 
-        if self.help is not None:
+        # Help is created later (see create_next_deferred_plugin)
+        if CONF.get('help', 'enable'):
             tut_action = create_action(self, _("Spyder tutorial"),
-                                       triggered=self.help.show_tutorial)
+                                       triggered=lambda:
+                                       self.help.show_tutorial())
         else:
             tut_action = None
 
@@ -1031,7 +1071,7 @@ class MainWindow(QMainWindow):
                                 programs.start_file(get_python_doc_path()))
             self.help_menu_actions.append(pydoc_act)
         # IPython documentation
-        if self.help is not None:
+        if CONF.get('help', 'enable'):
             ipython_menu = QMenu(_("IPython documentation"), self)
             intro_action = create_action(self, _("Intro to IPython"),
                                         triggered=self.ipyconsole.show_intro)
@@ -1260,13 +1300,10 @@ class MainWindow(QMainWindow):
             self.console.toggle_view_action.setChecked(False)
             self.console.dockwidget.hide()
 
-        # Show Help and Consoles by default
-        plugins_to_show = [self.ipyconsole]
-        if self.help is not None:
-            plugins_to_show.append(self.help)
-        for plugin in plugins_to_show:
-            if plugin.dockwidget.isVisible():
-                plugin.dockwidget.raise_()
+        # Show Consoles by default, and Help once it's created (see
+        # create_deferred_plugin)
+        if self.ipyconsole.dockwidget.isVisible():
+            self.ipyconsole.dockwidget.raise_()
 
         # Show history file if no console is visible
         if not self.ipyconsole.isvisible:
@@ -1274,7 +1311,7 @@ class MainWindow(QMainWindow):
 
         if self.open_project:
             self.projects.open_project(self.open_project)
-        else:
+        elif self.projects is not None:
             # Load last project if a project was active when Spyder
             # was closed
             self.projects.reopen_last_project()
@@ -1282,20 +1319,91 @@ class MainWindow(QMainWindow):
             # If no project is active, load last session
             if self.projects.get_active_project() is None:
                 self.editor.setup_open_files()
+        else:
+            # No project was active, so the last session is loaded
+            self.editor.setup_open_files()
 
         # Check for spyder updates
         if DEV is None and CONF.get('main', 'check_updates_on_startup'):
             self.give_updates_feedback = False
             self.check_updates(startup=True)
 
-        # Show dialog with missing dependencies
-        self.report_missing_dependencies()
+        # Show dialog with missing dependencies, once their versions are
+        # probed in the background
+        self.sig_dependencies_probed.connect(
+            self.report_missing_dependencies)
+        dependencies.probe_all(callback=self.sig_dependencies_probed.emit)
+
+        # Bring the index of the modules used for import completions up to
+        # date in the background
+        module_completion.refresh_index()
 
         # Raise the menuBar to the top of the main window widget's stack
         # (Fixes issue 3887)
         self.menuBar().raise_()
         self.is_setting_up = False
 
+        # Creating the remaining plugins in idle time
+        QTimer.singleShot(0, self.create_next_deferred_plugin)
+
+    def create_next_deferred_plugin(self):
+        """
+        Create the next plugin whose creation was deferred until the main
+        window was shown, and schedule the creation of the following one
+        """
+        if self.deferred_plugins:
+            self.create_deferred_plugin(*self.deferred_plugins.pop(0))
+            QTimer.singleShot(0, self.create_next_deferred_plugin)
+        else:
+            self.startup_profile.mark("All plugins created")
+            if self.show_startup_profile:
+                print(self.startup_profile.format(), file=STDERR)
+
+    def create_deferred_plugins(self):
+        """Create now all the plugins which are not created yet"""
+        while self.deferred_plugins:
+            self.create_deferred_plugin(*self.deferred_plugins.pop(0))
+
+    def create_deferred_plugin(self, attr, module_name, class_name):
+        """Create a plugin once the main window is set up"""
+        # Menus and toolbars are already filled, so the actions added by
+        # the plugin to their lists have to be added to them too
+        containers = [(getattr(self, name), name + '_actions') for name in
+                      ('file_menu', 'edit_menu', 'search_menu',
+                       'source_menu', 'run_menu', 'debug_menu',
+                       'consoles_menu', 'projects_menu', 'tools_menu',
+                       'main_toolbar', 'file_toolbar', 'edit_toolbar',
+                       'search_toolbar', 'source_toolbar', 'debug_toolbar',
+                       'run_toolbar')]
+        lengths = [len(getattr(self, actions)) for _c, actions in containers]
+        try:
+            plugin = self.create_plugin(attr, module_name, class_name)
+        except Exception as error:
+            setattr(self, attr, None)
+            print("%s: %s" % (class_name, str(error)), file=STDERR)
+            traceback.print_exc(file=STDERR)
+        else:
+            for (container, actions), length in zip(containers, lengths):
+                add_actions(container, getattr(self, actions)[length:])
+            self.apply_shortcuts()
+
+            # Placing the plugin where it was in the saved layout, or
+            # hiding it, as in all default layouts
+            if not self.restoreDockWidget(plugin.dockwidget):
+                plugin.dockwidget.hide()
+            elif plugin is self.help and plugin.dockwidget.isVisible():
+                # Help is shown by default
+                plugin.dockwidget.raise_()
+            try:
+                plugin.initialize_plugin_in_mainwindow_layout()
+            except Exception as error:
+                print("%s: %s" % (plugin, str(error)), file=STDERR)
+                traceback.print_exc(file=STDERR)
+            if not self.is_setting_up:
+                self.plugins_menu.clear()
+                self.create_plugins_menu()
+                self.apply_panes_settings()
+
     def update_window_title(self):
         """Update main spyder window title based on projects."""
         title = self.base_title
@@ -1482,6 +1590,8 @@ class MainWindow(QMainWindow):
        
     def setup_default_layouts(self, index, settings):
         """Setup default layouts when run for the first time"""
+        # Default layouts place all plugins
+        self.create_deferred_plugins()
         self.set_window_settings(*settings)
         self.setUpdatesEnabled(False)
 
@@ -2202,6 +2312,8 @@ class MainWindow(QMainWindow):
         self.dialog_manager.close_all()
         if self.toolbars_visible:
             self.save_visible_toolbars()
+        # Saving pending changes before a restart reads the config again
+        CONF.flush()
         self.already_closed = True
         return True
 
@@ -2520,7 +2632,10 @@ class MainWindow(QMainWindow):
         """Spyder path manager"""
         from spyder.widgets.pathmanager import PathManager
         self.remove_path_from_sys_path()
-        project_path = self.projects.get_pythonpath()
+        if self.projects is not None:
+            project_path = self.projects.get_pythonpath()
+        else:
+            project_path = []
         dialog = PathManager(self, self.path, project_path,
                              self.not_active_path, sync=True)
         dialog.redirect_stdio.connect(self.redirect_internalshell_stdio)
@@ -2606,6 +2721,7 @@ class MainWindow(QMainWindow):
     def edit_preferences(self):
         """Edit Spyder preferences"""
         from spyder.plugins.configdialog import ConfigDialog
+        self.create_deferred_plugins()
         dlg = ConfigDialog(self)
         dlg.size_change.connect(self.set_prefs_size)
         if self.prefs_dialog_size is not None:
@@ -3010,6 +3126,7 @@ def run_spyder(app, options, args):
         raise
 
     main.show()
+    main.startup_profile.mark("Main window shown")
     main.post_visible_setup()
 
     if main.console:
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Timeline of Spyder's startup
+
+It records how long each plugin takes to be imported, created and
+registered in the main window. It's printed with the --startup-profile
+command line option.
+"""
+
+# Standard library imports
+from contextlib import contextmanager
+import time
+
+
+# Stages of the creation of a plugin, in the order they happen
+PLUGIN_STAGES = ('import', 'construction', 'registration')
+
+
+class StartupProfile(object):
+    """Timeline of the steps of Spyder's startup"""
+
+    def __init__(self, start_time=None):
+        if start_time is None:
+            start_time = time.time()
+        self.start_time = start_time
+        self.steps = []  # (name, stage, start, duration), times in seconds
+
+    @contextmanager
+    def measure(self, name, stage):
+        """Record the duration of the stage of name run in a with block"""
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.steps.append((name, stage, start - self.start_time,
+                               time.time() - start))
+
+    def mark(self, name):
+        """Record an event without duration, e.g. the first paint"""
+        self.steps.append((name, '', time.time() - self.start_time, 0.))
+
+    def get_plugin_times(self):
+        """
+        Return a list of (name, times) for the plugins, where times maps
+        each of PLUGIN_STAGES to its duration, in the order of creation
+        """
+        names = []
+        times = {}
+        for name, stage, _start, duration in self.steps:
+            if stage not in PLUGIN_STAGES:
+                continue
+            if name not in times:
+                names.append(name)
+                times[name] = dict.fromkeys(PLUGIN_STAGES, 0.)
+            times[name][stage] += duration
+        return [(name, times[name]) for name in names]
+
+    def format(self):
+        """Return the timeline and the time spent by plugins, as text"""
+        lines = ['%10s %10s  %s' % ('start (ms)', 'time (ms)', 'step')]
+        for name, stage, start, duration in self.steps:
+            step = '%s: %s' % (name, stage) if stage else name
+            lines.append('%10.1f %10.1f  %s' % (start * 1000,
+                                                duration * 1000, step))
+        lines.append('')
+        lines.append('%-24s' % 'plugin' +
+                     ''.join('%14s' % stage for stage in PLUGIN_STAGES) +
+                     '%14s' % 'total')
+        for name, times in self.get_plugin_times():
+            durations = [times[stage] for stage in PLUGIN_STAGES]
+            lines.append('%-24s' % name +
+                         ''.join('%14.1f' % (duration * 1000)
+                                 for duration in durations + [sum(durations)]))
+        return '\n'.join(lines)
@@ -24,6 +24,7 @@ def test_get_options():
     assert not options.show_console
     assert not options.multithreaded
     assert not options.profile
+    assert not options.startup_profile
     assert options.window_title is None
     assert options.open_project is None
     assert options.files == []
@@ -40,6 +41,9 @@ def test_get_options():
     assert options.optimize
     assert options.working_directory == 'test dir'
 
+    options, args = getopt(['--startup-profile'])
+    assert options.startup_profile
+
     options, args = getopt('--window-title MyWindow'.split())
     assert options.window_title == 'MyWindow'
 
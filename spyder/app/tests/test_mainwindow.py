@@ -129,6 +129,8 @@ def main_window(request):
     app = initialize()
     options, args = get_options()
     window = run_spyder(app, options, args)
+    # Tests use plugins which are created once the window is shown
+    window.create_deferred_plugins()
     def close_window():
         window.close()
     request.addfinalizer(close_window)
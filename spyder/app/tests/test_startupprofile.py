@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for startupprofile.py
+"""
+
+import pytest
+
+from spyder.app.startupprofile import StartupProfile
+
+
+def test_startup_profile():
+    profile = StartupProfile()
+    for stage in ('import', 'construction', 'registration'):
+        with profile.measure('Editor', stage):
+            pass
+    with pytest.raises(ValueError):
+        with profile.measure('Help', 'construction'):
+            raise ValueError
+    profile.mark('Main window shown')
+
+    names = [name for name, _times in profile.get_plugin_times()]
+    assert names == ['Editor', 'Help']
+    assert len(profile.steps) == 5
+    text = profile.format()
+    assert 'Editor: registration' in text
+    assert 'Main window shown' in text
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -175,7 +175,8 @@ DEFAULTS = [
               'exclude_capitalized': False,
               'exclude_unsupported': True,
               'truncate': True,
-              'minmax': False
+              'minmax': False,
+              'confirm_transfer_size': 100
              }),
             ('editor',
              {
@@ -210,6 +211,7 @@ DEFAULTS = [
               'codecompletion/enter_key': True,
               'codecompletion/case_sensitive': True,
               'check_eol_chars': True,
+              'large_file_size': 10,
               'convert_eol_on_save': False,
               'convert_eol_on_save_to': 'LF',
               'tab_always_indent': False,
@@ -649,15 +651,19 @@ DEFAULTS = [
 # 3. You don't need to touch this value if you're just adding a new option
 CONF_VERSION = '42.0.0'
 
+# Options read from spyder.ini by other processes: the debugger of the
+# consoles loads breakpoints from it (see sitecustomize)
+EXTERNAL_OPTIONS = [('run', 'breakpoints'), ('run', 'breakpoints/enabled')]
+
 # Main configuration instance
 try:
     CONF = UserConfig('spyder', defaults=DEFAULTS, load=(not TEST),
                       version=CONF_VERSION, subfolder=SUBFOLDER, backup=True,
-                      raw_mode=True)
+                      raw_mode=True, external_options=EXTERNAL_OPTIONS)
 except:
     CONF = UserConfig('spyder', defaults=DEFAULTS, load=False,
                       version=CONF_VERSION, subfolder=SUBFOLDER, backup=True,
-                      raw_mode=True)
+                      raw_mode=True, external_options=EXTERNAL_OPTIONS)
 
 # Removing old .spyder.ini location:
 old_location = osp.join(get_home_dir(), '.spyder.ini')
@@ -45,6 +45,7 @@ def test_userconfig_get_does_not_eval_functions(userconfig):
 
 def test_userconfig_set_with_string(userconfig):
     userconfig.set('section', 'option', 'new value')
+    userconfig.flush()
     with open(userconfig.filename()) as inifile:
         iniContents = inifile.read()
     expected = '[main]\nversion = 1.0.0\n\n'
@@ -55,5 +56,46 @@ def test_userconfig_set_with_string(userconfig):
     assert iniContents == expected
 
 
+def test_userconfig_cached_values(userconfig):
+    """Test that cached values can't be changed by callers of get."""
+    userconfig.set('section', 'list', [1, 2])
+    value = userconfig.get('section', 'list')
+    value.append(3)
+    assert userconfig.get('section', 'list') == [1, 2]
+    userconfig.set('section', 'list', value)
+    assert userconfig.get('section', 'list') == [1, 2, 3]
+    assert userconfig.read_counts['section'] == 3
+    assert userconfig.write_counts['section'] == 2
+
+
+def test_userconfig_write_behind(userconfig, monkeypatch):
+    """Test that consecutive changes are saved at once."""
+    saves = []
+    monkeypatch.setattr('spyder.config.user.DefaultsConfig._save',
+                        lambda config: saves.append(config))
+    for i in range(10):
+        userconfig.set('section', 'option', i)
+    assert saves == []
+    userconfig.flush()
+    assert saves == [userconfig]
+    userconfig.flush()
+    assert saves == [userconfig]
+
+
+def test_userconfig_external_options(tmpdir, monkeypatch):
+    """Test that options read by other processes are saved at once."""
+    monkeypatch.setattr('spyder.config.user.get_conf_path', lambda: str(tmpdir))
+    userconfig = UserConfig('foo', defaults={}, subfolder=True,
+                            version='1.0.0', raw_mode=True,
+                            external_options=[('run', 'breakpoints')])
+    userconfig.set('run', 'breakpoints', {'spam.py': [(1, None)]})
+    userconfig.set('run', 'other', 1)
+    contents = tmpdir.join('foo.ini').read()
+    assert 'spam.py' in contents
+    assert 'other' not in contents
+    assert not tmpdir.join('foo.ini.tmp').check()
+    userconfig.flush()
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -14,10 +14,14 @@ from __future__ import print_function
 
 # Std imports
 import ast
+import atexit
+from collections import Counter
+import copy
 import os
 import re
 import os.path as osp
 import shutil
+import threading
 import time
 
 # Local imports
@@ -32,6 +36,27 @@ if PY2:
     import codecs
 
 
+# Delay (in seconds) before changes are saved to disk, so that consecutive
+# changes are written at once
+SAVE_DELAY = 0.5
+
+# Types of the values returned as is by UserConfig.get, the others are
+# copied to avoid changing the cached ones
+IMMUTABLE_TYPES = (bool, int, float, type(None), str, type(u''))
+
+# Configurations with changes waiting to be saved, by id (they are not
+# hashable)
+_PENDING_CONFIGS = {}
+
+
+def _flush_pending_configs():
+    """Save the changes of all configurations, at exit"""
+    for config in list(_PENDING_CONFIGS.values()):
+        config.flush()
+
+atexit.register(_flush_pending_configs)
+
+
 #==============================================================================
 # Auxiliary classes
 #==============================================================================
@@ -101,20 +126,31 @@ class DefaultsConfig(cp.ConfigParser):
         fname = self.filename()
 
         def _write_file(fname):
+            # The file is written under a temporary name and then renamed,
+            # so it's never left half written
+            tmp_fname = fname + '.tmp'
             if PY2:
                 # Python 2
-                with codecs.open(fname, 'w', encoding='utf-8') as configfile:
+                with codecs.open(tmp_fname, 'w',
+                                 encoding='utf-8') as configfile:
                     self._write(configfile)
             else:
                 # Python 3
-                with open(fname, 'w', encoding='utf-8') as configfile:
+                with open(tmp_fname, 'w', encoding='utf-8') as configfile:
                     self.write(configfile)
+            if hasattr(os, 'replace'):
+                # Atomic, also on Windows
+                os.replace(tmp_fname, fname)
+            else:
+                if os.name == 'nt' and osp.isfile(fname):
+                    os.remove(fname)
+                os.rename(tmp_fname, fname)
 
         try: # the "easy" way
             _write_file(fname)
         except IOError:
             try: # the "delete and sleep" way
-                if osp.isfile(fname):
+                if not hasattr(os, 'replace') and osp.isfile(fname):
                     os.remove(fname)
                 time.sleep(0.05)
                 _write_file(fname)
@@ -177,16 +213,32 @@ class UserConfig(DefaultsConfig):
               *or* list of tuples (section_name, options)
     version: version of the configuration file (X.Y.Z format)
     subfolder: configuration file will be saved in %home%/subfolder/%name%.ini
+    external_options: (section, option) pairs read from the .ini file by
+                      other processes, whose changes are saved at once
     
     Note that 'get' and 'set' arguments number and type
     differ from the overriden methods
+
+    Values returned by 'get' are cached, and changes are saved to disk
+    SAVE_DELAY seconds after they are made (see 'flush').
+    read_counts and write_counts count the calls to 'get' and 'set' of
+    each section.
     """
     DEFAULT_SECTION_NAME = 'main'
     def __init__(self, name, defaults=None, load=True, version=None,
                  subfolder=None, backup=False, raw_mode=False,
-                 remove_obsolete=False):
+                 remove_obsolete=False, external_options=None):
         DefaultsConfig.__init__(self, name, subfolder)
+        self.external_options = set(external_options or ())
         self.raw = 1 if raw_mode else 0
+        self._cache = {}
+        self._defaults_index = {}
+        self.read_counts = Counter()
+        self.write_counts = Counter()
+        self._dirty = False
+        self._save_timer = None
+        # Changes are saved from a timer thread
+        self._lock = threading.RLock()
         if (version is not None) and (re.match('^(\d+).(\d+).(\d+)$', version) is None):
             raise ValueError("Version number %r is incorrect - must be in X.Y.Z format" % version)
         if isinstance(defaults, dict):
@@ -227,7 +279,24 @@ class UserConfig(DefaultsConfig):
             if defaults is None:
                 # If no defaults are defined, set .ini file settings as default
                 self.set_as_defaults()
-        
+        # The file is created or updated right away, if needed
+        self.flush()
+
+    @property
+    def defaults(self):
+        """List of tuples (section_name, options) of default values"""
+        return self._defaults_list
+
+    @defaults.setter
+    def defaults(self, defaults):
+        self._defaults_list = defaults
+        # Index of the default values, by (section, option)
+        self._defaults_index = {}
+        for section, options in defaults or []:
+            for option, value in options.items():
+                self._defaults_index.setdefault((section, option), value)
+        self._cache.clear()
+
     def get_version(self, version='0.0.0'):
         """Return configuration (not application!) version"""
         return self.get(self.DEFAULT_SECTION_NAME, 'version', version)
@@ -255,6 +324,7 @@ class UserConfig(DefaultsConfig):
                 self.read(self.filename(), encoding='utf-8')
         except cp.MissingSectionHeaderError:
             print("Warning: File contains no section headers.")  # spyder: test-skip
+        self._cache.clear()
     
     def _load_old_defaults(self, old_version):
         """Read old defaults"""
@@ -308,8 +378,44 @@ class UserConfig(DefaultsConfig):
         """
         Remove .ini file associated to config
         """
+        self.flush()
         os.remove(self.filename())
 
+    def _set(self, section, option, value, verbose):
+        """
+        Private set method
+        """
+        with self._lock:
+            DefaultsConfig._set(self, section, option, value, verbose)
+        self._cache.pop((section, option), None)
+
+    def _save(self):
+        """
+        Save config into the associated .ini file, after SAVE_DELAY seconds
+
+        All the changes made in the meantime are saved at once.
+        """
+        with self._lock:
+            self._dirty = True
+            _PENDING_CONFIGS[id(self)] = self
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(SAVE_DELAY, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def flush(self):
+        """
+        Save pending changes into the associated .ini file now
+        """
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            _PENDING_CONFIGS.pop(id(self), None)
+            if self._dirty:
+                self._dirty = False
+                DefaultsConfig._save(self)
+
     def set_as_defaults(self):
         """
         Set defaults from the current config
@@ -351,13 +457,8 @@ class UserConfig(DefaultsConfig):
         -> useful for type checking in 'get' method
         """
         section = self._check_section_option(section, option)
-        for sec, options in self.defaults:
-            if sec == section:
-                if option in options:
-                    return options[ option ]
-        else:
-            return NoDefault
-                
+        return self._defaults_index.get((section, option), NoDefault)
+
     def get(self, section, option, default=NoDefault):
         """
         Get an option
@@ -366,6 +467,15 @@ class UserConfig(DefaultsConfig):
         will be raised if option doesn't exist)
         """
         section = self._check_section_option(section, option)
+        self.read_counts[section] += 1
+        try:
+            value = self._cache[(section, option)]
+        except KeyError:
+            pass
+        else:
+            if isinstance(value, IMMUTABLE_TYPES):
+                return value
+            return copy.deepcopy(value)
 
         if not self.has_section(section):
             if default is NoDefault:
@@ -408,7 +518,10 @@ class UserConfig(DefaultsConfig):
                 value = ast.literal_eval(value)
             except (SyntaxError, ValueError):
                 pass
-        return value
+        self._cache[(section, option)] = value
+        if isinstance(value, IMMUTABLE_TYPES):
+            return value
+        return copy.deepcopy(value)
 
     def set_default(self, section, option, default_value):
         """
@@ -419,6 +532,7 @@ class UserConfig(DefaultsConfig):
         for sec, options in self.defaults:
             if sec == section:
                 options[ option ] = default_value
+                self._defaults_index[(section, option)] = default_value
 
     def set(self, section, option, value, verbose=False, save=True):
         """
@@ -426,6 +540,7 @@ class UserConfig(DefaultsConfig):
         section=None: attribute a default section name
         """
         section = self._check_section_option(section, option)
+        self.write_counts[section] += 1
         default_value = self.get_default(section, option)
         if default_value is NoDefault:
             # This let us save correctly string value options with
@@ -446,11 +561,19 @@ class UserConfig(DefaultsConfig):
         self._set(section, option, value, verbose)
         if save:
             self._save()
+            if (section, option) in self.external_options:
+                self.flush()
             
     def remove_section(self, section):
-        cp.ConfigParser.remove_section(self, section)
+        with self._lock:
+            cp.ConfigParser.remove_section(self, section)
+        for key in list(self._cache):
+            if key[0] == section:
+                del self._cache[key]
         self._save()
             
     def remove_option(self, section, option):
-        cp.ConfigParser.remove_option(self, section, option)
+        with self._lock:
+            cp.ConfigParser.remove_option(self, section, option)
+        self._cache.pop((section, option), None)
         self._save()
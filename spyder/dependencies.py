@@ -4,15 +4,34 @@
 # Licensed under the terms of the MIT License
 # (see spyder/__init__.py for details)
 
-"""Module checking Spyder runtime dependencies"""
+"""Module checking Spyder runtime dependencies
 
+Installed versions are probed lazily: they are read in the metadata of the
+installed distributions, without importing them, and the results are
+cached on disk until the interpreter or its site-packages change. Modules
+without metadata are imported as a last resort.
+"""
 
+# Standard library imports
 import os
+import os.path as osp
+import sys
+import threading
 
 # Local imports
+from spyder.config.base import get_conf_path
+from spyder.py3compat import pickle
 from spyder.utils import programs
 
 
+CACHE_VERSION = 1
+
+# Results of get_installed_version, persisted in the cache
+_VERSIONS = {}
+_VERSIONS_LOCK = threading.RLock()
+_CACHE_STATE = {'loaded': False, 'modified': False, 'metadata': None}
+
+
 class Dependency(object):
     """Spyder's dependency
 
@@ -28,16 +47,20 @@ class Dependency(object):
         self.features = features
         self.required_version = required_version
         self.optional = optional
-        if installed_version is None:
-            try:
-                self.installed_version = programs.get_module_version(modname)
-            except:
-                # NOTE: Don't add any exception type here!
-                # Modules can fail to import in several ways besides
-                # ImportError
-                self.installed_version = None
-        else:
-            self.installed_version = installed_version
+        self.probed = installed_version is not None
+        self._installed_version = installed_version
+
+    @property
+    def installed_version(self):
+        """Installed version, probed the first time it's needed"""
+        if not self.probed:
+            self.probe()
+        return self._installed_version
+
+    def probe(self):
+        """Look for the installed version of the dependency"""
+        self._installed_version = get_installed_version(self.modname)
+        self.probed = True
 
     def check(self):
         """Check if dependency is installed"""
@@ -63,6 +86,110 @@ class Dependency(object):
 DEPENDENCIES = []
 
 
+def get_cache_path():
+    """Return the file where probed versions are cached"""
+    return get_conf_path('dependencies.pickle')
+
+
+def get_cache_key():
+    """
+    Return the key identifying the environment the cached versions were
+    probed in: the interpreter and the mtimes of its site-packages, which
+    change when packages are installed, upgraded or removed.
+    """
+    mtimes = []
+    for path in sys.path:
+        if osp.basename(path) not in ('site-packages', 'dist-packages'):
+            continue
+        try:
+            mtimes.append((path, os.stat(path).st_mtime))
+        except OSError:
+            pass
+    return (sys.executable, sys.version, tuple(mtimes))
+
+
+def load_cache():
+    """Load versions cached on disk for the current environment"""
+    try:
+        with open(get_cache_path(), 'rb') as fd:
+            data = pickle.load(fd)
+        if (data.get('version') == CACHE_VERSION and
+                data.get('key') == get_cache_key()):
+            _VERSIONS.update(data['versions'])
+    except Exception:
+        pass
+
+
+def save_cache():
+    """Save probed versions to disk, if new ones were probed"""
+    with _VERSIONS_LOCK:
+        if not _CACHE_STATE['modified']:
+            return
+        data = {'version': CACHE_VERSION, 'key': get_cache_key(),
+                'versions': dict(_VERSIONS)}
+        _CACHE_STATE['modified'] = False
+    try:
+        with open(get_cache_path(), 'wb') as fd:
+            pickle.dump(data, fd, 2)
+    except (IOError, OSError):
+        pass
+
+
+def get_installed_version(modname):
+    """
+    Return the installed version of modname, or None if it's not installed
+    or its version can't be found
+    """
+    with _VERSIONS_LOCK:
+        if not _CACHE_STATE['loaded']:
+            load_cache()
+            _CACHE_STATE['loaded'] = True
+        if modname in _VERSIONS:
+            return _VERSIONS[modname]
+        if _CACHE_STATE['metadata'] is None:
+            _CACHE_STATE['metadata'] = programs.get_metadata_versions()
+        version = programs.get_module_version_from_metadata(
+                      modname, _CACHE_STATE['metadata'])
+        if version is None:
+            try:
+                version = programs.get_module_version(modname)
+            except:
+                # NOTE: Don't add any exception type here!
+                # Modules can fail to import in several ways besides
+                # ImportError
+                version = None
+        _VERSIONS[modname] = version
+        _CACHE_STATE['modified'] = True
+        return version
+
+
+def probe_all(deps=DEPENDENCIES, callback=None):
+    """
+    Probe the installed versions of deps in a background thread, and save
+    them to the cache.
+
+    callback is called without arguments from that thread when done.
+    Return the thread.
+    """
+    def probe():
+        for dependency in deps[:]:
+            if not dependency.probed:
+                dependency.probe()
+        save_cache()
+        if callback is not None:
+            callback()
+
+    thread = threading.Thread(target=probe)
+    thread.daemon = True
+    thread.start()
+    return thread
+
+
+def all_probed(deps=DEPENDENCIES):
+    """Return True if the installed versions of deps are known"""
+    return all(dependency.probed for dependency in deps)
+
+
 def add(modname, features, required_version, installed_version=None,
         optional=False):
     """Add Spyder dependency"""
@@ -46,7 +46,8 @@ from spyder.widgets.editor import (EditorMainWindow, EditorSplitter,
                                    EditorStack, Printer)
 from spyder.widgets.sourcecode.codeeditor import CodeEditor
 from spyder.widgets.status import (CursorPositionStatus, EncodingStatus,
-                                   EOLStatus, ReadWriteStatus)
+                                   EOLStatus, LargeFileStatus,
+                                   ReadWriteStatus)
 from spyder.api.plugins import SpyderPluginWidget
 from spyder.api.preferences import PluginConfigPage
 from spyder.plugins.runconfig import (ALWAYS_OPEN_FIRST_RUN_OPTION,
@@ -259,8 +260,7 @@ class EditorConfigPage(PluginConfigPage):
         pep8_label = QLabel(_("<i>(Refer to the {} page)</i>").format(pep_url))
         pep8_label.setOpenExternalLinks(True)
         is_pyflakes = codeanalysis.is_pyflakes_installed()
-        is_pep8 = codeanalysis.get_checker_executable(
-                'pycodestyle') is not None
+        is_pep8 = codeanalysis.is_pycodestyle_installed()
         pyflakes_box = newcb(_("Real-time code analysis"),
                       'code_analysis/pyflakes', default=True,
                       tip=_("<p>If enabled, Python source code will be analyzed "
@@ -383,6 +383,21 @@ class EditorConfigPage(PluginConfigPage):
         eol_layout.addWidget(check_eol_box)
         eol_layout.addLayout(eol_on_save_layout)
         eol_group.setLayout(eol_layout)
+
+        large_file_group = QGroupBox(_("Large files"))
+        large_file_label = QLabel(_("Files larger than this size are shown "
+                                    "as plain text, without syntax "
+                                    "highlighting, code folding, "
+                                    "occurrence highlighting nor code "
+                                    "analysis, to open them faster."))
+        large_file_label.setWordWrap(True)
+        large_file_spin = self.create_spinbox(_("Large file size:"), _("MB"),
+                                              'large_file_size',
+                                              min_=1, max_=1000, step=1)
+        large_file_layout = QVBoxLayout()
+        large_file_layout.addWidget(large_file_label)
+        large_file_layout.addWidget(large_file_spin)
+        large_file_group.setLayout(large_file_layout)
         
         tabs = QTabWidget()
         tabs.addTab(self.create_tab(interface_group, display_group),
@@ -390,7 +405,8 @@ class EditorConfigPage(PluginConfigPage):
         tabs.addTab(self.create_tab(introspection_group, analysis_group),
                     _("Code Introspection/Analysis"))
         tabs.addTab(self.create_tab(template_btn, run_group, run_selection_group,
-                                    sourcecode_group, eol_group),
+                                    sourcecode_group, eol_group,
+                                    large_file_group),
                     _("Advanced settings"))
         
         vlayout = QVBoxLayout()
@@ -416,6 +432,7 @@ class Editor(SpyderPluginWidget):
     breakpoints_saved = Signal()
     run_in_current_extconsole = Signal(str, str, str, bool, bool)
     open_file_update = Signal(str)
+    sig_file_saved = Signal(str)
 
     def __init__(self, parent, ignore_last_opened_files=False):
         SpyderPluginWidget.__init__(self, parent)
@@ -458,6 +475,7 @@ class Editor(SpyderPluginWidget):
         self.dialog_size = None
         
         statusbar = self.main.statusBar()
+        self.largefile_status = LargeFileStatus(self, statusbar)
         self.readwrite_status = ReadWriteStatus(self, statusbar)
         self.eol_status = EOLStatus(self, statusbar)
         self.encoding_status = EncodingStatus(self, statusbar)
@@ -1237,7 +1255,6 @@ class Editor(SpyderPluginWidget):
         self.exec_in_extconsole.connect(self.main.execute_in_external_console)
         self.redirect_stdio.connect(self.main.redirect_internalshell_stdio)
         self.open_dir.connect(self.main.workingdirectory.chdir)
-        self.set_help(self.main.help)
         if self.main.outlineexplorer is not None:
             self.set_outlineexplorer(self.main.outlineexplorer)
         editorstack = self.get_current_editorstack()
@@ -1351,8 +1368,11 @@ class Editor(SpyderPluginWidget):
             editorstack.reset_statusbar.connect(self.readwrite_status.hide)
             editorstack.reset_statusbar.connect(self.encoding_status.hide)
             editorstack.reset_statusbar.connect(self.cursorpos_status.hide)
+            editorstack.reset_statusbar.connect(self.largefile_status.hide)
             editorstack.readonly_changed.connect(
                                         self.readwrite_status.readonly_changed)
+            editorstack.sig_large_file_changed.connect(
+                                  self.largefile_status.large_file_changed)
             editorstack.encoding_changed.connect(
                                          self.encoding_status.encoding_changed)
             editorstack.sig_editor_cursor_position_changed.connect(
@@ -1397,6 +1417,7 @@ class Editor(SpyderPluginWidget):
             ('set_occurrence_highlighting_enabled',  'occurrence_highlighting'),
             ('set_occurrence_highlighting_timeout',  'occurrence_highlighting/timeout'),
             ('set_checkeolchars_enabled',           'check_eol_chars'),
+            ('set_large_file_size',                 'large_file_size'),
             ('set_fullpath_sorting_enabled',        'fullpath_sorting'),
             ('set_tabbar_visible',                  'show_tab_bar'),
             ('set_classfunc_dropdown_visible',      'show_class_func_dropdown'),
@@ -1459,6 +1480,7 @@ class Editor(SpyderPluginWidget):
         editorstack.sig_next_cursor.connect(self.go_to_next_cursor_position)
         editorstack.sig_prev_warning.connect(self.go_to_previous_warning)
         editorstack.sig_next_warning.connect(self.go_to_next_warning)
+        editorstack.sig_pending_file_loaded.connect(self.pending_file_loaded)
 
     def unregister_editorstack(self, editorstack):
         """Removing editorstack only if it's not the last remaining"""
@@ -1493,6 +1515,7 @@ class Editor(SpyderPluginWidget):
             if str(id(editorstack)) != editorstack_id_str:
                 editorstack.file_saved_in_other_editorstack(original_filename,
                                                             filename)
+        self.sig_file_saved.emit(filename)
 
     @Slot(str, str, str)
     def file_renamed_in_data_in_editorstack(self, editorstack_id_str,
@@ -1911,8 +1934,9 @@ class Editor(SpyderPluginWidget):
                     break
             basedir = getcwd_or_home()
 
-            if self.main.projects.get_active_project() is not None:
-                basedir = self.main.projects.get_active_project_path()
+            if (self.projects is not None and
+                    self.projects.get_active_project() is not None):
+                basedir = self.projects.get_active_project_path()
             else:
                 c_fname = self.get_current_filename()
                 if c_fname is not None and c_fname != self.TEMPFILE_PATH:
@@ -1978,7 +2002,7 @@ class Editor(SpyderPluginWidget):
     @Slot(str, int, str)
     @Slot(str, int, str, object)
     def load(self, filenames=None, goto=None, word='', editorwindow=None,
-             processevents=True):
+             processevents=True, lazy=False):
         """
         Load a text file
         editorwindow: load in this editorwindow (useful when clicking on
@@ -1986,6 +2010,8 @@ class Editor(SpyderPluginWidget):
         processevents: determines if processEvents() should be called at the
         end of this method (set to False to prevent keyboard events from
         creeping through to the editor during debugging)
+        lazy: read the files other than the first one only when their tab is
+        shown or when the editor is idle (used to restore the last session)
         """
         editor0 = self.get_current_editor()
         if editor0 is not None:
@@ -2077,6 +2103,7 @@ class Editor(SpyderPluginWidget):
             current_editor = self.set_current_filename(filename,
                                                        editorwindow,
                                                        focus=focus)
+            pending = False
             if current_editor is None:
                 # -- Not a valid filename:
                 if not osp.isfile(filename):
@@ -2086,16 +2113,22 @@ class Editor(SpyderPluginWidget):
                 # Creating the editor widget in the first editorstack
                 # (the one that can't be destroyed), then cloning this
                 # editor widget in all other editorstacks:
-                finfo = self.editorstacks[0].load(filename, set_current=False)
+                finfo = self.editorstacks[0].load(
+                    filename, set_current=False, lazy=lazy and not focus,
+                    line=goto[index] if goto is not None else None)
                 finfo.path = self.main.get_spyder_pythonpath()
                 self._clone_file_everywhere(finfo)
                 current_editor = current_es.set_current_filename(filename,
                                                                  focus=focus)
-                current_editor.set_breakpoints(load_breakpoints(filename))
+                # Breakpoints of pending files are set once they're read
+                pending = finfo.is_pending()
+                if not pending:
+                    current_editor.set_breakpoints(load_breakpoints(filename))
                 self.register_widget_shortcuts(current_editor)
                 current_es.analyze_script()
                 self.__add_recent_file(filename)
-            if goto is not None: # 'word' is assumed to be None as well
+            if goto is not None and not pending:
+                # 'word' is assumed to be None as well
                 current_editor.go_to_line(goto[index], word=word)
                 position = current_editor.get_position('cursor')
                 self.cursor_moved(filename0, position0, filename, position)
@@ -2387,6 +2420,14 @@ class Editor(SpyderPluginWidget):
             self.add_cursor_position_to_history(filename0, position0)
         self.add_cursor_position_to_history(filename1, position1)
         
+    def pending_file_loaded(self, filename):
+        """Set the breakpoints of a file once its text is read"""
+        editorstack = self.editorstacks[0]
+        index = editorstack.has_filename(filename)
+        if index is not None:
+            editor = editorstack.data[index].editor
+            editor.set_breakpoints(load_breakpoints(filename))
+
     def text_changed_at(self, filename, position):
         self.last_edit_cursor_pos = (to_text_string(filename), position)
         
@@ -2735,6 +2776,8 @@ class Editor(SpyderPluginWidget):
             rt_analysis_o = self.get_option(rt_analysis_n)
             rta_timeout_n = 'realtime_analysis/timeout'
             rta_timeout_o = self.get_option(rta_timeout_n)
+            large_file_size_n = 'large_file_size'
+            large_file_size_o = self.get_option(large_file_size_n)
             finfo = self.get_current_finfo()
             if fpsorting_n in options:
                 if self.outlineexplorer is not None:
@@ -2803,6 +2846,8 @@ class Editor(SpyderPluginWidget):
                     editorstack.set_realtime_analysis_enabled(rt_analysis_o)
                 if rta_timeout_n in options:
                     editorstack.set_realtime_analysis_timeout(rta_timeout_o)
+                if large_file_size_n in options:
+                    editorstack.set_large_file_size(large_file_size_o)
 
             for name, action in self.checkable_actions.items():
                 if name in options:
@@ -2833,10 +2878,9 @@ class Editor(SpyderPluginWidget):
         If no project is active, then editor filenames are saved, otherwise
         the opened filenames are stored in the project config info.
         """
-        if self.projects is not None:
-            if not self.projects.get_active_project():
-                filenames = self.get_open_filenames()
-                self.set_option('filenames', filenames)
+        if self.projects is None or not self.projects.get_active_project():
+            filenames = self.get_open_filenames()
+            self.set_option('filenames', filenames)
  
     def setup_open_files(self):
         """Open the list of saved files per project"""
@@ -2855,7 +2899,7 @@ class Editor(SpyderPluginWidget):
             filenames = self.reorder_filenames(filenames)
             layout = self.get_option('layout_settings', None)
             is_vertical, cfname, clines = layout.get('splitsettings')[0]
-            self.load(filenames, goto=clines)
+            self.load(filenames, goto=clines, lazy=True)
             if layout is not None:
                 self.editorsplitter.set_layout_settings(layout,
                                                         dont_goto=filenames[0])
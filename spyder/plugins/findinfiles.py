@@ -86,6 +86,7 @@ class FindInFiles(SpyderPluginWidget):
     def set_project_path(self, path):
         """Refresh current project path"""
         self.findinfiles.find_options.set_project_path(path)
+        self.findinfiles.set_project_index(path)
 
     def set_current_opened_file(self, path):
         """Get path of current opened file in editor"""
@@ -94,6 +95,7 @@ class FindInFiles(SpyderPluginWidget):
     def unset_project_path(self):
         """Refresh current project path"""
         self.findinfiles.find_options.disable_project_search()
+        self.findinfiles.clear_project_index()
 
     @Slot()
     def findinfiles_callback(self):
@@ -149,6 +151,8 @@ class FindInFiles(SpyderPluginWidget):
         self.main.projects.sig_project_loaded.connect(self.set_project_path)
         self.main.projects.sig_project_closed.connect(self.unset_project_path)
         self.main.editor.open_file_update.connect(self.set_current_opened_file)
+        self.main.editor.sig_file_saved.connect(
+            self.findinfiles.update_project_index)
 
         findinfiles_action = create_action(self, _("&Find in files"),
                                    icon=ima.icon('findf'),
@@ -159,6 +163,15 @@ class FindInFiles(SpyderPluginWidget):
         self.main.search_toolbar_actions += [MENU_SEPARATOR,
                                              findinfiles_action]
         self.refreshdir()
+
+        # The plugin is created once the main window is shown, so a project
+        # or a file may already be opened
+        project_path = self.main.projects.get_active_project_path()
+        if project_path is not None:
+            self.set_project_path(project_path)
+        filename = self.main.editor.get_current_filename()
+        if filename is not None:
+            self.set_current_opened_file(filename)
     
     def refresh_plugin(self):
         """Refresh widget"""
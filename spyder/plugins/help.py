@@ -495,6 +495,9 @@ class Help(SpyderPluginWidget):
         self.main.add_dockwidget(self)
         self.main.console.set_help(self)
         self.internal_shell = self.main.console.shell
+        # Help is created after the editor and the IPython console
+        self.main.editor.set_help(self)
+        self.main.ipyconsole.set_help(self)
 
     def closing_plugin(self, cancelable=False):
         """Perform actions before parent main window is closed"""
@@ -771,7 +771,8 @@ class IPythonConsole(SpyderPluginWidget):
         if client and not self.testing:
             sw = client.shellwidget
             self.variableexplorer.set_shellwidget_from_id(id(sw))
-            self.help.set_shell(sw)
+            if self.help is not None:
+                self.help.set_shell(sw)
         self.update_tabs_text()
         self.sig_update_plugin_title.emit()
 
@@ -826,7 +827,6 @@ class IPythonConsole(SpyderPluginWidget):
         """Register plugin in Spyder's main window"""
         self.main.add_dockwidget(self)
 
-        self.help = self.main.help
         self.historylog = self.main.historylog
         self.variableexplorer = self.main.variableexplorer
         self.editor = self.main.editor
@@ -1581,6 +1581,19 @@ class IPythonConsole(SpyderPluginWidget):
         self.tabwidget.tabBar().tab_name_editor.edit_tab(index)
 
     #------ Public API (for help) ---------------------------------------------
+    def set_help(self, help_plugin):
+        """Connect Help to the clients, including the existing ones"""
+        self.help = help_plugin
+        for client in self.clients:
+            control = client.get_control()
+            if control is not None:
+                control.set_help(self.help)
+                control.set_help_enabled(
+                    CONF.get('help', 'connect/ipython_console'))
+        client = self.get_current_client()
+        if client is not None and not self.testing:
+            self.help.set_shell(client.shellwidget)
+
     def go_to_error(self, text):
         """Go to error if relevant"""
         match = get_error_match(to_text_string(text))
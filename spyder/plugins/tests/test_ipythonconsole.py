@@ -11,7 +11,6 @@ import shutil
 import tempfile
 from textwrap import dedent
 
-import cloudpickle
 from flaky import flaky
 from pygments.token import Name
 import pytest
@@ -433,11 +432,73 @@ def test_unicode_vars(ipyconsole, qtbot):
     assert shell.get_value('д') == 10
 
     # Change its value and verify
-    shell.set_value('д', [cloudpickle.dumps(20, protocol=2)])
+    shell.set_value('д', 20)
     qtbot.wait(1000)
     assert shell.get_value('д') == 20
 
 
+@pytest.mark.slow
+@flaky(max_runs=3)
+def test_set_value_in_chunks(ipyconsole, qtbot):
+    """Test that large values are sent to the kernel in chunks."""
+    import numpy as np
+
+    shell = ipyconsole.get_current_shellwidget()
+    qtbot.waitUntil(lambda: shell._prompt_html is not None,
+                    timeout=SHELL_TIMEOUT)
+
+    # An array of 24 MB is sent in 3 chunks
+    value = np.arange(3e6).reshape(1000, 3000)
+    progress = []
+    shell.sig_value_upload.connect(progress.append)
+    with qtbot.waitSignal(shell.sig_value_upload, timeout=SHELL_TIMEOUT,
+                          check_params_cb=lambda p: p['done']):
+        shell.set_value('arr', value)
+    assert len(progress) == 3
+    assert progress[-1]['error'] is None
+    assert progress[-1]['received'] == progress[-1]['size']
+
+    # The value set in the kernel can be modified
+    with qtbot.waitSignal(shell.executed):
+        shell.execute('arr[0, 0] = -1')
+    result = shell.get_value('arr')
+    assert result[0, 0] == -1
+    assert (result[1:] == value[1:]).all()
+
+
+@pytest.mark.slow
+@flaky(max_runs=3)
+def test_request_value_in_chunks(ipyconsole, qtbot):
+    """Test that large values are received from the kernel in chunks."""
+    import numpy as np
+
+    shell = ipyconsole.get_current_shellwidget()
+    qtbot.waitUntil(lambda: shell._prompt_html is not None,
+                    timeout=SHELL_TIMEOUT)
+    with qtbot.waitSignal(shell.executed):
+        shell.execute('import numpy as np; arr = np.arange(3e6)')
+
+    # An array of 24 MB is received in 3 chunks
+    progress = []
+    shell.sig_value_download.connect(progress.append)
+    with qtbot.waitSignal(shell.sig_value_download, timeout=SHELL_TIMEOUT,
+                          check_params_cb=lambda p: p['done']):
+        shell.request_value('arr')
+    assert len(progress) == 3
+    assert progress[-1]['error'] is None
+    assert (progress[-1]['value'] == np.arange(3e6)).all()
+
+    # Values larger than max_size are only sent once confirmed
+    del progress[:]
+    with qtbot.waitSignal(shell.sig_value_download, timeout=SHELL_TIMEOUT):
+        transfer_id = shell.request_value('arr', 1000)
+    assert progress[-1]['refused']
+    with qtbot.waitSignal(shell.sig_value_download, timeout=SHELL_TIMEOUT,
+                          check_params_cb=lambda p: p['done']):
+        shell.continue_value_request(transfer_id)
+    assert (progress[-1]['value'] == np.arange(3e6)).all()
+
+
 @pytest.mark.slow
 @flaky(max_runs=3)
 def test_read_stderr(ipyconsole, qtbot):
@@ -485,7 +546,7 @@ def test_values_dbg(ipyconsole, qtbot):
     assert shell.get_value('aa') == 10
 
     # Set value
-    shell.set_value('aa', [cloudpickle.dumps(20, protocol=2)])
+    shell.set_value('aa', 20)
     qtbot.wait(1000)
     assert shell.get_value('aa') == 20
 
@@ -17,6 +17,7 @@ def test_get_settings(monkeypatch):
         if option == 'remote1': return 'remote1val'
         if option == 'remote2': return 'remote2val'
         if option == 'dataframe_format': return '3d'
+        if option == 'confirm_transfer_size': return 100
         
     monkeypatch.setattr(VariableExplorer, 'CONF_SECTION', 'sect')
     monkeypatch.setattr('spyder.plugins.variableexplorer.REMOTE_SETTINGS', 
@@ -26,7 +27,7 @@ def test_get_settings(monkeypatch):
     app = qapplication()
     settings = VariableExplorer(None).get_settings()
     expected = {'remote1': 'remote1val', 'remote2': 'remote2val',
-                'dataframe_format': '%3d'}
+                'dataframe_format': '%3d', 'confirm_transfer_size': 100}
     assert settings == expected
 
 
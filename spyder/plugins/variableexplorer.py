@@ -37,6 +37,9 @@ class VariableExplorerConfigPage(PluginConfigPage):
         display_data = [('minmax', _("Show arrays min/max"), '')]
         display_boxes = [self.create_checkbox(text, option, tip=tip)
                          for option, text, tip in display_data]
+        transfer_spin = self.create_spinbox(
+            _("Ask before getting values larger than"), _("MB"),
+            'confirm_transfer_size', min_=1, max_=100000, step=10)
 
         filter_layout = QVBoxLayout()
         for box in filter_boxes:
@@ -46,6 +49,7 @@ class VariableExplorerConfigPage(PluginConfigPage):
         display_layout = QVBoxLayout()
         for box in display_boxes:
             display_layout.addWidget(box)
+        display_layout.addWidget(transfer_spin)
         display_group.setLayout(display_layout)
 
         vlayout = QVBoxLayout()
@@ -83,7 +87,8 @@ class VariableExplorer(SpyderPluginWidget):
         Retrieve all Variable Explorer configuration settings.
         
         Specifically, return the settings in CONF_SECTION with keys in 
-        REMOTE_SETTINGS, and the setting 'dataframe_format'.
+        REMOTE_SETTINGS, and the settings 'dataframe_format' and
+        'confirm_transfer_size'.
         
         Returns:
             dict: settings
@@ -96,6 +101,10 @@ class VariableExplorer(SpyderPluginWidget):
         # to avoid interference with ConfigParser's interpolation
         name = 'dataframe_format'
         settings[name] = '%{0}'.format(self.get_option(name))
+
+        # Only used by the frontend
+        name = 'confirm_transfer_size'
+        settings[name] = self.get_option(name)
         return settings
 
     @Slot(str, object)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""Tests for dependencies.py"""
+
+# Test library imports
+import pytest
+
+# Local imports
+from spyder import dependencies
+from spyder.utils import programs
+
+
+@pytest.fixture
+def probe_env(tmpdir, monkeypatch):
+    """Use an empty cache and record the modules imported to probe them."""
+    cache_path = str(tmpdir.join('dependencies.pickle'))
+    monkeypatch.setattr(dependencies, 'get_cache_path', lambda: cache_path)
+    monkeypatch.setattr(dependencies, '_VERSIONS', {})
+    monkeypatch.setattr(dependencies, '_CACHE_STATE',
+                        {'loaded': False, 'modified': False,
+                         'metadata': {'spam': '1.0'}})
+    imported = []
+
+    def get_module_version(modname):
+        imported.append(modname)
+        raise ImportError(modname)
+
+    monkeypatch.setattr(programs, 'get_module_version', get_module_version)
+    return imported
+
+
+def test_lazy_probing(probe_env):
+    """Test that versions are probed when needed, without imports."""
+    dependency = dependencies.Dependency('spam', 'Spam', '>=0.5')
+    assert not dependency.probed
+    assert dependency.check()
+    assert dependency.installed_version == '1.0'
+    assert probe_env == []
+
+    # Modules without metadata are imported
+    missing = dependencies.Dependency('eggs', 'Eggs', '>=1.0')
+    assert missing.installed_version is None
+    assert probe_env == ['eggs']
+
+
+def test_cached_versions(probe_env, monkeypatch):
+    """Test that versions are cached on disk for the same environment."""
+    dependencies.get_installed_version('eggs')
+    dependencies.save_cache()
+    dependencies._VERSIONS.clear()
+    dependencies.load_cache()
+    assert dependencies.get_installed_version('eggs') is None
+    assert probe_env == ['eggs']
+
+    # The cache is discarded when the environment changes
+    dependencies._VERSIONS.clear()
+    key = dependencies.get_cache_key()
+    monkeypatch.setattr(dependencies, 'get_cache_key',
+                        lambda: key + (('site-packages', 0),))
+    dependencies.load_cache()
+    assert 'eggs' not in dependencies._VERSIONS
+
+
+def test_probe_all(probe_env):
+    """Test probing dependencies in the background."""
+    deps = [dependencies.Dependency('spam', 'Spam', '>=0.5')]
+    done = []
+    dependencies.probe_all(deps, callback=lambda: done.append(True)).join()
+    assert done
+    assert dependencies.all_probed(deps)
+
+
+if __name__ == "__main__":
+    pytest.main()
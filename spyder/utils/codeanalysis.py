@@ -8,6 +8,7 @@
 Source code analysis utilities
 """
 
+import multiprocessing
 import sys
 import re
 import os
@@ -19,6 +20,7 @@ from spyder.config.base import _, DEBUG
 from spyder.utils import programs, encoding
 from spyder.py3compat import to_text_string, to_binary_string, PY3
 from spyder import dependencies
+from spyder.utils.workerpool import create_pool
 DEBUG_EDITOR = DEBUG >= 3
 
 #==============================================================================
@@ -102,6 +104,12 @@ def is_pyflakes_installed():
     return programs.is_module_installed('pyflakes', PYFLAKES_REQVER)
 
 
+def is_pycodestyle_installed():
+    """Return True if pycodestyle can be run, as a module or a program"""
+    return (programs.is_module_installed('pycodestyle', PYCODESTYLE_REQVER)
+            or get_checker_executable('pycodestyle') is not None)
+
+
 def get_checker_executable(name):
     """Return checker executable in the form of a list of arguments
     for subprocess.Popen"""
@@ -165,11 +173,61 @@ def check(args, source_code, filename=None, options=None):
     return results
 
 
+_STYLE_GUIDE = None
+
+
+def check_with_pycodestyle_module(source_code, filename=None):
+    """
+    Check source code with pycodestyle, in the current interpreter
+    Raises ImportError if pycodestyle is not installed
+    """
+    global _STYLE_GUIDE
+    import pycodestyle
+
+    class Report(pycodestyle.BaseReport):
+        """Report collecting the (message, line number) of each error"""
+        def __init__(self, options):
+            super(Report, self).__init__(options)
+            self.results = []
+
+        def error(self, line_number, offset, text, check):
+            code = super(Report, self).error(line_number, offset, text,
+                                             check)
+            if code:
+                self.results.append((line_number, offset, text))
+            return code
+
+    if _STYLE_GUIDE is None:
+        # Reading the user configuration is done only once
+        _STYLE_GUIDE = pycodestyle.StyleGuide(repeat=True)
+    if isinstance(source_code, bytes):
+        coding = encoding.get_coding(source_code) or 'utf-8'
+        try:
+            text = source_code.decode(coding)
+        except (UnicodeDecodeError, LookupError):
+            text = source_code.decode('latin-1')
+    else:
+        text = source_code
+    lines = text.splitlines(True)
+    report = Report(_STYLE_GUIDE.options)
+    checker = pycodestyle.Checker(filename or 'stdin', lines=lines,
+                                  options=_STYLE_GUIDE.options, report=report)
+    checker.check_all()
+    # Errors are sorted like in pycodestyle's own output
+    return [(message, lineno) for lineno, _offset, message
+            in sorted(report.results)
+            if 'analysis:ignore' not in lines[lineno-1]]
+
+
 def check_with_pep8(source_code, filename=None):
     """Check source code with pycodestyle"""
     try:
-        args = get_checker_executable('pycodestyle')
-        results = check(args, source_code, filename=filename, options=['-r'])
+        try:
+            results = check_with_pycodestyle_module(source_code, filename)
+        except ImportError:
+            args = get_checker_executable('pycodestyle')
+            results = check(args, source_code, filename=filename,
+                            options=['-r'])
     except Exception:
         # Never return None to avoid lock in spyder/widgets/editor.py
         # See Issue 1547
@@ -179,6 +237,56 @@ def check_with_pep8(source_code, filename=None):
     return results
 
 
+#==============================================================================
+# Analysis workers
+#==============================================================================
+# Checkers which can be run by the workers
+CHECKERS = {'pyflakes': check_with_pyflakes,
+            'pep8': check_with_pep8,
+            'todo': find_tasks}
+
+_POOL = None
+
+
+def init_worker():
+    """Import checkers once for all, when a worker starts"""
+    for module in ('pyflakes.checker', 'pycodestyle'):
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+
+
+def run_checker(args):
+    """
+    Worker entry point: check source code with one of CHECKERS
+
+    args is a (checker name, source code) tuple.
+    """
+    name, source_code = args
+    try:
+        return CHECKERS[name](source_code)
+    except Exception:
+        # There are no error callbacks in Python 2 pools, so this must
+        # never raise: results would be waited for ever
+        if DEBUG_EDITOR:
+            traceback.print_exc()
+        return []
+
+
+def get_pool():
+    """
+    Return the pool of analysis workers, shared by all editors
+
+    It has one worker per core. See workerpool.create_pool for the choice
+    between processes and threads.
+    """
+    global _POOL
+    if _POOL is None:
+        _POOL = create_pool(multiprocessing.cpu_count(), init_worker)
+    return _POOL
+
+
 if __name__ == '__main__':
 #    fname = __file__
     fname = os.path.join(os.path.dirname(__file__),
@@ -100,13 +100,21 @@ CODECS = ['utf-8', 'iso8859-1',  'iso8859-15', 'ascii', 'koi8-r', 'cp1251',
           'iso8859-10', 'iso8859-13', 'iso8859-14', 'latin-1',
           'utf-16']
 
+# Only the first two lines of a text may declare its coding, which are
+# looked for in this number of characters at its beginning
+CODING_PREFIX_SIZE = 8 * 1024
+
+# Number of bytes read at a time by read_chunks
+READ_CHUNK_SIZE = 1024 ** 2
+
 def get_coding(text):
     """
     Function to get the coding of a text.
     @param text text to inspect (string)
     @return coding string
     """
-    for line in text.splitlines()[:2]:
+    lines = text[:CODING_PREFIX_SIZE].splitlines()[:2]
+    for line in lines:
         try:
             result = CODING_RE.search(to_text_string(line))
         except UnicodeDecodeError:
@@ -123,7 +131,7 @@ def get_coding(text):
     # Fallback using chardet
     if is_binary_string(text):
         detector = UniversalDetector()
-        for line in text.splitlines()[:2]:
+        for line in lines:
             detector.feed(line)
             if detector.done: break
 
@@ -243,6 +251,57 @@ def read(filename, encoding='utf-8'):
     text, encoding = decode( open(filename, 'rb').read() )
     return text, encoding
 
+def read_chunks(filename, encoding=None, chunk_size=READ_CHUNK_SIZE):
+    """
+    Read text from file ('filename') in chunks of 'chunk_size' bytes,
+    detecting its encoding from the first chunk only, unless given
+    Return encoding and an iterator over the text of the chunks
+
+    The iterator raises UnicodeError if the file can't be decoded, in which
+    case it may be read again with encoding 'latin-1-guessed', as decode
+    would fall back to
+    """
+    textfile = open(filename, 'rb')
+    data = textfile.read(chunk_size)
+    bom = b''
+    if encoding is None:
+        for bom, encoding in ((BOM_UTF8, 'utf-8-bom'), (BOM_UTF16, 'utf-16'),
+                              (BOM_UTF32, 'utf-32')):
+            if data.startswith(bom):
+                break
+        else:
+            bom = b''
+            encoding = get_coding(data)
+            if not encoding or encoding.lower() == 'ascii':
+                # Non-ASCII text may come after the chunk
+                encoding = 'utf-8-guessed'
+    codec = encoding.replace('-bom', '').replace('-guessed', '')
+    try:
+        decoder = getincrementaldecoder(codec)()
+    except LookupError:
+        encoding = 'utf-8-guessed'
+        decoder = getincrementaldecoder('utf-8')()
+    return encoding, _decode_chunks(textfile, data[len(bom):], decoder,
+                                    chunk_size)
+
+def _decode_chunks(textfile, data, decoder, chunk_size):
+    """Decode data and then the rest of textfile, read by chunk_size bytes"""
+    with textfile:
+        pending = u''
+        while data:
+            text = pending + decoder.decode(data)
+            data = textfile.read(chunk_size)
+            # Keep CRLF end-of-lines split between two chunks together
+            if text.endswith(u'\r') and data:
+                text, pending = text[:-1], u'\r'
+            else:
+                pending = u''
+            if text:
+                yield text
+        text = decoder.decode(b'', True)
+        if text:
+            yield text
+
 def readlines(filename, encoding='utf-8'):
     """
     Read lines from file ('filename')
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Bulk search backend used by Find in Files
+
+Files are read whole through mmap and scanned with a precompiled bytes
+pattern, instead of line by line. Lists of files are dispatched in chunks to
+a pool of workers (processes or threads) and matches come back in batches.
+
+This module must not import Qt: its functions run inside worker processes.
+"""
+
+# Standard library imports
+from __future__ import print_function
+import mmap
+import multiprocessing
+import os
+import os.path as osp
+import re
+from collections import deque
+
+# Local imports
+from spyder.utils.external.binaryornot.helpers import is_binary_string
+from spyder.utils.workerpool import create_pool
+
+
+# Number of files sent to a worker in a single task
+CHUNK_SIZE = 32
+
+# Number of tasks queued per core while results are consumed
+TASKS_PER_WORKER = 2
+
+# Number of bytes inspected to decide if a file is binary
+BINARY_CHECK_SIZE = 1024
+
+# Same list used by binaryornot's is_binary
+BINARY_EXTENSIONS = ('pyc', 'iso', 'zip', 'pdf')
+
+
+def read_file(fname):
+    """
+    Return the contents of fname as a buffer.
+
+    Non-empty files are memory-mapped to avoid copying them; empty files
+    give an empty bytes object because they can't be mapped.
+    """
+    with open(fname, 'rb') as fd:
+        if os.fstat(fd.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def is_binary_buffer(fname, buf):
+    """Same heuristic as encoding.is_text_file, but on a buffer in memory."""
+    if fname.endswith(BINARY_EXTENSIONS):
+        return True
+    return is_binary_string(buf[:BINARY_CHECK_SIZE])
+
+
+def prepare_texts(texts, text_re, case_sensitive=True):
+    """
+    Prepare the search texts for a bulk scan of a whole file.
+
+    Regular expressions are recompiled with re.MULTILINE so that '^' and '$'
+    keep matching at every line, as they did when scanning line by line.
+    Case insensitive searches use re.IGNORECASE, also for plain texts, to
+    avoid lowering whole files. Texts that are the same in several
+    encodings are only kept once.
+    """
+    prepared = []
+    seen = set()
+    for text, enc in texts:
+        if text_re:
+            text = re.compile(text.pattern, text.flags | re.MULTILINE |
+                              (0 if case_sensitive else re.IGNORECASE))
+        elif not case_sensitive:
+            text = re.compile(re.escape(text), re.IGNORECASE)
+        key = text if isinstance(text, bytes) else (text.pattern, text.flags)
+        if key not in seen:
+            seen.add(key)
+            prepared.append((text, enc))
+    return prepared
+
+
+def _line_bounds(buf, pos):
+    """Return the start and end (after its newline) of the line at pos."""
+    start = buf.rfind(b'\n', 0, pos) + 1
+    end = buf.find(b'\n', pos)
+    return start, (len(buf) if end == -1 else end + 1)
+
+
+def _iter_spans(text, buf):
+    """
+    Iterate over the (start, end) spans of text found in buf.
+
+    Regular expressions are matched line by line, like a scan of the lines
+    of the file would do, so that patterns like '\\s+' don't match across
+    lines: lines are only found by searching the whole buffer.
+    """
+    if isinstance(text, bytes):
+        found = buf.find(text)
+        while found > -1:
+            yield found, found + len(text)
+            found = buf.find(text, found + 1)
+        return
+    pos = 0
+    size = len(buf)
+    while pos < size:
+        match = text.search(buf, pos)
+        if match is None:
+            return
+        line_start, line_end = _line_bounds(buf, match.start())
+        if match.end() <= line_end:
+            yield match.start(), match.end()
+            # The next match is searched from its end, like finditer does
+            pos = match.end() + (match.end() == match.start())
+            continue
+        # The match spans several lines: the rest of the line it starts on
+        # is searched on its own
+        for line_match in text.finditer(buf, max(pos, line_start),
+                                        line_end):
+            yield line_match.start(), line_match.end()
+        pos = line_end
+
+
+def search_buffer(fname, buf, texts):
+    """
+    Search texts, as returned by prepare_texts, in buf, the contents of
+    fname.
+
+    Returns a list of (fname, lineno, colno, match_end, line) tuples, which
+    is the format of the batches emitted by SearchThread.sig_file_matches,
+    sorted by position. Matches found in several encodings are only given
+    once.
+    """
+    if not buf:
+        return []
+
+    results = {}
+    for text, enc in texts:
+        lineno = 1
+        last_pos = 0
+        line_start = 0
+        line_end = -1
+        line = None
+        for start, end in _iter_spans(text, buf):
+            if start > line_end:
+                # mmap objects have no count method, hence the slice
+                lineno += buf[last_pos:start].count(b'\n')
+                last_pos = start
+                line_start = buf.rfind(b'\n', 0, start) + 1
+                line_end = buf.find(b'\n', start)
+                if line_end == -1:
+                    line_end = len(buf)
+                    line = buf[line_start:line_end]
+                else:
+                    line = buf[line_start:line_end + 1]
+                try:
+                    line = line.decode(enc)
+                except UnicodeDecodeError:
+                    pass
+            span = (start, min(end, line_end))
+            if span not in results:
+                results[span] = (fname, lineno, start - line_start,
+                                 span[1] - line_start, line)
+    return [results[span] for span in sorted(results)]
+
+
+def search_file(fname, texts, check_binary=True):
+    """
+    Search texts, as returned by prepare_texts, in the file fname.
+
+    Returns a tuple (results, error) where error is True if the file could
+    not be read.
+    """
+    fname = osp.abspath(fname)
+    try:
+        buf = read_file(fname)
+    except (IOError, OSError, ValueError):
+        return [], True
+    try:
+        if check_binary and is_binary_buffer(fname, buf):
+            return [], False
+        return search_buffer(fname, buf, texts), False
+    finally:
+        if isinstance(buf, mmap.mmap):
+            buf.close()
+
+
+def search_chunk(args):
+    """
+    Worker entry point: search texts in a list of files.
+
+    args is a (filenames, texts) tuple, texts being returned by
+    prepare_texts. Returns a tuple (last_filename, results, error).
+    """
+    filenames, texts = args
+    results = []
+    error = False
+    for fname in filenames:
+        file_results, file_error = search_file(fname, texts)
+        results.extend(file_results)
+        error = error or file_error
+    return filenames[-1], results, error
+
+
+def iter_chunks(filenames, size=CHUNK_SIZE):
+    """Group an iterable of file names in lists of at most size items."""
+    chunk = []
+    for fname in filenames:
+        chunk.append(fname)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+_POOL = None
+
+
+def get_pool():
+    """
+    Return the pool of search workers, created on the first search and
+    reused by the next ones.
+    """
+    global _POOL
+    if _POOL is None:
+        _POOL = create_pool()
+    return _POOL
+
+
+def imap_bounded(pool, func, iterable):
+    """
+    Like pool.imap, but keep only a few tasks queued at a time.
+
+    pool.imap queues all the tasks at once, so when the caller stops
+    consuming the results (e.g. a search is stopped) the remaining ones
+    would still delay the next users of a shared pool.
+    """
+    size = TASKS_PER_WORKER * multiprocessing.cpu_count()
+    pending = deque()
+    for args in iterable:
+        pending.append(pool.apply_async(func, (args,)))
+        if len(pending) >= size:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
@@ -8,7 +8,7 @@
 import os.path as osp
 
 # Third party imports
-from qtpy.QtGui import QIcon
+from qtpy.QtGui import QIcon, QIconEngine
 from qtpy.QtWidgets import QStyle, QWidget
 
 # Local imports
@@ -20,6 +20,7 @@ import qtawesome as qta
 _resource = {
     'directory': osp.join(osp.dirname(osp.realpath(__file__)), '../fonts'),
     'loaded': False,
+    'theme': None,
 }
 
 _qtaargs = {
@@ -272,15 +273,76 @@ def get_icon(name, default=None, resample=False):
         return icon
 
 
+class CachedIconEngine(QIconEngine):
+    """
+    Icon engine reusing the pixmaps rendered by another icon
+
+    Font icons are painted from their glyph every time they are shown, so
+    their pixmaps are kept for each size, mode and state they're drawn at.
+    """
+
+    def __init__(self, icon, pixmaps=None):
+        QIconEngine.__init__(self)
+        self.icon = icon
+        self.pixmaps = {} if pixmaps is None else pixmaps
+
+    def pixmap(self, size, mode, state):
+        """Reimplement Qt method"""
+        key = (size.width(), size.height(), mode, state)
+        pixmap = self.pixmaps.get(key)
+        if pixmap is None:
+            pixmap = self.icon.pixmap(size, mode, state)
+            self.pixmaps[key] = pixmap
+        return pixmap
+
+    def paint(self, painter, rect, mode, state):
+        """Reimplement Qt method"""
+        # Render at the resolution of the device, e.g. on high dpi screens
+        size = rect.size() * painter.device().devicePixelRatio()
+        painter.drawPixmap(rect, self.pixmap(size, mode, state))
+
+    def clone(self):
+        """Reimplement Qt method"""
+        return CachedIconEngine(self.icon, self.pixmaps)
+
+
+# Icons already created, by (name, theme, resample, icon_path)
+_icon_cache = {}
+
+
+def clear_icon_cache():
+    """Forget the icons already created, e.g. after a theme change"""
+    _icon_cache.clear()
+    _resource['theme'] = None
+
+
 def icon(name, resample=False, icon_path=None):
     theme = CONF.get('main', 'icon_theme')
+    if theme != _resource['theme']:
+        # Icons of the previous theme won't be used anymore
+        clear_icon_cache()
+        _resource['theme'] = theme
+    key = (name, theme, resample, icon_path)
+    try:
+        cached_icon = _icon_cache[key]
+    except KeyError:
+        cached_icon = _icon_cache[key] = _create_icon(name, theme, resample,
+                                                      icon_path)
+    if cached_icon is None:
+        return None
+    # QIcon is implicitly shared: this copy is cheap, and modifying it
+    # doesn't change the cached icon
+    return QIcon(cached_icon)
+
+
+def _create_icon(name, theme, resample, icon_path):
     if theme == 'spyder 3':
         if not _resource['loaded']:
             qta.load_font('spyder', 'spyder.ttf', 'spyder-charmap.json',
                           directory=_resource['directory'])
             _resource['loaded'] = True
         args, kwargs = _qtaargs[name]
-        return qta.icon(*args, **kwargs)
+        return QIcon(CachedIconEngine(qta.icon(*args, **kwargs)))
     elif theme == 'spyder 2':
         icon = get_icon(name + '.png', resample=resample)
         if icon_path:
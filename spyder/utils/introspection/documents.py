@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Synchronization of the documents of the editor with introspection servers
+
+Servers keep their own copy of each document. The client opens a document
+by sending its whole text, then only sends the edits made to it, each one
+increasing the document version. Requests refer to a document by its id
+and version instead of carrying its text.
+
+This module is imported by plugin servers, so it must only depend on the
+standard library.
+"""
+
+# Names of the requests handled by a DocumentStore
+DOCUMENT_REQUESTS = ('open_document', 'change_document', 'close_document')
+
+
+def get_text_delta(old, new):
+    """
+    Return (start, end, text) such that replacing old[start:end] by text
+    gives new, with the smallest single replaced region.
+    """
+    # Common prefix and suffix are found by bisection, so strings are
+    # compared by slices instead of character by character
+    low, high = 0, min(len(old), len(new))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[:middle] == new[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    prefix = low
+    low, high = 0, min(len(old), len(new)) - prefix
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[len(old) - middle:] == new[len(new) - middle:]:
+            low = middle
+        else:
+            high = middle - 1
+    suffix = low
+    return prefix, len(old) - suffix, new[prefix:len(new) - suffix]
+
+
+class DocumentError(Exception):
+    """A request refers to a document which is not in sync"""
+
+    def __init__(self, doc_id):
+        Exception.__init__(self, "Document %r is not in sync" % (doc_id,))
+        self.doc_id = doc_id
+
+
+class DocumentStore(object):
+    """Texts of the documents opened by a client, on the server side."""
+
+    def __init__(self):
+        self.documents = {}  # doc_id -> (version, text)
+
+    def handle_request(self, request):
+        """Apply an open_document, change_document or close_document."""
+        getattr(self, request['func_name'])(*request.get('args', ()))
+
+    def open_document(self, doc_id, version, text):
+        self.documents[doc_id] = (version, text)
+
+    def change_document(self, doc_id, version, start, end, text):
+        try:
+            old_version, old_text = self.documents[doc_id]
+        except KeyError:
+            return
+        if version != old_version + 1:
+            # An edit was lost: the client will open it again
+            del self.documents[doc_id]
+            return
+        self.documents[doc_id] = (version,
+                                  old_text[:start] + text + old_text[end:])
+
+    def close_document(self, doc_id):
+        self.documents.pop(doc_id, None)
+
+    def get_text(self, doc_id, version):
+        """Return the text of a document, raising DocumentError if the
+        version is not the one stored."""
+        try:
+            stored_version, text = self.documents[doc_id]
+        except KeyError:
+            raise DocumentError(doc_id)
+        if stored_version != version:
+            raise DocumentError(doc_id)
+        return text
+
+    def resolve(self, value):
+        """
+        Put back the source code in a request value referring to a document
+        by its (id, version).
+        """
+        if isinstance(value, dict) and 'document' in value:
+            value = dict(value)
+            doc_id, version = value.pop('document')
+            value['source_code'] = self.get_text(doc_id, version)
+        return value
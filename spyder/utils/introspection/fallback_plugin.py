@@ -85,7 +85,6 @@ class FallbackPlugin(IntrospectionPlugin):
         if not info['is_python_like']:
             return
         token = info['obj']
-        lines = info['lines']
         source_code = info['source_code']
         filename = info['filename']
 
@@ -96,7 +95,7 @@ class FallbackPlugin(IntrospectionPlugin):
             token = token.split('.')[-1]
 
         line_nr = get_definition_with_regex(source_code, token,
-                                            len(lines))
+                                            info['line_num'])
         if line_nr is None:
             return
         line = info['line']
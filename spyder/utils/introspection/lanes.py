@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Concurrent handling of the requests sent to introspection servers
+
+Requests are dispatched to lanes, one per kind of request, each one with
+its own worker thread, so a slow request (e.g. a go to definition) never
+delays the requests of other lanes (e.g. completions).
+
+A lane only keeps the most recent request. A request replaced by a newer
+one of the same lane, or cancelled by the client, is answered right away
+with a 'superseded' or 'cancelled' response instead of its result.
+"""
+
+# Standard library imports
+import threading
+
+
+# Lane of each kind of request; other requests get a lane of their own
+LANES = {
+    'get_completions': 'completions',
+    'get_info': 'info',
+    'get_definition': 'definition',
+}
+
+
+def make_response(request, **kwargs):
+    """Return a response to request, with the fields in kwargs."""
+    response = dict(func_name=request['func_name'],
+                    request_id=request['request_id'])
+    response.update(kwargs)
+    return response
+
+
+class Lane(object):
+    """Worker thread handling the most recent request of a kind."""
+
+    def __init__(self, name, handler, reply):
+        self.name = name
+        self.handler = handler  # request -> response
+        self.reply = reply      # Called with each response, from any thread
+        self.pending = None
+        self.running = None
+        self.running_dropped = False
+        self.stopped = False
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self.run,
+                                       name='introspection-' + name)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def submit(self, request):
+        """Queue request, superseding the requests not answered yet."""
+        with self.condition:
+            self._drop_pending('superseded')
+            self._drop_running('superseded')
+            self.pending = request
+            self.condition.notify()
+
+    def cancel(self, request_id):
+        """Cancel the request with request_id if it was not answered."""
+        with self.condition:
+            if (self.pending is not None and
+                    self.pending['request_id'] == request_id):
+                self._drop_pending('cancelled')
+            elif (self.running is not None and
+                    self.running['request_id'] == request_id):
+                self._drop_running('cancelled')
+
+    def stop(self):
+        """Stop the worker once the current request is handled."""
+        with self.condition:
+            self.stopped = True
+            self.condition.notify()
+
+    def is_busy(self):
+        """Return True if a request is pending or running."""
+        with self.condition:
+            return self.pending is not None or self.running is not None
+
+    def _drop_pending(self, reason):
+        if self.pending is not None:
+            self.reply(make_response(self.pending, **{reason: True}))
+            self.pending = None
+
+    def _drop_running(self, reason):
+        # The running request can't be interrupted: it's answered now and
+        # its result will be discarded
+        if self.running is not None and not self.running_dropped:
+            self.reply(make_response(self.running, **{reason: True}))
+            self.running_dropped = True
+
+    def run(self):
+        while 1:
+            with self.condition:
+                while self.pending is None and not self.stopped:
+                    self.condition.wait()
+                if self.stopped:
+                    return
+                request = self.running = self.pending
+                self.pending = None
+                self.running_dropped = False
+            response = self.handler(request)
+            with self.condition:
+                if not self.running_dropped:
+                    self.reply(response)
+                self.running = None
+
+
+class LaneDispatcher(object):
+    """
+    Dispatch requests to lanes, creating them on demand.
+
+    If concurrent is False, requests of different lanes are still
+    superseded and cancelled independently, but handled one at a time.
+    """
+
+    def __init__(self, handler, reply, concurrent=True):
+        if not concurrent:
+            lock = threading.Lock()
+
+            def handler(request, handler=handler):
+                with lock:
+                    return handler(request)
+        self.handler = handler
+        self.reply = reply
+        self.lanes = {}
+        self.request_lanes = {}  # request_id -> lane name, for cancellation
+
+    def get_lane_name(self, request):
+        func_name = request['func_name']
+        return LANES.get(func_name, func_name)
+
+    def submit(self, request):
+        name = self.get_lane_name(request)
+        lane = self.lanes.get(name)
+        if lane is None:
+            lane = self.lanes[name] = Lane(name, self.handler, self.reply)
+        # Only the ids of the requests that may still be cancelled are kept
+        self.request_lanes = dict((request_id, lane_name) for
+                                  request_id, lane_name in
+                                  self.request_lanes.items()
+                                  if lane_name != name)
+        self.request_lanes[request['request_id']] = name
+        lane.submit(request)
+
+    def cancel(self, request_id):
+        name = self.request_lanes.pop(request_id, None)
+        if name is not None:
+            self.lanes[name].cancel(request_id)
+
+    def is_busy(self):
+        return any(lane.is_busy() for lane in self.lanes.values())
+
+    def stop(self):
+        for lane in self.lanes.values():
+            lane.stop()
@@ -61,22 +61,23 @@ class PluginManager(QObject):
             plugin.received.connect(self.handle_response)
         self.plugins = plugins
         self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self._handle_timeout)
         self.desired = []
         self.ids = dict()
         self.info = None
         self.request = None
         self.pending = None
-        self.pending_request = None
         self.waiting = False
 
     def send_request(self, info):
         """Handle an incoming request from the user."""
         if self.waiting:
-            if info.serialize() != self.info.serialize():
-                self.pending_request = info
-            else:
+            if info.serialize() == self.info.serialize():
                 debug_print('skipping duplicate request')
-            return
+                return
+            # The new request supersedes the one being waited for
+            self._cancel_requests()
         debug_print('%s request' % info.name)
         desired = None
         self.info = info
@@ -108,27 +109,59 @@ class PluginManager(QObject):
         value = info.serialize()
         self.ids = dict()
         for plugin in plugins:
-            request_id = plugin.request(method, value)
-            self.ids[request_id] = plugin.name
-        self.timer.stop()
-        self.timer.singleShot(LEAD_TIME_SEC * 1000, self._handle_timeout)
+            request_id = plugin.request(method,
+                                        self._get_request_value(plugin, value))
+            if request_id is not None:
+                self.ids[request_id] = plugin.name
+        self.timer.start(int(LEAD_TIME_SEC * 1000))
+
+    def _get_request_value(self, plugin, value):
+        """
+        Return the value of a request to plugin, where the source code is
+        replaced by a reference to the document synced with its server.
+        """
+        doc_id = value['filename']
+        version = plugin.sync_document(doc_id, value['source_code'])
+        value = dict(value)
+        # Plugins only use the number of lines before the cursor
+        value.pop('lines', None)
+        if version is not None:
+            del value['source_code']
+            value['document'] = (doc_id, version)
+        return value
+
+    def _cancel_requests(self):
+        """Cancel the requests not answered yet."""
+        for request_id, name in self.ids.items():
+            self.plugins[name].cancel(request_id)
+        self.ids = dict()
+        self.pending = None
 
     def validate(self):
         for plugin in self.plugins.values():
             plugin.request('validate')
 
     def handle_response(self, response):
-        name = self.ids.get(response['request_id'], None)
+        if 'document_error' in response:
+            plugin = self.plugins.get(response['name'])
+            if plugin is not None:
+                plugin.forget_document(response['document_error'])
+        name = self.ids.pop(response['request_id'], None)
         if not name:
             return
         if response.get('error', None):
             debug_print('Response error:', response['error'])
-            return
-        if name == self.desired[0] or not self.waiting:
+        elif response.get('superseded') or response.get('cancelled'):
+            debug_print('Request superseded or cancelled')
+        elif name == self.desired[0] or not self.waiting:
             if response.get('result', None):
                 self._finalize(response)
+                return
         else:
             self.pending = response
+        # Don't wait for the timeout once all plugins have answered
+        if self.waiting and not self.ids:
+            self._handle_timeout()
 
     def close(self):
         for name, plugin in self.plugins.items():
@@ -137,6 +170,7 @@ class PluginManager(QObject):
 
     def _finalize(self, response):
         self.waiting = False
+        self.timer.stop()
         self.pending = None
         if self.info:
             delta = time.time() - self._start_time
@@ -145,14 +179,11 @@ class PluginManager(QObject):
                    str(response['result'])[:100], delta))
             response['info'] = self.info
             self.info = None
-            self.introspection_complete.emit(response)            
-        if self.pending_request:
-            info = self.pending_request
-            self.pending_request = None
-            self.send_request(info)
+            self.introspection_complete.emit(response)
 
     def _handle_timeout(self):
         self.waiting = False
+        self.timer.stop()
         if self.pending:
             self._finalize(self.pending)
         else:
@@ -344,6 +375,10 @@ class IntrospectionManager(QObject):
 
 class IntrospectionPlugin(object):
 
+    # Whether requests of different kinds (completions, info, definitions)
+    # can be handled at the same time, from different threads
+    concurrent = True
+
     def load_plugin(self):
         """Initialize the plugin"""
         pass
@@ -18,48 +18,13 @@
 #
 #------------------------------------------------------------------------------
 
-import imp
 import inspect
 import os.path
-import pkgutil
-import re
-from time import time
 import sys
-from zipimport import zipimporter
 
-from spyder.config.base import get_conf_path, running_in_mac_app
 from spyder.py3compat import PY3
-
-from pickleshare import PickleShareDB
-
-#-----------------------------------------------------------------------------
-# Globals and constants
-#-----------------------------------------------------------------------------
-
-# Path to the modules database
-MODULES_PATH = get_conf_path('db')
-
-# Time in seconds after which we give up
-if os.name == 'nt':
-    TIMEOUT_GIVEUP = 30
-else:
-    TIMEOUT_GIVEUP = 20
-
-# Py2app only uses .pyc files for the stdlib when optimize=0,
-# so we need to add it as another suffix here
-if running_in_mac_app():
-    suffixes = imp.get_suffixes() + [('.pyc', 'rb', '2')]
-else:
-    suffixes = imp.get_suffixes()
-
-# Regular expression for the python import statement
-import_re = re.compile(r'(?P<name>[a-zA-Z_][a-zA-Z0-9_]*?)'
-                       r'(?P<package>[/\\]__init__)?'
-                       r'(?P<suffix>%s)$' %
-                       r'|'.join(re.escape(s[0]) for s in suffixes))
-
-# Modules database
-modules_db = PickleShareDB(MODULES_PATH)
+from spyder.utils.introspection.module_index import (get_module_index,
+                                                     refresh_index)
 
 #-----------------------------------------------------------------------------
 # Utility functions
@@ -70,38 +35,10 @@ def module_list(path):
     Return the list containing the names of the modules available in the given
     folder.
     """
-    # sys.path has the cwd as an empty string, but isdir/listdir need it as '.'
-    if path == '':
-        path = '.'
-
-    # A few local constants to be used in loops below
-    pjoin = os.path.join
-
-    if os.path.isdir(path):
-        # Build a list of all files in the directory and all files
-        # in its subdirectories. For performance reasons, do not
-        # recurse more than one level into subdirectories.
-        files = []
-        for root, dirs, nondirs in os.walk(path):
-            subdir = root[len(path)+1:]
-            if subdir:
-                files.extend(pjoin(subdir, f) for f in nondirs)
-                dirs[:] = [] # Do not recurse into additional subdirectories.
-            else:
-                files.extend(nondirs)
-    else:
-        try:
-            files = list(zipimporter(path)._files.keys())
-        except:
-            files = []
-
-    # Build a list of modules which match the import_re regex.
-    modules = []
-    for f in files:
-        m = import_re.match(f)
-        if m:
-            modules.append(m.group('name'))
-    return list(set(modules))
+    listing = get_module_index().get_package(path)
+    if listing is None:
+        return []
+    return list(listing[0])
 
 
 def get_root_modules(paths):
@@ -113,58 +50,30 @@ def get_root_modules(paths):
         comming from our PYTHONPATH manager and from the currently selected
         project.
     """
-    modules = []
-    spy_modules = []
-    
-    for path in paths:
-        spy_modules += module_list(path)
-    spy_modules = set(spy_modules)
-    if '__init__' in spy_modules:
-        spy_modules.remove('__init__')
-    spy_modules = list(spy_modules)
-    
-    if 'rootmodules' in modules_db:
-        return spy_modules + modules_db['rootmodules']
-
-    t = time()
-    modules = list(sys.builtin_module_names)
     # TODO: Change this sys.path for console's interpreter sys.path
-    for path in sys.path:
-        modules += module_list(path)        
-        if time() - t > TIMEOUT_GIVEUP:
-            print("Module list generation is taking too long, we give up.\n")  # spyder: test-skip
-            modules_db['rootmodules'] = []
-            return []
-    
-    modules = set(modules)
-    excluded_modules = ['__init__'] + spy_modules
-    for mod in excluded_modules:
-        if mod in modules:
-            modules.remove(mod)
-    modules = list(modules)
-
-    modules_db['rootmodules'] = modules
-    return spy_modules + modules
+    modules = set(get_module_index().get_root_modules(list(paths) +
+                                                      sys.path))
+    modules.update(sys.builtin_module_names)
+    return list(modules)
 
 
 def get_submodules(mod):
     """Get all submodules of a given module"""
-    def catch_exceptions(module):
-        pass
+    index = get_module_index()
+    kind = index.find(mod, sys.path)
+    if kind == 'package':
+        return [mod] + index.get_submodules(mod, sys.path, recursive=True)
+    elif kind == 'module' or mod in sys.builtin_module_names:
+        return [mod]
+    # Modules which are not files, like os.path, can only be found by
+    # importing them
     try:
-        m = __import__(mod)
-        submodules = [mod]
-        submods = pkgutil.walk_packages(m.__path__, m.__name__ + '.',
-                                        catch_exceptions)
-        for sm in submods:
-            sm_name = sm[1]
-            submodules.append(sm_name)
+        __import__(mod)
     except ImportError:
         return []
     except:
-        return [mod]
-    
-    return submodules
+        pass
+    return [mod]
 
 
 def is_importable(module, attr, only_modules):
@@ -202,7 +111,14 @@ def try_import(mod, only_modules=False):
 def dot_completion(mod, paths):
     if len(mod) < 2:
         return [x for x in get_root_modules(paths) if x.startswith(mod[0])]
-    completion_list = try_import('.'.join(mod[:-1]), True)
+    package = '.'.join(mod[:-1])
+    submodules = get_module_index().get_submodules(package,
+                                                   sys.path + list(paths))
+    if submodules is not None:
+        completion_list = [x.rsplit('.', 1)[-1] for x in submodules]
+    else:
+        # Not a package: look for modules in its attributes
+        completion_list = try_import(package, True)
     completion_list = [x for x in completion_list if x.startswith(mod[-1])]
     completion_list = ['.'.join(mod[:-1] + [el]) for el in completion_list]
     return completion_list
@@ -263,9 +179,8 @@ def module_completion(line, paths=[]):
         
 
 def reset():
-    """Clear root modules database"""
-    if 'rootmodules' in modules_db:
-        del modules_db['rootmodules']
+    """Refresh the modules index in the background"""
+    refresh_index()
 
 
 def get_preferred_submodules():
@@ -273,9 +188,6 @@ def get_preferred_submodules():
     Get all submodules of the main scientific modules and others of our
     interest
     """
-    if 'submodules' in modules_db:
-        return modules_db['submodules']
-    
     mods = ['numpy', 'scipy', 'sympy', 'pandas', 'networkx', 'statsmodels',
             'matplotlib', 'sklearn', 'skimage', 'mpmath', 'os', 'PIL',
             'OpenGL', 'array', 'audioop', 'binascii', 'cPickle', 'cStringIO',
@@ -290,6 +202,5 @@ def get_preferred_submodules():
     for m in mods:
         submods = get_submodules(m)
         submodules += submods
-    
-    modules_db['submodules'] = submodules
+
     return submodules
@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Persistent index of the modules found in the entries of sys.path
+
+The index stores the modules and packages found in each directory (or zip
+archive) by its path and mtime. Queries only read the directories of the
+packages they go through, and scan them again if their mtime changed, so
+they're always up to date without importing anything.
+"""
+
+# Standard library imports
+import imp
+import os
+import os.path as osp
+import re
+import sys
+import threading
+import zipfile
+
+# Local imports
+from spyder.config.base import get_conf_path, running_in_mac_app
+from spyder.py3compat import pickle
+
+
+INDEX_VERSION = 1
+
+# Py2app only uses .pyc files for the stdlib when optimize=0,
+# so we need to add it as another suffix here
+if running_in_mac_app():
+    suffixes = imp.get_suffixes() + [('.pyc', 'rb', '2')]
+else:
+    suffixes = imp.get_suffixes()
+
+# Regular expression for the python import statement
+import_re = re.compile(r'(?P<name>[a-zA-Z_][a-zA-Z0-9_]*?)'
+                       r'(?P<package>[/\\]__init__)?'
+                       r'(?P<suffix>%s)$' %
+                       r'|'.join(re.escape(s[0]) for s in suffixes))
+
+# Names of directories which can be packages
+package_re = re.compile(r'[a-zA-Z_][a-zA-Z0-9_]*$')
+
+
+def get_index_path():
+    """Return the file where the module index is stored."""
+    return get_conf_path('module_index.pickle')
+
+
+def get_mtime(path):
+    """Return the mtime of path, or None if it doesn't exist."""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def scan_directory(path):
+    """
+    Return (modules, packages) for the directory path, where modules is the
+    sorted list of names of the modules and packages it contains, and
+    packages the set of names of the packages.
+    """
+    try:
+        names = os.listdir(path)
+    except OSError:
+        return [], set()
+    modules = set()
+    packages = set()
+    for name in names:
+        match = import_re.match(name)
+        if match:
+            modules.add(match.group('name'))
+        elif package_re.match(name):
+            package_path = osp.join(path, name)
+            if any(osp.isfile(osp.join(package_path, '__init__' + suffix[0]))
+                   for suffix in suffixes):
+                modules.add(name)
+                packages.add(name)
+    modules.discard('__init__')
+    return sorted(modules), packages
+
+
+def scan_archive(path):
+    """
+    Return a dict mapping the dotted names of the packages of the zip
+    archive path, '' being its root, to their (modules, packages).
+    """
+    try:
+        with zipfile.ZipFile(path) as archive:
+            names = archive.namelist()
+    except Exception:
+        return {}
+    tree = {}
+    for name in names:
+        parts = name.split('/')
+        match = import_re.match(parts[-1])
+        if not match:
+            continue
+        if match.group('name') == '__init__':
+            if len(parts) < 2:
+                continue
+            parent = tree.setdefault('.'.join(parts[:-2]), (set(), set()))
+            parent[0].add(parts[-2])
+            parent[1].add(parts[-2])
+            tree.setdefault('.'.join(parts[:-1]), (set(), set()))
+        else:
+            package = tree.setdefault('.'.join(parts[:-1]), (set(), set()))
+            package[0].add(match.group('name'))
+    return dict((name, (sorted(modules), packages))
+                for name, (modules, packages) in tree.items())
+
+
+class ModuleIndex(object):
+    """Index of the modules found in a list of paths, like sys.path."""
+
+    def __init__(self, index_path=None):
+        if index_path is None:
+            index_path = get_index_path()
+        self.index_path = index_path
+        self.directories = {}  # path -> (mtime, modules, packages)
+        self.archives = {}     # path -> (mtime, {package: (modules,
+                               #                            packages)})
+        self.modified = False
+        # The index is refreshed and queried from different threads
+        self.lock = threading.RLock()
+
+    # ---- Persistence
+    def load(self):
+        """Load the index from disk. Return True if successful."""
+        try:
+            with open(self.index_path, 'rb') as fd:
+                data = pickle.load(fd)
+        except Exception:
+            return False
+        if data.get('version') != INDEX_VERSION:
+            return False
+        with self.lock:
+            self.directories = data['directories']
+            self.archives = data['archives']
+            self.modified = False
+        return True
+
+    def save(self):
+        """Save the index to disk."""
+        with self.lock:
+            data = {'version': INDEX_VERSION,
+                    'directories': dict(self.directories),
+                    'archives': dict(self.archives)}
+            self.modified = False
+        dirname = osp.dirname(self.index_path)
+        # Spyder and the introspection servers may save at the same time
+        tmp_path = '%s.%d.tmp' % (self.index_path, os.getpid())
+        try:
+            if not osp.isdir(dirname):
+                os.makedirs(dirname)
+            with open(tmp_path, 'wb') as fd:
+                pickle.dump(data, fd, pickle.HIGHEST_PROTOCOL)
+            if osp.exists(self.index_path):
+                os.remove(self.index_path)
+            os.rename(tmp_path, self.index_path)
+        except (IOError, OSError):
+            pass
+
+    # ---- Listings
+    def get_directory(self, path):
+        """Return (modules, packages) of the directory path."""
+        mtime = get_mtime(path)
+        with self.lock:
+            entry = self.directories.get(path)
+        if entry is not None and entry[0] == mtime:
+            return entry[1:]
+        modules, packages = scan_directory(path)
+        with self.lock:
+            if mtime is None:
+                self.directories.pop(path, None)
+            else:
+                self.directories[path] = (mtime, modules, packages)
+            self.modified = True
+        return modules, packages
+
+    def get_archive(self, path):
+        """Return the package tree of the zip archive path."""
+        mtime = get_mtime(path)
+        with self.lock:
+            entry = self.archives.get(path)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+        tree = scan_archive(path)
+        with self.lock:
+            if mtime is None:
+                self.archives.pop(path, None)
+            else:
+                self.archives[path] = (mtime, tree)
+            self.modified = True
+        return tree
+
+    def get_package(self, path, package=''):
+        """
+        Return (modules, packages) of the package with dotted name package
+        found in the sys.path entry path, '' for the entry itself, or None
+        if it's not a package found there.
+        """
+        # sys.path has the cwd as an empty string
+        path = osp.abspath(path or '.')
+        parts = package.split('.') if package else []
+        if osp.isdir(path):
+            listing = self.get_directory(path)
+            for depth, part in enumerate(parts):
+                if part not in listing[1]:
+                    return None
+                listing = self.get_directory(osp.join(path,
+                                                      *parts[:depth + 1]))
+            return listing
+        tree = self.get_archive(path)
+        for depth, part in enumerate(parts):
+            parent = tree.get('.'.join(parts[:depth]))
+            if parent is None or part not in parent[1]:
+                return None
+        return tree.get(package)
+
+    # ---- Queries
+    def get_root_modules(self, paths):
+        """Return the sorted names of the modules found in paths."""
+        modules = set()
+        for path in paths:
+            listing = self.get_package(path)
+            if listing is not None:
+                modules.update(listing[0])
+        return sorted(modules)
+
+    def find(self, name, paths):
+        """
+        Return the kind of the module with dotted name, found as Python
+        would in paths: 'package', 'module' or None if it isn't found.
+        """
+        parts = name.split('.')
+        for path in paths:
+            listing = self.get_package(path)
+            if listing is None or parts[0] not in listing[0]:
+                continue
+            # The first entry with the top level module is the one used
+            parent = '.'.join(parts[:-1])
+            if parent:
+                listing = self.get_package(path, parent)
+            if listing is None or parts[-1] not in listing[0]:
+                return None
+            return 'package' if parts[-1] in listing[1] else 'module'
+        return None
+
+    def get_submodules(self, name, paths, recursive=False):
+        """
+        Return the dotted names of the submodules of the package name found
+        in paths, or None if it's not a package.
+        """
+        parts = name.split('.')
+        for path in paths:
+            listing = self.get_package(path)
+            if listing is None or parts[0] not in listing[0]:
+                continue
+            return self._get_submodules(path, name, recursive)
+        return None
+
+    def _get_submodules(self, path, name, recursive):
+        listing = self.get_package(path, name)
+        if listing is None:
+            return None
+        modules, packages = listing
+        submodules = []
+        for module in modules:
+            submodule = name + '.' + module
+            submodules.append(submodule)
+            if recursive and module in packages:
+                submodules.extend(self._get_submodules(path, submodule,
+                                                       recursive) or [])
+        return submodules
+
+    # ---- Update
+    def refresh(self, paths, stopped=None):
+        """
+        Bring the index of all the packages found in paths up to date,
+        dropping the directories not found anymore, and save it if it
+        was modified.
+
+        stopped is an optional callable used to interrupt the refresh.
+        """
+        seen = set()
+        for path in paths:
+            if stopped is not None and stopped():
+                return
+            path = osp.abspath(path or '.')
+            if osp.isdir(path):
+                self._refresh_directory(path, seen, stopped)
+            else:
+                self.get_archive(path)
+                seen.add(path)
+        with self.lock:
+            for path in set(self.directories) - seen:
+                del self.directories[path]
+                self.modified = True
+            for path in set(self.archives) - seen:
+                del self.archives[path]
+                self.modified = True
+            modified = self.modified
+        if modified:
+            self.save()
+
+    def _refresh_directory(self, path, seen, stopped):
+        if path in seen or (stopped is not None and stopped()):
+            return
+        seen.add(path)
+        for package in self.get_directory(path)[1]:
+            self._refresh_directory(osp.join(path, package), seen, stopped)
+
+
+_index = None
+
+
+def get_module_index():
+    """Return the module index shared by this process, loading it if
+    needed."""
+    global _index
+    if _index is None:
+        _index = ModuleIndex()
+        _index.load()
+    return _index
+
+
+def refresh_index(paths=None):
+    """
+    Refresh the module index of paths (sys.path by default) in a
+    background thread and return the thread.
+    """
+    if paths is None:
+        paths = sys.path[:]
+    index = get_module_index()
+    thread = threading.Thread(target=index.refresh, args=(paths,),
+                              name='module-index')
+    thread.daemon = True
+    thread.start()
+    return thread
@@ -5,6 +5,7 @@
 # (see spyder/__init__.py for details)
 
 # Local imports
+from collections import OrderedDict
 import imp
 import os
 import os.path as osp
@@ -19,11 +20,15 @@ import zmq
 
 # Local imports
 from spyder.config.base import debug_print, get_module_path
+from spyder.utils.introspection.documents import get_text_delta
 
 
 # Heartbeat timer in milliseconds
 HEARTBEAT = 1000
 
+# Number of documents kept in sync with a plugin server
+MAX_DOCUMENTS = 20
+
 
 class AsyncClient(QObject):
 
@@ -114,6 +119,8 @@ class AsyncClient(QObject):
         The response will be a dictionary the 'request_id' and the
         'func_name' as well as a 'result' field with the object returned by
         the function call or or an 'error' field with a traceback.
+        Requests replaced by a newer one of the same kind before being
+        answered get a response with a 'superseded' field instead.
         """
         if not self.is_initialized:
             return
@@ -125,6 +132,16 @@ class AsyncClient(QObject):
         self._send(request)
         return request_id
 
+    def cancel(self, request_id):
+        """Cancel a request.
+
+        The server answers with a 'cancelled' field instead of a 'result'
+        if the request was not answered yet.
+        """
+        if not self.is_initialized or request_id is None:
+            return
+        self._send(dict(func_name='server_cancel', request_id=request_id))
+
     def close(self):
         """Cleanly close the connection to the server.
         """
@@ -207,6 +224,42 @@ class PluginClient(AsyncClient):
                 executable=executable, cwd=cwd, env=env,
                 extra_args=[plugin_name], libs=[plugin_name])
         self.name = plugin_name
+        # Documents in sync with the server: doc_id -> (version, text),
+        # the most recently used last
+        self.documents = OrderedDict()
+        # A restarted server doesn't know any document
+        self.initialized.connect(self.documents.clear)
+
+    def sync_document(self, doc_id, text):
+        """
+        Send the text of a document to the server, as the edit made since
+        it was last sent if possible.
+
+        Return the version of the document, or None if the server is not
+        running.
+        """
+        if not self.is_initialized:
+            return None
+        document = self.documents.pop(doc_id, None)
+        if document is None:
+            version = 0
+            self.request('open_document', doc_id, version, text)
+        else:
+            version, old_text = document
+            if text != old_text:
+                version += 1
+                start, end, new_text = get_text_delta(old_text, text)
+                self.request('change_document', doc_id, version, start, end,
+                             new_text)
+        self.documents[doc_id] = (version, text)
+        while len(self.documents) > MAX_DOCUMENTS:
+            old_doc_id, _document = self.documents.popitem(last=False)
+            self.request('close_document', old_doc_id)
+        return version
+
+    def forget_document(self, doc_id):
+        """Open the document again on the server the next time it's used"""
+        self.documents.pop(doc_id, None)
 
 
 if __name__ == '__main__':
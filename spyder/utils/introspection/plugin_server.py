@@ -10,10 +10,19 @@ import traceback
 
 import zmq
 
+from spyder.py3compat import Queue
+from spyder.utils.introspection.documents import (DOCUMENT_REQUESTS,
+                                                  DocumentError,
+                                                  DocumentStore)
+from spyder.utils.introspection.lanes import LaneDispatcher, make_response
+
 
 # Timeout in milliseconds
 TIMEOUT = 10000
 
+# Polling interval in milliseconds while requests are being handled
+RESPONSE_POLL = 5
+
 
 class AsyncServer(object):
 
@@ -25,6 +34,13 @@ class AsyncServer(object):
     def __init__(self, port, *args):
         self.port = port
         self.object = self.initialize(*args)
+        self.documents = DocumentStore()
+        # Responses are sent by the main thread, as zmq sockets can't be
+        # shared with the worker threads of the lanes
+        self.responses = Queue.Queue()
+        self.lanes = LaneDispatcher(
+            self.handle_request, self.responses.put,
+            concurrent=getattr(self.object, 'concurrent', True))
         self.context = zmq.Context()
         self.socket = self.context.socket(zmq.PAIR)
         self.socket.connect("tcp://localhost:%s" % port)
@@ -41,13 +57,20 @@ class AsyncServer(object):
         t0 = time.time()
         initialized = False
         timed_out = False
+        last_event = t0
         while 1:
             # Poll for events, handling a timeout.
+            busy = self.lanes.is_busy() or not self.responses.empty()
             try:
-                events = self.socket.poll(TIMEOUT)
+                events = self.socket.poll(RESPONSE_POLL if busy else TIMEOUT)
             except KeyboardInterrupt:
                 time.sleep(0.1)
                 continue
+            self.send_responses()
+            if events:
+                last_event = time.time()
+            elif busy and time.time() - last_event < TIMEOUT / 1000.:
+                continue
             if events == 0 and initialized:
                 if timed_out:
                     delta = int(time.time() - t0)
@@ -58,7 +81,6 @@ class AsyncServer(object):
             timed_out = False
             initialized = True
             # Drain all exising requests, handling quit and heartbeat.
-            requests = []
             while 1:
                 try:
                     request = self.socket.recv_pyobj()
@@ -68,9 +90,15 @@ class AsyncServer(object):
                 if request['func_name'] == 'server_quit':
                     print('Quitting')  # spyder: test-skip
                     sys.stdout.flush()
+                    self.lanes.stop()
                     return
+                elif request['func_name'] == 'server_cancel':
+                    self.lanes.cancel(request['request_id'])
+                elif request['func_name'] in DOCUMENT_REQUESTS:
+                    # Edits must all be applied, in order
+                    self.documents.handle_request(request)
                 elif request['func_name'] != 'server_heartbeat':
-                    requests.append(request)
+                    self.submit_request(request)
                 else:
                     print('Got heartbeat')  # spyder: test-skip
                 try:
@@ -80,23 +108,43 @@ class AsyncServer(object):
                     continue
                 if events == 0:
                     break
-            # Select the most recent request.
-            if not requests:
-                continue
-            request = requests[-1]
 
-            # Gather the response
-            response = dict(func_name=request['func_name'],
-                            request_id=request['request_id'])
+    def submit_request(self, request):
+        """Queue a request in its lane.
+        """
+        # Documents are resolved now, as they may be changed by the next
+        # requests before this one is handled
+        try:
+            request['args'] = [self.documents.resolve(arg)
+                               for arg in request.get('args', [])]
+        except DocumentError as error:
+            self.responses.put(make_response(request, error=str(error),
+                                             document_error=error.doc_id))
+            return
+        self.lanes.submit(request)
+
+    def handle_request(self, request):
+        """Call the object for a request and return the response.
+
+        This is called from the worker thread of the lane of the request.
+        """
+        response = make_response(request)
+        try:
+            func = getattr(self.object, request['func_name'])
+            kwargs = request.get('kwargs', {})
+            response['result'] = func(*request['args'], **kwargs)
+        except Exception:
+            response['error'] = traceback.format_exc()
+        return response
+
+    def send_responses(self):
+        """Send the responses gathered by the lanes to the client.
+        """
+        while 1:
             try:
-                func = getattr(self.object, request['func_name'])
-                args = request.get('args', [])
-                kwargs = request.get('kwargs', {})
-                response['result'] = func(*args, **kwargs)
-            except Exception:
-                response['error'] = traceback.format_exc()
-
-            # Send the response to the client.
+                response = self.responses.get_nowait()
+            except Queue.Empty:
+                return
             self.socket.send_pyobj(response)
 
 
@@ -56,6 +56,9 @@ class RopePlugin(IntrospectionPlugin):
     # ---- IntrospectionPlugin API --------------------------------------------
     name = 'rope'
 
+    # The rope project and its caches are shared by all requests
+    concurrent = False
+
     def load_plugin(self):
         """Load the Rope introspection plugin"""
         if not programs.is_module_installed('rope', ROPE_REQVER):
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for documents.py
+"""
+
+# Test library imports
+import pytest
+
+# Local imports
+from spyder.utils.introspection.documents import (DocumentError,
+                                                  DocumentStore,
+                                                  get_text_delta)
+
+
+@pytest.mark.parametrize("old,new", [
+    ('import numpy', 'import numpy as np'),
+    ('import numpy', 'import nump'),
+    ('aaaa', 'aaaaaa'),
+    ('spam\neggs\n', 'spam\nham\neggs\n'),
+    ('', 'spam'),
+    ('spam', ''),
+    ('same', 'same'),
+])
+def test_get_text_delta(old, new):
+    """Test that deltas give the new text and are minimal."""
+    start, end, text = get_text_delta(old, new)
+    assert old[:start] + text + old[end:] == new
+    assert len(text) == max(len(new) - len(old), 0) or old == ''
+
+
+def test_document_store():
+    """Test applying edits to documents and resolving requests."""
+    store = DocumentStore()
+    store.handle_request({'func_name': 'open_document',
+                          'args': ('spam.py', 0, 'import numpy')})
+    store.handle_request({'func_name': 'change_document',
+                          'args': ('spam.py', 1) +
+                          get_text_delta('import numpy',
+                                         'import numpy as np')})
+    value = store.resolve({'document': ('spam.py', 1), 'position': 3})
+    assert value == {'source_code': 'import numpy as np', 'position': 3}
+
+    # Requests for another version or a closed document fail
+    with pytest.raises(DocumentError):
+        store.resolve({'document': ('spam.py', 0)})
+    store.handle_request({'func_name': 'close_document',
+                          'args': ('spam.py',)})
+    with pytest.raises(DocumentError):
+        store.resolve({'document': ('spam.py', 1)})
+
+    # A lost edit makes the document unknown until it's opened again
+    store.open_document('eggs.py', 0, 'eggs')
+    store.change_document('eggs.py', 2, 0, 0, 'spam')
+    with pytest.raises(DocumentError):
+        store.get_text('eggs.py', 2)
+
+
+if __name__ == "__main__":
+    pytest.main()
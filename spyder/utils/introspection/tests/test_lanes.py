@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for lanes.py
+"""
+
+# Standard library imports
+import threading
+
+# Test library imports
+import pytest
+
+# Local imports
+from spyder.py3compat import Queue
+from spyder.utils.introspection.lanes import LaneDispatcher
+
+
+def make_request(func_name, request_id):
+    return dict(func_name=func_name, request_id=request_id, args=[],
+                kwargs={})
+
+
+@pytest.fixture
+def dispatcher():
+    """Dispatcher whose definitions wait for an event to be set."""
+    release = threading.Event()
+    responses = Queue.Queue()
+
+    def handler(request):
+        if request['func_name'] == 'get_definition':
+            release.wait(5)
+        return dict(request_id=request['request_id'], result=True)
+
+    dispatcher = LaneDispatcher(handler, responses.put)
+    yield dispatcher, release, responses
+    release.set()
+    dispatcher.stop()
+
+
+def test_lanes_concurrent(dispatcher):
+    """Test that a slow request doesn't block other kinds of requests."""
+    dispatcher, release, responses = dispatcher
+    dispatcher.submit(make_request('get_definition', 'definition'))
+    dispatcher.submit(make_request('get_completions', 'completions'))
+    response = responses.get(timeout=5)
+    assert response == {'request_id': 'completions', 'result': True}
+    assert dispatcher.is_busy()
+    release.set()
+    response = responses.get(timeout=5)
+    assert response == {'request_id': 'definition', 'result': True}
+
+
+def test_lanes_superseded_and_cancelled(dispatcher):
+    """Test that superseded and cancelled requests are answered at once."""
+    dispatcher, release, responses = dispatcher
+    dispatcher.submit(make_request('get_definition', 'first'))
+    dispatcher.submit(make_request('get_definition', 'second'))
+    response = responses.get(timeout=5)
+    assert response['request_id'] == 'first'
+    assert response['superseded']
+
+    dispatcher.submit(make_request('get_definition', 'third'))
+    dispatcher.cancel('third')
+    responses_ids = set()
+    for _i in range(2):
+        response = responses.get(timeout=5)
+        assert response.get('superseded') or response.get('cancelled')
+        responses_ids.add(response['request_id'])
+    assert responses_ids == set(['second', 'third'])
+
+    # The results of dropped requests are never sent
+    release.set()
+    dispatcher.submit(make_request('get_completions', 'completions'))
+    response = responses.get(timeout=5)
+    assert response['request_id'] == 'completions'
+    assert responses.empty()
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for module_index.py
+"""
+
+# Standard library imports
+import os
+import zipfile
+
+# Test library imports
+import pytest
+
+# Local imports
+from spyder.utils.introspection.module_index import ModuleIndex
+
+
+@pytest.fixture
+def site_packages(tmpdir):
+    """Directory with some modules and packages, and a zip archive."""
+    root = tmpdir.mkdir('site-packages')
+    root.join('spam.py').write('')
+    package = root.mkdir('eggs')
+    package.join('__init__.py').write('')
+    package.join('ham.py').write('')
+    subpackage = package.mkdir('bacon')
+    subpackage.join('__init__.py').write('')
+    subpackage.join('beans.py').write('')
+    root.mkdir('data').join('notes.txt').write('')
+
+    archive = tmpdir.join('lib.zip')
+    with zipfile.ZipFile(str(archive), 'w') as zipped:
+        zipped.writestr('zipped/__init__.py', '')
+        zipped.writestr('zipped/inner.py', '')
+        zipped.writestr('toplevel.py', '')
+    return root, archive
+
+
+def test_module_index_queries(site_packages, tmpdir):
+    """Test finding modules and submodules without importing them."""
+    root, archive = site_packages
+    paths = [str(root), str(archive)]
+    index = ModuleIndex(str(tmpdir.join('index.pickle')))
+
+    assert index.get_root_modules(paths) == ['eggs', 'spam', 'toplevel',
+                                             'zipped']
+    assert index.find('eggs.bacon', paths) == 'package'
+    assert index.find('eggs.bacon.beans', paths) == 'module'
+    assert index.find('zipped.inner', paths) == 'module'
+    assert index.find('spam.ham', paths) is None
+    assert index.get_submodules('eggs', paths) == ['eggs.bacon', 'eggs.ham']
+    assert index.get_submodules('eggs', paths, recursive=True) == [
+        'eggs.bacon', 'eggs.bacon.beans', 'eggs.ham']
+    assert index.get_submodules('zipped', paths) == ['zipped.inner']
+    assert index.get_submodules('spam', paths) is None
+
+
+def test_module_index_refresh(site_packages, tmpdir):
+    """Test that the index is saved and follows changes on disk."""
+    root, archive = site_packages
+    paths = [str(root), str(archive)]
+    index_path = str(tmpdir.join('index.pickle'))
+    index = ModuleIndex(index_path)
+    index.refresh(paths)
+    assert str(root.join('eggs', 'bacon')) in index.directories
+
+    loaded = ModuleIndex(index_path)
+    assert loaded.load()
+    assert loaded.directories == index.directories
+
+    # Modified directories are scanned again
+    root.join('eggs', 'toast.py').write('')
+    mtime = os.stat(str(root.join('eggs'))).st_mtime
+    os.utime(str(root.join('eggs')), (mtime + 10, mtime + 10))
+    assert 'eggs.toast' in loaded.get_submodules('eggs', paths)
+
+    # Removed directories are dropped from the index
+    root.join('eggs', 'bacon').remove()
+    loaded.refresh(paths)
+    assert str(root.join('eggs', 'bacon')) not in loaded.directories
+
+
+if __name__ == "__main__":
+    pytest.main()
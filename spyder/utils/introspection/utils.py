@@ -14,6 +14,7 @@ import pickle
 import os.path as osp
 import re
 
+from spyder.py3compat import NUMERIC_TYPES, TEXT_TYPES
 from spyder.utils.misc import memoize
 
 from spyder.utils.syntaxhighlighters import (
@@ -28,6 +29,14 @@ from pygments.util import ClassNotFound
 from pygments.token import Token
 
 
+# Characters ending lines for str.splitlines
+LINE_BREAK_REGEX = re.compile(u'[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]',
+                              re.UNICODE)
+
+# Types of values which can be serialized without checking it
+SIMPLE_TYPES = TEXT_TYPES + NUMERIC_TYPES + (bytes, bool, type(None))
+
+
 class CodeInfo(object):
 
     id_regex = re.compile(r'[^\d\W][\w\.]*', re.UNICODE)
@@ -82,7 +91,7 @@ class CodeInfo(object):
         self.line = self.lines[-1]
         self.column = len(self.lines[-1])
 
-        full_line = self.source_code.splitlines()[self.line_num - 1]
+        full_line = self.line + self._get_rest_of_line()
 
         lexer = find_lexer_for_filename(self.filename)
 
@@ -98,7 +107,6 @@ class CodeInfo(object):
             self.full_obj = self.obj
 
             if self.obj:
-                full_line = self.source_code.splitlines()[self.line_num - 1]
                 rest = full_line[self.column:]
                 match = re.match(self.id_regex, rest)
                 if match:
@@ -127,6 +135,21 @@ class CodeInfo(object):
                 self.column = self.line.index(self.obj) + len(self.obj)
                 self.position = self.position - len(self.line) + self.column
 
+    def _get_rest_of_line(self):
+        """
+        Return the text of the current line after the position, without
+        splitting the whole source code in lines.
+        """
+        source_code = self.source_code
+        # The line before a line break is the current one, as for
+        # splitlines (see _get_info)
+        if LINE_BREAK_REGEX.match(source_code, self.position - 1):
+            return ''
+        match = LINE_BREAK_REGEX.search(source_code, self.position)
+        if match is None:
+            return source_code[self.position:]
+        return source_code[self.position:match.start()]
+
     def _get_docstring(self):
         """Find the docstring we are currently in."""
         left = self.position
@@ -158,6 +181,11 @@ class CodeInfo(object):
     def serialize(self):
         state = {}
         for (key, value) in self.__dict__.items():
+            if isinstance(value, SIMPLE_TYPES):
+                # Don't copy big strings, like the source code, to check
+                # they can be pickled
+                state[key] = value
+                continue
             try:
                 pickle.dumps(value)
                 state[key] = value
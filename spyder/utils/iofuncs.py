@@ -15,6 +15,7 @@ from __future__ import print_function
 
 import sys
 import os
+import struct
 import tarfile
 import tempfile
 import os.path as osp
@@ -200,12 +201,6 @@ try:
                 return {name: data}, None
         except Exception as error:
             return None, str(error)
-
-    def __save_array(data, basename, index):
-        """Save numpy array"""
-        fname = basename + '_%04d.npy' % index
-        np.save(fname, data)
-        return fname
 except:
     load_array = None
 
@@ -279,59 +274,212 @@ def load_json(filename):
         return None, str(err)
 
 
+#==============================================================================
+# Spyder data files
+#==============================================================================
+# Files written by Spyder < 4 are tar archives, with a pickle of the
+# namespace and a .npy file for each array. Newer files are a single
+# container, which can be read without extracting it:
+#
+# * SPYDATA_MAGIC, followed by the offset of the index (8 bytes)
+# * One record per variable, starting at a multiple of SPYDATA_ALIGNMENT:
+#   plain arrays are stored in npy format, so their data can be memory
+#   mapped in place; other values are pickled
+# * The index: a pickled dict mapping variable names to their records
+SPYDATA_MAGIC = b'\x93SPYDATA'
+SPYDATA_VERSION = 1
+SPYDATA_ALIGNMENT = 64
+
+# Arrays of at least this size (in bytes) are memory mapped when a .spydata
+# file is imported, so that only the parts which are looked at are read
+SPYDATA_MMAP_SIZE = 2**24
+
+
+def _align(fdesc):
+    """Pad fdesc with zeros up to the next aligned position"""
+    padding = -fdesc.tell() % SPYDATA_ALIGNMENT
+    fdesc.write(b'\0' * padding)
+
+
+def _is_mappable_array(value):
+    """Return True if value is an array that can be memory mapped"""
+    return (load_array is not None and type(value) in (np.ndarray, np.memmap) and
+            value.size > 0 and not value.dtype.hasobject)
+
+
+def _replace(src, dst):
+    """Rename src to dst, replacing dst if it exists"""
+    if hasattr(os, 'replace'):
+        # Atomic, also on Windows
+        os.replace(src, dst)
+    else:
+        if os.name == 'nt' and osp.isfile(dst):
+            os.remove(dst)
+        os.rename(src, dst)
+
+
 def save_dictionary(data, filename):
     """Save dictionary in a single file .spydata file"""
     filename = osp.abspath(filename)
-    old_cwd = getcwd_or_home()
-    os.chdir(osp.dirname(filename))
+    # Arrays of data can be read from filename while it's written, so a
+    # new file is written and then replaces it. Note that on Windows a
+    # file can't be replaced while arrays loaded from it with a mmap_mode
+    # are still mapped to it; an error message is returned then
+    tmp_filename = filename + '.tmp'
     error_message = None
     try:
-        saved_arrays = {}
-        if load_array is not None:
-            # Saving numpy arrays with np.save
-            arr_fname = osp.splitext(filename)[0]
-            for name in list(data.keys()):
-                if isinstance(data[name], np.ndarray) and data[name].size > 0:
-                    # Saving arrays at data root
-                    fname = __save_array(data[name], arr_fname,
-                                       len(saved_arrays))
-                    saved_arrays[(name, None)] = osp.basename(fname)
-                    data.pop(name)
-                elif isinstance(data[name], (list, dict)):
-                    # Saving arrays nested in lists or dictionaries
-                    if isinstance(data[name], list):
-                        iterator = enumerate(data[name])
-                    else:
-                        iterator = iter(list(data[name].items()))
-                    to_remove = []
-                    for index, value in iterator:
-                        if isinstance(value, np.ndarray) and value.size > 0:
-                            fname = __save_array(value, arr_fname,
-                                               len(saved_arrays))
-                            saved_arrays[(name, index)] = osp.basename(fname)
-                            to_remove.append(index)
-                    for index in sorted(to_remove, reverse=True):
-                        data[name].pop(index)
-            if saved_arrays:
-                data['__saved_arrays__'] = saved_arrays
-        pickle_filename = osp.splitext(filename)[0]+'.pickle'
-        with open(pickle_filename, 'wb') as fdesc:
-            pickle.dump(data, fdesc, 2)
-        tar = tarfile.open(filename, "w")
-        for fname in [pickle_filename]+[fn for fn in list(saved_arrays.values())]:
-            tar.add(osp.basename(fname))
-            os.remove(fname)
-        tar.close()
-        if saved_arrays:
-            data.pop('__saved_arrays__')
-    except (RuntimeError, pickle.PicklingError, TypeError) as error:
+        index = {}
+        with open(tmp_filename, 'wb') as fdesc:
+            fdesc.write(SPYDATA_MAGIC + struct.pack('<Q', 0))
+            for name in sorted(data.keys()):
+                value = data[name]
+                _align(fdesc)
+                offset = fdesc.tell()
+                if _is_mappable_array(value):
+                    # Data is written from the array's memory, not copied.
+                    # The npy version is the oldest one that can hold the
+                    # header (e.g. (2, 0) for dtypes with many fields)
+                    with warnings.catch_warnings():
+                        # Warning about the version needed to read it
+                        warnings.simplefilter('ignore', UserWarning)
+                        np.lib.format.write_array(fdesc, value, version=None,
+                                                  allow_pickle=False)
+                    index[name] = ('array', offset)
+                else:
+                    pickle.dump(value, fdesc, 2)
+                    index[name] = ('pickle', offset)
+            _align(fdesc)
+            index_offset = fdesc.tell()
+            pickle.dump({'version': SPYDATA_VERSION, 'variables': index},
+                        fdesc, 2)
+            fdesc.seek(len(SPYDATA_MAGIC))
+            fdesc.write(struct.pack('<Q', index_offset))
+        _replace(tmp_filename, filename)
+    except (RuntimeError, pickle.PicklingError, TypeError, AttributeError,
+            ValueError, MemoryError, IOError, OSError) as error:
         error_message = to_text_string(error)
-    os.chdir(old_cwd)
+        try:
+            os.remove(tmp_filename)
+        except OSError:
+            pass
     return error_message
 
 
-def load_dictionary(filename):
-    """Load dictionary from .spydata file"""
+def read_dictionary_index(filename):
+    """
+    Return the index of a .spydata file: a dict mapping variable names to
+    (kind, offset) tuples, or None if the file was written by Spyder < 4
+    """
+    with open(filename, 'rb') as fdesc:
+        if fdesc.read(len(SPYDATA_MAGIC)) != SPYDATA_MAGIC:
+            return None
+        index_offset, = struct.unpack('<Q', fdesc.read(8))
+        fdesc.seek(index_offset)
+        index = pickle.load(fdesc)
+    if index['version'] > SPYDATA_VERSION:
+        raise ValueError(_("This file was saved by a newer version "
+                           "of Spyder"))
+    return index['variables']
+
+
+def _read_npy(func, fdesc, **kwargs):
+    """Call an npy reading function of numpy on fdesc"""
+    try:
+        # Large headers were written by save_dictionary, not by a third
+        # party, so they can be trusted
+        return func(fdesc, max_header_size=sys.maxsize, **kwargs)
+    except TypeError:
+        # numpy < 1.24 has no limit
+        return func(fdesc, **kwargs)
+
+
+def _read_array(fdesc, filename, offset, mmap_mode, mmap_size=0):
+    """Read the array stored in npy format at offset"""
+    fdesc.seek(offset)
+    version = np.lib.format.read_magic(fdesc)
+    if version == (1, 0):
+        shape, fortran_order, dtype = \
+            _read_npy(np.lib.format.read_array_header_1_0, fdesc)
+    elif version == (2, 0):
+        shape, fortran_order, dtype = \
+            _read_npy(np.lib.format.read_array_header_2_0, fdesc)
+    else:
+        # Headers with utf-8 field names can only be read by read_array
+        fdesc.seek(offset)
+        return _read_npy(np.lib.format.read_array, fdesc, allow_pickle=False)
+    order = 'F' if fortran_order else 'C'
+    count = 1
+    for dim in shape:
+        count *= dim
+    if mmap_mode is not None and count * dtype.itemsize >= mmap_size:
+        return np.memmap(filename, dtype=dtype, mode=mmap_mode,
+                         offset=fdesc.tell(), shape=shape, order=order)
+    arr = np.fromfile(fdesc, dtype=dtype, count=count)
+    if fortran_order:
+        return arr.reshape(shape[::-1]).transpose()
+    return arr.reshape(shape)
+
+
+def load_dictionary(filename, names=None, mmap_mode=None, mmap_size=0):
+    """
+    Load dictionary from .spydata file
+
+    names is an optional list of the variables to load. Arrays are read
+    into memory, or memory mapped with mmap_mode if given ('c' means
+    copy-on-write: changes to them are not written to the file) and they
+    are at least mmap_size bytes. Mapped arrays keep the file open, so on
+    Windows it can't be replaced by save_dictionary until they are gone.
+    """
+    filename = osp.abspath(filename)
+    try:
+        index = read_dictionary_index(filename)
+    except (IOError, OSError, EOFError, ValueError, KeyError,
+            struct.error, pickle.UnpicklingError) as error:
+        return None, to_text_string(error)
+    if index is None:
+        data, error_message = _load_tar_dictionary(filename)
+        if data is not None and names is not None:
+            data = dict((name, data[name]) for name in names if name in data)
+        return data, error_message
+
+    if names is None:
+        names = list(index.keys())
+    data = {}
+    error_message = None
+    try:
+        with open(filename, 'rb') as fdesc:
+            for name in names:
+                if name not in index:
+                    continue
+                kind, offset = index[name]
+                if kind == 'array':
+                    data[name] = _read_array(fdesc, filename, offset,
+                                             mmap_mode, mmap_size)
+                else:
+                    fdesc.seek(offset)
+                    data[name] = pickle.load(fdesc)
+    except (IOError, OSError, EOFError, ValueError,
+            pickle.UnpicklingError) as error:
+        error_message = to_text_string(error)
+    return data, error_message
+
+
+def import_dictionary(filename):
+    """
+    Load dictionary from .spydata file, to import it in a namespace
+
+    Large arrays are mapped copy-on-write, so their data is only read
+    when it's used. On Windows they are read into memory instead, because
+    the file couldn't be saved again while they are mapped.
+    """
+    if os.name == 'nt':
+        return load_dictionary(filename)
+    return load_dictionary(filename, mmap_mode='c',
+                           mmap_size=SPYDATA_MMAP_SIZE)
+
+
+def _load_tar_dictionary(filename):
+    """Load dictionary from a .spydata file saved by Spyder < 4"""
     filename = osp.abspath(filename)
     old_cwd = getcwd_or_home()
     tmp_folder = tempfile.mkdtemp()
@@ -418,7 +566,7 @@ class IOFunctions(object):
     def get_internal_funcs(self):
         return [
                 ('.spydata', _("Spyder data files"),
-                             load_dictionary, save_dictionary),
+                             import_dictionary, save_dictionary),
                 ('.npy', _("NumPy arrays"), load_array, None),
                 ('.npz', _("NumPy zip arrays"), load_array, None),
                 ('.mat', _("Matlab files"), load_matlab, save_matlab),
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Binary encoding of the namespace views sent to the Variable Explorer
+
+Views are encoded by columns: a table of unique strings (names, types,
+colors and displayed values) plus packed arrays of fixed size integer
+fields, most of them indexing that table.
+The result is a small JSON header and a list of byte buffers, meant to be
+sent as the buffers of a spyder_msg, so neither side has to build or parse
+a repr.
+
+This module is imported by the kernel, so it must only depend on the
+standard library.
+"""
+
+import struct
+
+
+CODEC_VERSION = 1
+
+# Encoded value of missing integers
+NONE = -1
+
+# Encoded number of dimensions of sizes which are plain integers
+SCALAR = -2
+
+# Boolean properties, in the order of their bits in the flags array
+FLAG_PROPERTIES = ('is_list', 'is_dict', 'is_set', 'is_array', 'is_image',
+                   'is_data_frame', 'is_series')
+
+
+def _pack(code, values):
+    """Pack a list of integers as little endian values of type code."""
+    return struct.pack('<%d%s' % (len(values), code), *values)
+
+
+def _unpack(code, data):
+    """Unpack little endian values of type code."""
+    data = bytes(data)
+    count = len(data) // struct.calcsize(code)
+    return struct.unpack('<%d%s' % (count, code), data)
+
+
+class _StringTable(object):
+    """Table of unique strings, encoded in utf-8."""
+
+    def __init__(self):
+        self.indexes = {}
+        self.strings = []
+
+    def add(self, text):
+        index = self.indexes.get(text)
+        if index is None:
+            index = self.indexes[text] = len(self.strings)
+            self.strings.append(text)
+        return index
+
+    def encode(self):
+        encoded = []
+        for text in self.strings:
+            if not isinstance(text, bytes):
+                text = text.encode('utf-8')
+            encoded.append(text)
+        lengths = [len(text) for text in encoded]
+        return [_pack('I', lengths), b''.join(encoded)]
+
+
+def _decode_strings(lengths, blob):
+    blob = bytes(blob)
+    strings = []
+    start = 0
+    for length in _unpack('I', lengths):
+        strings.append(blob[start:start + length].decode('utf-8', 'replace'))
+        start += length
+    return strings
+
+
+def _encode_shape(shape, ndims, dims):
+    """Add a size or shape (an int, a tuple of ints or None) to arrays."""
+    if shape is None:
+        ndims.append(NONE)
+    elif isinstance(shape, tuple):
+        ndims.append(len(shape))
+        dims.extend(shape)
+    else:
+        ndims.append(SCALAR)
+        dims.append(shape)
+
+
+def _decode_shapes(ndims, dims):
+    shapes = []
+    position = 0
+    for ndim in ndims:
+        if ndim == NONE:
+            shapes.append(None)
+        elif ndim == SCALAR:
+            shapes.append(dims[position])
+            position += 1
+        else:
+            shapes.append(tuple(dims[position:position + ndim]))
+            position += ndim
+    return shapes
+
+
+def encode_namespace_view(view, removed=(), properties=None):
+    """
+    Encode a namespace view, as made by make_remote_view.
+
+    *removed* is a list of names of removed variables, *properties* maps
+    variable names to their properties, as made by the kernel's
+    get_var_properties.
+
+    Returns a tuple (header, buffers), where header is a JSONable dict.
+    """
+    strings = _StringTable()
+    names = sorted(view)
+    records = []
+    size_ndims = []
+    size_dims = []
+    for name in names:
+        entry = view[name]
+        records.extend([strings.add(name), strings.add(entry['type']),
+                        strings.add(entry['color']),
+                        strings.add(entry['view'])])
+        _encode_shape(entry['size'], size_ndims, size_dims)
+    removed_indexes = [strings.add(name) for name in removed]
+
+    flags = []
+    lens = []
+    ndims = []
+    shape_ndims = []
+    shape_dims = []
+    has_properties = properties is not None
+    if has_properties:
+        for name in names:
+            props = properties[name]
+            bits = 0
+            for bit, key in enumerate(FLAG_PROPERTIES):
+                if props[key]:
+                    bits |= 1 << bit
+            flags.append(bits)
+            length = props['len']
+            lens.append(NONE if length is None else length)
+            ndim = props['array_ndim']
+            ndims.append(NONE if ndim is None else ndim)
+            _encode_shape(props['array_shape'], shape_ndims, shape_dims)
+
+    header = {'version': CODEC_VERSION, 'count': len(names),
+              'properties': has_properties}
+    buffers = strings.encode()
+    buffers += [_pack('I', records), _pack('i', size_ndims),
+                _pack('q', size_dims), _pack('I', removed_indexes),
+                _pack('H', flags), _pack('q', lens), _pack('i', ndims),
+                _pack('i', shape_ndims), _pack('q', shape_dims)]
+    return header, buffers
+
+
+def decode_namespace_view(header, buffers):
+    """
+    Decode a namespace view encoded by encode_namespace_view.
+
+    Returns a tuple (view, removed, properties); properties is None if they
+    were not encoded.
+    """
+    if header.get('version') != CODEC_VERSION:
+        raise ValueError("Unsupported namespace view encoding")
+    strings = _decode_strings(buffers[0], buffers[1])
+    records = _unpack('I', buffers[2])
+    sizes = _decode_shapes(_unpack('i', buffers[3]), _unpack('q', buffers[4]))
+    removed = [strings[index] for index in _unpack('I', buffers[5])]
+
+    names = []
+    view = {}
+    for i in range(header['count']):
+        name, vtype, color, display = records[4 * i:4 * i + 4]
+        name = strings[name]
+        names.append(name)
+        view[name] = {'type': strings[vtype], 'size': sizes[i],
+                      'color': strings[color], 'view': strings[display]}
+
+    properties = None
+    if header['properties']:
+        flags = _unpack('H', buffers[6])
+        lens = _unpack('q', buffers[7])
+        ndims = _unpack('i', buffers[8])
+        shapes = _decode_shapes(_unpack('i', buffers[9]),
+                                _unpack('q', buffers[10]))
+        properties = {}
+        for i, name in enumerate(names):
+            props = dict((key, bool(flags[i] & (1 << bit)))
+                         for bit, key in enumerate(FLAG_PROPERTIES))
+            props['len'] = None if lens[i] == NONE else lens[i]
+            props['array_ndim'] = None if ndims[i] == NONE else ndims[i]
+            props['array_shape'] = shapes[i]
+            properties[name] = props
+    return view, removed, properties
@@ -40,6 +40,27 @@ class SpyderKernel(IPythonKernel):
 
         self.namespace_view_settings = {}
 
+        # Entries of the last namespace view sent to the frontend, used
+        # to send only what changed since then
+        self._namespace_view_cache = {}
+        self._namespace_view_cache_settings = None
+
+        # DataFrames shown by kernel backed editors, by id
+        self._remote_dataframes = {}
+        self._next_dataframe_id = 0
+
+        # Values whose transfer to the frontend waits for confirmation,
+        # by transfer id
+        self._value_downloads = {}
+
+        # Values set from the Variable Explorer are sent through comms
+        if not IS_EXT_INTERPRETER:
+            from spyder.utils.ipython.value_transfer import COMM_TARGET
+        else:
+            from utils.ipython.value_transfer import COMM_TARGET
+        self.comm_manager.register_target(COMM_TARGET,
+                                          self._open_value_upload)
+
         self._pdb_obj = None
         self._pdb_step = None
         self._do_publish_pdb_state = True
@@ -86,16 +107,11 @@ class SpyderKernel(IPythonKernel):
         * 'size' and 'type' are self-evident
         * and'view' is its value or the text shown in the last column
         """
-        if not IS_EXT_INTERPRETER:
-            from spyder.widgets.variableexplorer.utils import make_remote_view
-        else:
-            from widgets.variableexplorer.utils import make_remote_view
-
         settings = self.namespace_view_settings
         if settings:
-            ns = self._get_current_namespace()
-            view = repr(make_remote_view(ns, settings, EXCLUDED_NAMES))
-            return view
+            self._namespace_view_cache = {}
+            view, removed, full = self._get_namespace_view_delta()
+            return repr(view)
         else:
             return repr(None)
 
@@ -114,27 +130,62 @@ class SpyderKernel(IPythonKernel):
             ns = self._get_current_namespace()
             data = get_remote_data(ns, settings, mode='editable',
                                    more_excluded_names=EXCLUDED_NAMES)
-
-            properties = {}
-            for name, value in list(data.items()):
-                properties[name] = {
-                    'is_list':  isinstance(value, (tuple, list)),
-                    'is_dict':  isinstance(value, dict),
-                    'is_set': isinstance(value, set),
-                    'len': self._get_len(value),
-                    'is_array': self._is_array(value),
-                    'is_image': self._is_image(value),
-                    'is_data_frame': self._is_data_frame(value),
-                    'is_series': self._is_series(value),
-                    'array_shape': self._get_array_shape(value),
-                    'array_ndim': self._get_array_ndim(value)
-                }
-
-            return repr(properties)
+            return repr(self._get_var_properties(data))
         else:
             return repr(None)
 
-    def send_spyder_msg(self, spyder_msg_type, content=None, data=None):
+    def publish_namespace_view(self):
+        """
+        Publish the changes in the namespace view and the properties of
+        the changed variables through send_spyder_msg.
+
+        The view is sent in binary form (see namespace_codec), so it
+        doesn't have to be converted to a repr here and evaluated in the
+        frontend. If the summaries of some large arrays ran out of time,
+        'pending' is True in its header and the frontend is expected to
+        call finish_namespace_summaries.
+        """
+        if not IS_EXT_INTERPRETER:
+            from spyder.utils.ipython.namespace_codec import (
+                encode_namespace_view)
+            from spyder.widgets.variableexplorer.utils import ARRAY_SUMMARIES
+        else:
+            from utils.ipython.namespace_codec import encode_namespace_view
+            from widgets.variableexplorer.utils import ARRAY_SUMMARIES
+
+        if not self.namespace_view_settings:
+            return
+        changed, removed, full = self._get_namespace_view_delta()
+        ns = self._get_current_namespace()
+        properties = self._get_var_properties(
+            dict((name, ns[name]) for name in changed))
+        header, buffers = encode_namespace_view(changed, removed,
+                                                properties)
+        header['full'] = full
+        header['pending'] = ARRAY_SUMMARIES.has_pending()
+        self.send_spyder_msg('namespace_view',
+                             content={'namespace_view': header},
+                             buffers=buffers)
+
+    def finish_namespace_summaries(self):
+        """
+        Finish the summaries of large arrays that ran out of time while
+        making the last namespace view, and publish the view again.
+
+        The frontend runs this after getting a view with pending
+        summaries, so it's only done when the kernel is idle.
+        """
+        if not IS_EXT_INTERPRETER:
+            from spyder.widgets.variableexplorer.utils import ARRAY_SUMMARIES
+        else:
+            from widgets.variableexplorer.utils import ARRAY_SUMMARIES
+
+        if ARRAY_SUMMARIES.finish_pending():
+            self.publish_namespace_view()
+        self._do_publish_pdb_state = False
+
+    def send_spyder_msg(self, spyder_msg_type, content=None, data=None,
+                        buffers=None):
         """publish custom messages to the spyder frontend
 
         Parameters
@@ -147,8 +198,12 @@ class SpyderKernel(IPythonKernel):
         data: any
             Any object that is serializable by cloudpickle (should be most
             things). Will arrive as cloudpickled bytes in `.buffers[0]`.
+        buffers: list
+            Raw bytes buffers to send instead of the pickled data.
         """
-        import cloudpickle
+        if buffers is None:
+            import cloudpickle
+            buffers = [cloudpickle.dumps(data, protocol=PICKLE_PROTOCOL)]
 
         if content is None:
             content = {}
@@ -157,42 +212,148 @@ class SpyderKernel(IPythonKernel):
             self.iopub_socket,
             'spyder_msg',
             content=content,
-            buffers=[cloudpickle.dumps(data, protocol=PICKLE_PROTOCOL)],
+            buffers=buffers,
             parent=self._parent_header,
         )
 
     def get_value(self, name):
         """Get the value of a variable"""
         ns = self._get_current_namespace()
-        value = ns[name]
+        self._send_reply(ns[name])
+
+    def send_value(self, name, transfer_id, protocol, max_size=None):
+        """
+        Send the value of a variable in chunks of 'value_download'
+        messages (see value_transfer), pickled with protocol or the
+        highest one supported here.
+
+        If the value takes more than max_size bytes, only its size is sent
+        and it's kept until continue_value_download or
+        cancel_value_download are called.
+        """
+        if not IS_EXT_INTERPRETER:
+            from spyder.utils.ipython.value_transfer import (
+                dump_value, get_pickle_protocol)
+        else:
+            from utils.ipython.value_transfer import (dump_value,
+                                                      get_pickle_protocol)
+
         try:
-            self.send_spyder_msg('data', data=value)
-        except:
-            # * There is no need to inform users about
-            #   these errors.
-            # * value = None makes Spyder to ignore
-            #   petitions to display a value
-            self.send_spyder_msg('data', data=None)
+            ns = self._get_current_namespace()
+            buffers = dump_value(ns[name],
+                                 min(protocol, get_pickle_protocol()))
+        except Exception as error:
+            self._send_value_download(transfer_id, error=repr(error))
+        else:
+            size = sum(len(buf) for buf in buffers)
+            if max_size is not None and size > max_size:
+                self._value_downloads[transfer_id] = buffers
+                self._send_value_download(transfer_id, size=size,
+                                          refused=True)
+            else:
+                self._send_value_chunks(transfer_id, buffers)
+        self._do_publish_pdb_state = False
+
+    def continue_value_download(self, transfer_id):
+        """Send a value refused by send_value because of its size"""
+        buffers = self._value_downloads.pop(transfer_id, None)
+        if buffers is not None:
+            self._send_value_chunks(transfer_id, buffers)
+        self._do_publish_pdb_state = False
+
+    def cancel_value_download(self, transfer_id):
+        """Drop a value refused by send_value because of its size"""
+        self._value_downloads.pop(transfer_id, None)
         self._do_publish_pdb_state = False
 
     def set_value(self, name, value, PY2_frontend):
         """Set the value of a variable"""
-        import cloudpickle
         ns = self._get_reference_namespace(name)
+        ns[name] = self._load_value(value, PY2_frontend)
 
-        # We send serialized values in a list of one element
-        # from Spyder to the kernel, to be able to send them
-        # at all in Python 2
-        svalue = value[0]
+    def get_pickle_protocol(self):
+        """
+        Send the highest pickle protocol supported to set values through
+        comms (see value_transfer)
+        """
+        if not IS_EXT_INTERPRETER:
+            from spyder.utils.ipython.value_transfer import (
+                get_pickle_protocol)
+        else:
+            from utils.ipython.value_transfer import get_pickle_protocol
 
-        # We need to convert svalue to bytes if the frontend
-        # runs in Python 2 and the kernel runs in Python 3
-        if PY2_frontend and not PY2:
-            svalue = bytes(svalue, 'latin-1')
+        self._send_reply(get_pickle_protocol())
 
-        # Deserialize and set value in namespace
-        dvalue = cloudpickle.loads(svalue)
-        ns[name] = dvalue
+    # --- For kernel backed DataFrame editors
+    def open_dataframe(self, name):
+        """
+        Start showing a DataFrame, Series or Index in an editor.
+
+        Its id and structure are sent through send_spyder_msg.
+        """
+        if not IS_EXT_INTERPRETER:
+            from spyder.widgets.variableexplorer.utils import RemoteDataFrame
+        else:
+            from widgets.variableexplorer.utils import RemoteDataFrame
+
+        ns = self._get_current_namespace()
+        dataframe_id = self._next_dataframe_id
+        self._next_dataframe_id += 1
+        remote = RemoteDataFrame(ns[name])
+        remote.name = name
+        self._remote_dataframes[dataframe_id] = remote
+        info = remote.get_info()
+        info['id'] = dataframe_id
+        self._send_reply(info)
+
+    def get_dataframe_window(self, dataframe_id, row_start, row_stop,
+                             col_start, col_stop):
+        """Send a window of the rows and columns of a DataFrame"""
+        remote = self._remote_dataframes[dataframe_id]
+        self._send_reply(remote.get_window(row_start, row_stop,
+                                           col_start, col_stop))
+
+    def send_dataframe_window(self, dataframe_id, row_start, row_stop,
+                              col_start, col_stop):
+        """
+        Send a window of the rows and columns of a DataFrame in a
+        'dataframe_reply' message, which the frontend doesn't wait for.
+        """
+        remote = self._remote_dataframes.get(dataframe_id)
+        if remote is not None:
+            window = [row_start, row_stop, col_start, col_stop]
+            self._send_dataframe_reply(
+                dataframe_id, 'window',
+                remote.get_window(row_start, row_stop, col_start, col_stop),
+                window=window)
+        self._do_publish_pdb_state = False
+
+    def sort_dataframe(self, dataframe_id, column, ascending):
+        """Sort the rows of a DataFrame and send the error, if any"""
+        remote = self._remote_dataframes[dataframe_id]
+        self._send_reply(remote.sort(column, ascending))
+
+    def send_dataframe_minmax(self, dataframe_id):
+        """
+        Send the min/max of the columns of a DataFrame in a
+        'dataframe_reply' message, which the frontend doesn't wait for.
+        """
+        remote = self._remote_dataframes.get(dataframe_id)
+        if remote is not None:
+            self._send_dataframe_reply(dataframe_id, 'minmax',
+                                       remote.get_minmax())
+        self._do_publish_pdb_state = False
+
+    def set_dataframe_values(self, dataframe_id, value, PY2_frontend):
+        """Apply a list of (row, column, value) edits to a DataFrame"""
+        remote = self._remote_dataframes[dataframe_id]
+        remote.set_values(self._load_value(value, PY2_frontend))
+        ns = self._get_reference_namespace(remote.name)
+        ns[remote.name] = remote.get_value()
+
+    def close_dataframe(self, dataframe_id):
+        """Stop showing a DataFrame"""
+        self._remote_dataframes.pop(dataframe_id, None)
 
     def remove_value(self, name):
         """Remove a variable"""
@@ -253,11 +414,13 @@ class SpyderKernel(IPythonKernel):
         """
         Publish Variable Explorer state and Pdb step through
         send_spyder_msg.
+
+        The changes in the namespace view are published as when not
+        debugging (see publish_namespace_view).
         """
         if self._pdb_obj and self._do_publish_pdb_state:
-            state = dict(namespace_view = self.get_namespace_view(),
-                         var_properties = self.get_var_properties(),
-                         step = self._pdb_step)
+            self.publish_namespace_view()
+            state = dict(step = self._pdb_step)
             self.send_spyder_msg('pdb_state', content={'pdb_state': state})
         self._do_publish_pdb_state = True
 
@@ -364,6 +527,144 @@ class SpyderKernel(IPythonKernel):
 
         return ns
 
+    def _get_namespace_view_delta(self):
+        """
+        Return the namespace view entries that changed since the last
+        view was made, the names of the variables removed since then and
+        whether the entries are the whole view
+        """
+        if not IS_EXT_INTERPRETER:
+            from spyder.widgets.variableexplorer.utils import (
+                make_remote_view_delta)
+        else:
+            from widgets.variableexplorer.utils import make_remote_view_delta
+
+        # Entries have to be computed again if the settings changed
+        settings = self.namespace_view_settings
+        if settings != self._namespace_view_cache_settings:
+            self._namespace_view_cache = {}
+            self._namespace_view_cache_settings = settings.copy()
+
+        full = not self._namespace_view_cache
+        ns = self._get_current_namespace()
+        changed, removed = make_remote_view_delta(
+            ns, settings, self._namespace_view_cache, EXCLUDED_NAMES)
+        return changed, removed, full
+
+    def _load_value(self, value, PY2_frontend):
+        """Deserialize a value sent by the frontend"""
+        import cloudpickle
+
+        # We send serialized values in a list of one element
+        # from Spyder to the kernel, to be able to send them
+        # at all in Python 2
+        svalue = value[0]
+
+        # We need to convert svalue to bytes if the frontend
+        # runs in Python 2 and the kernel runs in Python 3
+        if PY2_frontend and not PY2:
+            svalue = bytes(svalue, 'latin-1')
+
+        return cloudpickle.loads(svalue)
+
+    def _send_value_chunks(self, transfer_id, buffers):
+        """Send the buffers of a value in chunks"""
+        if not IS_EXT_INTERPRETER:
+            from spyder.utils.ipython.value_transfer import split_chunks
+        else:
+            from utils.ipython.value_transfer import split_chunks
+
+        sizes = [len(buf) for buf in buffers]
+        for chunk in split_chunks(buffers):
+            self._send_value_download(
+                transfer_id, [view for index, offset, view in chunk],
+                size=sum(sizes), sizes=sizes,
+                parts=[[index, offset] for index, offset, view in chunk])
+
+    def _send_value_download(self, transfer_id, buffers=None, **kwargs):
+        """Send a 'value_download' message about a transfer"""
+        download = dict(id=transfer_id, **kwargs)
+        self.send_spyder_msg('value_download',
+                             content={'value_download': download},
+                             buffers=buffers or [])
+
+    def _open_value_upload(self, comm, msg):
+        """
+        Receive the value of a variable in the chunks sent through comm,
+        reporting the progress with 'value_upload' messages
+        """
+        if not IS_EXT_INTERPRETER:
+            from spyder.utils.ipython.value_transfer import ChunkedValue
+        else:
+            from utils.ipython.value_transfer import ChunkedValue
+
+        name = msg['content']['data']['name']
+        upload = ChunkedValue(msg['content']['data']['sizes'])
+
+        def handle_chunk(msg):
+            error = None
+            try:
+                upload.add_chunk(msg['content']['data']['parts'],
+                                 msg['buffers'])
+                done = upload.is_complete()
+                if done:
+                    ns = self._get_reference_namespace(name)
+                    ns[name] = upload.load()
+            except Exception as exc:
+                done = True
+                error = repr(exc)
+            progress = dict(name=name, received=upload.received,
+                            size=upload.size, done=done, error=error)
+            self.send_spyder_msg('value_upload',
+                                 content={'value_upload': progress})
+            if done:
+                # Free the buffers right away
+                upload.buffers = None
+                comm.close()
+
+        comm.on_msg(handle_chunk)
+
+    def _send_reply(self, value):
+        """Send a value waited for by the frontend"""
+        try:
+            self.send_spyder_msg('data', data=value)
+        except:
+            # * There is no need to inform users about
+            #   these errors.
+            # * value = None makes Spyder to ignore
+            #   petitions to display a value
+            self.send_spyder_msg('data', data=None)
+        self._do_publish_pdb_state = False
+
+    def _send_dataframe_reply(self, dataframe_id, kind, value, window=None):
+        """Send a value asked for by a kernel backed DataFrame editor"""
+        reply = {'id': dataframe_id, 'kind': kind, 'window': window}
+        try:
+            self.send_spyder_msg('dataframe_reply',
+                                 content={'dataframe_reply': reply},
+                                 data=value)
+        except:
+            # The editor keeps showing that the value is being loaded
+            pass
+
+    def _get_var_properties(self, data):
+        """Return the properties of the variables in dictionary data"""
+        properties = {}
+        for name, value in list(data.items()):
+            properties[name] = {
+                'is_list':  isinstance(value, (tuple, list)),
+                'is_dict':  isinstance(value, dict),
+                'is_set': isinstance(value, set),
+                'len': self._get_len(value),
+                'is_array': self._is_array(value),
+                'is_image': self._is_image(value),
+                'is_data_frame': self._is_data_frame(value),
+                'is_series': self._is_series(value),
+                'array_shape': self._get_array_shape(value),
+                'array_ndim': self._get_array_ndim(value)
+            }
+        return properties
+
     def _get_reference_namespace(self, name):
         """
         Return namespace where reference name is defined
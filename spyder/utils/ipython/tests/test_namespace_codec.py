@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for namespace_codec.py
+"""
+
+import pytest
+
+from spyder.utils.ipython.namespace_codec import (decode_namespace_view,
+                                                  encode_namespace_view)
+
+
+VIEW = {
+    'a': {'type': 'int', 'size': 1, 'color': '#0000ff', 'view': '1'},
+    u'ñ': {'type': 'str', 'size': 3, 'color': '#800000', 'view': u'ñañ'},
+    'arr': {'type': 'float64', 'size': (2, 3), 'color': '#ff00ff',
+            'view': 'Min: 0.0\nMax: 5.0'},
+    'img': {'type': 'Image', 'size': None, 'color': '#008000',
+            'view': 'Image'},
+}
+
+PROPERTIES = dict((name, {'is_list': False, 'is_dict': False,
+                          'is_set': False, 'len': None, 'is_array': False,
+                          'is_image': False, 'is_data_frame': False,
+                          'is_series': False, 'array_shape': None,
+                          'array_ndim': None})
+                  for name in VIEW)
+PROPERTIES['arr'].update(is_array=True, len=2, array_shape=(2, 3),
+                         array_ndim=2)
+PROPERTIES[u'ñ']['len'] = 3
+
+
+def test_roundtrip():
+    """Test that views, removed names and properties are preserved."""
+    header, buffers = encode_namespace_view(VIEW, ['b', 'c'], PROPERTIES)
+    assert all(isinstance(buf, bytes) for buf in buffers)
+    view, removed, properties = decode_namespace_view(header, buffers)
+    assert view == VIEW
+    assert removed == ['b', 'c']
+    assert properties == PROPERTIES
+
+
+def test_empty_and_without_properties():
+    """Test encoding empty views and views without properties."""
+    header, buffers = encode_namespace_view({})
+    assert decode_namespace_view(header, buffers) == ({}, [], None)
+
+    header, buffers = encode_namespace_view(VIEW)
+    # Buffers received from zmq are memoryviews
+    buffers = [memoryview(buf) for buf in buffers]
+    assert decode_namespace_view(header, buffers) == (VIEW, [], None)
+
+
+if __name__ == "__main__":
+    pytest.main()
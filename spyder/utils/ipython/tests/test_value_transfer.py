@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for value_transfer.py
+"""
+
+import pickle
+
+import numpy as np
+import pytest
+
+from spyder.utils.ipython.value_transfer import (ChunkedValue, dump_value,
+                                                 get_pickle_protocol,
+                                                 split_chunks)
+
+
+def upload(buffers, chunk_size):
+    """Send buffers in chunks as the frontend does and return the upload."""
+    received = ChunkedValue([len(buf) for buf in buffers])
+    for chunk in split_chunks(buffers, chunk_size):
+        assert sum(len(view) for index, offset, view in chunk) <= chunk_size
+        received.add_chunk([(index, offset) for index, offset, view in chunk],
+                           [view.tobytes() for index, offset, view in chunk])
+    assert received.is_complete()
+    return received
+
+
+@pytest.mark.parametrize("protocol", [2, get_pickle_protocol()])
+def test_value_roundtrip(protocol):
+    """Test that values are received intact, as writable arrays."""
+    value = {'arr': np.arange(1000.).reshape(20, 50),
+             'strided': np.arange(100)[::3],
+             'empty': np.zeros(0),
+             'text': u'ñandú'}
+    buffers = dump_value(value, protocol)
+    result = upload(buffers, 1000).load()
+    assert sorted(result) == sorted(value)
+    for name in ('arr', 'strided', 'empty'):
+        assert (result[name] == value[name]).all()
+        assert result[name].flags.writeable
+    assert result['text'] == value['text']
+
+
+@pytest.mark.skipif(pickle.HIGHEST_PROTOCOL < 5,
+                    reason="Out-of-band buffers need pickle protocol 5")
+def test_out_of_band_buffers():
+    """Test that the data of arrays isn't copied to the pickle."""
+    value = np.arange(1e5)
+    buffers = dump_value(value, 5)
+    assert len(buffers) == 2
+    assert len(buffers[0]) < 1000
+    assert np.shares_memory(np.frombuffer(buffers[1]), value)
+
+    # Chunks are views of the buffers
+    chunks = split_chunks(buffers, 2 ** 16)
+    assert len(chunks) == 13
+    assert np.shares_memory(np.frombuffer(chunks[5][0][2]), value)
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Binary transfer of values between the Variable Explorer and the kernel
+
+Values are pickled with protocol 5 when both sides support it, so the data
+of NumPy arrays (and of any object supporting out-of-band buffers) is not
+copied into the pickle. The pickle and those buffers are then split in
+chunks of at most CHUNK_SIZE bytes, sent as the raw buffers of messages:
+comm messages to set values in the kernel, and spyder_msg messages to get
+them from it. The receiving side never has to parse them from source code,
+never holds more than one copy of them, and can follow the progress of
+the transfer.
+
+This module is imported by the kernel, so it must only depend on the
+standard library and cloudpickle.
+"""
+
+import pickle
+import sys
+
+
+PY2 = sys.version[0] == '2'
+
+# Name of the comm target registered by the kernel to receive values
+COMM_TARGET = 'spyder_set_value'
+
+# Maximum number of bytes sent in a single message
+CHUNK_SIZE = 8 * 1024 ** 2
+
+# To be able to send values between Python 2 and 3
+PICKLE_PROTOCOL = 2
+
+
+def get_pickle_protocol():
+    """
+    Return the highest pickle protocol supported here by cloudpickle, 5
+    meaning that out-of-band buffers are supported.
+    """
+    import cloudpickle
+    protocol = min(pickle.HIGHEST_PROTOCOL, 5)
+    if protocol == 5:
+        try:
+            cloudpickle.dumps(None, protocol=protocol,
+                              buffer_callback=lambda buf: None)
+        except TypeError:
+            protocol = 4
+    return protocol
+
+
+def dump_value(value, protocol=PICKLE_PROTOCOL):
+    """
+    Pickle value with protocol and return the list of buffers to send: the
+    pickle followed by its out-of-band buffers, if any.
+    """
+    import cloudpickle
+    if protocol < 5:
+        return [memoryview(cloudpickle.dumps(value, protocol=protocol))]
+
+    buffers = []
+
+    def add_buffer(buf):
+        try:
+            buffers.append(buf.raw())
+        except BufferError:
+            # Buffers which aren't contiguous are kept in the pickle
+            return True
+
+    data = cloudpickle.dumps(value, protocol=protocol,
+                             buffer_callback=add_buffer)
+    return [memoryview(data)] + buffers
+
+
+def split_chunks(buffers, chunk_size=CHUNK_SIZE):
+    """
+    Split buffers in chunks of at most chunk_size bytes, without copying
+    them.
+
+    Return a list of chunks, each one a list of (index, offset, view),
+    where view holds the bytes of buffers[index] starting at offset.
+    """
+    chunks = []
+    chunk = []
+    free = chunk_size
+    for index, buf in enumerate(buffers):
+        view = memoryview(buf)
+        size = len(view)
+        offset = 0
+        while offset < size:
+            length = min(free, size - offset)
+            chunk.append((index, offset, view[offset:offset + length]))
+            offset += length
+            free -= length
+            if free == 0:
+                chunks.append(chunk)
+                chunk = []
+                free = chunk_size
+    if chunk or not chunks:
+        chunks.append(chunk)
+    return chunks
+
+
+class ChunkedValue(object):
+    """Value received in chunks, made by split_chunks."""
+
+    def __init__(self, sizes):
+        # The data is copied once, as it arrives, to buffers owned by the
+        # receiving side, so the arrays loaded from them are writable
+        self.buffers = [bytearray(size) for size in sizes]
+        self.size = sum(sizes)
+        self.received = 0
+
+    def add_chunk(self, parts, buffers):
+        """
+        Add the buffers of a chunk, where parts is the list of the
+        (index, offset) of each buffer.
+        """
+        for (index, offset), buf in zip(parts, buffers):
+            view = memoryview(buf)
+            self.buffers[index][offset:offset + len(view)] = view
+            self.received += len(view)
+
+    def is_complete(self):
+        return self.received >= self.size
+
+    def load(self):
+        """Return the value received."""
+        import cloudpickle
+        data = self.buffers[0]
+        if PY2:
+            data = bytes(data)
+        if len(self.buffers) > 1:
+            return cloudpickle.loads(data, buffers=self.buffers[1:])
+        return cloudpickle.loads(data)
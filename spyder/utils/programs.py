@@ -382,6 +382,102 @@ def get_module_version(module_name):
     return getattr(mod, '__version__', getattr(mod, 'VERSION', None))
 
 
+def _normalize_distribution_name(name):
+    """Return a name comparable to the ones of modules and distributions."""
+    return name.replace('-', '_').lower()
+
+
+def _read_metadata_version(path):
+    """Return the Version field of a metadata file, or None."""
+    try:
+        with open(path, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    # End of the headers
+                    break
+                if line.startswith(b'Version:'):
+                    return to_text_string(line[8:].strip(), 'utf-8')
+    except (IOError, OSError, UnicodeDecodeError):
+        pass
+    return None
+
+
+def _get_distribution_info(path, entry):
+    """
+    Return the name and version of the distribution described by the
+    dist-info or egg-info entry of path, or (None, None).
+    """
+    basename, ext = osp.splitext(entry)
+    info_path = osp.join(path, entry)
+    if ext == '.dist-info':
+        # Wheels guarantee dist-info dirs are named name-version
+        name, _sep, version = basename.partition('-')
+        return name, version or None
+    # Egg-info entries can be named name-version-pyX.Y, name-version or
+    # name (in develop mode), and be a file or a dir
+    parts = basename.split('-')
+    name = parts[0]
+    if len(parts) > 1 and parts[1][:1].isdigit():
+        return name, parts[1]
+    if osp.isdir(info_path):
+        info_path = osp.join(info_path, 'PKG-INFO')
+    return name, _read_metadata_version(info_path)
+
+
+def get_metadata_versions(paths=None):
+    """
+    Return a dict mapping the normalized names of the installed
+    distributions, and of the top level modules they provide, to their
+    versions.
+
+    Versions are read in the dist-info and egg-info metadata found in
+    paths (sys.path by default), so no module is imported. As for imports,
+    the first path providing a name takes precedence.
+    """
+    if paths is None:
+        paths = sys.path
+    versions = {}
+    for path in paths:
+        if not path or not osp.isdir(path):
+            continue
+        try:
+            entries = sorted(os.listdir(path))
+        except OSError:
+            continue
+        for entry in entries:
+            if not entry.endswith(('.dist-info', '.egg-info')):
+                continue
+            name, version = _get_distribution_info(path, entry)
+            if not name or version is None:
+                continue
+            names = [name]
+            top_level = osp.join(path, entry, 'top_level.txt')
+            if osp.isfile(top_level):
+                try:
+                    with open(top_level) as f:
+                        names += [line.strip() for line in f if line.strip()]
+                except (IOError, OSError, UnicodeDecodeError):
+                    pass
+            for name in names:
+                versions.setdefault(_normalize_distribution_name(name),
+                                    version)
+    return versions
+
+
+def get_module_version_from_metadata(module_name, versions=None):
+    """
+    Return the version of the distribution providing module_name, as read
+    in its metadata, or None if it can't be found.
+
+    versions is a dict returned by get_metadata_versions, to avoid
+    scanning sys.path again when several modules are looked up.
+    """
+    if versions is None:
+        versions = get_metadata_versions()
+    return versions.get(_normalize_distribution_name(module_name))
+
+
 def is_module_installed(module_name, version=None, installed_version=None,
                         interpreter=None):
     """
@@ -95,6 +95,39 @@ def get_color_scheme(name):
     return scheme
 
 
+def shift_block_data(data, block_nb, delta):
+    """
+    Return a copy of data, a dict indexed by block numbers, updated after
+    delta blocks were inserted after block_nb (or removed, if delta < 0)
+
+    Entries of the blocks which follow the change are moved; those of
+    removed blocks are dropped. Keys which are not block numbers are kept.
+    """
+    shifted = {}
+    for key, value in data.items():
+        if not isinstance(key, int) or key <= block_nb:
+            shifted[key] = value
+        elif delta > 0 or key > block_nb - delta:
+            shifted[key + delta] = value
+    return shifted
+
+
+def get_identifier_blocks(identifiers, word):
+    """
+    Return the sorted list of the numbers of the blocks containing word,
+    from identifiers, a dict of the identifiers of each block
+    """
+    return sorted(block_nb for block_nb, words in identifiers.items()
+                  if word in words)
+
+
+def get_outlineexplorer_key(oedata):
+    """Return what identifies the contents of outline explorer data"""
+    if oedata is None:
+        return None
+    return (oedata.text, oedata.fold_level, oedata.def_type, oedata.def_name)
+
+
 #==============================================================================
 # Syntax highlighting color schemes
 #==============================================================================
@@ -103,6 +136,8 @@ class BaseSH(QSyntaxHighlighter):
     # Syntax highlighting rules:
     PROG = None
     BLANKPROG = re.compile("\s+")
+    # Words indexed to mark their occurrences
+    IDENTIFIER_PROG = re.compile(r"[^\W\d]\w*", re.U)
     # Syntax highlighting states (from one text block to another):
     NORMAL = 0
     # Syntax highlighting parameters.
@@ -111,7 +146,19 @@ class BaseSH(QSyntaxHighlighter):
     def __init__(self, parent, font=None, color_scheme='Spyder'):
         QSyntaxHighlighter.__init__(self, parent)
 
+        # Outline explorer data, indexed by block number. It's kept up to
+        # date as blocks are highlighted, inserted and removed, and
+        # outlineexplorer_revision is incremented each time it changes
         self.outlineexplorer_data = {}
+        self.outlineexplorer_revision = 0
+        self._block_count = None
+
+        # Identifiers of each block, indexed by block number and kept up to
+        # date the same way, and the blocks found for a word since
+        # identifiers_revision last changed
+        self.identifiers = {}
+        self.identifiers_revision = 0
+        self._identifier_blocks = {}
 
         self.font = font
         if is_text_string(color_scheme):
@@ -222,7 +269,12 @@ class BaseSH(QSyntaxHighlighter):
 
         :param text: text to highlight.
         """
+        block_nb = self.update_block_data(text)
+        oedata = self.outlineexplorer_data.pop(block_nb, None)
         self.highlight_block(text)
+        if (get_outlineexplorer_key(oedata) != get_outlineexplorer_key(
+                self.outlineexplorer_data.get(block_nb))):
+            self.outlineexplorer_revision += 1
 
         # Process blocks for fold detection
         current_block = self.currentBlock()
@@ -233,6 +285,31 @@ class BaseSH(QSyntaxHighlighter):
                 self.fold_detector.process_block(
                     current_block, previous_block, text)
 
+    def update_block_data(self, text):
+        """
+        Update data indexed by block numbers before highlighting the
+        current block, whose text is text, and return its number.
+
+        Subclasses overriding highlightBlock must call this first.
+        """
+        # Blocks are highlighted in order, starting from the first one
+        # changed, so blocks were inserted or removed just after this one
+        block_nb = self.currentBlock().blockNumber()
+        block_count = self.document().blockCount()
+        if self._block_count is not None and block_count != self._block_count:
+            self.shift_block_data(block_nb, block_count - self._block_count)
+        self._block_count = block_count
+
+        identifiers = frozenset(self.IDENTIFIER_PROG.findall(
+                                                    to_text_string(text)))
+        if identifiers != self.identifiers.get(block_nb, frozenset()):
+            if identifiers:
+                self.identifiers[block_nb] = identifiers
+            else:
+                self.identifiers.pop(block_nb, None)
+            self._identifiers_changed()
+        return block_nb
+
     def highlight_block(self, text):
         """
         Abstract method. Override this to apply syntax highlighting.
@@ -275,8 +352,46 @@ class BaseSH(QSyntaxHighlighter):
     def get_outlineexplorer_data(self):
         return self.outlineexplorer_data
 
+    def get_identifier_blocks(self, word):
+        """
+        Return the sorted list of the numbers of the blocks where word is
+        found as an identifier.
+
+        The list is shared by all callers until the identifiers change, so
+        it must not be modified.
+        """
+        blocks = self._identifier_blocks.get(word)
+        if blocks is None:
+            blocks = get_identifier_blocks(self.identifiers, word)
+            self._identifier_blocks[word] = blocks
+        return blocks
+
+    def get_identifier_columns(self, block, word):
+        """Return the columns where word is found in block as an
+        identifier"""
+        return [match.start() for match
+                in self.IDENTIFIER_PROG.finditer(to_text_string(block.text()))
+                if match.group() == word]
+
+    def _identifiers_changed(self):
+        self.identifiers_revision += 1
+        self._identifier_blocks = {}
+
+    def shift_block_data(self, block_nb, delta):
+        """Update data indexed by block numbers after blocks were inserted
+        or removed after block_nb"""
+        self.outlineexplorer_data = shift_block_data(
+            self.outlineexplorer_data, block_nb, delta)
+        self.outlineexplorer_revision += 1
+        self.identifiers = shift_block_data(self.identifiers, block_nb, delta)
+        self._identifiers_changed()
+
     def rehighlight(self):
         self.outlineexplorer_data = {}
+        self.outlineexplorer_revision += 1
+        self.identifiers = {}
+        self._identifiers_changed()
+        self._block_count = None
         QApplication.setOverrideCursor(QCursor(Qt.WaitCursor))
         QSyntaxHighlighter.rehighlight(self)
         QApplication.restoreOverrideCursor()
@@ -537,16 +652,23 @@ class PythonSH(BaseSH):
         self.formats['trailing'] = self.formats['normal']
         self.highlight_spaces(text, offset)
         
+        block_nb = self.currentBlock().blockNumber()
         if oedata is not None:
-            block_nb = self.currentBlock().blockNumber()
             self.outlineexplorer_data[block_nb] = oedata
             self.outlineexplorer_data['found_cell_separators'] = self.found_cell_separators
         if import_stmt is not None:
-            block_nb = self.currentBlock().blockNumber()
             self.import_statements[block_nb] = import_stmt
+        else:
+            self.import_statements.pop(block_nb, None)
             
     def get_import_statements(self):
         return list(self.import_statements.values())
+
+    def shift_block_data(self, block_nb, delta):
+        """Reimplemented to update import statements"""
+        BaseSH.shift_block_data(self, block_nb, delta)
+        self.import_statements = shift_block_data(self.import_statements,
+                                                  block_nb, delta)
             
     def rehighlight(self):
         self.import_statements = {}
@@ -1023,6 +1145,7 @@ class MarkdownSH(BaseSH):
 
     def highlightBlock(self, text):
         text = to_text_string(text)
+        self.update_block_data(text)
         previous_state = self.previousBlockState()
 
         if previous_state == self.CODE:
@@ -1209,6 +1332,7 @@ class PygmentsSH(BaseSH):
         """ Actually highlight the block"""
         # Note that an undefined blockstate is equal to -1, so the first block
         # will have the correct behaviour of starting at 0.
+        self.update_block_data(text)
         if self._allow_highlight:
             start = self.previousBlockState() + 1
             end = start + len(text)
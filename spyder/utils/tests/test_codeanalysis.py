@@ -16,7 +16,7 @@ import pytest
 
 # Local imports
 from spyder.utils.codeanalysis import (check_with_pep8, check_with_pyflakes,
-                                       find_tasks)
+                                       find_tasks, get_pool, run_checker)
 from spyder.py3compat import PY2
 
 TEST_FILE = os.path.join(os.path.dirname(__file__), 'data/example.py')
@@ -33,5 +33,14 @@ def test_codeanalysis():
     assert len(check_results) == num_results
 
 
+def test_run_checker():
+    """Test running checkers in the pool of analysis workers."""
+    code = open(TEST_FILE).read()
+    results = get_pool().apply(run_checker, (('todo', code),))
+    assert results == find_tasks(code)
+    # Errors are never raised in workers
+    assert run_checker(('todo', None)) == []
+
+
 if __name__ == "__main__":
     pytest.main()
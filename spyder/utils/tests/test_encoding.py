@@ -8,7 +8,8 @@
 import pytest
 import os
 
-from spyder.utils.encoding import is_text_file, get_coding
+from spyder.utils.encoding import (is_text_file, get_coding, decode,
+                                   read_chunks)
 
 __location__ = os.path.realpath(os.path.join(os.getcwd(),
                                              os.path.dirname(__file__)))
@@ -34,5 +35,27 @@ def test_files_encodings(expected_encoding, text_file):
         assert get_coding(text).lower() == expected_encoding.lower()
 
 
+@pytest.mark.parametrize(
+    'data',
+    [u'sp\xe4m = "\u4e2d"\r\n'.encode('utf-8') * 1000,
+     b'# -*- coding: latin-1 -*-\r\nspam = "\xf1"\r\n' * 1000,
+     b'spam = 1\r\n' * 1000 + b'bacon = "\xf1"\r\n'])
+def test_read_chunks(tmpdir, data):
+    """Test that files read in chunks are decoded as when read at once."""
+    p = tmpdir.join('chunks.py')
+    p.write_binary(data)
+    text, encoding = decode(data)
+    coding, chunks = read_chunks(str(p), chunk_size=1001)
+    try:
+        chunks = list(chunks)
+    except UnicodeError:
+        coding, chunks = read_chunks(str(p), 'latin-1-guessed', 1001)
+        chunks = list(chunks)
+    assert u''.join(chunks) == text
+    assert coding.replace('-guessed', '') == encoding.replace('-guessed', '')
+    # CRLF end-of-lines aren't split between chunks
+    assert not any(chunk.endswith(u'\r') for chunk in chunks)
+
+
 if __name__ == '__main__':
     pytest.main()
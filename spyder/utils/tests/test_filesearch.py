@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for filesearch.py
+"""
+
+# Standard library imports
+from multiprocessing.pool import ThreadPool
+import re
+
+# Test library imports
+import pytest
+
+# Local imports
+from spyder.utils import filesearch
+
+
+TEXT = b"spam ham\nfoo SPAM spam\n\nlast spam"
+
+
+def test_search_buffer_literal():
+    """Test that literal matches give the same positions as a line scan."""
+    results = filesearch.search_buffer('f', TEXT, [(b'spam', 'utf-8')])
+    assert [r[1:4] for r in results] == [(1, 0, 4), (2, 9, 13), (4, 5, 9)]
+    assert results[1][4] == u'foo SPAM spam\n'
+
+
+def test_search_buffer_case_insensitive():
+    """Test case insensitive searches."""
+    texts = filesearch.prepare_texts([(b'spam', 'utf-8')], False, False)
+    results = filesearch.search_buffer('f', TEXT, texts)
+    assert [r[1:3] for r in results] == [(1, 0), (2, 4), (2, 9), (4, 5)]
+    texts = filesearch.prepare_texts([(re.compile(b'SPAM$'), 'utf-8')],
+                                     True, False)
+    results = filesearch.search_buffer('f', TEXT, texts)
+    assert [r[1:3] for r in results] == [(2, 9), (4, 5)]
+
+
+def test_search_buffer_regexp_anchors():
+    """Test that '^' and '$' still match on every line."""
+    texts = filesearch.prepare_texts([(re.compile(b'^spam|spam$'), 'utf-8')],
+                                     True)
+    results = filesearch.search_buffer('f', TEXT, texts)
+    assert [r[1:3] for r in results] == [(1, 0), (2, 9), (4, 5)]
+
+
+def test_search_buffer_regexp_lines():
+    """Test that regular expressions don't match across lines."""
+    buf = b"a = 1;\n\nb = 2; c\n"
+    texts = filesearch.prepare_texts([(re.compile(br';\s+'), 'utf-8'),
+                                      (re.compile(br'=[^;]*'), 'utf-8')],
+                                     True)
+    results = filesearch.search_buffer('f', buf, texts)
+    assert [r[1:4] for r in results] == [(1, 2, 5), (1, 5, 6), (3, 2, 5),
+                                         (3, 5, 7)]
+    # Same as a line scan, with ends up to the newline
+    expected = []
+    for lineno, line in enumerate(buf.splitlines(True)):
+        line_end = len(line.rstrip(b'\n'))
+        for text, _enc in texts:
+            expected.extend((lineno + 1, m.start(), min(m.end(), line_end))
+                            for m in text.finditer(line))
+    assert [r[1:4] for r in results] == sorted(expected)
+
+
+def test_search_buffer_encodings():
+    """Test that matches are kept for every encoding, but only once."""
+    buf = u"caf\xe9\ncaf\xe9\n".encode('utf-8') + u"caf\xe9".encode('latin-1')
+    texts = [(u"caf\xe9".encode(enc), enc)
+             for enc in ('utf-8', 'latin-1', 'iso-8859-15')]
+    texts = filesearch.prepare_texts(texts, False)
+    assert len(texts) == 2
+    results = filesearch.search_buffer('f', buf, texts)
+    assert [r[1] for r in results] == [1, 2, 3]
+    assert results[2][4] == u"caf\xe9"
+
+
+def test_search_chunk(tmpdir):
+    """Test searching a chunk of files, including empty ones."""
+    spam = tmpdir.join('spam.txt')
+    spam.write_binary(TEXT)
+    empty = tmpdir.join('empty.txt')
+    empty.write_binary(b'')
+    last, results, error = filesearch.search_chunk(
+        ([str(empty), str(spam)], [(b'ham', 'utf-8')]))
+    assert last == str(spam)
+    assert not error
+    assert [r[1:3] for r in results] == [(1, 5)]
+
+
+def test_iter_chunks():
+    """Test grouping of file names."""
+    chunks = list(filesearch.iter_chunks(range(5), size=2))
+    assert chunks == [[0, 1], [2, 3], [4]]
+
+
+def test_imap_bounded():
+    """Test that results come in order and tasks are queued lazily."""
+    pool = ThreadPool(2)
+    consumed = []
+
+    def tasks():
+        for i in range(1000):
+            consumed.append(i)
+            yield i
+
+    results = filesearch.imap_bounded(pool, abs, tasks())
+    assert next(results) == 0
+    assert len(consumed) < 1000
+    assert list(results) == list(range(1, 1000))
+    pool.terminate()
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for icon_manager.py
+"""
+
+# Test library imports
+import pytest
+
+# Local imports
+from spyder.config.main import CONF
+from spyder.utils import icon_manager as ima
+
+
+@pytest.fixture
+def icon_theme(qtbot):
+    """Restore the icon theme and clear the icon cache after a test."""
+    theme = CONF.get('main', 'icon_theme')
+    ima.clear_icon_cache()
+    yield theme
+    CONF.set('main', 'icon_theme', theme)
+    ima.clear_icon_cache()
+
+
+def test_icon_cache(icon_theme):
+    """Test that icons are created once per theme."""
+    icon = ima.icon('filenew')
+    assert ima.icon('filenew').cacheKey() == icon.cacheKey()
+    assert ima.icon('filenew', resample=True).cacheKey() != icon.cacheKey()
+
+    CONF.set('main', 'icon_theme', 'spyder 2')
+    assert ima.icon('filenew').cacheKey() != icon.cacheKey()
+    assert len(ima._icon_cache) == 1
+
+
+def test_cached_pixmaps(icon_theme):
+    """Test that the pixmaps of font icons are rendered once per size."""
+    CONF.set('main', 'icon_theme', 'spyder 3')
+    icon = ima.icon('filenew')
+    pixmap = icon.pixmap(16, 16)
+    assert not pixmap.isNull()
+    assert ima.icon('filenew').pixmap(16, 16).cacheKey() == pixmap.cacheKey()
+    assert icon.pixmap(24, 24).cacheKey() != pixmap.cacheKey()
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -86,6 +86,66 @@ def test_spydata_import(spydata_values):
         valid = valid and bool(np.mean(spydata_values[var] == data[var]))
     assert valid
 
+def test_spydata_roundtrip(tmpdir, spydata_values):
+    """Test saving and loading spydata files, with memory mapped arrays."""
+    data = dict(spydata_values)
+    data['E'] = np.asfortranarray(np.arange(12.).reshape(3, 4))
+    data['F'] = np.array([], dtype=int)
+    path = str(tmpdir.join('test.spydata'))
+    assert iofuncs.save_dictionary(data, path) is None
+    assert sorted(iofuncs.read_dictionary_index(path)) == sorted(data)
+
+    loaded, error = iofuncs.load_dictionary(path)
+    assert error is None
+    assert sorted(loaded) == sorted(data)
+    assert not isinstance(loaded['C'], np.memmap)
+    assert np.array_equal(loaded['C'], data['C'])
+    assert np.array_equal(loaded['E'], data['E'])
+    assert loaded['E'].flags.f_contiguous
+    assert loaded['F'].size == 0
+    assert loaded['D'] == data['D']
+
+    # Arrays are loaded in memory, so the file can be overwritten
+    loaded['C'][0, 0] = 5
+    assert iofuncs.save_dictionary(loaded, path) is None
+
+    # or mapped copy-on-write
+    selected, error = iofuncs.load_dictionary(path, names=['B', 'C'],
+                                              mmap_mode='c')
+    assert sorted(selected) == ['B', 'C']
+    assert isinstance(selected['C'], np.memmap)
+    assert selected['C'][0, 0] == 5
+    selected['C'][0, 0] = 6
+    del selected
+    assert iofuncs.load_dictionary(path)[0]['C'][0, 0] == 5
+
+def test_spydata_large_header(tmpdir):
+    """Test saving arrays whose npy header doesn't fit in version 1.0."""
+    dtype = np.dtype([('field_%05d' % i, 'f8') for i in range(5000)])
+    data = {'a': np.zeros(2, dtype=dtype)}
+    path = str(tmpdir.join('test.spydata'))
+    assert iofuncs.save_dictionary(data, path) is None
+    loaded, error = iofuncs.load_dictionary(path)
+    assert error is None
+    assert loaded['a'].dtype == dtype
+    assert not tmpdir.join('test.spydata.tmp').check()
+
+@pytest.mark.skipif(os.name == 'nt', reason="Arrays aren't mapped on Windows")
+def test_spydata_import_mapped(tmpdir, monkeypatch):
+    """Test that large arrays are memory mapped when a file is imported."""
+    monkeypatch.setattr(iofuncs, 'SPYDATA_MMAP_SIZE', 64)
+    data = {'small': np.arange(4.), 'large': np.arange(16.)}
+    path = str(tmpdir.join('test.spydata'))
+    assert iofuncs.save_dictionary(data, path) is None
+    loaded, error = iofuncs.iofunctions.load_funcs['.spydata'](path)
+    assert error is None
+    assert not isinstance(loaded['small'], np.memmap)
+    assert isinstance(loaded['large'], np.memmap)
+    # The file can be saved again while they are mapped
+    loaded['large'][0] = 5
+    assert iofuncs.save_dictionary(loaded, path) is None
+    assert iofuncs.load_dictionary(path)[0]['large'][0] == 5
+
 @pytest.mark.skipif(iofuncs.load_matlab is None, reason="SciPy required")
 def test_matlabstruct():
     """Test support for matlab stlye struct."""
@@ -14,7 +14,8 @@ from spyder.utils.programs import (run_python_script_in_terminal,
                                    is_python_interpreter,
                                    is_python_interpreter_valid_name,
                                    find_program, shell_split, check_version,
-                                   is_module_installed)
+                                   is_module_installed, get_metadata_versions,
+                                   get_module_version_from_metadata)
 
 
 if os.name == 'nt':
@@ -96,6 +97,26 @@ def test_is_module_installed():
     assert not is_module_installed('IPython', '>=1.0;<3.0')
     assert is_module_installed('jedi', '>=0.7.0')
 
+def test_get_metadata_versions(tmpdir):
+    """Test reading versions in metadata, without importing modules."""
+    site = tmpdir.mkdir('site-packages')
+    dist_info = site.mkdir('pyzmq-16.0.2.dist-info')
+    dist_info.join('top_level.txt').write('zmq\n')
+    site.mkdir('Cython-0.27.egg-info')
+    egg_info = site.mkdir('spam.egg-info')
+    egg_info.join('PKG-INFO').write('Name: spam\nVersion: 1.2\n')
+    site.join('eggs-0.1-py3.6.egg-info').write('Version: 0.1\n')
+    other = tmpdir.mkdir('other')
+    other.mkdir('pyzmq-15.0.dist-info')
+
+    versions = get_metadata_versions([str(site), str(other)])
+    assert get_module_version_from_metadata('zmq', versions) == '16.0.2'
+    assert get_module_version_from_metadata('pyzmq', versions) == '16.0.2'
+    assert get_module_version_from_metadata('cython', versions) == '0.27'
+    assert get_module_version_from_metadata('spam', versions) == '1.2'
+    assert get_module_version_from_metadata('eggs', versions) == '0.1'
+    assert get_module_version_from_metadata('foo', versions) is None
+
 if __name__ == '__main__':
     pytest.main()
     
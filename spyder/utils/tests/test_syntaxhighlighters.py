@@ -7,7 +7,7 @@
 
 import pytest
 from qtpy.QtWidgets import QApplication
-from qtpy.QtGui import QTextDocument
+from qtpy.QtGui import QTextCursor, QTextDocument
 
 from spyder.utils.syntaxhighlighters import HtmlSH, PythonSH, MarkdownSH
 from spyder.py3compat import PY3
@@ -107,5 +107,74 @@ def test_python_not_an_outline_explorer_comment(line):
     assert not PythonSH.OECOMMENT.match(line)
 
 
+def test_python_outline_explorer_data_edits(qtbot):
+    """Test that outline explorer data follows insertions and removals."""
+    doc = QTextDocument('def f():\n    pass\n\nclass A:\n    import os\n')
+    sh = PythonSH(doc, color_scheme='Spyder')
+    # Changes are only highlighted in documents with a layout, once they
+    # were highlighted a first time
+    doc.documentLayout()
+    qtbot.wait(10)
+    oedata = sh.get_outlineexplorer_data()
+    assert sorted(k for k in oedata if isinstance(k, int)) == [0, 3]
+    revision = sh.outlineexplorer_revision
+
+    # Inserting lines moves the data of the following blocks
+    cursor = QTextCursor(doc.findBlockByNumber(2))
+    cursor.insertText('x = 1\ny = 2\n')
+    oedata = sh.get_outlineexplorer_data()
+    assert sorted(k for k in oedata if isinstance(k, int)) == [0, 5]
+    assert oedata[5].def_name == 'A'
+    assert sh.import_statements == {6: 'import os'}
+    assert sh.outlineexplorer_revision > revision
+
+    # Removing a definition removes its data
+    cursor = QTextCursor(doc.firstBlock())
+    cursor.movePosition(QTextCursor.Down, QTextCursor.KeepAnchor, 2)
+    cursor.removeSelectedText()
+    oedata = sh.get_outlineexplorer_data()
+    assert sorted(k for k in oedata if isinstance(k, int)) == [3]
+    assert oedata[3].def_name == 'A'
+
+    # Editing other lines doesn't change the data
+    revision = sh.outlineexplorer_revision
+    cursor = QTextCursor(doc.firstBlock())
+    cursor.insertText('z')
+    assert sh.outlineexplorer_revision == revision
+
+
+def test_identifier_blocks_edits(qtbot):
+    """Test that the index of identifiers follows edits."""
+    doc = QTextDocument('x = 1\ny = x + 1\n# no x_1 here\nprint(x, "x")\n')
+    sh = PythonSH(doc, color_scheme='Spyder')
+    doc.documentLayout()
+    qtbot.wait(10)
+    assert sh.get_identifier_blocks('x') == [0, 1, 3]
+    assert sh.get_identifier_blocks('x_1') == [2]
+    assert sh.get_identifier_blocks('z') == []
+    assert sh.get_identifier_columns(doc.findBlockByNumber(3), 'x') == [6, 10]
+
+    # Inserting lines moves the following blocks
+    revision = sh.identifiers_revision
+    cursor = QTextCursor(doc.findBlockByNumber(1))
+    cursor.insertText('z = 2\n\n')
+    assert sh.get_identifier_blocks('x') == [0, 3, 5]
+    assert sh.get_identifier_blocks('z') == [1]
+    assert sh.identifiers_revision > revision
+
+    # Removing lines drops their identifiers
+    cursor = QTextCursor(doc.firstBlock())
+    cursor.movePosition(QTextCursor.Down, QTextCursor.KeepAnchor, 3)
+    cursor.removeSelectedText()
+    assert sh.get_identifier_blocks('x') == [0, 2]
+    assert sh.get_identifier_blocks('z') == []
+
+    # Editing a line without changing its identifiers keeps the index
+    revision = sh.identifiers_revision
+    cursor = QTextCursor(doc.firstBlock())
+    cursor.insertText(' ')
+    assert sh.identifiers_revision == revision
+
+
 if __name__ == '__main__':
     pytest.main()
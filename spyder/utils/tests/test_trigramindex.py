@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for trigramindex.py
+"""
+
+# Standard library imports
+import os
+import os.path as osp
+import re
+
+# Test library imports
+import pytest
+
+# Local imports
+from spyder.utils.trigramindex import regexp_literals, TrigramIndex
+
+
+@pytest.fixture
+def project(tmpdir):
+    """Create a small project and return its index."""
+    root = tmpdir.mkdir('project')
+    root.join('spam.py').write('import spam\nspam.eggs()\n')
+    root.join('ham.py').write('HAM = 1\n')
+    root.mkdir('.git').join('config').write('spam')
+    index = TrigramIndex(str(root),
+                         index_path=str(tmpdir.join('index.pickle')))
+    index.refresh()
+    return index
+
+
+def basenames(filenames):
+    return sorted(osp.basename(fname) for fname in filenames)
+
+
+def test_regexp_literals():
+    """Test extraction of mandatory literals from regular expressions."""
+    assert regexp_literals(b'spam') == [b'spam']
+    assert regexp_literals(b'def \\w+\\(') is None
+    assert regexp_literals(b'spam\\.eggs?') == [b'spam.egg']
+    assert regexp_literals(b'^import +spam[0-9]*$') == [b'import ', b'spam']
+    assert regexp_literals(b'spam|ham') is None
+
+
+def test_candidates(project):
+    """Test narrowing the files to search."""
+    assert basenames(project.candidates([(b'spam', 'utf-8')], False)) == \
+        ['spam.py']
+    assert basenames(project.candidates([(b'ham', 'utf-8')], False)) == \
+        ['ham.py']
+    texts = [(re.compile(b'spam\\.eg+s'), 'utf-8')]
+    assert basenames(project.candidates(texts, True)) == ['spam.py']
+    # Too short to be narrowed
+    assert project.candidates([(b'sp', 'utf-8')], False) is None
+
+
+def test_incremental_update(project):
+    """Test that modified files are reindexed and saved indexes reloaded."""
+    fname = osp.join(project.root_path, 'ham.py')
+    with open(fname, 'w') as f:
+        f.write('import eggs\n')
+    stat = os.stat(fname)
+    os.utime(fname, (stat.st_atime, stat.st_mtime + 10))
+    assert project.update_file(fname)
+    assert basenames(project.candidates([(b'eggs', 'utf-8')], False)) == \
+        ['ham.py', 'spam.py']
+    assert project.candidates([(b'ham', 'utf-8')], False) == []
+
+    project.save()
+    index = TrigramIndex(project.root_path, index_path=project.index_path)
+    assert index.load()
+    assert not index.refresh()
+    assert basenames(index.candidates([(b'eggs', 'utf-8')], False)) == \
+        ['ham.py', 'spam.py']
+
+
+def test_refresh_path(project):
+    """Test that refreshing a directory only looks at its files."""
+    root = project.root_path
+    os.mkdir(osp.join(root, 'sub'))
+    with open(osp.join(root, 'sub', 'eggs.py'), 'w') as f:
+        f.write('eggs = 1\n')
+    with open(osp.join(root, 'eggs.py'), 'w') as f:
+        f.write('eggs = 2\n')
+    os.remove(osp.join(root, 'ham.py'))
+    assert project.refresh(path=osp.join(root, 'sub'))
+    assert basenames(project.candidates([(b'eggs', 'utf-8')], False)) == \
+        ['eggs.py', 'spam.py']
+    assert basenames(project.candidates([(b'ham', 'utf-8')], False)) == \
+        ['ham.py']
+    assert project.refresh()
+    assert basenames(project.candidates([(b'ham', 'utf-8')], False)) == []
+
+
+def test_skipped_dirs(project):
+    """Test that the files of excluded directories are left out."""
+    git_dir = osp.join(project.root_path, '.git')
+    assert project.skipped_dirs() == [git_dir]
+    assert not project.contains(osp.join(git_dir, 'config'))
+    assert project.contains(osp.join(project.root_path, 'spam.py'))
+    assert basenames(project.candidates([(b'spam', 'utf-8')], False)) == \
+        ['spam.py']
+
+
+if __name__ == "__main__":
+    pytest.main()
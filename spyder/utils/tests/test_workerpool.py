@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for workerpool.py
+"""
+
+# Standard library imports
+import os
+import subprocess
+import sys
+
+# Test library imports
+import pytest
+
+# Local imports
+from spyder.py3compat import PY2
+from spyder.utils import workerpool
+
+
+# Like scripts/spyder, it doesn't check that it's the main module
+SCRIPT = """
+import sys
+with open({runs!r}, 'a') as f:
+    f.write('run\\n')
+
+from spyder.utils import filesearch
+pool = filesearch.get_pool()
+task = ([{fname!r}], [(b'spam', 'utf-8')])
+for last, results, error in filesearch.imap_bounded(
+        pool, filesearch.search_chunk, [task]):
+    sys.stdout.write('%d matches' % len(results))
+pool.terminate()
+"""
+
+
+def test_thread_pool():
+    """Test the fallback to threads."""
+    pool = workerpool.create_pool(2, use_processes=False)
+    assert pool.apply(abs, (-1,)) == 1
+    pool.terminate()
+
+
+@pytest.mark.skipif(PY2, reason="Processes are only spawned on Python 3")
+def test_unguarded_main_script(tmpdir):
+    """Test that workers don't re-run the main script of their parent."""
+    spam = tmpdir.join('spam.txt')
+    spam.write_binary(b'spam\nham spam\n')
+    runs = tmpdir.join('runs.txt')
+    script = tmpdir.join('script.py')
+    script.write(SCRIPT.format(runs=str(runs), fname=str(spam)))
+    env = os.environ.copy()
+    root = os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.dirname(os.path.abspath(workerpool.__file__)))))
+    env['PYTHONPATH'] = os.pathsep.join(
+        [root] + [p for p in env.get('PYTHONPATH', '').split(os.pathsep)
+                  if p])
+    # Workers re-running the script would fail to start over and over
+    output = subprocess.check_output([sys.executable, str(script)], env=env,
+                                     cwd=str(tmpdir), timeout=60)
+    assert output.decode().endswith('2 matches')
+    assert runs.read() == 'run\n'
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,390 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Persistent trigram index of the files of a project
+
+The index maps every (lowercased) three bytes sequence found in the text
+files of a project to the ids of the files containing it, kept in arrays
+of increasing ids. Find in Files uses it to narrow the files to scan for
+literals and simple regular expressions.
+"""
+
+# Standard library imports
+from __future__ import print_function
+from array import array
+import hashlib
+import os
+import os.path as osp
+import re
+import threading
+
+# Local imports
+from spyder.config.base import get_conf_path
+from spyder.py3compat import pickle, to_binary_string
+from spyder.utils.external.binaryornot.helpers import is_binary_string
+
+
+INDEX_VERSION = 2
+
+# Files bigger than this are never indexed; they are always searched
+MAX_FILE_SIZE = 10 * 1024 ** 2
+
+# Directories that are never indexed. Their files are searched without the
+# index unless they are excluded by the search (see skipped_dirs)
+EXCLUDED_DIRS = ('.git', '.hg', '.svn', '.spyproject', '__pycache__')
+
+
+def get_index_path(root_path):
+    """Return the file where the index of root_path is stored."""
+    key = hashlib.md5(to_binary_string(osp.normcase(root_path),
+                                       'utf-8')).hexdigest()
+    return get_conf_path(osp.join('trigrams', key + '.pickle'))
+
+
+def get_trigrams(data):
+    """Return the set of trigrams of data (bytes), ignoring case."""
+    data = data.lower()
+    return set(data[i:i + 3] for i in range(len(data) - 2))
+
+
+def regexp_literals(pattern):
+    """
+    Return the literal fragments that any match of pattern must contain.
+
+    Only simple regular expressions, without groups or alternatives, are
+    analysed. None is returned when nothing can be inferred.
+    """
+    if b'|' in pattern or b'(' in pattern:
+        return None
+    literals = []
+    current = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i:i + 1]
+        if char == b'\\':
+            escaped = pattern[i + 1:i + 2]
+            if escaped.isalnum() or not escaped:
+                # Character class (\d, \w, ...) or back reference
+                literals.append(b''.join(current))
+                current = []
+            else:
+                current.append(escaped)
+            i += 2
+            continue
+        if char in (b'*', b'?') or char == b'{':
+            # The previous character is optional
+            if current:
+                current.pop()
+            literals.append(b''.join(current))
+            current = []
+            if char == b'{':
+                end = pattern.find(b'}', i)
+                i = len(pattern) if end == -1 else end
+        elif char == b'[':
+            literals.append(b''.join(current))
+            current = []
+            end = pattern.find(b']', i + 2)
+            i = len(pattern) if end == -1 else end
+        elif char in (b'.', b'^', b'$', b'+', b'}', b']'):
+            # For '+', one occurrence of the previous character is mandatory
+            # so it's kept in the current fragment
+            literals.append(b''.join(current))
+            current = []
+        else:
+            current.append(char)
+        i += 1
+    literals.append(b''.join(current))
+    return [lit for lit in literals if len(lit) >= 3]
+
+
+class TrigramIndex(object):
+    """
+    Trigram index of the text files found under a root path.
+
+    Files are identified by their path relative to the root path, passed
+    through normcase, so the same file is always found under the same key.
+    """
+
+    def __init__(self, root_path, index_path=None):
+        self.root_path = osp.abspath(root_path)
+        if index_path is None:
+            index_path = get_index_path(self.root_path)
+        self.index_path = index_path
+        self.files = {}      # key -> [file id, mtime, size, relative path]
+        self.postings = {}   # trigram -> array of increasing file ids
+        self.dead = set()    # ids of files removed or reindexed
+        self.unindexed = {}  # key -> relative path of too big files
+        self.skipped = {}    # key -> relative path of EXCLUDED_DIRS found
+        self.next_id = 0
+        self.ready = False
+        # The index is refreshed and queried from different threads
+        self.lock = threading.RLock()
+        # Refreshes are done one at a time
+        self.refresh_lock = threading.Lock()
+
+    # ---- Persistence
+    def load(self):
+        """Load the index from disk. Return True if successful."""
+        with self.lock:
+            return self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path, 'rb') as fd:
+                data = pickle.load(fd)
+        except Exception:
+            return False
+        if data.get('version') != INDEX_VERSION:
+            return False
+        self.files = data['files']
+        self.postings = data['postings']
+        self.dead = data['dead']
+        self.unindexed = data['unindexed']
+        self.skipped = data['skipped']
+        self.next_id = data['next_id']
+        return True
+
+    def save(self):
+        """Save the index to disk."""
+        with self.lock:
+            self._save()
+
+    def _save(self):
+        data = {'version': INDEX_VERSION, 'files': self.files,
+                'postings': self.postings, 'dead': self.dead,
+                'unindexed': self.unindexed, 'skipped': self.skipped,
+                'next_id': self.next_id}
+        dirname = osp.dirname(self.index_path)
+        try:
+            if not osp.isdir(dirname):
+                os.makedirs(dirname)
+            tmp_path = self.index_path + '.tmp'
+            with open(tmp_path, 'wb') as fd:
+                pickle.dump(data, fd, pickle.HIGHEST_PROTOCOL)
+            if osp.exists(self.index_path):
+                os.remove(self.index_path)
+            os.rename(tmp_path, self.index_path)
+        except (IOError, OSError):
+            pass
+
+    # ---- Update
+    def relpath(self, filename):
+        """Return the path of filename relative to the root path."""
+        return osp.relpath(osp.abspath(filename), self.root_path)
+
+    def key(self, relpath):
+        """Return the key of a relative path in the index."""
+        return osp.normcase(relpath)
+
+    def walk(self, path=None, stopped=None):
+        """
+        Generate the relative paths of the files under path (the root
+        path by default), recording the EXCLUDED_DIRS found in skipped.
+        """
+        for dirpath, dirs, files in os.walk(path or self.root_path):
+            if stopped is not None and stopped():
+                return
+            for dirname in dirs[:]:
+                if dirname in EXCLUDED_DIRS:
+                    dirs.remove(dirname)
+                    relpath = self.relpath(osp.join(dirpath, dirname))
+                    with self.lock:
+                        self.skipped[self.key(relpath)] = relpath
+            for fname in files:
+                yield self.relpath(osp.join(dirpath, fname))
+
+    def remove_file(self, key):
+        """Remove a file from the index."""
+        entry = self.files.pop(key, None)
+        if entry is not None:
+            self.dead.add(entry[0])
+        self.unindexed.pop(key, None)
+
+    def update_file(self, filename):
+        """
+        (Re)index filename if its mtime or size changed.
+
+        Return True if the index was modified.
+        """
+        with self.lock:
+            return self._update_file(filename)
+
+    def _update_file(self, filename):
+        relpath = self.relpath(filename)
+        key = self.key(relpath)
+        fullpath = osp.join(self.root_path, relpath)
+        try:
+            stat = os.stat(fullpath)
+        except OSError:
+            if key in self.files or key in self.unindexed:
+                self.remove_file(key)
+                return True
+            return False
+        entry = self.files.get(key)
+        if entry is not None and entry[1:3] == [stat.st_mtime, stat.st_size]:
+            return False
+        if key in self.unindexed and stat.st_size > MAX_FILE_SIZE:
+            return False
+        self.remove_file(key)
+        if stat.st_size > MAX_FILE_SIZE:
+            self.unindexed[key] = relpath
+            return True
+        try:
+            with open(fullpath, 'rb') as fd:
+                data = fd.read()
+        except (IOError, OSError):
+            self.unindexed[key] = relpath
+            return True
+        if is_binary_string(data[:1024]):
+            # Binary files are never searched, but must be remembered
+            # to avoid reading them again on every refresh
+            trigrams = ()
+        else:
+            trigrams = get_trigrams(data)
+        file_id = self.next_id
+        self.next_id += 1
+        self.files[key] = [file_id, stat.st_mtime, stat.st_size, relpath]
+        for trigram in trigrams:
+            posting = self.postings.get(trigram)
+            if posting is None:
+                self.postings[trigram] = array('i', [file_id])
+            else:
+                # Ids only increase, so postings stay sorted
+                posting.append(file_id)
+        return True
+
+    def refresh(self, stopped=None, path=None):
+        """
+        Bring the index of the files under path (the root path by default)
+        up to date with the files on disk.
+
+        Only files whose mtime or size changed are read again.
+        stopped is an optional callable used to interrupt the refresh.
+        Return True if the index was modified.
+        """
+        with self.refresh_lock:
+            return self._refresh(stopped, path)
+
+    def _refresh(self, stopped, path):
+        if path is None or self.key(self.relpath(path)) == self.key('.'):
+            path = None
+            prefix = None
+        else:
+            path = osp.abspath(path)
+            prefix = self.key(self.relpath(path)) + os.sep
+
+        def in_path(key):
+            return prefix is None or key.startswith(prefix)
+
+        with self.lock:
+            for key in [key for key in self.skipped if in_path(key)]:
+                del self.skipped[key]
+        modified = False
+        seen = set()
+        for relpath in self.walk(path, stopped):
+            if stopped is not None and stopped():
+                return modified
+            seen.add(self.key(relpath))
+            fullpath = osp.join(self.root_path, relpath)
+            modified = self.update_file(fullpath) or modified
+        with self.lock:
+            for key in (set(self.files) | set(self.unindexed)) - seen:
+                if in_path(key):
+                    self.remove_file(key)
+                    modified = True
+            self.compact()
+            if path is None:
+                self.ready = True
+        return modified
+
+    def compact(self):
+        """Drop removed files from the postings if there are many of them."""
+        if len(self.dead) <= len(self.files):
+            return
+        dead = self.dead
+        for trigram in list(self.postings):
+            ids = array('i', [i for i in self.postings[trigram]
+                              if i not in dead])
+            if ids:
+                self.postings[trigram] = ids
+            else:
+                del self.postings[trigram]
+        self.dead = set()
+
+    # ---- Queries
+    def contains(self, path):
+        """
+        Return True if path is under the root path of the index and not in
+        one of EXCLUDED_DIRS.
+        """
+        path = osp.normcase(osp.abspath(path))
+        root = osp.normcase(self.root_path)
+        if path != root and not path.startswith(root + os.sep):
+            return False
+        excluded = [osp.normcase(dirname) for dirname in EXCLUDED_DIRS]
+        return not any(part in excluded
+                       for part in path[len(root):].split(os.sep))
+
+    def skipped_dirs(self):
+        """
+        Return the absolute paths of the EXCLUDED_DIRS found, whose files
+        are not part of the index.
+        """
+        with self.lock:
+            return sorted(osp.join(self.root_path, relpath)
+                          for relpath in self.skipped.values())
+
+    def literal_candidates(self, literal):
+        """Return the ids of the files that can contain literal."""
+        postings = [self.postings.get(trigram)
+                    for trigram in get_trigrams(literal)]
+        if not all(postings):
+            return set()
+        postings.sort(key=len)
+        ids = set(postings[0])
+        for posting in postings[1:]:
+            if not ids:
+                break
+            ids.intersection_update(posting)
+        return ids - self.dead
+
+    def candidates(self, texts, text_re):
+        """
+        Return the absolute paths of the indexed files that may match texts.
+
+        texts is a list of (text, encoding) tuples as built by Find in
+        Files, text_re tells if they are compiled regular expressions.
+        Return None if the index can't be used to narrow the search.
+        The files of skipped_dirs are never part of the result.
+        """
+        with self.lock:
+            if not self.ready:
+                return None
+            return self._candidates(texts, text_re)
+
+    def _candidates(self, texts, text_re):
+        ids = set()
+        for text, _enc in texts:
+            if text_re:
+                if text.flags & re.VERBOSE:
+                    return None
+                literals = regexp_literals(text.pattern)
+            else:
+                literals = [text] if len(text) >= 3 else []
+            if not literals:
+                return None
+            text_ids = None
+            for literal in literals:
+                literal_ids = self.literal_candidates(literal)
+                text_ids = (literal_ids if text_ids is None
+                            else text_ids & literal_ids)
+            ids |= text_ids
+        filenames = [entry[3] for entry in self.files.values()
+                     if entry[0] in ids]
+        filenames.extend(self.unindexed.values())
+        return sorted(osp.join(self.root_path, relpath)
+                      for relpath in filenames)
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Pools of workers shared by the background tasks of Spyder
+
+Worker processes are started with the 'spawn' method, because forking the
+GUI is not safe once Qt and its threads are running. A spawned process
+normally re-runs the main script of its parent, which would start a new
+Spyder from launchers without an ``if __name__ == '__main__'`` guard: the
+workers of these pools run this module instead.
+
+This module must not import Qt: it's the main module of worker processes.
+"""
+
+# Standard library imports
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+import sys
+
+try:
+    from multiprocessing.context import SpawnContext, SpawnProcess
+except ImportError:
+    # Python 2 can only fork
+    SpawnContext = SpawnProcess = None
+
+
+if SpawnProcess is not None:
+    class WorkerProcess(SpawnProcess):
+        """Spawned process whose main module is this one"""
+        def start(self):
+            # The main module is looked up while the process is started, to
+            # tell the child what to run as __mp_main__
+            main_module = sys.modules['__main__']
+            sys.modules['__main__'] = sys.modules[__name__]
+            try:
+                super(WorkerProcess, self).start()
+            finally:
+                sys.modules['__main__'] = main_module
+
+    class WorkerContext(SpawnContext):
+        """Spawn context starting WorkerProcess'es"""
+        Process = WorkerProcess
+
+
+def create_pool(processes=None, initializer=None, use_processes=None):
+    """
+    Create a pool of workers.
+
+    Processes are used by default. A pool of threads is used instead on
+    Python 2, in frozen applications, which can't spawn a plain
+    interpreter, or if a process pool can't be created.
+    """
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    if use_processes is None:
+        use_processes = (SpawnContext is not None and
+                         not getattr(sys, 'frozen', False))
+    if use_processes:
+        try:
+            return WorkerContext().Pool(processes, initializer)
+        except (OSError, ImportError, ValueError):
+            pass
+    return ThreadPool(processes, initializer)
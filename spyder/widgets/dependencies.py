@@ -10,7 +10,7 @@
 import sys
 
 # Third party imports
-from qtpy.QtCore import Qt
+from qtpy.QtCore import Qt, Signal
 from qtpy.QtGui import QColor
 from qtpy.QtWidgets import (QApplication, QDialog, QDialogButtonBox,
                             QHBoxLayout, QVBoxLayout, QLabel, QPushButton,
@@ -38,32 +38,47 @@ class DependenciesTreeWidget(QTreeWidget):
         self.addTopLevelItems([mandatory_item, optional_item])
 
         for dependency in dependencies:
+            if dependency.probed:
+                installed_version = dependency.installed_version
+            else:
+                # Don't block the dialog while the version is probed
+                installed_version = _("Checking...")
             item = QTreeWidgetItem([dependency.modname,
                                     dependency.required_version,
-                                    dependency.installed_version,
+                                    installed_version,
                                     dependency.features])
-            if dependency.check():
-                item.setIcon(0, ima.icon('dependency_ok'))
-            elif dependency.optional:
-                item.setIcon(0, ima.icon('dependency_warning'))
-                item.setForeground(2, QColor('#ff6a00'))
-            else:
-                item.setIcon(0, ima.icon('dependency_error'))
-                item.setForeground(2, QColor(Qt.darkRed))
+            if dependency.probed:
+                self.set_status(item, dependency)
             if dependency.optional:
                 optional_item.addChild(item)
             else:
                 mandatory_item.addChild(item)
         self.expandAll()
 
+    def set_status(self, item, dependency):
+        """Show if dependency is satisfied in its item"""
+        if dependency.check():
+            item.setIcon(0, ima.icon('dependency_ok'))
+        elif dependency.optional:
+            item.setIcon(0, ima.icon('dependency_warning'))
+            item.setForeground(2, QColor('#ff6a00'))
+        else:
+            item.setIcon(0, ima.icon('dependency_error'))
+            item.setForeground(2, QColor(Qt.darkRed))
+
     def resize_columns_to_contents(self):
         for col in range(self.columnCount()):
             self.resizeColumnToContents(col)
 
 
 class DependenciesDialog(QDialog):
+    # Emitted from a background thread when all versions are probed
+    sig_probed = Signal()
+
     def __init__(self, parent):
         QDialog.__init__(self, parent)
+        self.dependencies = []
+        self.sig_probed.connect(self.refresh)
         self.setWindowTitle("Spyder %s: %s" % (__version__,
                                                _("Dependencies")))
         self.setWindowIcon(ima.icon('tooloptions'))
@@ -96,7 +111,15 @@ class DependenciesDialog(QDialog):
         self.resize(840, 560)
 
     def set_data(self, dependencies):
-        self.treewidget.update_dependencies(dependencies)
+        from spyder.dependencies import all_probed, probe_all
+        self.dependencies = dependencies
+        self.refresh()
+        if not all_probed(dependencies):
+            probe_all(dependencies, callback=self.sig_probed.emit)
+
+    def refresh(self):
+        """Show the current state of the dependencies"""
+        self.treewidget.update_dependencies(self.dependencies)
         self.treewidget.resize_columns_to_contents()
 
     def copy_to_clipboard(self):
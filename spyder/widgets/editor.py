@@ -13,27 +13,29 @@
 
 # Local imports
 from __future__ import print_function
+import multiprocessing
 import os
 import os.path as osp
 import sys
-from collections import MutableSequence
+import time
+from collections import MutableSequence, OrderedDict
 
 # Third party imports
 from qtpy import is_pyqt46
 from qtpy.compat import getsavefilename
 from qtpy.QtCore import (QByteArray, QFileInfo, QObject, QPoint, QSize, Qt,
-                         QThread, QTimer, Signal, Slot)
+                         QTimer, Signal, Slot)
 from qtpy.QtGui import QFont
 from qtpy.QtWidgets import (QAction, QApplication, QFileDialog, QHBoxLayout,
                             QMainWindow, QMessageBox, QMenu, QSplitter,
                             QVBoxLayout, QWidget, QListWidget, QListWidgetItem)
 
 # Local imports
-from spyder.config.base import _, DEBUG, PYTEST, STDERR, STDOUT
+from spyder.config.base import _, DEBUG, PYTEST, STDOUT
 from spyder.config.gui import config_shortcut, get_shortcut
 from spyder.config.utils import (get_edit_filetypes, get_edit_filters,
                                  get_filter, is_kde_desktop, is_anaconda)
-from spyder.py3compat import qbytearray_to_str, to_text_string
+from spyder.py3compat import PY3, qbytearray_to_str, to_text_string
 from spyder.utils import icon_manager as ima
 from spyder.utils import (codeanalysis, encoding, sourcecode,
                           syntaxhighlighters)
@@ -48,113 +50,138 @@ from spyder.widgets.sourcecode.base import TextEditBaseWidget  # analysis:ignore
 from spyder.widgets.sourcecode.codeeditor import Printer       # analysis:ignore
 from spyder.widgets.sourcecode.codeeditor import get_file_language
 from spyder.widgets.status import (CursorPositionStatus, EncodingStatus,
-                                   EOLStatus, ReadWriteStatus)
+                                   EOLStatus, LargeFileStatus,
+                                   ReadWriteStatus)
 from spyder.widgets.tabs import BaseTabs
 from spyder.config.main import CONF
 from spyder.widgets.explorer import show_in_external_file_explorer
 
 DEBUG_EDITOR = DEBUG >= 3
 
+# Time in ms between the batches of pending files read in the background,
+# and maximum time in s spent reading each batch
+PENDING_FILES_INTERVAL = 200
+PENDING_FILES_BATCH_TIME = 0.05
 
-class AnalysisThread(QThread):
-    """Analysis thread"""
-    def __init__(self, parent, checker, source_code):
-        super(AnalysisThread, self).__init__(parent)
-        self.checker = checker
-        self.results = None
-        self.source_code = source_code
+# Time in s after which a code analysis job whose results never came back
+# (e.g. its worker died) stops holding a slot of the analysis manager
+ANALYSIS_JOB_TIMEOUT = 30
 
-    def run(self):
-        """Run analysis"""
-        try:
-            self.results = self.checker(self.source_code)
-        except Exception:
-            if DEBUG_EDITOR:
-                import traceback
-                traceback.print_exc(file=STDERR)
 
+class AnalysisManager(QObject):
+    """
+    Code analysis manager
 
-class ThreadManager(QObject):
-    """Analysis thread manager"""
-    def __init__(self, parent, max_simultaneous_threads=2):
-        super(ThreadManager, self).__init__(parent)
-        self.max_simultaneous_threads = max_simultaneous_threads
-        self.started_threads = {}
-        self.pending_threads = []
+    Checkers run in the pool of workers of codeanalysis.get_pool. Only the
+    latest job of each checker is kept for a file: queuing a new one replaces
+    the pending job, and the results of older running jobs are ignored.
+    Jobs that fail, or don't finish in job_timeout seconds, release their
+    slot so that analysis never stalls.
+    """
+    sig_job_finished = Signal(object, object)
+
+    def __init__(self, parent, max_simultaneous_jobs=None):
+        super(AnalysisManager, self).__init__(parent)
+        if max_simultaneous_jobs is None:
+            max_simultaneous_jobs = multiprocessing.cpu_count()
+        self.max_simultaneous_jobs = max_simultaneous_jobs
+        self.pending_jobs = OrderedDict()  # (parent id, checker) -> source
+        self.running_jobs = {}             # (job key, generation) -> start
+        self.generations = {}              # job key -> latest generation
         self.end_callbacks = {}
-
-    def close_threads(self, parent):
-        """Close threads associated to parent_id"""
-        if DEBUG_EDITOR:
-            print("Call to 'close_threads'", file=STDOUT)
-        if parent is None:
-            # Closing all threads
-            self.pending_threads = []
-            threadlist = []
-            for threads in list(self.started_threads.values()):
-                threadlist += threads
-        else:
-            parent_id = id(parent)
-            self.pending_threads = [(_th, _id) for (_th, _id)
-                                    in self.pending_threads
-                                    if _id != parent_id]
-            threadlist = self.started_threads.get(parent_id, [])
-        for thread in threadlist:
-            if DEBUG_EDITOR:
-                print("Waiting for thread %r to finish" % thread, file=STDOUT)
-            while thread.isRunning():
-                # We can't terminate thread safely, so we simply wait...
-                QApplication.processEvents()
-
-    def close_all_threads(self):
-        """Close all threads"""
+        self.job_timeout = ANALYSIS_JOB_TIMEOUT
+        self.timeout_timer = QTimer(self)
+        self.timeout_timer.setSingleShot(True)
+        self.timeout_timer.timeout.connect(self.update_queue)
+        self.sig_job_finished.connect(self.job_finished)
+
+    def cancel_jobs(self, parent):
+        """Cancel jobs associated to parent"""
         if DEBUG_EDITOR:
-            print("Call to 'close_all_threads'", file=STDOUT)
-        self.close_threads(None)
-
-    def add_thread(self, checker, end_callback, source_code, parent):
-        """Add thread to queue"""
+            print("Call to 'cancel_jobs'", file=STDOUT)
         parent_id = id(parent)
-        thread = AnalysisThread(self, checker, source_code)
-        self.end_callbacks[id(thread)] = end_callback
-        self.pending_threads.append((thread, parent_id))
+        for key in list(self.end_callbacks.keys()):
+            if parent is None or key[0] == parent_id:
+                self.pending_jobs.pop(key, None)
+                self.end_callbacks.pop(key)
+                # Results of running jobs will be ignored
+                self.generations[key] += 1
+
+    def cancel_all_jobs(self):
+        """Cancel all jobs"""
+        self.cancel_jobs(None)
+
+    def add_job(self, checker, end_callback, source_code, parent):
+        """
+        Add job to queue
+
+        checker is the name of one of codeanalysis.CHECKERS.
+        """
+        key = (id(parent), checker)
+        self.generations[key] = self.generations.get(key, 0) + 1
+        self.end_callbacks[key] = end_callback
+        # A pending job for the same file is stale: it's replaced
+        self.pending_jobs[key] = source_code
         if DEBUG_EDITOR:
-            print("Added thread %r to queue" % thread, file=STDOUT)
-        QTimer.singleShot(50, self.update_queue)
+            print("Added job %r to queue" % (key,), file=STDOUT)
+        self.update_queue()
 
     def update_queue(self):
-        """Update queue"""
-        started = 0
-        for parent_id, threadlist in list(self.started_threads.items()):
-            still_running = []
-            for thread in threadlist:
-                if thread.isFinished():
-                    end_callback = self.end_callbacks.pop(id(thread))
-                    if thread.results is not None:
-                        #  The thread was executed successfully
-                        end_callback(thread.results)
-                    thread.setParent(None)
-                    thread = None
-                else:
-                    still_running.append(thread)
-                    started += 1
-            threadlist = None
-            if still_running:
-                self.started_threads[parent_id] = still_running
-            else:
-                self.started_threads.pop(parent_id)
-        if DEBUG_EDITOR:
-            print("Updating queue:", file=STDOUT)
-            print("    started:", started, file=STDOUT)
-            print("    pending:", len(self.pending_threads), file=STDOUT)
-        if self.pending_threads and started < self.max_simultaneous_threads:
-            thread, parent_id = self.pending_threads.pop(0)
-            thread.finished.connect(self.update_queue)
-            threadlist = self.started_threads.get(parent_id, [])
-            self.started_threads[parent_id] = threadlist+[thread]
+        """Start pending jobs, up to max_simultaneous_jobs"""
+        self.release_lost_jobs()
+        while (self.pending_jobs and
+               len(self.running_jobs) < self.max_simultaneous_jobs):
+            key, source_code = self.pending_jobs.popitem(last=False)
+            job = (key, self.generations[key])
+            self.running_jobs[job] = time.time()
             if DEBUG_EDITOR:
-                print("===>starting:", thread, file=STDOUT)
-            thread.start()
+                print("===>starting:", job, file=STDOUT)
+            # Callbacks are called from a thread of the pool, the signal
+            # brings results back to the main thread
+            kwargs = {}
+            if PY3:
+                kwargs['error_callback'] = (
+                    lambda error, job=job: self.sig_job_finished.emit(job, []))
+            codeanalysis.get_pool().apply_async(
+                codeanalysis.run_checker, ((key[1], source_code),),
+                callback=lambda results, job=job: self.sig_job_finished.emit(
+                    job, results), **kwargs)
+        if self.running_jobs:
+            self.timeout_timer.start(int(self.job_timeout * 1000))
+
+    def release_lost_jobs(self):
+        """Free the slots of the jobs running for more than job_timeout"""
+        now = time.time()
+        for job, start in list(self.running_jobs.items()):
+            if now - start >= self.job_timeout:
+                if DEBUG_EDITOR:
+                    print("===>timed out:", job, file=STDOUT)
+                self.running_jobs.pop(job)
+
+    @Slot(object, object)
+    def job_finished(self, job, results):
+        """Pass results of the job to its callback, unless it's stale"""
+        self.running_jobs.pop(job, None)
+        key, generation = job
+        if (self.generations.get(key) == generation and
+                key in self.end_callbacks):
+            self.end_callbacks.pop(key)(results)
+        self.update_queue()
+
+
+class PendingFile(object):
+    """
+    File restored from the last session whose text hasn't been read yet
+
+    Its text is read the first time its tab is shown, or in the background
+    when the editorstack is idle. Until then its editors, one per
+    editorstack, share an empty document.
+    """
+    def __init__(self, line=None):
+        self.line = line
+        self.loaded = False
+        self.mixed_eol_chars = False
+        self.finfos = []
 
 
 class FileInfo(QObject):
@@ -166,16 +193,17 @@ class FileInfo(QObject):
     edit_goto = Signal(str, int, str)
     send_to_help = Signal(str, str, str, str, bool)
 
-    def __init__(self, filename, encoding, editor, new, threadmanager,
+    def __init__(self, filename, encoding, editor, new, analysis_manager,
                  introspection_plugin):
         QObject.__init__(self)
-        self.threadmanager = threadmanager
+        self.analysis_manager = analysis_manager
         self.filename = filename
         self.newly_created = new
         self.default = False      # Default untitled file
         self.encoding = encoding
         self.editor = editor
         self.path = []
+        self.pending = None
 
         self.classes = (filename, None, None)
         self.analysis_results = []
@@ -188,6 +216,10 @@ class FileInfo(QObject):
         self.pyflakes_results = None
         self.pep8_results = None
 
+    def is_pending(self):
+        """Return True if the text of the file hasn't been read yet"""
+        return self.pending is not None and not self.pending.loaded
+
     def text_changed(self):
         """Editor's text has changed"""
         self.default = False
@@ -201,8 +233,7 @@ class FileInfo(QObject):
     def run_code_analysis(self, run_pyflakes, run_pep8):
         """Run code analysis"""
         run_pyflakes = run_pyflakes and codeanalysis.is_pyflakes_installed()
-        run_pep8 = run_pep8 and\
-                   codeanalysis.get_checker_executable('pycodestyle') is not None
+        run_pep8 = run_pep8 and codeanalysis.is_pycodestyle_installed()
         self.pyflakes_results = []
         self.pep8_results = []
         if self.editor.is_python():
@@ -213,11 +244,11 @@ class FileInfo(QObject):
             if run_pep8:
                 self.pep8_results = None
             if run_pyflakes:
-                self.threadmanager.add_thread(codeanalysis.check_with_pyflakes,
+                self.analysis_manager.add_job('pyflakes',
                                               self.pyflakes_analysis_finished,
                                               source_code, self)
             if run_pep8:
-                self.threadmanager.add_thread(codeanalysis.check_with_pep8,
+                self.analysis_manager.add_job('pep8',
                                               self.pep8_analysis_finished,
                                               source_code, self)
 
@@ -251,8 +282,7 @@ class FileInfo(QObject):
     def run_todo_finder(self):
         """Run TODO finder"""
         if self.editor.is_python():
-            self.threadmanager.add_thread(codeanalysis.find_tasks,
-                                          self.todo_finished,
+            self.analysis_manager.add_job('todo', self.todo_finished,
                                           self.get_source_code(), self)
 
     def todo_finished(self, results):
@@ -435,6 +465,7 @@ class EditorStack(QWidget):
     reset_statusbar = Signal()
     readonly_changed = Signal(bool)
     encoding_changed = Signal(str)
+    sig_large_file_changed = Signal(bool)
     sig_editor_cursor_position_changed = Signal(int, int)
     sig_refresh_eol_chars = Signal(str)
     starting_long_process = Signal(str)
@@ -471,13 +502,14 @@ class EditorStack(QWidget):
     sig_next_cursor = Signal()
     sig_prev_warning = Signal()
     sig_next_warning = Signal()
+    sig_pending_file_loaded = Signal(str)
 
     def __init__(self, parent, actions):
         QWidget.__init__(self, parent)
 
         self.setAttribute(Qt.WA_DeleteOnClose)
 
-        self.threadmanager = ThreadManager(self)
+        self.analysis_manager = AnalysisManager(self)
         self.new_window = False
         self.undock_action = None
         self.horsplit_action = None
@@ -574,6 +606,7 @@ class EditorStack(QWidget):
         self.occurrence_highlighting_enabled = True
         self.occurrence_highlighting_timeout=1500
         self.checkeolchars_enabled = True
+        self.large_file_size = 10
         self.always_remove_trailing_spaces = False
         self.convert_eol_on_save = False
         self.convert_eol_on_save_to = 'LF'
@@ -595,6 +628,12 @@ class EditorStack(QWidget):
         self.analysis_timer.setInterval(2000)
         self.analysis_timer.timeout.connect(self.analyze_script)
 
+        # Reading of pending files in the background
+        self.pending_timer = QTimer(self)
+        self.pending_timer.setSingleShot(True)
+        self.pending_timer.setInterval(PENDING_FILES_INTERVAL)
+        self.pending_timer.timeout.connect(self.load_pending_files)
+
         # Accepting drops
         self.setAcceptDrops(True)
 
@@ -820,7 +859,8 @@ class EditorStack(QWidget):
         self.tabs.add_corner_widgets(widgets)
 
     def closeEvent(self, event):
-        self.threadmanager.close_all_threads()
+        self.pending_timer.stop()
+        self.analysis_manager.cancel_all_jobs()
         self.analysis_timer.timeout.disconnect(self.analyze_script)
 
         # Remove editor references from the outline explorer settings
@@ -839,14 +879,22 @@ class EditorStack(QWidget):
         finfo = self.create_new_editor(fname, enc, "",
                                        set_current=set_current, new=new,
                                        cloned_from=other_finfo.editor)
+        if other_finfo.is_pending():
+            finfo.pending = other_finfo.pending
+            finfo.pending.finfos.append(finfo)
+            # The first tab added is made current before this
+            self.load_pending_file(self.data.index(finfo),
+                                   current_only=True)
         finfo.set_analysis_results(other_finfo.analysis_results)
         finfo.set_todo_results(other_finfo.todo_results)
         return finfo.editor
 
     def clone_from(self, other):
         """Clone EditorStack from other instance"""
+        # Files are not made current one after the other, so that only the
+        # text of the current one is read if they are pending
         for other_finfo in other.data:
-            self.clone_editor_from(other_finfo, set_current=True)
+            self.clone_editor_from(other_finfo, set_current=False)
         self.set_stack_index(other.get_stack_index())
 
     @Slot()
@@ -901,7 +949,8 @@ class EditorStack(QWidget):
         if self.introspector:
             editor = self.get_current_editor()
             position = editor.get_position('cursor')
-            self.help.switch_to_editor_source()
+            if self.help is not None:
+                self.help.switch_to_editor_source()
             self.introspector.show_object_info(position, auto=False)
         else:
             text = self.get_current_editor().get_current_object()
@@ -1186,6 +1235,10 @@ class EditorStack(QWidget):
         # CONF.get(self.CONF_SECTION, 'check_eol_chars')
         self.checkeolchars_enabled = state
 
+    def set_large_file_size(self, size):
+        # CONF.get(self.CONF_SECTION, 'large_file_size')
+        self.large_file_size = size
+
     def set_fullpath_sorting_enabled(self, state):
         # CONF.get(self.CONF_SECTION, 'fullpath_sorting')
         self.fullpath_sorting_enabled = state
@@ -1511,7 +1564,7 @@ class EditorStack(QWidget):
         is_ok = force or self.save_if_changed(cancelable=True, index=index)
         if is_ok:
             finfo = self.data[index]
-            self.threadmanager.close_threads(finfo)
+            self.analysis_manager.cancel_jobs(finfo)
             # Removing editor reference from outline explorer settings:
             if self.outlineexplorer is not None:
                 self.outlineexplorer.remove_editor(finfo.editor)
@@ -1674,6 +1727,7 @@ class EditorStack(QWidget):
                 return
             index = self.get_stack_index()
 
+        self.load_pending_file(index)
         finfo = self.data[index]
         if not (finfo.editor.document().isModified() or
                 finfo.newly_created) and not force:
@@ -1711,13 +1765,6 @@ class EditorStack(QWidget):
             self.analyze_script(index)
             self.introspector.validate()
 
-            #XXX CodeEditor-only: re-scan the whole text to rebuild outline
-            # explorer data from scratch (could be optimized because
-            # rehighlighting text means searching for all syntax coloring
-            # patterns instead of only searching for class/def patterns which
-            # would be sufficient for outline explorer data.
-            finfo.editor.rehighlight()
-
             self._refresh_outlineexplorer(index)
             return True
         except EnvironmentError as error:
@@ -1811,6 +1858,7 @@ class EditorStack(QWidget):
         if index is None:
             # Save the currently edited file
             index = self.get_stack_index()
+        self.load_pending_file(index)
         finfo = self.data[index]
         # The next line is necessary to avoid checking if the file exists
         # While running __check_file_status
@@ -1866,6 +1914,7 @@ class EditorStack(QWidget):
         if index is None:
             # Save the currently edited file
             index = self.get_stack_index()
+        self.load_pending_file(index)
         finfo = self.data[index]
         original_filename = finfo.filename
         filename = self.select_savename(original_filename)
@@ -1955,6 +2004,14 @@ class EditorStack(QWidget):
 #        for btn in (self.filelist_btn, self.previous_btn, self.next_btn):
 #            btn.setEnabled(count > 1)
 
+        if index != -1:
+            self.load_pending_file(index)
+            pending = self.data[index].pending
+            if (pending is not None and pending.mixed_eol_chars and
+                    self.isVisible()):
+                pending.mixed_eol_chars = False
+                self.fix_mixed_eol_chars(index)
+
         editor = self.get_current_editor()
         if index != -1:
             editor.setFocus()
@@ -2035,6 +2092,7 @@ class EditorStack(QWidget):
         """Refreshing statusbar widgets"""
         finfo = self.data[index]
         self.encoding_changed.emit(finfo.encoding)
+        self.sig_large_file_changed.emit(finfo.editor.large_file)
         # Refresh cursor position status:
         line, index = finfo.editor.get_cursor_line_column()
         self.sig_editor_cursor_position_changed.emit(line, index)
@@ -2179,21 +2237,17 @@ class EditorStack(QWidget):
     def reload(self, index):
         """Reload file from disk"""
         finfo = self.data[index]
-        txt, finfo.encoding = encoding.read(finfo.filename)
-        finfo.lastmodified = QFileInfo(finfo.filename).lastModified()
         position = finfo.editor.get_position('cursor')
-        finfo.editor.set_text(txt)
+        if finfo.editor.large_file:
+            finfo.encoding = self.read_large_file(finfo)
+        else:
+            txt, finfo.encoding = encoding.read(finfo.filename)
+            finfo.editor.set_text(txt)
+        finfo.lastmodified = QFileInfo(finfo.filename).lastModified()
         finfo.editor.document().setModified(False)
         finfo.editor.set_cursor_position(position)
         self.introspector.validate()
 
-        #XXX CodeEditor-only: re-scan the whole text to rebuild outline
-        # explorer data from scratch (could be optimized because
-        # rehighlighting text means searching for all syntax coloring
-        # patterns instead of only searching for class/def patterns which
-        # would be sufficient for outline explorer data.
-        finfo.editor.rehighlight()
-
         self._refresh_outlineexplorer(index)
 
     def revert(self):
@@ -2227,7 +2281,7 @@ class EditorStack(QWidget):
         editor.sig_show_object_info.connect(introspector.show_object_info)
         editor.go_to_definition.connect(introspector.go_to_definition)
 
-        finfo = FileInfo(fname, enc, editor, new, self.threadmanager,
+        finfo = FileInfo(fname, enc, editor, new, self.analysis_manager,
                          self.introspector)
 
         self.add_to_data(finfo, set_current)
@@ -2345,36 +2399,151 @@ class EditorStack(QWidget):
             finfo.editor.document().setModified(False)
         return finfo
 
-    def load(self, filename, set_current=True):
+    def load(self, filename, set_current=True, lazy=False, line=None):
         """
         Load filename, create an editor instance and return it
         *Warning* This is loading file, creating editor but not executing
         the source code analysis -- the analysis must be done by the editor
         plugin (in case multiple editorstack instances are handled)
+
+        If lazy is True, the file is only read the first time its tab is
+        shown or when the editorstack is idle, going then to line.
+        Files without extension are always read, since their language
+        depends on their text.
+
+        Files larger than large_file_size (in MB) are read in large file
+        mode, see read_large_file.
         """
         filename = osp.abspath(to_text_string(filename))
+        if lazy and osp.splitext(filename)[1]:
+            finfo = self.create_new_editor(filename, None, "", set_current)
+            finfo.pending = PendingFile(line)
+            finfo.pending.finfos.append(finfo)
+            self.load_pending_file(self.data.index(finfo), current_only=True)
+            self.pending_timer.start()
+            return finfo
         self.starting_long_process.emit(_("Loading %s...") % filename)
-        text, enc = encoding.read(filename)
-        finfo = self.create_new_editor(filename, enc, text, set_current)
-        index = self.data.index(finfo)
+        if self.is_large_file(filename):
+            finfo = self.create_new_editor(filename, None, "", False)
+            finfo.editor.set_large_file_mode()
+            finfo.encoding = self.read_large_file(finfo)
+            finfo.editor.document().setModified(False)
+            index = self.data.index(finfo)
+            if set_current:
+                self.set_stack_index(index)
+                self.current_changed(index)
+        else:
+            text, enc = encoding.read(filename)
+            finfo = self.create_new_editor(filename, enc, text, set_current)
+            index = self.data.index(finfo)
         self._refresh_outlineexplorer(index, update=True)
         self.ending_long_process.emit("")
-        if self.isVisible() and self.checkeolchars_enabled \
+        if not finfo.editor.large_file and self.isVisible() \
+           and self.checkeolchars_enabled \
            and sourcecode.has_mixed_eol_chars(text):
-            name = osp.basename(filename)
-            self.msgbox = QMessageBox(
-                    QMessageBox.Warning,
-                    self.title,
-                    _("<b>%s</b> contains mixed end-of-line "
-                      "characters.<br>Spyder will fix this "
-                      "automatically.") % name,
-                    QMessageBox.Ok,
-                    self)
-            self.msgbox.exec_()
-            self.set_os_eol_chars(index)
+            self.fix_mixed_eol_chars(index)
         self.is_analysis_done = False
         return finfo
 
+    def load_pending_file(self, index, current_only=False):
+        """
+        Read the text of the file at index if it's pending, and if it's the
+        current one when current_only is True
+        """
+        finfo = self.data[index]
+        current = index == self.get_stack_index()
+        if not finfo.is_pending() or (current_only and not current):
+            return
+        pending = finfo.pending
+        pending.loaded = True
+        if current:
+            self.starting_long_process.emit(
+                _("Loading %s...") % finfo.filename)
+        large_file = self.is_large_file(finfo.filename)
+        lastmodified = QFileInfo(finfo.filename).lastModified()
+
+        # Reading the file is not an edit
+        for other_finfo in pending.finfos:
+            other_finfo.blockSignals(True)
+            if large_file:
+                other_finfo.editor.set_large_file_mode()
+        if large_file:
+            enc = self.read_large_file(finfo)
+        else:
+            text, enc = encoding.read(finfo.filename)
+            finfo.editor.set_text(text)
+        for other_finfo in pending.finfos:
+            other_finfo.blockSignals(False)
+            other_finfo.encoding = enc
+            other_finfo.lastmodified = lastmodified
+            other_finfo.editor.eol_chars = finfo.editor.eol_chars
+        pending.finfos = []
+        finfo.editor.document().setModified(False)
+        if pending.line is not None:
+            finfo.editor.go_to_line(pending.line)
+        finfo.editor.run_pygments_highlighter()
+        pending.mixed_eol_chars = (not large_file and
+                                   self.checkeolchars_enabled and
+                                   sourcecode.has_mixed_eol_chars(text))
+        self.sig_pending_file_loaded.emit(finfo.filename)
+        if current:
+            self._refresh_outlineexplorer(index, update=True)
+            self.ending_long_process.emit("")
+            self.is_analysis_done = False
+            self.analyze_script(index)
+
+    def is_large_file(self, filename):
+        """Return True if filename is larger than large_file_size (in MB)"""
+        try:
+            return osp.getsize(filename) > self.large_file_size * 1024 ** 2
+        except OSError:
+            return False
+
+    def read_large_file(self, finfo):
+        """
+        Read the file of finfo in chunks into its editor, which must be in
+        large file mode, and return its encoding
+
+        Its encoding is detected from its first chunk only, its text isn't
+        highlighted, folded nor analyzed and it isn't checked for mixed
+        end-of-line characters.
+        """
+        enc, chunks = encoding.read_chunks(finfo.filename)
+        try:
+            finfo.editor.set_text_from_chunks(chunks)
+        except UnicodeError:
+            enc, chunks = encoding.read_chunks(finfo.filename,
+                                               'latin-1-guessed')
+            finfo.editor.set_text_from_chunks(chunks)
+        return enc
+
+    def load_pending_files(self):
+        """
+        Read pending files in the background, in batches leaving time to
+        process events
+        """
+        start = time.time()
+        for index, finfo in enumerate(self.data):
+            if finfo.is_pending():
+                if time.time() - start > PENDING_FILES_BATCH_TIME:
+                    self.pending_timer.start()
+                    return
+                self.load_pending_file(index)
+
+    def fix_mixed_eol_chars(self, index):
+        """Warn that the file at index has mixed EOL characters and fix it"""
+        name = osp.basename(self.data[index].filename)
+        self.msgbox = QMessageBox(
+                QMessageBox.Warning,
+                self.title,
+                _("<b>%s</b> contains mixed end-of-line "
+                  "characters.<br>Spyder will fix this "
+                  "automatically.") % name,
+                QMessageBox.Ok,
+                self)
+        self.msgbox.exec_()
+        self.set_os_eol_chars(index)
+
     def set_os_eol_chars(self, index=None, osname=None):
         """Sets the EOL character(s) based on the operating system.
         
@@ -2686,7 +2855,8 @@ class EditorSplitter(QSplitter):
             # XXX - this overrides value from the loop to always be False?
             orientation = False
             if hasattr(editorstack, 'data'):
-                clines = [finfo.editor.get_cursor_line_number()
+                clines = [(finfo.pending.line or 1) if finfo.is_pending()
+                          else finfo.editor.get_cursor_line_number()
                           for finfo in editorstack.data]
                 cfname = editorstack.get_current_filename()
             splitsettings.append((orientation == Qt.Vertical, cfname, clines))
@@ -2757,6 +2927,7 @@ class EditorWidget(QSplitter):
         self.setAttribute(Qt.WA_DeleteOnClose)
 
         statusbar = parent.statusBar() # Create a status bar
+        self.largefile_status = LargeFileStatus(self, statusbar)
         self.readwrite_status = ReadWriteStatus(self, statusbar)
         self.eol_status = EOLStatus(self, statusbar)
         self.encoding_status = EncodingStatus(self, statusbar)
@@ -2812,8 +2983,11 @@ class EditorWidget(QSplitter):
         editorstack.reset_statusbar.connect(self.readwrite_status.hide)
         editorstack.reset_statusbar.connect(self.encoding_status.hide)
         editorstack.reset_statusbar.connect(self.cursorpos_status.hide)
+        editorstack.reset_statusbar.connect(self.largefile_status.hide)
         editorstack.readonly_changed.connect(
                                         self.readwrite_status.readonly_changed)
+        editorstack.sig_large_file_changed.connect(
+                                  self.largefile_status.large_file_changed)
         editorstack.encoding_changed.connect(
                                          self.encoding_status.encoding_changed)
         editorstack.sig_editor_cursor_position_changed.connect(
@@ -17,8 +17,8 @@ from qtpy.QtCore import QSize, Qt, Signal, Slot
 from qtpy.QtWidgets import QHBoxLayout, QTreeWidgetItem, QVBoxLayout, QWidget
 
 # Local imports
-from spyder.config.base import _, STDOUT
-from spyder.py3compat import to_text_string
+from spyder.config.base import _
+from spyder.py3compat import is_text_string, to_text_string
 from spyder.utils import icon_manager as ima
 from spyder.utils.qthelpers import (create_action, create_toolbutton,
                                     set_item_user_text, create_plugin_layout)
@@ -89,22 +89,39 @@ class TreeItem(QTreeWidgetItem):
         
     def set_icon(self, icon):
         self.setIcon(0, icon)
-        
+
+    def set_line(self, line):
+        """Update the line of the item, without changing its icon"""
+        self.line = line
+        self.setToolTip(0, self.get_tooltip())
+
+    def get_tooltip(self):
+        return _("Line %s") % str(self.line)
+
     def setup(self):
-        self.setToolTip(0, _("Line %s") % str(self.line))
+        self.setToolTip(0, self.get_tooltip())
 
 class ClassItem(TreeItem):
+    def get_tooltip(self):
+        return _("Class defined at line %s") % str(self.line)
+
     def setup(self):
         self.set_icon(ima.icon('class'))
-        self.setToolTip(0, _("Class defined at line %s") % str(self.line))
+        self.setToolTip(0, self.get_tooltip())
 
 class FunctionItem(TreeItem):
     def is_method(self):
         return isinstance(self.parent(), ClassItem)
     
+    def get_tooltip(self):
+        if self.is_method():
+            return _("Method defined at line %s") % str(self.line)
+        else:
+            return _("Function defined at line %s") % str(self.line)
+
     def setup(self):
+        self.setToolTip(0, self.get_tooltip())
         if self.is_method():
-            self.setToolTip(0, _("Method defined at line %s") % str(self.line))
             name = to_text_string(self.text(0))
             if name.startswith('__'):
                 self.set_icon(ima.icon('private2'))
@@ -114,8 +131,6 @@ class FunctionItem(TreeItem):
                 self.set_icon(ima.icon('method'))
         else:
             self.set_icon(ima.icon('function'))
-            self.setToolTip(0, _("Function defined at line %s"
-                                 ) % str(self.line))
 
 class CommentItem(TreeItem):
     def __init__(self, name, line, parent, preceding):
@@ -127,7 +142,7 @@ class CommentItem(TreeItem):
         font = self.font(0)
         font.setItalic(True)
         self.setFont(0, font)
-        self.setToolTip(0, _("Line %s") % str(self.line))
+        self.setToolTip(0, self.get_tooltip())
 
 class CellItem(TreeItem):
     def __init__(self, name, line, parent, preceding):
@@ -146,7 +161,10 @@ class CellItem(TreeItem):
         font = self.font(0)
         font.setItalic(True)
         self.setFont(0, font)
-        self.setToolTip(0, _("Cell starts at line %s") % str(self.line))
+        self.setToolTip(0, self.get_tooltip())
+
+    def get_tooltip(self):
+        return _("Cell starts at line %s") % str(self.line)
 
 def get_item_children(item):
     children = [item.child(index) for index in range(item.childCount())]
@@ -164,20 +182,69 @@ def item_at_line(root_item, line):
         previous_item = item
 
 
-def remove_from_tree_cache(tree_cache, line=None, item=None):
-    if line is None:
-        for line, (_it, _level, _debug) in list(tree_cache.items()):
-            if _it is item:
-                break
-    item, _level, debug = tree_cache.pop(line)
-    try:
-        for child in [item.child(_i) for _i in range(item.childCount())]:
-            remove_from_tree_cache(tree_cache, item=child)
-        item.parent().removeChild(item)
-    except RuntimeError:
-        # Item has already been deleted
-        #XXX: remove this debug-related fragment of code
-        print("unable to remove tree item: ", debug, file=STDOUT)
+def get_outline_entries(oe_data, show_comments=True):
+    """
+    Return the entries of the outline of a file, from the outline explorer
+    data of its highlighter
+
+    Entries are (line, level, item class, name, parent) tuples, where parent
+    is the index of the parent entry, or -1 for top level entries.
+    """
+    entries = []
+    ancestors = [(-1, 0)]
+    previous_index = -1
+    previous_level = None
+    block_nbs = sorted(key for key in oe_data if not is_text_string(key))
+    for block_nb in block_nbs:
+        data = oe_data[block_nb]
+        level = data.fold_level
+        if level is None:
+            continue
+        if data.is_comment():
+            if not show_comments:
+                continue
+            if data.def_type == data.CELL:
+                item_class = CellItem
+            else:
+                item_class = CommentItem
+            name = data.text
+        elif data.is_class_or_function():
+            name = data.def_name
+            if name is None:
+                continue
+            if data.def_type == data.CLASS:
+                item_class = ClassItem
+            else:
+                item_class = FunctionItem
+        else:
+            # if/else/try/for/etc foldable blocks
+            continue
+
+        if previous_level is not None:
+            if level == previous_level:
+                pass
+            elif level > previous_level+4: # Invalid indentation
+                continue
+            elif level > previous_level:
+                ancestors.append((previous_index, previous_level))
+            else:
+                while len(ancestors) > 1 and level <= previous_level:
+                    ancestors.pop(-1)
+                    _index, previous_level = ancestors[-1]
+        parent, _level = ancestors[-1]
+        entries.append((block_nb+1, level, item_class, name, parent))
+        previous_index = len(entries)-1
+        previous_level = level
+    return entries
+
+
+class OutlineCache(object):
+    """Outline of a file: its entries and their tree items"""
+    def __init__(self):
+        self.entries = []
+        self.items = []
+        self.revision = None
+        self.show_comments = None
 
 
 class OutlineExplorerTreeWidget(OneColumnTree):
@@ -334,113 +401,79 @@ class OutlineExplorerTreeWidget(OneColumnTree):
         """
         Generates an outline of the editor's content and stores the result
         in a cache.
+
+        tree_cache is the cache returned for the previous outline of the
+        same editor. Only the entries that changed since then are updated
+        in the tree, with the subtrees of their items.
         """
         if tree_cache is None:
-            tree_cache = {}
-        
-        # Removing cached items for which line is > total line nb
-        for _l in list(tree_cache.keys()):
-            if _l >= editor.get_line_count():
-                # Checking if key is still in tree cache in case one of its 
-                # ancestors was deleted in the meantime (deleting all children):
-                if _l in tree_cache:
-                    remove_from_tree_cache(tree_cache, line=_l)
-                    
-        ancestors = [(root_item, 0)]
-        previous_item = None
-        previous_level = None
-        
-        oe_data = editor.highlighter.get_outlineexplorer_data()
+            tree_cache = OutlineCache()
+        highlighter = editor.highlighter
+        oe_data = highlighter.get_outlineexplorer_data()
         editor.has_cell_separators = oe_data.get('found_cell_separators', False)
-        for block_nb in range(editor.get_line_count()):
-            line_nb = block_nb+1
-            data = oe_data.get(block_nb)
-            level = None if data is None else data.fold_level
-            citem, clevel, _d = tree_cache.get(line_nb, (None, None, ""))
-            
-            # Skip iteration if line is not the first line of a foldable block
-            if level is None:
-                if citem is not None:
-                    remove_from_tree_cache(tree_cache, line=line_nb)
-                continue
-            
-            # Searching for class/function statements
-            not_class_nor_function = data.is_not_class_nor_function()
-            if not not_class_nor_function:
-                class_name = data.get_class_name()
-                if class_name is None:
-                    func_name = data.get_function_name()
-                    if func_name is None:
-                        if citem is not None:
-                            remove_from_tree_cache(tree_cache, line=line_nb)
-                        continue
-
-            # Skip iteration for if/else/try/for/etc foldable blocks.
-            if not_class_nor_function and not data.is_comment():
-                if citem is not None:
-                    remove_from_tree_cache(tree_cache, line=line_nb)
-                continue
-
-            if previous_level is not None:
-                if level == previous_level:
+        revision = highlighter.outlineexplorer_revision
+        if (tree_cache.revision == revision and
+                tree_cache.show_comments == self.show_comments):
+            return tree_cache
+        tree_cache.revision = revision
+        tree_cache.show_comments = self.show_comments
+
+        old_entries, items = tree_cache.entries, tree_cache.items
+        entries = get_outline_entries(oe_data, self.show_comments)
+        nb_old, nb_new = len(old_entries), len(entries)
+        # Entries are unchanged, except maybe for their line, before
+        # prefix and after suffix
+        prefix = 0
+        while (prefix < min(nb_old, nb_new) and
+               old_entries[prefix][1:] == entries[prefix][1:]):
+            prefix += 1
+        suffix = 0
+        while (suffix < min(nb_old, nb_new) - prefix and
+               old_entries[nb_old-1-suffix][1:4] ==
+               entries[nb_new-1-suffix][1:4]):
+            suffix += 1
+        # Items can only be kept in the suffix if they keep their parent,
+        # so it's shortened to start after the last one which doesn't
+        offset = nb_new - nb_old
+        index = nb_new - suffix
+        while index < nb_new:
+            parent = old_entries[index-offset][4]
+            if parent >= nb_old-suffix:
+                parent += offset
+            elif parent >= prefix:
+                parent = None
+            if parent != entries[index][4]:
+                suffix = nb_new-1-index
+            index += 1
+
+        # Removing items which changed, with their children
+        for index in range(prefix, nb_old-suffix):
+            if not prefix <= old_entries[index][4] < nb_old-suffix:
+                item = items[index]
+                try:
+                    item.parent().removeChild(item)
+                except RuntimeError:
+                    # Item has already been deleted
                     pass
-                elif level > previous_level+4: # Invalid indentation
-                    continue
-                elif level > previous_level:
-                    ancestors.append((previous_item, previous_level))
-                else:
-                    while len(ancestors) > 1 and level <= previous_level:
-                        ancestors.pop(-1)
-                        _item, previous_level = ancestors[-1]
-            parent, _level = ancestors[-1]
-            
-            if citem is not None:
-                cname = to_text_string(citem.text(0))
-                
-            preceding = root_item if previous_item is None else previous_item
-            if not_class_nor_function and data.is_comment():
-                if not self.show_comments:
-                    if citem is not None:
-                        remove_from_tree_cache(tree_cache, line=line_nb)
-                    continue
-                if citem is not None:
-                    if data.text == cname and level == clevel:
-                        previous_level = clevel
-                        previous_item = citem
-                        continue
-                    else:
-                        remove_from_tree_cache(tree_cache, line=line_nb)
-                if data.def_type == data.CELL:
-                    item = CellItem(data.text, line_nb, parent, preceding)
-                else:
-                    item = CommentItem(data.text, line_nb, parent, preceding)
-            elif class_name is not None:
-                if citem is not None:
-                    if class_name == cname and level == clevel:
-                        previous_level = clevel
-                        previous_item = citem
-                        continue
-                    else:
-                        remove_from_tree_cache(tree_cache, line=line_nb)
-                item = ClassItem(class_name, line_nb, parent, preceding)
-            else:
-                if citem is not None:
-                    if func_name == cname and level == clevel:
-                        previous_level = clevel
-                        previous_item = citem
-                        continue
-                    else:
-                        remove_from_tree_cache(tree_cache, line=line_nb)
-                item = FunctionItem(func_name, line_nb, parent, preceding)
-                
+
+        # Creating their replacements
+        new_items = items[:prefix]
+        for index in range(prefix, nb_new-suffix):
+            line, level, item_class, name, parent = entries[index]
+            parent = root_item if parent < 0 else new_items[parent]
+            preceding = root_item if index == 0 else new_items[index-1]
+            item = item_class(name, line, parent, preceding)
             item.setup()
-            debug = "%s -- %s/%s" % (str(item.line).rjust(6),
-                                     to_text_string(item.parent().text(0)),
-                                     to_text_string(item.text(0)))
-            tree_cache[line_nb] = (item, level, debug)
-            previous_level = level
-            previous_item = item
-            
+            new_items.append(item)
+        new_items += items[nb_old-suffix:]
+
+        # Updating lines of the items which were kept
+        for item, entry in zip(new_items, entries):
+            if item.line != entry[0]:
+                item.set_line(entry[0])
+
+        tree_cache.entries = entries
+        tree_cache.items = new_items
         return tree_cache
 
     def root_item_selected(self, item):
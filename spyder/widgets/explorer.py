@@ -125,6 +125,10 @@ class IconProvider(QFileIconProvider):
                     '.pptx': 'PowerpointFileIcon'}
 
     """Project tree widget icon provider"""
+
+    # Icon names by file extension, shared by all providers
+    extension_icons = {}
+
     def __init__(self, treeview):
         super(IconProvider, self).__init__()
         self.treeview = treeview
@@ -139,42 +143,62 @@ class IconProvider(QFileIconProvider):
         if isinstance(icontype_or_qfileinfo, QFileIconProvider.IconType):
             return super(IconProvider, self).icon(icontype_or_qfileinfo)
         else:
+            # Use the file info already gathered by the model, to avoid
+            # stat calls which are slow on network drives
             qfileinfo = icontype_or_qfileinfo
-            fname = osp.normpath(to_text_string(qfileinfo.absoluteFilePath()))
-            if osp.isdir(fname):
+            if qfileinfo.isDir():
                 return ima.icon('DirOpenIcon')
             else:
-                basename = osp.basename(fname)
-                _, extension = osp.splitext(basename)
-                mime_type, _ = mime.guess_type(basename)
-                icon = ima.icon('FileIcon')
-
-                if extension in self.OFFICE_FILES:
-                    icon = ima.icon(self.OFFICE_FILES[extension])
-
-                if mime_type is not None:
-                    try:
-                        # Fix for issue 5080.  Even though mimetypes.guess_type
-                        # documentation states that the return value will be
-                        # None or a tuple of the form type/subtype, in the
-                        # Windows registry, .sql has a mimetype of text\plain
-                        # instead of text/plain therefore mimetypes is
-                        # returning it incorrectly.
-                        file_type, bin_name = mime_type.split('/')
-                    except ValueError:
-                        file_type = 'text'
-                    if file_type == 'text':
-                        icon = ima.icon('TextFileIcon')
-                    elif file_type == 'audio':
-                        icon = ima.icon('AudioFileIcon')
-                    elif file_type == 'video':
-                        icon = ima.icon('VideoFileIcon')
-                    elif file_type == 'image':
-                        icon = ima.icon('ImageFileIcon')
-                    elif file_type == 'application':
-                        if bin_name in self.application_icons:
-                            icon = ima.icon(self.application_icons[bin_name])
-                return icon
+                extension = self.get_extension(
+                    to_text_string(qfileinfo.fileName()))
+                try:
+                    icon_name = self.extension_icons[extension]
+                except KeyError:
+                    icon_name = self.get_icon_name(extension)
+                    self.extension_icons[extension] = icon_name
+                return ima.icon(icon_name)
+
+    def get_extension(self, basename):
+        """
+        Return the extension of basename which determines its icon,
+        including the one before a compression extension (e.g. .tar.gz)
+        """
+        root, extension = osp.splitext(basename)
+        if extension.lower() in mime.encodings_map:
+            extension = osp.splitext(root)[1] + extension
+        return extension
+
+    def get_icon_name(self, extension):
+        """Return the name of the icon of files with extension"""
+        icon_name = 'FileIcon'
+        if extension in self.OFFICE_FILES:
+            icon_name = self.OFFICE_FILES[extension]
+
+        # Mime types only depend on extensions
+        mime_type, _ = mime.guess_type('file' + extension)
+        if mime_type is not None:
+            try:
+                # Fix for issue 5080.  Even though mimetypes.guess_type
+                # documentation states that the return value will be
+                # None or a tuple of the form type/subtype, in the
+                # Windows registry, .sql has a mimetype of text\plain
+                # instead of text/plain therefore mimetypes is
+                # returning it incorrectly.
+                file_type, bin_name = mime_type.split('/')
+            except ValueError:
+                file_type = 'text'
+            if file_type == 'text':
+                icon_name = 'TextFileIcon'
+            elif file_type == 'audio':
+                icon_name = 'AudioFileIcon'
+            elif file_type == 'video':
+                icon_name = 'VideoFileIcon'
+            elif file_type == 'image':
+                icon_name = 'ImageFileIcon'
+            elif file_type == 'application':
+                if bin_name in self.application_icons:
+                    icon_name = self.application_icons[bin_name]
+        return icon_name
 
 
 class DirView(QTreeView):
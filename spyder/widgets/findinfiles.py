@@ -19,12 +19,14 @@ import os.path as osp
 import re
 import sys
 import math
+import time
 import traceback
 
 # Third party imports
 from qtpy.compat import getexistingdirectory
 from qtpy.QtGui import QAbstractTextDocumentLayout, QTextDocument
-from qtpy.QtCore import QMutex, QMutexLocker, Qt, QThread, Signal, Slot, QSize
+from qtpy.QtCore import (QMutex, QMutexLocker, Qt, QThread, QTimer, Signal,
+                         Slot, QSize)
 from qtpy.QtWidgets import (QHBoxLayout, QLabel, QListWidget, QSizePolicy,
                             QTreeWidgetItem, QVBoxLayout, QWidget,
                             QStyledItemDelegate, QStyleOptionViewItem,
@@ -34,8 +36,9 @@ from qtpy.QtWidgets import (QHBoxLayout, QLabel, QListWidget, QSizePolicy,
 from spyder.config.base import _
 from spyder.py3compat import to_text_string
 from spyder.utils import icon_manager as ima
-from spyder.utils.encoding import is_text_file
+from spyder.utils import filesearch
 from spyder.utils.misc import getcwd_or_home
+from spyder.utils.trigramindex import TrigramIndex
 from spyder.widgets.comboboxes import PatternComboBox
 from spyder.widgets.onecolumntree import OneColumnTree
 from spyder.utils.qthelpers import create_toolbutton, get_icon
@@ -55,6 +58,20 @@ EXTERNAL_PATH = 4
 MAX_PATH_LENGTH = 60
 MAX_PATH_HISTORY = 15
 
+# Results are added to the tree at most once per interval (in ms)
+RESULTS_FLUSH_INTERVAL = 100
+
+# Number of match items created under a single file item at first, and
+# each time the item of its remaining matches is activated
+MAX_FILE_ROWS = 500
+
+# Files are expanded as they are found until this many match items exist
+MAX_EXPANDED_ROWS = 2000
+
+# Minimum time in s between two refreshes of the project index requested
+# by searches
+INDEX_REFRESH_INTERVAL = 30
+
 
 def truncate_path(text):
     ellipsis = '...'
@@ -69,7 +86,7 @@ class SearchThread(QThread):
     sig_finished = Signal(bool)
     sig_current_file = Signal(str)
     sig_current_folder = Signal(str)
-    sig_file_match = Signal(tuple, int)
+    sig_file_matches = Signal(list, int)
     sig_out_print = Signal(object)
 
     def __init__(self, parent):
@@ -92,6 +109,7 @@ class SearchThread(QThread):
         self.results = {}
         self.total_matches = 0
         self.is_file = False
+        self.index = None
 
     def initialize(self, path, is_file, exclude,
                    texts, text_re, case_sensitive):
@@ -126,83 +144,215 @@ class SearchThread(QThread):
         with QMutexLocker(self.mutex):
             self.stopped = True
 
+    def is_stopped(self):
+        with QMutexLocker(self.mutex):
+            return self.stopped
+
     def find_files_in_path(self, path):
         if self.pathlist is None:
             self.pathlist = []
         self.pathlist.append(path)
+        filenames = None
+        if self.index is not None and self.index.contains(path):
+            filenames = self.get_index_candidates(path)
+        if filenames is None:
+            filenames = self.walk(path)
+        try:
+            texts = filesearch.prepare_texts(self.texts, self.text_re,
+                                             self.case_sensitive)
+            tasks = ((chunk, texts)
+                     for chunk in filesearch.iter_chunks(filenames))
+            # Stopping the iteration stops queuing tasks in the pool,
+            # which is shared by all searches
+            for fname, results, error in filesearch.imap_bounded(
+                    filesearch.get_pool(), filesearch.search_chunk, tasks):
+                with QMutexLocker(self.mutex):
+                    if self.stopped:
+                        return False
+                self.sig_current_file.emit(fname)
+                self.process_results(results, error)
+        except re.error:
+            self.error_flag = _("invalid regular expression")
+            return False
+        self.completed = True
+        return True
+
+    def walk(self, path):
+        """Generate the names of the files to search in path"""
         for path, dirs, files in os.walk(path):
             with QMutexLocker(self.mutex):
                 if self.stopped:
-                    return False
-            try:
-                for d in dirs[:]:
-                    dirname = os.path.join(path, d)
-                    if re.search(self.exclude, dirname + os.sep):
-                        dirs.remove(d)
-                for f in files:
-                    filename = os.path.join(path, f)
-                    if re.search(self.exclude, filename):
-                        continue
-                    if is_text_file(filename):
-                        self.find_string_in_file(filename)
-            except re.error:
-                self.error_flag = _("invalid regular expression")
-                return False
-        return True
+                    return
+            for d in dirs[:]:
+                dirname = os.path.join(path, d)
+                if re.search(self.exclude, dirname + os.sep):
+                    dirs.remove(d)
+            for f in files:
+                filename = os.path.join(path, f)
+                if re.search(self.exclude, filename):
+                    continue
+                yield filename
+
+    def get_index_candidates(self, path):
+        """
+        Return the files to search in path according to the project
+        index, or None if it can't be used
+
+        The index is kept up to date in the background by IndexThread,
+        so only the candidates are checked to still exist. The directories
+        it doesn't index are walked unless they are excluded.
+        """
+        filenames = self.index.candidates(self.texts, self.text_re)
+        if filenames is None:
+            return None
+        path = osp.abspath(path)
+        filenames = list(self.filter_candidates(path, filenames))
+        for dirname in self.filter_candidates(path,
+                                              self.index.skipped_dirs(),
+                                              dirs=True):
+            filenames.extend(self.walk(dirname))
+        return filenames
+
+    def filter_candidates(self, path, filenames, dirs=False):
+        """
+        Generate the files (or directories if dirs is True) of the project
+        index that are in path and are not excluded, as walk would do
+        """
+        path = osp.abspath(path)
+        prefix = osp.normcase(path) + os.sep
+        excluded_dirs = {}
+        for filename in filenames:
+            if not osp.normcase(filename).startswith(prefix):
+                continue
+            # Paths are given as walk would give them
+            filename = path + filename[len(path):]
+            if re.search(self.exclude, filename + (os.sep if dirs else '')):
+                continue
+            dirname = osp.dirname(filename)
+            if dirname not in excluded_dirs:
+                excluded_dirs[dirname] = self.is_excluded_dir(path, dirname)
+            if excluded_dirs[dirname]:
+                continue
+            # Files removed since the index was refreshed
+            if (osp.isdir if dirs else osp.isfile)(filename):
+                yield filename
+
+    def is_excluded_dir(self, path, dirname):
+        """Return True if walk(path) doesn't enter dirname or its parents"""
+        while len(dirname) > len(path):
+            if re.search(self.exclude, dirname + os.sep):
+                return True
+            dirname = osp.dirname(dirname)
+        return False
 
     def find_string_in_file(self, fname):
         self.error_flag = False
         self.sig_current_file.emit(fname)
-        try:
-            for lineno, line in enumerate(open(fname, 'rb')):
-                for text, enc in self.texts:
-                    line_search = line
-                    if not self.case_sensitive:
-                        line_search = line_search.lower()
-                    if self.text_re:
-                        found = re.search(text, line_search)
-                        if found is not None:
-                            break
-                    else:
-                        found = line_search.find(text)
-                        if found > -1:
-                            break
-                try:
-                    line_dec = line.decode(enc)
-                except UnicodeDecodeError:
-                    line_dec = line
-                if not self.case_sensitive:
-                    line = line.lower()
-                if self.text_re:
-                    for match in re.finditer(text, line):
-                        self.total_matches += 1
-                        self.sig_file_match.emit((osp.abspath(fname),
-                                                  lineno + 1,
-                                                  match.start(),
-                                                  match.end(), line_dec),
-                                                 self.total_matches)
-                else:
-                    found = line.find(text)
-                    while found > -1:
-                        self.total_matches += 1
-                        self.sig_file_match.emit((osp.abspath(fname),
-                                                  lineno + 1,
-                                                  found,
-                                                  found + len(text), line_dec),
-                                                 self.total_matches)
-                        for text, enc in self.texts:
-                            found = line.find(text, found + 1)
-                            if found > -1:
-                                break
-        except IOError as xxx_todo_changeme:
-            (_errno, _strerror) = xxx_todo_changeme.args
-            self.error_flag = _("permission denied errors were encountered")
+        texts = filesearch.prepare_texts(self.texts, self.text_re,
+                                         self.case_sensitive)
+        results, error = filesearch.search_file(fname, texts,
+                                                check_binary=False)
+        self.process_results(results, error)
         self.completed = True
 
+    def process_results(self, results, error):
+        """Emit a batch of matches returned by the search backend"""
+        if error:
+            self.error_flag = _("permission denied errors were encountered")
+        self.total_matches += len(results)
+        if results:
+            self.sig_file_matches.emit(results, self.total_matches)
+
     def get_results(self):
         return self.results, self.pathlist, self.total_matches, self.error_flag
 
 
+class IndexThread(QThread):
+    """
+    Thread that loads, refreshes and saves a project trigram index, and
+    reindexes the files saved in Spyder
+    """
+    sig_finished = Signal()
+
+    def __init__(self, parent, index):
+        QThread.__init__(self, parent)
+        self.mutex = QMutex()
+        self.index = index
+        self.stopped = False
+        self.loaded = False
+        self.refresh_requested = True
+        self.last_refresh = None
+        self.filenames = []
+        # Requests made while the thread was finishing
+        self.finished.connect(self.start_pending)
+
+    def run(self):
+        try:
+            if not self.loaded:
+                self.index.load()
+                self.loaded = True
+            modified = False
+            while not self.is_stopped():
+                with QMutexLocker(self.mutex):
+                    refresh = self.refresh_requested
+                    filenames = self.filenames
+                    self.refresh_requested = False
+                    self.filenames = []
+                if refresh:
+                    modified = (self.index.refresh(stopped=self.is_stopped)
+                                or modified)
+                    self.last_refresh = time.time()
+                elif filenames:
+                    for filename in filenames:
+                        modified = (self.index.update_file(filename)
+                                    or modified)
+                else:
+                    break
+            if modified:
+                self.index.save()
+        except Exception:
+            traceback.print_exc()
+        self.sig_finished.emit()
+
+    def is_stopped(self):
+        with QMutexLocker(self.mutex):
+            return self.stopped
+
+    def stop(self):
+        with QMutexLocker(self.mutex):
+            self.stopped = True
+
+    def refresh(self):
+        """
+        Refresh the index in the thread, to find the changes made outside
+        Spyder, unless it was done less than INDEX_REFRESH_INTERVAL ago
+        """
+        if not self.index.ready or (
+                self.last_refresh is not None and
+                time.time() - self.last_refresh < INDEX_REFRESH_INTERVAL):
+            # The first refresh isn't done or one was done recently
+            return
+        with QMutexLocker(self.mutex):
+            self.refresh_requested = True
+        self.start_pending()
+
+    def update_file(self, filename):
+        """Reindex filename in the thread"""
+        with QMutexLocker(self.mutex):
+            self.filenames.append(filename)
+        self.start_pending()
+
+    def start_pending(self):
+        """Start the thread if there is something to do and it's stopped"""
+        if self.isRunning():
+            return
+        with QMutexLocker(self.mutex):
+            if self.stopped or not (self.refresh_requested or
+                                    self.filenames):
+                return
+        self.start()
+
+
 class ExternalPathItem(QListWidgetItem):
     def __init__(self, parent, path):
         self.path = path
@@ -559,6 +709,30 @@ class LineMatchItem(QTreeWidgetItem):
         return self.lineno >= x.lineno
 
 
+class MoreMatchesItem(QTreeWidgetItem):
+    def __init__(self, parent, num_matches):
+        self.num_matches = num_matches
+        QTreeWidgetItem.__init__(self, parent, [self.__repr__()],
+                                 QTreeWidgetItem.Type)
+
+    def __repr__(self):
+        text = _("{0} more matches, click to show them")
+        return to_text_string("<em>{0}</em>").format(
+            text.format(self.num_matches))
+
+    def __unicode__(self):
+        return self.__repr__()
+
+    def __str__(self):
+        return self.__repr__()
+
+    def __lt__(self, x):
+        return False
+
+    def __ge__(self, x):
+        return True
+
+
 class FileMatchItem(QTreeWidgetItem):
     def __init__(self, parent, filename, sorting):
 
@@ -573,6 +747,12 @@ class FileMatchItem(QTreeWidgetItem):
         QTreeWidgetItem.__init__(self, parent, [title], QTreeWidgetItem.Type)
 
         self.setToolTip(0, filename)
+        # Match items are created when the item is expanded
+        self.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+        self.fullname = filename
+        self.num_rows = 0
+        self.max_rows = MAX_FILE_ROWS
+        self.more_item = None
 
     def __lt__(self, x):
         if self.sorting['status'] == ON:
@@ -639,6 +819,10 @@ class ResultsBrowser(OneColumnTree):
         self.sorting = {}
         self.data = None
         self.files = None
+        self.matches = None
+        self.pending = []
+        self.num_matches = 0
+        self.num_rows = 0
         self.set_title('')
         self.set_sorting(OFF)
         self.setSortingEnabled(False)
@@ -647,9 +831,18 @@ class ResultsBrowser(OneColumnTree):
         self.setItemDelegate(ItemDelegate(self))
         self.setUniformRowHeights(False)
         self.header().sectionClicked.connect(self.sort_section)
+        self.itemExpanded.connect(self.populate_file_item)
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(RESULTS_FLUSH_INTERVAL)
+        self.flush_timer.timeout.connect(self.flush_results)
 
     def activated(self, item):
         """Double-click event"""
+        if isinstance(item, MoreMatchesItem):
+            self.show_more_matches(item.parent())
+            return
         itemdata = self.data.get(id(self.currentItem()))
         if itemdata is not None:
             filename, lineno, colno = itemdata
@@ -671,9 +864,14 @@ class ResultsBrowser(OneColumnTree):
     def clear_title(self, search_text):
         self.clear()
         self.setSortingEnabled(False)
+        self.flush_timer.stop()
         self.num_files = 0
         self.data = {}
         self.files = {}
+        self.matches = {}
+        self.pending = []
+        self.num_matches = 0
+        self.num_rows = 0
         self.set_sorting(OFF)
         self.search_text = search_text
         title = "'%s' - " % search_text
@@ -749,13 +947,44 @@ class ResultsBrowser(OneColumnTree):
     @Slot(tuple, int)
     def append_result(self, results, num_matches):
         """Real-time update of search results"""
-        filename, lineno, colno, match_end, line = results
+        self.append_results([results], num_matches)
+
+    @Slot(list, int)
+    def append_results(self, results, num_matches):
+        """
+        Buffer a batch of search results, which are added to the tree
+        by flush_results
+        """
+        self.pending.extend(results)
+        self.num_matches = num_matches
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
 
-        if filename not in self.files:
-            file_item = FileMatchItem(self, filename, self.sorting)
+    @Slot()
+    def flush_results(self):
+        """Add the buffered search results to the tree"""
+        self.flush_timer.stop()
+        pending, self.pending = self.pending, []
+        new_files = []
+        for result in pending:
+            filename = result[0]
+            if filename not in self.files:
+                file_item = FileMatchItem(self, filename, self.sorting)
+                self.files[filename] = file_item
+                self.matches[filename] = []
+                self.num_files += 1
+                new_files.append(file_item)
+            self.matches[filename].append(result)
+
+        # Show the first matches right away, as they arrive
+        for file_item in new_files:
+            if self.num_rows >= MAX_EXPANDED_ROWS:
+                break
             file_item.setExpanded(True)
-            self.files[filename] = file_item
-            self.num_files += 1
+        for filename in set(result[0] for result in pending):
+            file_item = self.files[filename]
+            if file_item.isExpanded():
+                self.populate_file_item(file_item)
 
         search_text = self.search_text
         title = "'%s' - " % search_text
@@ -767,14 +996,45 @@ class ResultsBrowser(OneColumnTree):
             text_files = _('file')
             if nb_files > 1:
                 text_files += 's'
-            text = "%d %s %d %s" % (num_matches, text_matches,
+            text = "%d %s %d %s" % (self.num_matches, text_matches,
                                     nb_files, text_files)
         self.set_title(title + text)
 
-        file_item = self.files[filename]
-        line = self.truncate_result(line, colno, match_end)
-        item = LineMatchItem(file_item, lineno, colno, line)
-        self.data[id(item)] = (filename, lineno, colno)
+    @Slot()
+    def expandAll(self):
+        """Reimplemented to create the match items of every file first"""
+        for file_item in (self.files or {}).values():
+            self.populate_file_item(file_item)
+        OneColumnTree.expandAll(self)
+
+    def show_more_matches(self, file_item):
+        """Create the next MAX_FILE_ROWS match items of file_item"""
+        file_item.max_rows = file_item.num_rows + MAX_FILE_ROWS
+        self.populate_file_item(file_item)
+
+    @Slot(QTreeWidgetItem)
+    def populate_file_item(self, file_item):
+        """
+        Create the match items of file_item that were not created yet,
+        up to its max_rows
+        """
+        if not isinstance(file_item, FileMatchItem):
+            return
+        matches = self.matches.get(file_item.fullname, [])
+        end = min(len(matches), file_item.max_rows)
+        if file_item.more_item is not None:
+            file_item.removeChild(file_item.more_item)
+            file_item.more_item = None
+        for filename, lineno, colno, match_end, line in \
+                matches[file_item.num_rows:end]:
+            line = self.truncate_result(line, colno, match_end)
+            item = LineMatchItem(file_item, lineno, colno, line)
+            self.data[id(item)] = (filename, lineno, colno)
+        self.num_rows += end - file_item.num_rows
+        file_item.num_rows = end
+        if len(matches) > end:
+            file_item.more_item = MoreMatchesItem(file_item,
+                                                  len(matches) - end)
 
 
 class FileProgressBar(QWidget):
@@ -835,6 +1095,7 @@ class FindInFilesWidget(QWidget):
         self.setWindowTitle(_('Find in files'))
 
         self.search_thread = None
+        self.index_thread = None
         self.search_path = ''
         self.get_pythonpath_callback = None
 
@@ -881,6 +1142,8 @@ class FindInFilesWidget(QWidget):
         self.search_thread = SearchThread(self)
         self.search_thread.get_pythonpath_callback = (
             self.get_pythonpath_callback)
+        if self.index_thread is not None:
+            self.search_thread.index = self.index_thread.index
         self.search_thread.sig_finished.connect(self.search_complete)
         self.search_thread.sig_current_file.connect(
             lambda x: self.status_bar.set_label_path(x, folder=False)
@@ -888,8 +1151,8 @@ class FindInFilesWidget(QWidget):
         self.search_thread.sig_current_folder.connect(
             lambda x: self.status_bar.set_label_path(x, folder=True)
         )
-        self.search_thread.sig_file_match.connect(
-            self.result_browser.append_result
+        self.search_thread.sig_file_matches.connect(
+            self.result_browser.append_results
         )
         self.search_thread.sig_out_print.connect(
             lambda x: sys.stdout.write(str(x) + "\n")
@@ -915,9 +1178,33 @@ class FindInFilesWidget(QWidget):
             self.search_thread.setParent(None)
             self.search_thread = None
 
+    def set_project_index(self, path):
+        """Build or load the trigram index of the project in path"""
+        self.clear_project_index()
+        index = TrigramIndex(path)
+        self.index_thread = IndexThread(self, index)
+        self.index_thread.start()
+
+    def clear_project_index(self):
+        """Stop using the current project trigram index"""
+        if self.index_thread is not None:
+            self.index_thread.stop()
+            self.index_thread.wait()
+            self.index_thread.setParent(None)
+            self.index_thread = None
+
+    def update_project_index(self, filename):
+        """Update the project trigram index after filename was saved"""
+        if self.index_thread is None:
+            return
+        index = self.index_thread.index
+        if index.ready and index.contains(filename):
+            self.index_thread.update_file(filename)
+
     def closing_widget(self):
         """Perform actions before widget is closed"""
         self.stop_and_reset_thread(ignore_results=True)
+        self.clear_project_index()
 
     def search_complete(self, completed):
         """Current search thread has finished"""
@@ -925,9 +1212,13 @@ class FindInFilesWidget(QWidget):
         self.find_options.ok_button.setEnabled(True)
         self.find_options.stop_button.setEnabled(False)
         self.status_bar.hide()
-        self.result_browser.expandAll()
+        self.result_browser.flush_results()
         if self.search_thread is None:
             return
+        if self.index_thread is not None:
+            # The index was used as it is: changes made outside Spyder
+            # will be found by the next searches
+            self.index_thread.refresh()
         self.sig_finished.emit()
         found = self.search_thread.get_results()
         self.stop_and_reset_thread()
@@ -9,8 +9,6 @@ Widget that handles communications between a console in debugging
 mode and Spyder
 """
 
-import ast
-
 from qtpy.QtCore import Qt
 
 from qtconsole.rich_jupyter_widget import RichJupyterWidget
@@ -46,21 +44,15 @@ class DebuggingWidget(RichJupyterWidget):
         after running any pdb command.
 
         See publish_pdb_state in utils/ipython/spyder_kernel.py and
-        notify_spyder in utils/site/sitecustomize.py and
+        notify_spyder in utils/site/sitecustomize.py. The Variable
+        Explorer is refreshed by the 'namespace_view' message sent
+        before pdb_state.
         """
         if 'step' in pdb_state and 'fname' in pdb_state['step']:
             fname = pdb_state['step']['fname']
             lineno = pdb_state['step']['lineno']
             self.sig_pdb_step.emit(fname, lineno)
 
-        if 'namespace_view' in pdb_state:
-            self.sig_namespace_view.emit(ast.literal_eval(
-                    pdb_state['namespace_view']))
-
-        if 'var_properties' in pdb_state:
-            self.sig_var_properties.emit(ast.literal_eval(
-                    pdb_state['var_properties']))
-
     # ---- Private API (overrode by us) ----------------------------
     def _handle_input_request(self, msg):
         """Save history and add a %plot magic."""
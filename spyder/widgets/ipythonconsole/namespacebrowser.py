@@ -10,6 +10,7 @@ the Variable Explorer
 """
 
 from time import time
+import uuid
 
 from qtpy.QtCore import QEventLoop
 from qtpy.QtWidgets import QMessageBox
@@ -19,6 +20,15 @@ from qtconsole.rich_jupyter_widget import RichJupyterWidget
 
 from spyder.config.base import _, debug_print
 from spyder.py3compat import PY2, to_text_string
+from spyder.utils.ipython.namespace_codec import decode_namespace_view
+from spyder.utils.ipython.value_transfer import (ChunkedValue, COMM_TARGET,
+                                                 dump_value,
+                                                 get_pickle_protocol,
+                                                 split_chunks)
+
+
+# To be able to send values between Python 2 and 3
+PICKLE_PROTOCOL = 2
 
 
 class NamepaceBrowserWidget(RichJupyterWidget):
@@ -38,6 +48,9 @@ class NamepaceBrowserWidget(RichJupyterWidget):
     _kernel_value = None
     _kernel_is_starting = True
 
+    # Highest pickle protocol supported by the kernel to set values
+    _kernel_pickle_protocol = None
+
     # --- Public API --------------------------------------------------
     def set_namespacebrowser(self, namespacebrowser):
         """Set namespace browser widget"""
@@ -50,17 +63,24 @@ class NamepaceBrowserWidget(RichJupyterWidget):
         self.sig_namespace_view.connect(lambda data:
             self.namespacebrowser.process_remote_view(data))
 
+        # Update namespace view with the changes since the last refresh
+        self.sig_namespace_view_delta.connect(lambda delta:
+            self.namespacebrowser.process_remote_view_delta(delta))
+
         # Update properties of variables
         self.sig_var_properties.connect(lambda data:
             self.namespacebrowser.set_var_properties(data))
 
+        # Show the progress of the values sent to the kernel
+        self.sig_value_upload.connect(lambda progress:
+            self.namespacebrowser.set_upload_progress(progress))
+
     def refresh_namespacebrowser(self):
         """Refresh namespace browser"""
         if self.namespacebrowser:
-            self.silent_exec_method(
-                'get_ipython().kernel.get_namespace_view()')
-            self.silent_exec_method(
-                'get_ipython().kernel.get_var_properties()')
+            # The view arrives as a 'namespace_view' spyder_msg
+            self.silent_execute(
+                'get_ipython().kernel.publish_namespace_view()')
 
     def set_namespace_view_settings(self):
         """Set the namespace view settings"""
@@ -71,41 +91,112 @@ class NamepaceBrowserWidget(RichJupyterWidget):
     def get_value(self, name):
         """Ask kernel for a value"""
         code = u"get_ipython().kernel.get_value('%s')" % name
-        if self._reading:
-            method = self.kernel_client.input
-            code = u'!' + code
-        else:
-            method = self.silent_execute
+        return self._get_reply(code)
 
-        # Wait until the kernel returns the value
-        wait_loop = QEventLoop()
-        self.sig_got_reply.connect(wait_loop.quit)
-        method(code)
-        wait_loop.exec_()
-
-        # Remove loop connection and loop
-        self.sig_got_reply.disconnect(wait_loop.quit)
-        wait_loop = None
-
-        # Handle exceptions
-        if self._kernel_value is None:
-            if self._kernel_reply:
-                msg = self._kernel_reply[:]
-                self._kernel_reply = None
-                raise ValueError(msg)
+    def request_value(self, name, max_size=None):
+        """
+        Ask the kernel for the value of a variable without waiting for it
+        and return the id of the transfer.
 
-        return self._kernel_value
+        The value arrives in chunks, whose progress is given by
+        sig_value_download (see _handle_value_download). If it takes more
+        than max_size bytes, the kernel waits for continue_value_request
+        or cancel_value_request to be called.
+        """
+        transfer_id = uuid.uuid4().hex
+        self._value_downloads[transfer_id] = None
+        self._execute_method(
+            u"get_ipython().kernel.send_value('%s', '%s', %d, %s)"
+            % (name, transfer_id, get_pickle_protocol(), max_size))
+        return transfer_id
+
+    def continue_value_request(self, transfer_id):
+        """Get a value refused by the kernel because of its size"""
+        if transfer_id in self._value_downloads:
+            self._execute_method(
+                u"get_ipython().kernel.continue_value_download('%s')"
+                % transfer_id)
+
+    def cancel_value_request(self, transfer_id):
+        """Stop getting a value, ignoring the chunks still to come"""
+        if transfer_id in self._value_downloads:
+            del self._value_downloads[transfer_id]
+            self._execute_method(
+                u"get_ipython().kernel.cancel_value_download('%s')"
+                % transfer_id)
 
     def set_value(self, name, value):
         """Set value for a variable"""
-        value = to_text_string(value)
-        code = u"get_ipython().kernel.set_value('%s', %s, %s)" % (name, value,
-                                                                  PY2)
-
         if self._reading:
+            # The kernel doesn't handle comm messages while debugging, so
+            # the value is sent in the source of the code to run. We need
+            # to enclose it in a list to be able to send it in Python 2
+            value = to_text_string([cloudpickle.dumps(
+                value, protocol=PICKLE_PROTOCOL)])
+            code = u"get_ipython().kernel.set_value('%s', %s, %s)" % (
+                name, value, PY2)
             self.kernel_client.input(u'!' + code)
         else:
-            self.silent_execute(code)
+            self._upload_value(name, value)
+
+    # --- For kernel backed DataFrame editors
+    def open_dataframe(self, name):
+        """
+        Start showing a DataFrame, Series or Index in an editor and return
+        its structure (see RemoteDataFrame.get_info)
+        """
+        return self._get_reply(
+            u"get_ipython().kernel.open_dataframe('%s')" % name)
+
+    def get_dataframe_window(self, dataframe_id, row_start, row_stop,
+                             col_start, col_stop):
+        """Return the positions and values of a window of a DataFrame"""
+        return self._get_reply(
+            u"get_ipython().kernel.get_dataframe_window(%d, %d, %d, %d, %d)"
+            % (dataframe_id, row_start, row_stop, col_start, col_stop))
+
+    def sort_dataframe(self, dataframe_id, column, ascending):
+        """Sort the rows of a DataFrame; return an error message or None"""
+        return self._get_reply(
+            u"get_ipython().kernel.sort_dataframe(%d, %d, %s)"
+            % (dataframe_id, column, ascending))
+
+    def request_dataframe_window(self, dataframe_id, row_start, row_stop,
+                                 col_start, col_stop):
+        """
+        Ask the kernel for a window of a DataFrame without waiting for it.
+
+        It arrives through sig_dataframe_reply (see
+        _handle_dataframe_reply).
+        """
+        self._execute_method(
+            u"get_ipython().kernel.send_dataframe_window(%d, %d, %d, %d, %d)"
+            % (dataframe_id, row_start, row_stop, col_start, col_stop))
+
+    def request_dataframe_minmax(self, dataframe_id):
+        """
+        Ask the kernel for the min/max of the columns of a DataFrame
+        without waiting for them.
+
+        They arrive through sig_dataframe_reply (see
+        _handle_dataframe_reply).
+        """
+        self._execute_method(
+            u"get_ipython().kernel.send_dataframe_minmax(%d)" % dataframe_id)
+
+    def set_dataframe_values(self, dataframe_id, edits):
+        """Apply a list of (row, column, value) edits to a DataFrame"""
+        # Values are sent as in RemoteCollectionsEditorTableView.new_value
+        value = to_text_string([cloudpickle.dumps(edits,
+                                                  protocol=PICKLE_PROTOCOL)])
+        self._execute_method(
+            u"get_ipython().kernel.set_dataframe_values(%d, %s, %s)"
+            % (dataframe_id, value, PY2))
+
+    def close_dataframe(self, dataframe_id):
+        """Stop showing a DataFrame"""
+        self._execute_method(
+            u"get_ipython().kernel.close_dataframe(%d)" % dataframe_id)
 
     def remove_value(self, name):
         """Remove a variable"""
@@ -162,6 +253,137 @@ class NamepaceBrowserWidget(RichJupyterWidget):
         return self._kernel_reply
 
     # ---- Private API (defined by us) ------------------------------
+    def _get_reply(self, code):
+        """Run a kernel method which sends back a value and return it"""
+        if self._reading:
+            method = self.kernel_client.input
+            code = u'!' + code
+        else:
+            method = self.silent_execute
+
+        # Wait until the kernel returns the value
+        wait_loop = QEventLoop()
+        self.sig_got_reply.connect(wait_loop.quit)
+        method(code)
+        wait_loop.exec_()
+
+        # Remove loop connection and loop
+        self.sig_got_reply.disconnect(wait_loop.quit)
+        wait_loop = None
+
+        # Handle exceptions
+        if self._kernel_value is None:
+            if self._kernel_reply:
+                msg = self._kernel_reply[:]
+                self._kernel_reply = None
+                raise ValueError(msg)
+
+        # Reset the value to save memory
+        value = self._kernel_value
+        self._kernel_value = None
+        return value
+
+    def _get_kernel_pickle_protocol(self):
+        """Return the highest pickle protocol supported by the kernel"""
+        if self._kernel_pickle_protocol is None:
+            try:
+                protocol = self._get_reply(
+                    u"get_ipython().kernel.get_pickle_protocol()")
+            except ValueError:
+                protocol = None
+            self._kernel_pickle_protocol = protocol or PICKLE_PROTOCOL
+        return self._kernel_pickle_protocol
+
+    def _upload_value(self, name, value):
+        """
+        Send a value to the kernel as raw buffers, in chunks of comm
+        messages (see value_transfer)
+        """
+        protocol = min(get_pickle_protocol(),
+                       self._get_kernel_pickle_protocol())
+        buffers = dump_value(value, protocol)
+        comm_id = uuid.uuid4().hex
+        self._send_comm_msg('comm_open',
+                            dict(comm_id=comm_id, target_name=COMM_TARGET,
+                                 data=dict(name=name,
+                                           sizes=[len(buf)
+                                                  for buf in buffers])))
+        # Chunks are views of the buffers, which are sent without copies
+        for chunk in split_chunks(buffers):
+            parts = [[index, offset] for index, offset, view in chunk]
+            self._send_comm_msg('comm_msg',
+                                dict(comm_id=comm_id,
+                                     data=dict(parts=parts)),
+                                [view for index, offset, view in chunk])
+
+    def _send_comm_msg(self, msg_type, content, buffers=None):
+        """Send a comm message to the kernel through the shell channel"""
+        msg = self.kernel_client.session.msg(msg_type, content)
+        msg['buffers'] = buffers or []
+        self.kernel_client.shell_channel.send(msg)
+
+    def _handle_value_download(self, download, buffers):
+        """
+        Handle a 'value_download' message and emit sig_value_download
+        with the progress of the transfer: a dict with its id, the
+        number of bytes received and the size of the value, and whether
+        it was refused because of its size, if it's done, and its value
+        or error message once it's done.
+        """
+        transfer_id = download['id']
+        if transfer_id not in self._value_downloads:
+            # The request was cancelled
+            return
+        progress = dict(id=transfer_id, received=0, size=download.get('size'),
+                        refused=False, done=False, value=None,
+                        error=download.get('error'))
+        if progress['error'] is not None:
+            progress['done'] = True
+        elif download.get('refused'):
+            progress['refused'] = True
+        else:
+            value = self._value_downloads[transfer_id]
+            if value is None:
+                value = ChunkedValue(download['sizes'])
+                self._value_downloads[transfer_id] = value
+            value.add_chunk(download['parts'], buffers)
+            progress['received'] = value.received
+            if value.is_complete():
+                progress['done'] = True
+                try:
+                    progress['value'] = value.load()
+                except Exception as error:
+                    progress['error'] = repr(error)
+        if progress['done']:
+            self._value_downloads.pop(transfer_id)
+        self.sig_value_download.emit(progress)
+
+    def _handle_dataframe_reply(self, reply, buffers):
+        """
+        Handle a 'dataframe_reply' message and emit sig_dataframe_reply
+        with a dict of the id of the DataFrame, the kind of value ('window'
+        or 'minmax'), the window asked for, as [row_start, row_stop,
+        col_start, col_stop], and the value.
+        """
+        try:
+            if PY2:
+                value = cloudpickle.loads(buffers[0])
+            else:
+                value = cloudpickle.loads(bytes(buffers[0]))
+        except Exception as error:
+            debug_print("Invalid DataFrame reply: %r" % error)
+            return
+        reply = dict(reply)
+        reply['value'] = value
+        self.sig_dataframe_reply.emit(reply)
+
+    def _execute_method(self, code):
+        """Run a kernel method, also while debugging"""
+        if self._reading:
+            self.kernel_client.input(u'!' + code)
+        else:
+            self.silent_execute(code)
+
     def _handle_spyder_msg(self, msg):
         """
         Handle internal spyder messages
@@ -181,6 +403,30 @@ class NamepaceBrowserWidget(RichJupyterWidget):
                 self._kernel_value = value
             self.sig_got_reply.emit()
             return
+        elif spyder_msg_type == 'namespace_view':
+            header = msg['content']['namespace_view']
+            try:
+                view, removed, properties = decode_namespace_view(
+                    header, msg['buffers'])
+            except Exception as error:
+                debug_print("Invalid namespace view: %r" % error)
+                return
+            self.sig_namespace_view_delta.emit(
+                {'changed': view, 'removed': removed,
+                 'full': header['full'], 'properties': properties})
+            if header.get('pending'):
+                # Summaries of large arrays are finished by the kernel
+                # once it's done with what it was asked before
+                self._execute_method(
+                    'get_ipython().kernel.finish_namespace_summaries()')
+        elif spyder_msg_type == 'value_download':
+            self._handle_value_download(msg['content']['value_download'],
+                                        msg['buffers'])
+        elif spyder_msg_type == 'dataframe_reply':
+            self._handle_dataframe_reply(msg['content']['dataframe_reply'],
+                                         msg['buffers'])
+        elif spyder_msg_type == 'value_upload':
+            self.sig_value_upload.emit(msg['content']['value_upload'])
         elif spyder_msg_type == 'pdb_state':
             pdb_state = msg['content']['pdb_state']
             if pdb_state is not None and isinstance(pdb_state, dict):
@@ -232,6 +478,15 @@ class NamepaceBrowserWidget(RichJupyterWidget):
             # has been alive in each console.
             self.ipyclient.t0 = time()
             self.ipyclient.timer.timeout.connect(self.ipyclient.show_time)
+
+            # The kernel may run with another Python version now
+            self._kernel_pickle_protocol = None
+
+            # Values being received from the kernel are lost
+            for transfer_id in list(self._value_downloads):
+                self._handle_value_download(
+                    {'id': transfer_id, 'error': _("The kernel restarted")},
+                    [])
             self.ipyclient.timer.start(1000)
 
             # This handles restarts when the kernel dies
@@ -39,7 +39,11 @@ class ShellWidget(NamepaceBrowserWidget, HelpWidget, DebuggingWidget):
 
     # For NamepaceBrowserWidget
     sig_namespace_view = Signal(object)
+    sig_namespace_view_delta = Signal(object)
     sig_var_properties = Signal(object)
+    sig_value_upload = Signal(object)
+    sig_value_download = Signal(object)
+    sig_dataframe_reply = Signal(object)
     sig_show_syspath = Signal(object)
     sig_show_env = Signal(object)
 
@@ -76,6 +80,9 @@ class ShellWidget(NamepaceBrowserWidget, HelpWidget, DebuggingWidget):
         # To save kernel replies in silent execution
         self._kernel_reply = None
 
+        # Values being received from the kernel, by transfer id
+        self._value_downloads = {}
+
         # Set the color of the matched parentheses here since the qtconsole
         # uses a hard-coded value that is not modified when the color scheme is
         # set in the qtconsole constructor. See issue #4806.   
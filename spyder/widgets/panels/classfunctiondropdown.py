@@ -408,7 +408,18 @@ class ClassFunctionDropdown(Panel):
         self.parents = _get_parents(self.classes, linenum)
         update_selected_cb(self.parents, self.class_cb)
 
+    def setVisible(self, visible):
+        """Update the dropdowns when shown, since they aren't while hidden."""
+        super(ClassFunctionDropdown, self).setVisible(visible)
+        # The editor may not be set up yet
+        if visible and self._editor.highlighter is not None:
+            linenum, column = self._editor.get_cursor_line_column()
+            self._handle_cursor_position_change_event(linenum, column)
+
     @Slot(int, int)
     def _handle_cursor_position_change_event(self, linenum, column):
+        # Finding the definitions walks the whole document
+        if self.isHidden():
+            return
         self._update_data()
         self.update_selected(linenum)
@@ -7,13 +7,82 @@
 This module contains the Scroll Flag panel
 """
 
+# Standard library imports
+from bisect import bisect_left, insort
+
 from qtpy.QtCore import QSize, Qt, QRect
-from qtpy.QtGui import QPainter, QBrush, QColor, QCursor
+from qtpy.QtGui import QPainter, QBrush, QColor, QCursor, QPixmap
 from qtpy.QtWidgets import (QStyle, QStyleOptionSlider, QApplication)
 
 from spyder.api.panel import Panel
 
 
+# Kinds of flags found in the user data of blocks, in painting order
+FLAG_KINDS = ('warning', 'error', 'todo', 'breakpoint')
+
+
+class FlagIndex(object):
+    """
+    Sorted block numbers of the lines having flags, by kind of flag
+
+    Flags are kept in the user data of blocks, so they move with them when
+    lines are added or removed. The index is then rebuilt from the document
+    the next time it's needed.
+    The index is shared by an editor and its clones.
+    """
+
+    def __init__(self):
+        self.lines = dict((kind, []) for kind in FLAG_KINDS)
+        self.valid = True
+        # Incremented on every change, to know when to repaint flags
+        self.version = 0
+
+    def invalidate(self):
+        """Rebuild the index the next time it's needed"""
+        self.valid = False
+        self.version += 1
+
+    def get_lines(self, document):
+        """Return a dict mapping the kinds of flags to their lines"""
+        if not self.valid:
+            self.lines = dict((kind, []) for kind in FLAG_KINDS)
+            block = document.firstBlock()
+            while block.isValid():
+                data = block.userData()
+                if data:
+                    line_number = block.blockNumber()
+                    if data.code_analysis:
+                        if any(error for _msg, error in data.code_analysis):
+                            self.lines['error'].append(line_number)
+                        else:
+                            self.lines['warning'].append(line_number)
+                    if data.todo:
+                        self.lines['todo'].append(line_number)
+                    if data.breakpoint:
+                        self.lines['breakpoint'].append(line_number)
+                block = block.next()
+            self.valid = True
+        return self.lines
+
+    def set_lines(self, kind, lines):
+        """Set all the lines having flags of kind"""
+        self.lines[kind] = sorted(set(lines))
+        self.version += 1
+
+    def set_line(self, kind, line_number, state):
+        """Add (state is True) or remove the flag of kind of a line"""
+        self.version += 1
+        if not self.valid:
+            return
+        lines = self.lines[kind]
+        index = bisect_left(lines, line_number)
+        present = index < len(lines) and lines[index] == line_number
+        if state and not present:
+            insort(lines, line_number)
+        elif not state and present:
+            del lines[index]
+
+
 class ScrollFlagArea(Panel):
     """Source code editor's scroll flag area"""
     WIDTH = 12
@@ -31,13 +100,17 @@ class ScrollFlagArea(Panel):
         self._range_indicator_is_visible = False
         self._alt_key_is_down = False
 
+        # Flags are painted in a pixmap, kept until they change
+        self._flags_pixmap = None
+        self._flags_key = None
+
         editor.sig_focus_changed.connect(self.update)
         editor.sig_key_pressed.connect(self.keyPressEvent)
         editor.sig_key_released.connect(self.keyReleaseEvent)
         editor.sig_alt_left_mouse_pressed.connect(self.mousePressEvent)
         editor.sig_alt_mouse_moved.connect(self.mouseMoveEvent)
         editor.sig_leave_out.connect(self.update)
-        editor.sig_flags_changed.connect(self.update)
+        editor.sig_flags_changed.connect(self.flags_changed)
 
     @property
     def slider(self):
@@ -68,47 +141,8 @@ class ScrollFlagArea(Panel):
         Override Qt method.
         Painting the scroll flag area
         """
-        make_flag = self.make_flag_qrect
-
-        # Fill the whole painting area
         painter = QPainter(self)
-        painter.fillRect(event.rect(), self.editor.sideareas_color)
-
-        # Paint warnings and todos
-        block = self.editor.document().firstBlock()
-        for line_number in range(self.editor.document().blockCount()+1):
-            data = block.userData()
-            if data:
-                if data.code_analysis:
-                    # Paint the warnings
-                    color = self.editor.warning_color
-                    for _message, error in data.code_analysis:
-                        if error:
-                            color = self.editor.error_color
-                            break
-                    self.set_painter(painter, color)
-                    painter.drawRect(make_flag(line_number))
-                if data.todo:
-                    # Paint the todos
-                    self.set_painter(painter, self.editor.todo_color)
-                    painter.drawRect(make_flag(line_number))
-                if data.breakpoint:
-                    # Paint the breakpoints
-                    self.set_painter(painter, self.editor.breakpoint_color)
-                    painter.drawRect(make_flag(line_number))
-            block = block.next()
-
-        # Paint the occurrences
-        if self.editor.occurrences:
-            self.set_painter(painter, self.editor.occurrence_color)
-            for line_number in self.editor.occurrences:
-                painter.drawRect(make_flag(line_number))
-
-        # Paint the found results
-        if self.editor.found_results:
-            self.set_painter(painter, self.editor.found_results_color)
-            for line_number in self.editor.found_results:
-                painter.drawRect(make_flag(line_number))
+        painter.drawPixmap(0, 0, self.get_flags_pixmap())
 
         # Paint the slider range
         if not self._unit_testing:
@@ -135,6 +169,74 @@ class ScrollFlagArea(Panel):
         else:
             self._range_indicator_is_visible = False
 
+    def flags_changed(self):
+        """Repaint the flags, which have changed"""
+        self._flags_pixmap = None
+        self.update()
+
+    def get_flags_key(self):
+        """
+        Return what the painting of flags depends on, besides the flags
+        themselves
+        """
+        editor = self.editor
+        vsb = editor.verticalScrollBar()
+        if self.slider:
+            geometry = (vsb.minimum(), vsb.maximum(), vsb.pageStep(),
+                        self.offset, self.get_scrollbar_position_height())
+        else:
+            # Flags are aligned with their lines
+            geometry = (editor.contentOffset().y(),
+                        editor.fontMetrics().height(),
+                        editor.document().size().height())
+        colors = tuple(QColor(color).rgba() for color in
+                       (editor.sideareas_color, editor.warning_color,
+                        editor.error_color, editor.todo_color,
+                        editor.breakpoint_color, editor.occurrence_color,
+                        editor.found_results_color))
+        return (self.width(), self.height(), self.slider, geometry, colors,
+                editor.blockCount(), editor.flag_index.version)
+
+    def get_flags_pixmap(self):
+        """Return a pixmap with the flags painted on the whole area"""
+        key = self.get_flags_key()
+        if self._flags_pixmap is not None and key == self._flags_key:
+            return self._flags_pixmap
+        editor = self.editor
+        ratio = self.devicePixelRatio()
+        pixmap = QPixmap(self.size() * ratio)
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(QColor(editor.sideareas_color))
+        painter = QPainter(pixmap)
+        flag_lines = editor.get_flag_lines()
+        for lines, color in ((flag_lines['warning'], editor.warning_color),
+                             (flag_lines['error'], editor.error_color),
+                             (flag_lines['todo'], editor.todo_color),
+                             (flag_lines['breakpoint'],
+                              editor.breakpoint_color),
+                             (editor.occurrences, editor.occurrence_color),
+                             (editor.found_results,
+                              editor.found_results_color)):
+            if lines:
+                self.paint_flags(painter, lines, color)
+        painter.end()
+        self._flags_pixmap = pixmap
+        self._flags_key = key
+        return pixmap
+
+    def paint_flags(self, painter, lines, color):
+        """
+        Paint the flags of lines, only once for lines mapped to the same
+        pixel row
+        """
+        self.set_painter(painter, color)
+        last_top = None
+        for line_number in lines:
+            rect = self.make_flag_qrect(line_number)
+            if rect.top() != last_top:
+                painter.drawRect(rect)
+                last_top = rect.top()
+
     def enterEvent(self, event):
         """Override Qt method"""
         self.update()
@@ -208,7 +310,7 @@ class ScrollFlagArea(Panel):
             # The 0.5 offset is used to align the flags with the center of
             # their corresponding text edit block before scaling.
 
-            return QRect(self.FLAGS_DX/2, position-self.FLAGS_DY/2,
+            return QRect(self.FLAGS_DX//2, int(position-self.FLAGS_DY/2),
                          self.WIDTH-self.FLAGS_DX, self.FLAGS_DY)
         else:
             # When the vertical scrollbar is not visible, the flags are
@@ -220,7 +322,7 @@ class ScrollFlagArea(Panel):
             bottom = top + self.editor.blockBoundingRect(block).height()
             middle = (top + bottom)/2
 
-            return QRect(self.FLAGS_DX/2, middle-self.FLAGS_DY/2,
+            return QRect(self.FLAGS_DX//2, int(middle-self.FLAGS_DY/2),
                          self.WIDTH-self.FLAGS_DX, self.FLAGS_DY)
 
     def make_slider_range(self, cursor_pos):
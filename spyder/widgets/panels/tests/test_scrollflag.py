@@ -176,6 +176,34 @@ def test_range_indicator_visible_on_hover_only(editor_bot):
     qtbot.waitUntil(lambda: not sfa._range_indicator_is_visible)
 
 
+def test_flag_index(editor_bot):
+    """Test that flagged lines are indexed and move with their blocks, and
+    that flags are painted again only when they change."""
+    qtbot, editor = editor_bot
+    sfa = editor.scrollflagarea
+    editor.set_text(long_code)
+
+    editor.add_remove_breakpoint(line_number=2)
+    editor.process_todo([[True, 3]])
+    editor.process_code_analysis([['E227 warning', 4], ['syntax error', 5],
+                                  ['E225 warning', 5]])
+    assert editor.get_flag_lines() == {'warning': [3], 'error': [4],
+                                       'todo': [2], 'breakpoint': [1]}
+
+    # Insert a line at the top of the file
+    cursor = editor.textCursor()
+    cursor.setPosition(0)
+    cursor.insertText('\n')
+    assert editor.get_flag_lines() == {'warning': [4], 'error': [5],
+                                       'todo': [3], 'breakpoint': [2]}
+
+    pixmap = sfa.get_flags_pixmap()
+    assert sfa.get_flags_pixmap() is pixmap
+    editor.add_remove_breakpoint(line_number=3)
+    assert editor.get_flag_lines()['breakpoint'] == []
+    assert sfa.get_flags_pixmap() is not pixmap
+
+
 @pytest.mark.skipif(PYQT4, reason="It segfaults frequently")
 def test_range_indicator_alt_modifier_response(editor_bot):
     """Test that the slider range indicator is visible while the alt key is
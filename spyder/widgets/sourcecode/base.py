@@ -349,7 +349,28 @@ class TextEditBaseWidget(QPlainTextEdit, BaseEditMixin):
             key (str) name of the extra selections group.
             extra_selections (list of sourcecode.api.TextDecoration).
         """
-        # use draw orders to highlight current_cell and current_line first
+        self._set_draw_order(key, extra_selections)
+        self.clear_extra_selections(key)
+        self.extra_selections_dict[key] = extra_selections
+
+    def add_extra_selections(self, key, extra_selections):
+        """Add extra selections to those of a key and show them.
+
+        Unlike set_extra_selections, previous decorations of the key are
+        kept, and only the ones given are added to the DecorationsManager.
+
+        Args:
+            key (str) name of the extra selections group.
+            extra_selections (list of sourcecode.api.TextDecoration).
+        """
+        self._set_draw_order(key, extra_selections)
+        self.extra_selections_dict[key] = (
+            self.get_extra_selections(key) + extra_selections)
+        self.decorations.add(extra_selections)
+
+    def _set_draw_order(self, key, extra_selections):
+        """Use draw orders to highlight current_cell and current_line
+        first"""
         draw_order = DRAW_ORDERS.get(key)
         if draw_order is None:
             draw_order = DRAW_ORDERS.get('on_top')
@@ -357,9 +378,6 @@ class TextEditBaseWidget(QPlainTextEdit, BaseEditMixin):
         for selection in extra_selections:
             selection.draw_order = draw_order
 
-        self.clear_extra_selections(key)
-        self.extra_selections_dict[key] = extra_selections
-
     def update_extra_selections(self):
         """Add extra selections to DecorationsManager.
 
@@ -378,8 +396,9 @@ class TextEditBaseWidget(QPlainTextEdit, BaseEditMixin):
         Args:
             key (str) name of the extra selections group.
         """
-        for decoration in self.extra_selections_dict.get(key, []):
-            self.decorations.remove(decoration)
+        extra_selections = self.extra_selections_dict.get(key)
+        if extra_selections:
+            self.decorations.remove(extra_selections)
         self.extra_selections_dict[key] = []
 
     def changed(self):
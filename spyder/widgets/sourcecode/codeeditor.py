@@ -20,6 +20,7 @@ Editor widget based on QtGui.QPlainTextEdit
 # Standard library imports
 from __future__ import division
 from unicodedata import category
+import bisect
 import os.path as osp
 import re
 import sre_constants
@@ -29,7 +30,7 @@ import time
 # Third party imports
 from qtpy import is_pyqt46
 from qtpy.compat import to_qvariant
-from qtpy.QtCore import QRegExp, Qt, QTimer, Signal, Slot
+from qtpy.QtCore import QPoint, QRegExp, Qt, QTimer, Signal, Slot
 from qtpy.QtGui import (QColor, QCursor, QFont, QIntValidator,
                         QKeySequence, QPaintEvent, QPainter, QMouseEvent,
                         QTextBlockUserData, QTextCharFormat, QTextCursor,
@@ -62,7 +63,7 @@ from spyder.widgets.sourcecode.kill_ring import QtKillRing
 from spyder.widgets.panels.linenumber import LineNumberArea
 from spyder.widgets.panels.edgeline import EdgeLine
 from spyder.widgets.panels.indentationguides import IndentationGuide
-from spyder.widgets.panels.scrollflag import ScrollFlagArea
+from spyder.widgets.panels.scrollflag import FlagIndex, ScrollFlagArea
 from spyder.widgets.panels.manager import PanelsManager
 from spyder.widgets.panels.codefolding import FoldingPanel
 from spyder.widgets.sourcecode.folding import IndentFoldDetector
@@ -84,6 +85,9 @@ except:
 LOG_FILENAME = get_conf_path('codeeditor.log')
 DEBUG_EDITOR = DEBUG >= 3
 
+# Number of lines whose occurrences are marked at once, after the visible ones
+OCCURRENCES_BATCH_SIZE = 500
+
 
 def is_letter_or_number(char):
     """ Returns whether the specified unicode character is a letter or a number.
@@ -379,7 +383,6 @@ class CodeEditor(TextEditBaseWidget):
 
         # Indicate occurrences of the selected word
         self.cursorPositionChanged.connect(self.__cursor_position_changed)
-        self.__find_first_pos = None
         self.__find_flags = None
 
         self.supported_language = False
@@ -388,12 +391,19 @@ class CodeEditor(TextEditBaseWidget):
         self.comment_string = None
         self._kill_ring = QtKillRing(self)
 
+        # Files too large to be highlighted, folded or analyzed
+        self.large_file = False
+
         # Block user data
         self.blockuserdata_list = []
 
         # Update breakpoints if the number of lines in the file changes
         self.blockCountChanged.connect(self.update_breakpoints)
 
+        # Lines having flags in the scroll flag area
+        self.flag_index = FlagIndex()
+        self.blockCountChanged.connect(self.flag_index_changed)
+
         # Highlight using Pygments highlighter timer
         # ---------------------------------------------------------------------
         # For files that use the PygmentsSH we parse the full file inside
@@ -414,6 +424,15 @@ class CodeEditor(TextEditBaseWidget):
         self.occurrence_timer.timeout.connect(self.__mark_occurrences)
         self.occurrences = []
         self.occurrence_color = QColor(Qt.yellow).lighter(160)
+        # Occurrences are marked in the visible lines first, and then in the
+        # others by batches, each time the event loop is idle
+        self.__occurrence_word = None
+        self.__occurrence_lines = []
+        self.occurrence_batch_timer = QTimer(self)
+        self.occurrence_batch_timer.setSingleShot(True)
+        self.occurrence_batch_timer.setInterval(0)
+        self.occurrence_batch_timer.timeout.connect(
+            self.__mark_occurrence_lines)
 
         # Mark found results
         self.textChanged.connect(self.__text_has_changed)
@@ -601,7 +620,10 @@ class CodeEditor(TextEditBaseWidget):
 
     def set_as_clone(self, editor):
         """Set as clone editor"""
+        if editor.large_file:
+            self.set_large_file_mode()
         self.setDocument(editor.document())
+        self.flag_index = editor.flag_index
         self.document_id = editor.get_document_id()
         self.highlighter = editor.highlighter
         self.eol_chars = editor.eol_chars
@@ -745,6 +767,7 @@ class CodeEditor(TextEditBaseWidget):
 
     def set_occurrence_highlighting(self, enable):
         """Enable/disable occurrence highlighting"""
+        enable = enable and not self.large_file
         self.occurrence_highlighting = enable
         if not enable:
             self.__clear_occurrences()
@@ -770,7 +793,26 @@ class CodeEditor(TextEditBaseWidget):
         else:
             self.unhighlight_current_cell()
 
+    def set_large_file_mode(self):
+        """
+        Set large file mode: the text is shown as plain text, without
+        highlighting, folding, marking occurrences nor scroll flags, and
+        isn't analyzed
+        """
+        self.large_file = True
+        self.supported_language = False
+        self.supported_cell_language = False
+        self.classfunc_match = None
+        self.set_language(None)
+        self.set_highlight_current_cell(False)
+        self.set_occurrence_highlighting(False)
+        self.panels.get(FoldingPanel).setVisible(False)
+        self.classfuncdropdown.setVisible(False)
+        self.scrollflagarea.set_enabled(False)
+
     def set_language(self, language, filename=None):
+        if self.large_file:
+            language, filename = None, None
         self.tab_indents = language in self.TAB_ALWAYS_INDENTS
         self.comment_string = ''
         sh_class = sh.TextSH
@@ -807,6 +849,9 @@ class CodeEditor(TextEditBaseWidget):
 
         self.highlighter.fold_detector = IndentFoldDetector()
         self.highlighter.editor = self
+        if self.large_file:
+            # Keep the highlighter for its colors, but don't let it highlight
+            self.highlighter.setDocument(None)
 
     def is_json(self):
         return (isinstance(self.highlighter, sh.PygmentsSH) and
@@ -929,25 +974,6 @@ class CodeEditor(TextEditBaseWidget):
             self.remove_selected_text()
 
     #------Find occurrences
-    def __find_first(self, text):
-        """Find first occurrence: scan whole document"""
-        flags = QTextDocument.FindCaseSensitively|QTextDocument.FindWholeWords
-        cursor = self.textCursor()
-        # Scanning whole document
-        cursor.movePosition(QTextCursor.Start)
-        regexp = QRegExp(r"\b%s\b" % QRegExp.escape(text), Qt.CaseSensitive)
-        cursor = self.document().find(regexp, cursor, flags)
-        self.__find_first_pos = cursor.position()
-        return cursor
-
-    def __find_next(self, text, cursor):
-        """Find next occurrence"""
-        flags = QTextDocument.FindCaseSensitively|QTextDocument.FindWholeWords
-        regexp = QRegExp(r"\b%s\b" % QRegExp.escape(text), Qt.CaseSensitive)
-        cursor = self.document().find(regexp, cursor, flags)
-        if cursor.position() != self.__find_first_pos:
-            return cursor
-
     def __cursor_position_changed(self):
         """Cursor position has changed"""
         line, column = self.get_cursor_line_column()
@@ -966,6 +992,9 @@ class CodeEditor(TextEditBaseWidget):
 
     def __clear_occurrences(self):
         """Clear occurrence markers"""
+        self.occurrence_batch_timer.stop()
+        self.__occurrence_word = None
+        self.__occurrence_lines = []
         self.occurrences = []
         self.clear_extra_selections('occurrences')
         self.sig_flags_changed.emit()
@@ -975,6 +1004,18 @@ class CodeEditor(TextEditBaseWidget):
                         underline_style=QTextCharFormat.WaveUnderline,
                         update=False):
         extra_selections = self.get_extra_selections(key)
+        selection = self.__get_selection(cursor, foreground_color,
+                                         background_color, underline_color,
+                                         underline_style)
+        extra_selections.append(selection)
+        self.set_extra_selections(key, extra_selections)
+        if update:
+            self.update_extra_selections()
+
+    def __get_selection(self, cursor, foreground_color=None,
+                        background_color=None, underline_color=None,
+                        underline_style=QTextCharFormat.WaveUnderline):
+        """Return a decoration of the text selected by cursor"""
         selection = TextDecoration(cursor)
         if foreground_color is not None:
             selection.format.setForeground(foreground_color)
@@ -987,10 +1028,7 @@ class CodeEditor(TextEditBaseWidget):
                                          to_qvariant(underline_color))
         selection.format.setProperty(QTextFormat.FullWidthSelection,
                                      to_qvariant(True))
-        extra_selections.append(selection)
-        self.set_extra_selections(key, extra_selections)
-        if update:
-            self.update_extra_selections()
+        return selection
 
     def __mark_occurrences(self):
         """Marking occurrences of the currently selected word"""
@@ -1010,22 +1048,50 @@ class CodeEditor(TextEditBaseWidget):
            to_text_string(text) == 'self'):
             return
 
-        # Highlighting all occurrences of word *text*
-        cursor = self.__find_first(text)
-        self.occurrences = []
-        while cursor:
-            self.occurrences.append(cursor.blockNumber())
-            self.__highlight_selection('occurrences', cursor,
-                                       background_color=self.occurrence_color)
-            cursor = self.__find_next(text, cursor)
-        self.update_extra_selections()
-        if len(self.occurrences) > 1 and self.occurrences[-1] == 0:
-            # XXX: this is never happening with PySide but it's necessary
-            # for PyQt4... this must be related to a different behavior for
-            # the QTextDocument.find function between those two libraries
-            self.occurrences.pop(-1)
+        # Lines with occurrences of word *text* come from the index of
+        # identifiers kept up to date by the highlighter, so the document
+        # isn't searched and the scroll flags are shown right away
+        text = to_text_string(text)
+        self.occurrences = self.highlighter.get_identifier_blocks(text)
+        self.__occurrence_word = text
+        self.__occurrence_lines = self.occurrences
+        self.__mark_occurrence_lines(batch_size=0)
         self.sig_flags_changed.emit()
 
+    def __mark_occurrence_lines(self, batch_size=None):
+        """
+        Mark the occurrences of the current word in the visible lines, and
+        in batch_size of the other lines left to mark (by default,
+        OCCURRENCES_BATCH_SIZE)
+        """
+        if batch_size is None:
+            batch_size = OCCURRENCES_BATCH_SIZE
+        lines = self.__occurrence_lines
+        first, last = self.get_visible_block_numbers()
+        start = bisect.bisect_left(lines, first)
+        end = bisect.bisect_right(lines, last)
+        others = lines[:start] + lines[end:]
+        batch = lines[start:end] + others[:batch_size]
+        self.__occurrence_lines = others[batch_size:]
+
+        word = self.__occurrence_word
+        document = self.document()
+        selections = []
+        for line_number in batch:
+            block = document.findBlockByNumber(line_number)
+            for column in self.highlighter.get_identifier_columns(block,
+                                                                  word):
+                cursor = QTextCursor(block)
+                cursor.setPosition(block.position() + column)
+                cursor.setPosition(block.position() + column + len(word),
+                                   QTextCursor.KeepAnchor)
+                selections.append(self.__get_selection(
+                    cursor, background_color=self.occurrence_color))
+        if selections:
+            self.add_extra_selections('occurrences', selections)
+        if self.__occurrence_lines:
+            self.occurrence_batch_timer.start()
+
     #-----highlight found results (find/replace widget)
     def highlight_found_results(self, pattern, words=False, regexp=False):
         """Highlight all found patterns"""
@@ -1079,6 +1145,13 @@ class CodeEditor(TextEditBaseWidget):
         point.setY(point.y()+self.panels.margin_size(Panel.Position.TOP))
         return point
 
+    def get_visible_block_numbers(self):
+        """Return the numbers of the first and last visible blocks"""
+        first = self.firstVisibleBlock().blockNumber()
+        bottom = QPoint(0, self.viewport().height() - 1)
+        last = self.cursorForPosition(bottom).blockNumber()
+        return first, max(first, last)
+
     def get_linenumber_from_mouse_event(self, event):
         """Return line number from mouse event"""
         block = self.firstVisibleBlock()
@@ -1159,6 +1232,8 @@ class CodeEditor(TextEditBaseWidget):
             if len(text) == 0 or text.startswith(('#', '"', "'")):
                 data.breakpoint = False
         block.setUserData(data)
+        self.flag_index.set_line('breakpoint', block.blockNumber(),
+                                 data.breakpoint)
         self.linenumberarea.update()
         self.sig_flags_changed.emit()
         self.breakpoints_changed.emit()
@@ -1185,6 +1260,8 @@ class CodeEditor(TextEditBaseWidget):
                 # sure if it's supposed to or not, but that seems to be the
                 # intent.
                 del data
+        self.flag_index.set_lines('breakpoint', [])
+        self.sig_flags_changed.emit()
 
     def set_breakpoints(self, breakpoints):
         """Set breakpoints"""
@@ -1196,6 +1273,19 @@ class CodeEditor(TextEditBaseWidget):
         """Update breakpoints"""
         self.breakpoints_changed.emit()
 
+    #------Scroll flags
+    def get_flag_lines(self):
+        """
+        Return a dict mapping the kinds of flags of blocks ('warning',
+        'error', 'todo' and 'breakpoint') to the sorted block numbers of the
+        lines having them
+        """
+        return self.flag_index.get_lines(self.document())
+
+    def flag_index_changed(self):
+        """Rebuild the index of flags, whose lines were moved"""
+        self.flag_index.invalidate()
+
     #-----Code introspection
     def do_completion(self, automatic=False):
         """Trigger completion"""
@@ -1314,6 +1404,31 @@ class CodeEditor(TextEditBaseWidget):
         #if self.supported_language:
             #self.highlighter.rehighlight()
 
+    def set_text_from_chunks(self, chunks):
+        """
+        Set the text of the editor from an iterator over chunks of text,
+        without ever holding all of it as a string
+        """
+        document = self.document()
+        document.setUndoRedoEnabled(False)
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+        cursor.select(QTextCursor.Document)
+        cursor.removeSelectedText()
+        first_text = None
+        try:
+            for text in chunks:
+                if first_text is None:
+                    first_text = text
+                cursor.insertText(text)
+        finally:
+            cursor.endEditBlock()
+            document.setUndoRedoEnabled(True)
+        self.moveCursor(QTextCursor.Start)
+        # EOL characters are looked for in the first chunk only
+        self.set_eol_chars(first_text or '')
+        self.new_text_set.emit()
+
     def set_text_from_file(self, filename, language=None):
         """Set the text of the editor from file *fname*"""
         text, _enc = encoding.read(filename)
@@ -1382,6 +1497,8 @@ class CodeEditor(TextEditBaseWidget):
             data.code_analysis = []
             if data.is_empty():
                 del data
+        self.flag_index.set_lines('warning', [])
+        self.flag_index.set_lines('error', [])
         self.setUpdatesEnabled(True)
         # When the new code analysis results are empty, it is necessary
         # to update manually the scrollflag and linenumber areas (otherwise,
@@ -1399,6 +1516,7 @@ class CodeEditor(TextEditBaseWidget):
         cursor = self.textCursor()
         document = self.document()
         flags = QTextDocument.FindCaseSensitively|QTextDocument.FindWholeWords
+        errors = {}
         for message, line_number in check_results:
             error = 'syntax' in message
             # Note: line_number start from 1 (not 0)
@@ -1408,6 +1526,8 @@ class CodeEditor(TextEditBaseWidget):
                 data = BlockUserData(self)
             data.code_analysis.append( (message, error) )
             block.setUserData(data)
+            if block.isValid():
+                errors[line_number-1] = errors.get(line_number-1) or error
             refs = re.findall(r"\'[a-zA-Z0-9_]*\'", message)
             for ref in refs:
                 # Highlighting found references
@@ -1440,6 +1560,11 @@ class CodeEditor(TextEditBaseWidget):
                         cursor = document.find(text, cursor, flags)
         self.update_extra_selections()
         self.setUpdatesEnabled(True)
+        self.flag_index.set_lines('warning', [line for line, error
+                                              in errors.items() if not error])
+        self.flag_index.set_lines('error', [line for line, error
+                                            in errors.items() if error])
+        self.sig_flags_changed.emit()
         self.linenumberarea.update()
         self.classfuncdropdown.update()
 
@@ -1510,6 +1635,7 @@ class CodeEditor(TextEditBaseWidget):
             data.todo = ''
             if data.is_empty():
                 del data
+        todo_lines = []
         for message, line_number in todo_results:
             block = self.document().findBlockByNumber(line_number-1)
             data = block.userData()
@@ -1517,6 +1643,9 @@ class CodeEditor(TextEditBaseWidget):
                 data = BlockUserData(self)
             data.todo = message
             block.setUserData(data)
+            if block.isValid():
+                todo_lines.append(line_number-1)
+        self.flag_index.set_lines('todo', todo_lines)
         self.sig_flags_changed.emit()
 
 
@@ -11,6 +11,7 @@ from qtpy.QtGui import QTextCursor, QTextFormat
 
 # Local imports
 from spyder.utils.qthelpers import qapplication
+from spyder.widgets.sourcecode import codeeditor
 from spyder.widgets.sourcecode.codeeditor import CodeEditor
 
 
@@ -42,7 +43,7 @@ def test_extra_selections(qtbot):
     cursor.movePosition(QTextCursor.Right, n=5)
     editor.setTextCursor(cursor)
 
-    qtbot.waitUntil(lambda: len(editor.extraSelections()) >= 6, timeout=2000)
+    qtbot.waitUntil(lambda: len(editor.extraSelections()) >= 5, timeout=2000)
     selections = editor.extraSelections()
     selected_texts = [sel.cursor.selectedText() for sel in selections]
 
@@ -57,5 +58,42 @@ def test_extra_selections(qtbot):
     assert set(selected_texts[2:5]) == set(['some_variable'])
 
 
+def test_mark_occurrences_visible_first(qtbot, monkeypatch):
+    """Test that occurrences in the visible lines are marked first."""
+    monkeypatch.setattr(codeeditor, 'OCCURRENCES_BATCH_SIZE', 10)
+    editor = construct_editor(occurrence_timeout=10)
+    qtbot.addWidget(editor)
+    editor.set_text('\n'.join('value_%d = value + %d' % (i, i)
+                              for i in range(100)))
+    editor.resize(400, 300)
+    editor.show()
+
+    # Record what is marked when the scroll flags are updated, that is
+    # before the lines which aren't visible are marked
+    marked = []
+    editor.sig_flags_changed.connect(lambda: marked.append(
+        (editor.occurrences,
+         [editor.document().findBlock(sel.cursor.position()).blockNumber()
+          for sel in editor.get_extra_selections('occurrences')])))
+
+    # Move cursor over 'value' in line 50
+    editor.go_to_line(50)
+    cursor = editor.textCursor()
+    cursor.movePosition(QTextCursor.Right, n=12)
+    editor.setTextCursor(cursor)
+
+    qtbot.waitUntil(lambda: len(editor.get_extra_selections('occurrences'))
+                    == 100, timeout=2000)
+    occurrences, lines = marked[-1]
+    assert occurrences == list(range(100))
+    first, last = editor.get_visible_block_numbers()
+    assert first <= 49 <= last
+    assert set(range(first, last + 1)) <= set(lines)
+    assert len(lines) == last - first + 1
+    texts = [sel.cursor.selectedText()
+             for sel in editor.get_extra_selections('occurrences')]
+    assert set(texts) == set(['value'])
+
+
 if __name__ == "__main__":
     pytest.main()
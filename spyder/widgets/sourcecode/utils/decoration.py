@@ -53,9 +53,18 @@ class TextDecorationsManager(Manager):
         """
         Removes a text decoration from the editor.
 
-        :param decoration: Text decoration to remove
+        :param decoration: Text decoration to remove (could be a list, to
+            update the editor only once)
         :type decoration: spyder.api.TextDecoration
         """
+        if isinstance(decoration, list):
+            removed = set(decoration)
+            decorations = [d for d in self._decorations if d not in removed]
+            if len(decorations) == len(self._decorations):
+                return False
+            self._decorations = decorations
+            self.update()
+            return True
         try:
             self._decorations.remove(decoration)
             self.update()
@@ -231,6 +231,37 @@ class EncodingStatus(StatusBarWidget):
         self.encoding.setText(str(encoding).upper().ljust(15))
 
 
+class LargeFileStatus(StatusBarWidget):
+    """Status bar widget telling if the current file is a large file."""
+
+    def __init__(self, parent, statusbar):
+        """Status bar widget telling if the current file is a large file."""
+        super(LargeFileStatus, self).__init__(parent, statusbar)
+
+        # Widget
+        self.label = QLabel(_("Large file"))
+
+        # Widget setup
+        self.label.setFont(self.label_font)
+        self.setToolTip(_("This file is shown as plain text, without syntax "
+                          "highlighting, code folding, occurrence "
+                          "highlighting nor code analysis, because it's "
+                          "larger than the size set in the Editor "
+                          "preferences"))
+
+        # Layouts
+        layout = self.layout()
+        layout.addWidget(self.label)
+        layout.addSpacing(20)
+
+        # Setup
+        self.hide()
+
+    def large_file_changed(self, large_file):
+        """Show the widget only if the current file is in large file mode."""
+        self.setVisible(large_file)
+
+
 class CursorPositionStatus(StatusBarWidget):
     """Status bar widget for the current file cursor postion."""
 
@@ -273,7 +304,8 @@ def test():
     statusbar = win.statusBar()
     swidgets = []
     for klass in (ReadWriteStatus, EOLStatus, EncodingStatus,
-                  CursorPositionStatus, MemoryStatus, CPUStatus):
+                  LargeFileStatus, CursorPositionStatus, MemoryStatus,
+                  CPUStatus):
         swidget = klass(win, statusbar)
         swidgets.append(swidget)
     win.show()
@@ -35,5 +35,17 @@ def test_dependencies(qtbot):
     assert dlg
 
 
+def test_dependencies_probed_in_background(qtbot, setup_dependencies):
+    """Test that the dialog is filled in when versions are probed."""
+    dependency = dependencies.Dependency("baz", "Non-existent module",
+                                         ">=1.0")
+    dlg = setup_dependencies
+    with qtbot.waitSignal(dlg.sig_probed, timeout=5000):
+        dlg.set_data([dependency])
+    item = dlg.treewidget.topLevelItem(0).child(0)
+    assert dependency.probed
+    assert item.text(2) != "Checking..."
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -10,6 +10,7 @@ Tests for editor.py
 
 # Standard library imports
 from sys import platform
+import threading
 try:
     from unittest.mock import Mock, MagicMock
 except ImportError:
@@ -19,11 +20,13 @@ except ImportError:
 import pytest
 from flaky import flaky
 from qtpy.QtCore import Qt
-from qtpy.QtGui import QTextCursor
+from qtpy.QtGui import QFont, QTextCursor
 
 # Local imports
+from spyder.utils import codeanalysis
 from spyder.utils.fixtures import setup_editor
-from spyder.widgets.editor import EditorStack, EditorSplitter
+from spyder.widgets.editor import (AnalysisManager, EditorStack,
+                                   EditorSplitter)
 from spyder.widgets.findreplace import FindReplace
 from spyder.py3compat import PY2
 
@@ -525,5 +528,124 @@ def test_tab_moves_focus_from_search_to_replace(editor_find_replace_bot):
     assert finder.replace_text.hasFocus()
 
 
+def test_analysis_manager_stale_jobs(qtbot):
+    """Check that only the results of the latest job of a file are kept."""
+    manager = AnalysisManager(None, max_simultaneous_jobs=1)
+    first, second = object(), object()
+    results = []
+    manager.add_job('todo', results.append, '# TODO spam', first)
+    manager.add_job('todo', results.append, '# TODO ham', second)
+    # Replaces the pending job of second
+    manager.add_job('todo', results.append, '# TODO eggs', second)
+    assert len(manager.pending_jobs) == 1
+    qtbot.waitUntil(lambda: not manager.running_jobs and
+                    not manager.pending_jobs)
+    assert results == [[('Spam', 1)], [('Eggs', 1)]]
+
+    # Results of cancelled jobs are ignored
+    manager.add_job('todo', results.append, '# TODO spam', first)
+    manager.cancel_jobs(first)
+    qtbot.waitUntil(lambda: not manager.running_jobs)
+    assert len(results) == 2
+
+
+
+def test_analysis_manager_lost_jobs(qtbot, monkeypatch):
+    """Check that jobs that fail or never finish release their slot."""
+    class FakePool(object):
+        def __init__(self):
+            self.calls = []
+
+        def apply_async(self, func, args, callback=None,
+                        error_callback=None):
+            self.calls.append(args)
+            if error_callback is not None and len(self.calls) == 1:
+                # Like in a real pool, callbacks come from another thread
+                threading.Thread(target=error_callback,
+                                 args=(RuntimeError('failed'),)).start()
+
+    pool = FakePool()
+    monkeypatch.setattr(codeanalysis, 'get_pool', lambda: pool)
+    manager = AnalysisManager(None, max_simultaneous_jobs=1)
+    manager.job_timeout = 0.2
+    first, second = object(), object()
+    results = []
+    manager.add_job('todo', results.append, '# TODO spam', first)
+    manager.add_job('todo', results.append, '# TODO ham', second)
+    if not PY2:
+        # The error of the first job freed its slot
+        qtbot.waitUntil(lambda: len(pool.calls) == 2)
+        assert results == [[]]
+    # Jobs that never finish are released after the timeout
+    manager.add_job('todo', results.append, '# TODO eggs', first)
+    qtbot.waitUntil(lambda: not manager.pending_jobs)
+    assert len(pool.calls) == 3
+
+def test_load_pending_files(base_editor_bot, tmpdir):
+    """Test that files loaded lazily are read when shown or when idle."""
+    editor_stack, qtbot = base_editor_bot
+    text = 'spam = 1\nbacon = 2\neggs = 3\n'
+    filenames = []
+    for name in ('first.py', 'second.py', 'third.py'):
+        tmpdir.join(name).write(text)
+        filenames.append(str(tmpdir.join(name)))
+    editor_stack.load(filenames[0])
+    for filename in filenames[1:]:
+        editor_stack.load(filename, set_current=False, lazy=True, line=3)
+    finfos = editor_stack.data
+    assert [finfo.is_pending() for finfo in finfos] == [False, True, True]
+    assert finfos[1].editor.toPlainText() == ''
+
+    # Showing a tab reads its file and goes to the line given
+    editor_stack.set_stack_index(1)
+    assert not finfos[1].is_pending()
+    assert finfos[1].editor.toPlainText() == text
+    assert finfos[1].editor.get_cursor_line_number() == 3
+    assert finfos[1].encoding is not None
+    assert not finfos[1].editor.document().isModified()
+
+    # The other files are read in the background
+    qtbot.waitUntil(lambda: not finfos[2].is_pending())
+    assert finfos[2].editor.toPlainText() == text
+
+
+def test_load_large_file(base_editor_bot, tmpdir):
+    """Test that large files are read in large file mode."""
+    editor_stack, qtbot = base_editor_bot
+    editor_stack.set_large_file_size(0.01)
+    text = u'spam = "\xf1and\xfa"\r\n' * 2000
+    large_file = tmpdir.join('large.py')
+    large_file.write_binary(text.encode('utf-8'))
+    tmpdir.join('small.py').write('spam = 1\n')
+    finfo = editor_stack.load(str(large_file))
+    with qtbot.waitSignal(editor_stack.sig_large_file_changed) as blocker:
+        editor_stack.refresh()
+    assert blocker.args == [True]
+    editor = finfo.editor
+    assert editor.large_file
+    assert editor.toPlainText() == text.replace('\r\n', '\n')
+    assert editor.get_line_separator() == '\r\n'
+    assert finfo.encoding == 'utf-8'
+    assert not editor.document().isModified()
+
+    # Its text isn't highlighted nor analyzed
+    assert editor.highlighter.document() is None
+    assert not editor.is_python()
+    assert not editor.occurrence_highlighting
+    editor_stack.set_occurrence_highlighting_enabled(True)
+    assert not editor.occurrence_highlighting
+
+    # Nor in its clones, nor if it's loaded lazily
+    editor_stack.set_default_font(QFont())
+    clone = editor_stack.clone_editor_from(finfo, set_current=False)
+    assert clone.large_file and not clone.is_python()
+    finfo = editor_stack.load(str(tmpdir.join('small.py')))
+    assert not finfo.editor.large_file
+    finfo = editor_stack.load(str(large_file), set_current=False, lazy=True)
+    qtbot.waitUntil(lambda: not finfo.is_pending())
+    assert finfo.editor.large_file
+    assert finfo.editor.toPlainText() == text.replace('\r\n', '\n')
+
+
 if __name__ == "__main__":
     pytest.main()
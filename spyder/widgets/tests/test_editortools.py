@@ -10,6 +10,7 @@ Tests for editortool.py
 
 # Third party imports
 import pytest
+from qtpy.QtGui import QTextCursor
 
 # Local imports
 from spyder.widgets.editortools import (OutlineExplorerWidget, FileRootItem,
@@ -119,6 +120,67 @@ def test_outline_explorer(outline_explorer_bot):
             assert item.is_method() == expected_result[2]
 
 
+def get_tree(item):
+    """Return the structure of the tree under item."""
+    children = [item.child(i) for i in range(item.childCount())]
+    return [(type(child).__name__, child.text(0), child.line,
+             child.toolTip(0), get_tree(child)) for child in children]
+
+
+@pytest.mark.parametrize('edit', [
+    (26, 'class class0(object):\n    def method0(self):\n        pass\n'),
+    (8, '    def inner(self):\n        pass\n'),
+    (25, '\n\n\n'),
+    (20, '\n# %% cell\n'),
+])
+def test_outline_explorer_incremental_update(outline_explorer_bot, edit):
+    """
+    Test that updates of the outline after editing give the same tree as
+    a new outline, and that they are skipped when nothing changed.
+    """
+    outline_explorer, qtbot = outline_explorer_bot
+    treewidget = outline_explorer.treewidget
+    editor = treewidget.current_editor
+    editor_id = treewidget.editor_ids[editor]
+    root_item = treewidget.editor_items[editor_id]
+    tree_cache = treewidget.editor_tree_cache[editor_id]
+    items = list(tree_cache.items)
+
+    # Renaming the class and inserting lines
+    line, inserted = edit
+    cursor = QTextCursor(editor.document().findBlockByNumber(line - 1))
+    cursor.insertText(inserted)
+    block = editor.document().findBlockByNumber(
+        text.splitlines().index('class class1(object):') +
+        inserted.count('\n'))
+    cursor = QTextCursor(block)
+    cursor.movePosition(QTextCursor.Right, n=len('class class'))
+    cursor.deleteChar()
+    cursor.insertText('2')
+    treewidget.update_all()
+
+    new_editor = CodeEditor(None)
+    new_editor.set_language('py', 'test_outline_explorer.py')
+    new_editor.set_text(editor.toPlainText())
+    new_explorer = OutlineExplorerWidget()
+    new_explorer.set_current_editor(
+            new_editor, 'test_outline_explorer.py', False, False)
+    new_root = new_explorer.treewidget.editor_items[
+        new_editor.get_document_id()]
+    assert get_tree(root_item) == get_tree(new_root)
+    # Items before the edits were kept
+    assert tree_cache.items[:2] == items[:2]
+
+    revision = tree_cache.revision
+    cursor.insertText('3')
+    cursor.deletePreviousChar()
+    treewidget.update_all()
+    assert tree_cache.revision != revision
+    revision = tree_cache.revision
+    treewidget.update_all()
+    assert tree_cache.revision == revision
+
+
 if __name__ == "__main__":
     import os
     pytest.main(['-x', os.path.basename(__file__), '-v', '-rw'])
@@ -10,9 +10,11 @@ Tests for explorer.py
 
 # Test library imports
 import pytest
+from qtpy.QtCore import QFileInfo
 
 # Local imports
-from spyder.widgets.explorer import FileExplorerTest, ProjectExplorerTest
+from spyder.widgets.explorer import (FileExplorerTest, IconProvider,
+                                     ProjectExplorerTest)
 
 @pytest.fixture
 def setup_file_explorer(qtbot):
@@ -42,6 +44,24 @@ def test_project_explorer(qtbot):
     pe.show()
     assert pe
 
+def test_icon_provider(qtbot, tmpdir):
+    """Test that icons are resolved once per extension."""
+    provider = IconProvider(None)
+    assert provider.get_extension('spam.tar.gz') == '.tar.gz'
+    assert provider.get_extension('spam.py') == '.py'
+    assert provider.get_icon_name('.tar.gz') == 'ArchiveFileIcon'
+    assert provider.get_icon_name('.xlsx') == 'ExcelFileIcon'
+    assert provider.get_icon_name('') == 'FileIcon'
+
+    IconProvider.extension_icons.clear()
+    tmpdir.join('spam.png').write('')
+    tmpdir.join('eggs.png').write('')
+    for fname in ('spam.png', 'eggs.png'):
+        icon = provider.icon(QFileInfo(str(tmpdir.join(fname))))
+        assert not icon.isNull()
+    assert IconProvider.extension_icons == {'.png': 'ImageFileIcon'}
+    assert not provider.icon(QFileInfo(str(tmpdir))).isNull()
+
 
 if __name__ == "__main__":
     pytest.main()
@@ -18,7 +18,8 @@ from pytestqt import qtbot
 
 # Local imports
 import spyder.widgets.findinfiles
-from spyder.widgets.findinfiles import FindInFilesWidget
+from spyder.utils.trigramindex import TrigramIndex
+from spyder.widgets.findinfiles import FindInFilesWidget, IndexThread
 
 LOCATION = os.path.realpath(os.path.join(os.getcwd(),
                                          os.path.dirname(__file__)))
@@ -132,5 +133,66 @@ def test_case_sensitive_search(qtbot):
     assert matches == {'ham.txt': [(9, 0)]}
 
 
+def test_results_row_cap(qtbot, monkeypatch):
+    """Test that only MAX_FILE_ROWS match items are created per file."""
+    monkeypatch.setattr(spyder.widgets.findinfiles, 'MAX_FILE_ROWS', 2)
+    find_in_files = setup_findinfiles(qtbot)
+    find_in_files.set_search_text('spam')
+    find_in_files.find_options.set_directory(osp.join(LOCATION, "data"))
+    find_in_files.find()
+    blocker = qtbot.waitSignal(find_in_files.sig_finished)
+    blocker.wait()
+    browser = find_in_files.result_browser
+    matches = process_search_results(browser.data)
+    assert all(len(lines) == 2 for lines in matches.values())
+    assert browser.num_matches == sum(len(lines) for lines in
+                                      expected_results().values())
+
+    # The remaining matches are shown when their item is activated
+    file_item = [item for item in browser.files.values()
+                 if item.more_item is not None][0]
+    num_matches = len(browser.matches[file_item.fullname])
+    while file_item.more_item is not None:
+        browser.activated(file_item.more_item)
+    assert file_item.childCount() == num_matches
+    assert file_item.num_rows == num_matches
+
+
+def test_search_with_project_index(qtbot, tmpdir):
+    """
+    Test that searches use the project index as it is and refresh it in
+    the background, and that files of the directories it doesn't index are
+    found.
+    """
+    root = tmpdir.mkdir('project')
+    root.join('spam.py').write('spam = 1\n')
+    root.join('ham.py').write('ham = 1\n')
+    root.join('gone.py').write('spam = 2\n')
+    index = TrigramIndex(str(root),
+                         index_path=str(tmpdir.join('index.pickle')))
+    index.refresh()
+    root.join('ham.py').write('ham = spam\n')
+    root.join('eggs.txt').write('spam\n')
+    root.join('gone.py').remove()
+    root.mkdir('.git').join('config').write('spam\n')
+    find_in_files = setup_findinfiles(qtbot, exclude=r"\.pyc$")
+    find_in_files.index_thread = IndexThread(find_in_files, index)
+    find_in_files.set_search_text('spam')
+    find_in_files.find_options.set_directory(str(root))
+
+    # Removed candidates are skipped
+    with qtbot.waitSignal(find_in_files.sig_finished):
+        find_in_files.find()
+    matches = process_search_results(find_in_files.result_browser.data)
+    assert sorted(matches) == ['spam.py']
+
+    # Changes made outside Spyder are found once the index is refreshed
+    qtbot.waitUntil(lambda: find_in_files.index_thread.isFinished())
+    with qtbot.waitSignal(find_in_files.sig_finished):
+        find_in_files.find()
+    matches = process_search_results(find_in_files.result_browser.data)
+    assert sorted(matches) == ['config', 'eggs.txt', 'ham.py', 'spam.py']
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -16,8 +16,8 @@ from qtpy.QtWidgets import QMainWindow
 
 # Local imports
 from spyder.widgets.status import (ReadWriteStatus, EOLStatus, EncodingStatus,
-                                   CursorPositionStatus, MemoryStatus,
-                                   CPUStatus)
+                                   LargeFileStatus, CursorPositionStatus,
+                                   MemoryStatus, CPUStatus)
 
 @pytest.fixture
 def setup_status_bar(qtbot):
@@ -34,11 +34,12 @@ def test_status_bar(qtbot):
     win, statusbar = setup_status_bar(qtbot)
     swidgets = []
     for klass in (ReadWriteStatus, EOLStatus, EncodingStatus,
-                  CursorPositionStatus, MemoryStatus, CPUStatus):
+                  LargeFileStatus, CursorPositionStatus, MemoryStatus,
+                  CPUStatus):
         swidget = klass(win, statusbar)
         swidgets.append(swidget)
     assert win
-    assert len(swidgets) == 6
+    assert len(swidgets) == 7
 
 
 if __name__ == "__main__":
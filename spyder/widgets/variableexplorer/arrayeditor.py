@@ -15,6 +15,8 @@ NumPy Array Editor Dialog based on Qt
 
 # Standard library imports
 from __future__ import print_function
+from collections import OrderedDict
+import re
 
 # Third party imports
 from qtpy.compat import from_qvariant, to_qvariant
@@ -89,6 +91,19 @@ LARGE_SIZE = 5e5
 LARGE_NROWS = 1e5
 LARGE_COLS = 60
 
+# Size of the tiles of cells whose texts and colors are computed at once,
+# and number of tiles kept in memory
+TILE_ROWS = 50
+TILE_COLS = 10
+MAX_TILES = 64
+
+# Resolution of the hues of QColor
+HUE_STEPS = 36000
+
+# Formats converting values with str, repr or ascii, which give different
+# results for NumPy scalars and the Python values they are converted to
+OBJECT_FORMAT_RE = re.compile(r'%[^a-zA-Z%]*[rsa]')
+
 
 #==============================================================================
 # Utility functions
@@ -110,6 +125,95 @@ def get_idx_rect(index_list):
     return ( min(rows), max(rows), min(cols), max(cols) )
 
 
+def get_python_values(array, format):
+    """
+    Return a 2D array as nested lists of values formatting like its items
+    with format: Python values when possible, which is much faster, or
+    NumPy scalars.
+    """
+    dtype = array.dtype
+    if (dtype.kind in 'biu' or dtype.type in (np.float64, np.complex128) or
+            dtype.kind == 'f' and not OBJECT_FORMAT_RE.search(format)):
+        return array.tolist()
+    return [list(row) for row in array]
+
+
+class HueColors(object):
+    """
+    Colors of given saturation, value and alpha made from arrays of hues.
+
+    Hues are rounded to the resolution of QColor, so a single QColor is
+    made for each distinct hue.
+    """
+
+    def __init__(self, saturation, value, alpha):
+        self.saturation = saturation
+        self.value = value
+        self.alpha = alpha
+        self.colors = {}
+
+    def get_color(self, hue):
+        """Return the color of hue, as QColor.fromHsvF."""
+        return QColor.fromHsvF(hue, self.saturation, self.value, self.alpha)
+
+    def get_colors(self, hues):
+        """Return the colors of an array of hues, as a list."""
+        hues = np.asarray(hues, dtype=float)
+        finite = np.isfinite(hues)
+        # Rounded as QColor does
+        steps = np.where(finite, np.floor(hues * HUE_STEPS + .5),
+                         -1).astype(int)
+        colors = self.colors
+        for step in np.unique(steps[finite]).tolist():
+            if step not in colors:
+                colors[step] = self.get_color(step / float(HUE_STEPS))
+        result = [colors.get(step) for step in steps.tolist()]
+        if not finite.all():
+            for position in np.flatnonzero(~finite).tolist():
+                result[position] = self.get_color(float(hues[position]))
+        return result
+
+
+class TileCache(object):
+    """
+    LRU cache of the display data of tiles of rows x columns cells.
+
+    make_tile(row_start, row_stop, col_start, col_stop) returns the data of
+    the cells of a tile, as a list of rows, each a list of cell data.
+    """
+
+    def __init__(self, make_tile, rows=TILE_ROWS, columns=TILE_COLS,
+                 max_tiles=MAX_TILES):
+        self.make_tile = make_tile
+        self.rows = rows
+        self.columns = columns
+        self.max_tiles = max_tiles
+        self.tiles = OrderedDict()
+
+    def get(self, row, column):
+        """Return the data of a cell, making its tile if needed."""
+        key = (row // self.rows, column // self.columns)
+        tile = self.tiles.pop(key, None)
+        if tile is None:
+            row_start = key[0] * self.rows
+            col_start = key[1] * self.columns
+            tile = self.make_tile(row_start, row_start + self.rows,
+                                  col_start, col_start + self.columns)
+            if len(self.tiles) >= self.max_tiles:
+                self.tiles.popitem(last=False)
+        self.tiles[key] = tile
+        try:
+            return tile[row % self.rows][column % self.columns]
+        except IndexError:
+            # Tiles at the end of the data are shorter, and make_tile may
+            # have left out cells it couldn't compute with the others
+            return self.make_tile(row, row + 1, column, column + 1)[0][0]
+
+    def clear(self):
+        """Drop all tiles, e.g. after the data or the format changed."""
+        self.tiles.clear()
+
+
 #==============================================================================
 # Main classes
 #==============================================================================
@@ -142,9 +246,13 @@ class ArrayModel(QAbstractTableModel):
         self.sat = .7 # Saturation
         self.val = 1. # Value
         self.alp = .6 # Alpha-channel
+        self.hue_colors = HueColors(self.sat, self.val, self.alp)
 
         self._data = data
         self._format = format
+        self.font = get_font(font_size_delta=DEFAULT_SMALL_DELTA)
+        # Texts and colors of the cells: (text, color or None)
+        self.tiles = TileCache(self.make_tile)
         
         self.total_rows = self._data.shape[0]
         self.total_cols = self._data.shape[1]
@@ -250,40 +358,102 @@ class ArrayModel(QAbstractTableModel):
             value = self._data[i, j]
         return self.changes.get((i, j), value)
 
-    def data(self, index, role=Qt.DisplayRole):
-        """Cell content"""
-        if not index.isValid():
-            return to_qvariant()
-        value = self.get_value(index)
+    def get_text(self, value):
+        """Return the text of a cell"""
         if is_binary_string(value):
             try:
                 value = to_text_string(value, 'utf8')
             except:
                 pass
-        if role == Qt.DisplayRole:
-            if value is np.ma.masked:
-                return ''
+        if value is np.ma.masked:
+            return ''
+        try:
+            return self._format % value
+        except TypeError:
+            self.readonly = True
+            return repr(value)
+        except (ValueError, OverflowError):
+            # e.g. '%d' % nan or '%d' % inf
+            return repr(value)
+
+    def get_color(self, value):
+        """Return the background color of a cell, or None"""
+        if not self.bgcolor_enabled or value is np.ma.masked:
+            return None
+        try:
+            hue = (self.hue0 +
+                   self.dhue * (float(self.vmax) - self.color_func(value))
+                   / (float(self.vmax) - self.vmin))
+            hue = float(np.abs(hue))
+        except TypeError:
+            return None
+        return self.hue_colors.get_color(hue)
+
+    def get_block_texts(self, block):
+        """Return the texts of the cells of a 2D block of data."""
+        mask = np.ma.getmaskarray(block)
+        data = np.ma.getdata(block)
+        if data.ndim == 2 and data.dtype.kind in 'biufc':
+            try:
+                texts = [[self._format % value for value in row]
+                         for row in get_python_values(data, self._format)]
+            except (TypeError, ValueError, OverflowError):
+                pass
             else:
-                try:
-                    return to_qvariant(self._format % value)
-                except TypeError:
-                    self.readonly = True
-                    return repr(value)
+                if mask.any():
+                    for i, j in zip(*np.nonzero(mask)):
+                        texts[i][j] = ''
+                return texts
+        return [[self.get_text(block[i, j]) for j in range(block.shape[1])]
+                for i in range(block.shape[0])]
+
+    def get_block_colors(self, block):
+        """Return the background colors of the cells of a 2D block of
+        data."""
+        rows, columns = block.shape[:2]
+        if not self.bgcolor_enabled:
+            return [[None] * columns for i in range(rows)]
+        mask = np.ma.getmaskarray(block)
+        data = np.ma.getdata(block)
+        if data.ndim == 2 and data.dtype.kind in 'biufc':
+            vmax = float(self.vmax)
+            hues = np.abs(self.hue0 + self.dhue *
+                          (vmax - self.color_func(data).astype(float))
+                          / (vmax - self.vmin))
+            colors = self.hue_colors.get_colors(hues.ravel())
+            colors = [colors[i * columns:(i + 1) * columns]
+                      for i in range(rows)]
+            if mask.any():
+                for i, j in zip(*np.nonzero(mask)):
+                    colors[i][j] = None
+            return colors
+        return [[self.get_color(block[i, j]) for j in range(columns)]
+                for i in range(rows)]
+
+    def make_tile(self, row_start, row_stop, col_start, col_stop):
+        """Compute the texts and colors of a tile of cells at once."""
+        block = self._data[row_start:row_stop, col_start:col_stop]
+        texts = self.get_block_texts(block)
+        colors = self.get_block_colors(block)
+        for (i, j), value in self.changes.items():
+            if row_start <= i < row_stop and col_start <= j < col_stop:
+                texts[i - row_start][j - col_start] = self.get_text(value)
+                colors[i - row_start][j - col_start] = self.get_color(value)
+        return [list(zip(*cells)) for cells in zip(texts, colors)]
+
+    def data(self, index, role=Qt.DisplayRole):
+        """Cell content"""
+        if not index.isValid():
+            return to_qvariant()
+        if role == Qt.DisplayRole:
+            return to_qvariant(self.tiles.get(index.row(),
+                                               index.column())[0])
         elif role == Qt.TextAlignmentRole:
             return to_qvariant(int(Qt.AlignCenter|Qt.AlignVCenter))
-        elif role == Qt.BackgroundColorRole and self.bgcolor_enabled \
-          and value is not np.ma.masked:
-            try:
-                hue = (self.hue0 +
-                       self.dhue * (float(self.vmax) - self.color_func(value))
-                       / (float(self.vmax) - self.vmin))
-                hue = float(np.abs(hue))
-                color = QColor.fromHsvF(hue, self.sat, self.val, self.alp)
-                return to_qvariant(color)
-            except TypeError:
-                return to_qvariant()
+        elif role == Qt.BackgroundColorRole and self.bgcolor_enabled:
+            return to_qvariant(self.tiles.get(index.row(), index.column())[1])
         elif role == Qt.FontRole:
-            return to_qvariant(get_font(font_size_delta=DEFAULT_SMALL_DELTA))
+            return to_qvariant(self.font)
         return to_qvariant()
 
     def setData(self, index, value, role=Qt.EditRole):
@@ -324,12 +494,14 @@ class ArrayModel(QAbstractTableModel):
 
         # Add change to self.changes
         self.changes[(i, j)] = val
-        self.dataChanged.emit(index, index)
         if not is_string(val):
             if val > self.vmax:
                 self.vmax = val
             if val < self.vmin:
                 self.vmin = val
+        # The colors of all the cells may have changed with vmin or vmax
+        self.tiles.clear()
+        self.dataChanged.emit(index, index)
         return True
 
     def flags(self, index):
@@ -350,6 +522,7 @@ class ArrayModel(QAbstractTableModel):
             return to_qvariant(labels[section])
 
     def reset(self):
+        self.tiles.clear()
         self.beginResetModel()
         self.endResetModel()
 
@@ -18,12 +18,12 @@ Collections (i.e. dictionary, list, set and tuple) editor widget and dialog
 
 # Standard library imports
 from __future__ import print_function
+import bisect
 import datetime
 import gc
 import sys
 
 # Third party imports
-import cloudpickle
 from qtpy.compat import getsavefilename, to_qvariant
 from qtpy.QtCore import (QAbstractTableModel, QDateTime, QModelIndex, Qt,
                          Signal, Slot)
@@ -31,7 +31,8 @@ from qtpy.QtGui import QColor, QKeySequence
 from qtpy.QtWidgets import (QAbstractItemDelegate, QApplication, QDateEdit,
                             QDateTimeEdit, QDialog, QDialogButtonBox,
                             QInputDialog, QItemDelegate, QLineEdit, QMenu,
-                            QMessageBox, QTableView, QVBoxLayout, QWidget)
+                            QMessageBox, QProgressDialog, QTableView,
+                            QVBoxLayout, QWidget)
 
 # Local import
 from spyder.config.base import _
@@ -55,12 +56,10 @@ if ndarray is not FakeObject:
     from spyder.widgets.variableexplorer.arrayeditor import ArrayEditor
 
 if DataFrame is not FakeObject:
-    from spyder.widgets.variableexplorer.dataframeeditor import DataFrameEditor
+    from spyder.widgets.variableexplorer.dataframeeditor import (
+        DataFrameEditor, LARGE_SIZE as DATAFRAME_LARGE_SIZE)
 
 
-# To be able to get and set variables between Python 2 and 3
-PICKLE_PROTOCOL = 2
-
 LARGE_NROWS = 100
 ROWS_TO_LOAD = 50
 
@@ -110,6 +109,7 @@ class ReadOnlyCollectionsModel(QAbstractTableModel):
             self.title = self.title + ' - '
         self.sizes = []
         self.types = []
+        self.sort_order = None
         self.set_data(data)
         
     def get_data(self):
@@ -196,6 +196,7 @@ class ReadOnlyCollectionsModel(QAbstractTableModel):
     def sort(self, column, order=Qt.AscendingOrder):
         """Overriding sort method"""
         reverse = (order==Qt.DescendingOrder)
+        self.sort_order = (column, reverse)
         if column == 0:
             self.sizes = sort_against(self.sizes, self.keys, reverse)
             self.types = sort_against(self.types, self.keys, reverse)
@@ -227,6 +228,61 @@ class ReadOnlyCollectionsModel(QAbstractTableModel):
         self.beginResetModel()
         self.endResetModel()
 
+    def apply_delta(self, changed, removed):
+        """
+        Apply the changes of a remote view without resetting the model:
+        entries in *changed* are updated or added, and keys in *removed*
+        are deleted
+        """
+        for key in removed:
+            if key not in self._data:
+                continue
+            row = self.keys.index(key)
+            loaded = row < self.rows_loaded
+            if loaded:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self.sizes[row]
+                del self.types[row]
+                self.rows_loaded -= 1
+            del self.keys[row]
+            del self._data[key]
+            self.total_rows -= 1
+            if loaded:
+                self.endRemoveRows()
+
+        for key, entry in list(changed.items()):
+            if key in self._data:
+                self._data[key] = entry
+                row = self.keys.index(key)
+                if row < self.rows_loaded:
+                    self.sizes[row] = entry['size']
+                    self.types[row] = entry['type']
+                    self.dataChanged.emit(self.index(row, 0),
+                                          self.index(row, 3))
+            else:
+                row = self.get_insertion_row(key)
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._data[key] = entry
+                self.keys.insert(row, key)
+                self.sizes.insert(row, entry['size'])
+                self.types.insert(row, entry['type'])
+                self.rows_loaded += 1
+                self.total_rows += 1
+                self.endInsertRows()
+
+    def get_insertion_row(self, key):
+        """Return the row where a new key has to be inserted"""
+        loaded_keys = self.keys[:self.rows_loaded]
+        if self.sort_order is not None and self.sort_order[0] == 0:
+            try:
+                if self.sort_order[1]:
+                    return len(loaded_keys) - bisect.bisect_left(
+                        loaded_keys[::-1], key)
+                return bisect.bisect_right(loaded_keys, key)
+            except TypeError:
+                pass
+        return len(loaded_keys)
+
     def columnCount(self, qindex=QModelIndex()):
         """Array column number"""
         return 4
@@ -439,6 +495,13 @@ class CollectionsDelegate(QItemDelegate):
                                    "<i>%s</i>"
                                    ) % to_text_string(msg))
             return
+        return self.create_value_editor(parent, index, value)
+
+    def create_value_editor(self, parent, index, value):
+        """
+        Return the editor of value, the value at index, if it's edited in
+        place. Otherwise show the dialog to edit it and return None.
+        """
         key = index.model().get_key(index)
         readonly = isinstance(value, (tuple, set)) or self.parent().readonly \
                    or not is_known_type(value)
@@ -1393,6 +1456,103 @@ class RemoteCollectionsDelegate(CollectionsDelegate):
             name = index.model().keys[index.row()]
             self.parent().new_value(name, value)
 
+    def createEditor(self, parent, option, index):
+        """Overriding method createEditor"""
+        if (index.column() == 3 and DataFrame is not FakeObject and
+                self.is_large_dataframe(index)):
+            self.create_kernel_dataframe_editor(index)
+            return None
+        if index.column() == 3 and self.is_edited_in_dialog(index):
+            # The dialog is shown once the value arrives, so the interface
+            # doesn't freeze while large values are transferred
+            key = index.model().get_key(index)
+            self.parent().request_value(
+                key, lambda value, key=key: self.show_dialog(key, value))
+            return None
+        return CollectionsDelegate.createEditor(self, parent, option, index)
+
+    def is_edited_in_dialog(self, index):
+        """
+        Return True if the variable at index is a collection, an array,
+        an image or a DataFrame, which are edited in a dialog
+        """
+        name = index.model().keys[index.row()]
+        try:
+            properties = self.parent().var_properties[name]
+        except KeyError:
+            return False
+        return any(properties.get(kind) for kind in
+                   ('is_list', 'is_dict', 'is_set', 'is_array', 'is_image',
+                    'is_data_frame', 'is_series'))
+
+    def show_dialog(self, key, value):
+        """Show the dialog editing value, the value of variable key"""
+        index = self.parent().model.get_index_from_key(key)
+        if not index.isValid():
+            # The variable was removed meanwhile
+            return
+        editor = self.create_value_editor(self.parent(), index, value)
+        if editor is not None:
+            # Only happens if the type of the variable changed meanwhile
+            editor.deleteLater()
+
+    def is_large_dataframe(self, index):
+        """
+        Return True if the variable at index is a DataFrame or Series too
+        large to be sent to the frontend
+        """
+        name = index.model().keys[index.row()]
+        try:
+            if not (self.parent().is_data_frame(name) or
+                    self.parent().is_series(name)):
+                return False
+            size = 1
+            for dim in index.model().sizes[index.row()]:
+                size *= dim
+        except (KeyError, TypeError, IndexError):
+            return False
+        return size > DATAFRAME_LARGE_SIZE
+
+    def create_kernel_dataframe_editor(self, index):
+        """
+        Show a DataFrame or Series with an editor which only requests
+        from the kernel the rows and columns it shows
+        """
+        name = index.model().keys[index.row()]
+        shellwidget = self.parent().shellwidget
+        try:
+            info = shellwidget.open_dataframe(name)
+            if info is None:
+                return
+        except Exception as msg:
+            QMessageBox.critical(self.parent(), _("Error"),
+                                 _("Spyder was unable to retrieve the value of "
+                                   "this variable from the console.<br><br>"
+                                   "The error mesage was:<br>"
+                                   "<i>%s</i>"
+                                   ) % to_text_string(msg))
+            return
+        editor = DataFrameEditor()
+        editor.setup_and_check_kernel(shellwidget, info, title=name)
+        editor.dataModel.set_format(index.model().dataframe_format)
+        editor.sig_option_changed.connect(self.change_option)
+
+        # Edits are sent to the kernel by the model, so the value is never
+        # set from editor_accepted
+        model = editor.dataModel
+        if not self.parent().readonly:
+            editor.accepted.connect(
+                lambda model=model: self.commit_kernel_dataframe(model))
+        editor.finished.connect(lambda result, model=model: model.close())
+        self.create_dialog(editor, dict(model=index.model(), editor=editor,
+                                        key=name, readonly=True))
+
+    def commit_kernel_dataframe(self, model):
+        """Send the edits of a kernel backed DataFrame editor"""
+        if model.edits:
+            model.commit()
+            self.parent().shellwidget.refresh_namespacebrowser()
+
 
 class RemoteCollectionsEditorTableView(BaseTableView):
     """DictEditor table view"""
@@ -1416,6 +1576,13 @@ class RemoteCollectionsEditorTableView(BaseTableView):
         self.delegate = RemoteCollectionsDelegate(self)
         self.setItemDelegate(self.delegate)
 
+        # Values requested to the kernel, by transfer id
+        self.value_requests = {}
+        # Size in MB above which users have to confirm getting values
+        self.confirm_transfer_size = None
+        if shellwidget is not None:
+            shellwidget.sig_value_download.connect(self.value_download)
+
         self.setup_table()
         self.menu = self.setup_menu(minmax)
 
@@ -1428,13 +1595,81 @@ class RemoteCollectionsEditorTableView(BaseTableView):
         self.shellwidget._kernel_value = None
         return value
 
+    def request_value(self, name, callback):
+        """
+        Get the value of a variable without waiting for it, and call
+        callback with it once it arrives
+        """
+        max_size = None
+        if self.confirm_transfer_size:
+            max_size = int(self.confirm_transfer_size * 1024 ** 2)
+        transfer_id = self.shellwidget.request_value(name, max_size)
+        self.value_requests[transfer_id] = dict(name=name, callback=callback,
+                                                dialog=None)
+
+    def cancel_value_request(self, transfer_id):
+        """Stop getting a value"""
+        request = self.value_requests.pop(transfer_id, None)
+        if request is not None:
+            self.shellwidget.cancel_value_request(transfer_id)
+            if request['dialog'] is not None:
+                request['dialog'].close()
+                request['dialog'].deleteLater()
+
+    @Slot(object)
+    def value_download(self, progress):
+        """Show the progress of a value requested to the kernel"""
+        transfer_id = progress['id']
+        request = self.value_requests.get(transfer_id)
+        if request is None:
+            return
+        name = request['name']
+        if progress['refused']:
+            answer = QMessageBox.warning(
+                self, _("Warning"),
+                _("The value of <b>%s</b> takes %.1f MB. Getting it from "
+                  "the console can take some time.<br><br>"
+                  "Do you want to continue anyway?"
+                  ) % (name, progress['size'] / 1024. ** 2),
+                QMessageBox.Yes | QMessageBox.No)
+            if answer == QMessageBox.Yes:
+                self.shellwidget.continue_value_request(transfer_id)
+            else:
+                self.cancel_value_request(transfer_id)
+        elif progress['done']:
+            self.value_requests.pop(transfer_id)
+            if request['dialog'] is not None:
+                request['dialog'].close()
+                request['dialog'].deleteLater()
+            if progress['error'] is not None:
+                QMessageBox.critical(self, _("Error"),
+                                     _("Spyder was unable to retrieve the "
+                                       "value of this variable from the "
+                                       "console.<br><br>"
+                                       "The error mesage was:<br>"
+                                       "<i>%s</i>"
+                                       ) % to_text_string(progress['error']))
+            else:
+                request['callback'](progress['value'])
+        else:
+            dialog = request['dialog']
+            if dialog is None:
+                dialog = QProgressDialog(
+                    _("Getting the value of %s...") % name, _("Cancel"),
+                    0, 100, self)
+                dialog.setWindowTitle(_("Variable explorer"))
+                dialog.setMinimumDuration(0)
+                dialog.canceled.connect(
+                    lambda transfer_id=transfer_id:
+                    self.cancel_value_request(transfer_id))
+                request['dialog'] = dialog
+            dialog.setValue(int(100 * progress['received'] /
+                                max(progress['size'], 1)))
+
     def new_value(self, name, value):
         """Create new value in data"""
         try:
-            # We need to enclose values in a list to be able to send
-            # them to the kernel in Python 2
-            svalue = [cloudpickle.dumps(value, protocol=PICKLE_PROTOCOL)]
-            self.shellwidget.set_value(name, svalue)
+            self.shellwidget.set_value(name, value)
         except TypeError as e:
             QMessageBox.critical(self, _("Error"),
                                  "TypeError: %s" % to_text_string(e))
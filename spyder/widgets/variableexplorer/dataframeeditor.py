@@ -24,6 +24,7 @@ Pandas DataFrame Editor Dialog
 """
 
 # Standard library imports
+from collections import OrderedDict
 import time
 
 # Third party imports
@@ -50,7 +51,10 @@ from spyder.utils import encoding
 from spyder.utils import icon_manager as ima
 from spyder.utils.qthelpers import (add_actions, create_action,
                                     keybinding, qapplication)
-from spyder.widgets.variableexplorer.arrayeditor import get_idx_rect
+from spyder.widgets.variableexplorer.arrayeditor import (get_idx_rect,
+                                                         HueColors,
+                                                         TileCache)
+from spyder.widgets.variableexplorer.utils import get_columns_minmax
 
 # Supported Numbers and complex numbers
 REAL_NUMBER_TYPES = (float, int, np.int64, np.int32)
@@ -67,6 +71,17 @@ LARGE_NROWS = 1e5
 LARGE_COLS = 60
 ROWS_TO_LOAD = 500
 COLS_TO_LOAD = 40
+# Note: the size of the tiles of cells whose texts and colors are computed at
+# once (see TileCache) must divide ROWS_TO_LOAD and COLS_TO_LOAD, so a tile
+# is always in a single window of kernel backed models
+
+# Number of windows of ROWS_TO_LOAD x COLS_TO_LOAD cells kept in memory by
+# kernel backed models
+MAX_WINDOWS = 32
+
+# Text of the cells and labels of kernel backed models whose window is still
+# to come from the kernel
+LOADING_TEXT = u'\u2026'
 
 # Background colours
 BACKGROUND_NUMBER_MINHUE = 0.66 # hue for largest number
@@ -108,6 +123,10 @@ class DataFrameModel(QAbstractTableModel):
     https://github.com/wavexx/gtabview/blob/master/gtabview/models.py
     """
 
+    # True if the min/max of columns are computed only when needed, even
+    # for large DataFrames
+    minmax_on_demand = False
+
     def __init__(self, dataFrame, format=DEFAULT_FORMAT, parent=None):
         QAbstractTableModel.__init__(self)
         self.dialog = parent
@@ -116,16 +135,25 @@ class DataFrameModel(QAbstractTableModel):
         self.df_header = dataFrame.columns.tolist()
         self._format = format
         self.complex_intran = None
-        
-        self.total_rows = self.df.shape[0]
-        self.total_cols = self.df.shape[1]
+        self.init_display()
+
+    def init_display(self):
+        """Setup background colors and paging according to the shape."""
+        # Texts and colors of the cells: (text, color or None)
+        self.tiles = TileCache(self.make_tile)
+        self.hue_colors = HueColors(BACKGROUND_NUMBER_SATURATION,
+                                    BACKGROUND_NUMBER_VALUE,
+                                    BACKGROUND_NUMBER_ALPHA)
+        self.font = get_font(font_size_delta=DEFAULT_SMALL_DELTA)
+        self.total_rows = self.shape[0]
+        self.total_cols = self.shape[1]
         size = self.total_rows * self.total_cols
 
         self.max_min_col = None
         if size < LARGE_SIZE:
-            self.max_min_col_update()
             self.colum_avg_enabled = True
             self.bgcolor_enabled = True
+            self.max_min_col_update()
             self.colum_avg(1)
         else:
             self.colum_avg_enabled = False
@@ -211,24 +239,10 @@ class DataFrameModel(QAbstractTableModel):
         minimum of the absolute values. If vmax equals vmin, then vmin is 
         decreased by one.
         """
-        if self.df.shape[0] == 0: # If no rows to compute max/min then return
-            return
-        self.max_min_col = []
-        for dummy, col in self.df.iteritems():
-            if col.dtype in REAL_NUMBER_TYPES + COMPLEX_NUMBER_TYPES:
-                if col.dtype in REAL_NUMBER_TYPES:
-                    vmax = col.max(skipna=True)
-                    vmin = col.min(skipna=True)
-                else:
-                    vmax = col.abs().max(skipna=True)
-                    vmin = col.abs().min(skipna=True)
-                if vmax != vmin:
-                    max_min = [vmax, vmin]
-                else:
-                    max_min = [vmax, vmin - 1]
-            else:
-                max_min = None
-            self.max_min_col.append(max_min)
+        max_min_col = get_columns_minmax(self.df)
+        # If no rows to compute max/min then keep the previous ones
+        if max_min_col is not None:
+            self.max_min_col = max_min_col
 
     def get_format(self):
         """Return current format"""
@@ -256,10 +270,12 @@ class DataFrameModel(QAbstractTableModel):
 
     def get_bgcolor(self, index):
         """Background color depending on value."""
-        column = index.column()
         if not self.bgcolor_enabled:
             return
-        value = self.get_value(index.row(), column)
+        return self.tiles.get(index.row(), index.column())[1]
+
+    def get_value_bgcolor(self, value, column):
+        """Background color of a value of a column."""
         if self.max_min_col[column] is None:
             color = QColor(BACKGROUND_NONNUMBER_COLOR)
             if is_text_string(value):
@@ -292,34 +308,113 @@ class DataFrameModel(QAbstractTableModel):
             value = self.df.iloc[row, column]
         return value
 
+    def set_value(self, row, column, value):
+        """Set the value of a cell of the DataFrame."""
+        self.df.iloc[row, column] = value
+
+    def get_frame(self, row_min, row_max, col_min, col_max):
+        """Return the DataFrame restricted to the given rows and columns."""
+        return self.df.iloc[slice(row_min, row_max + 1),
+                            slice(col_min, col_max + 1)]
+
+    def get_block(self, row_start, row_stop, col_start, col_stop):
+        """Return the DataFrame of the cells of a tile."""
+        return self.df.iloc[row_start:row_stop, col_start:col_stop]
+
     def update_df_index(self):
         """"Update the DataFrame index"""
         self.df_index = self.df.index.tolist()
 
+    def get_text(self, value):
+        """Return the text of a cell"""
+        if isinstance(value, float):
+            try:
+                return self._format % value
+            except (ValueError, TypeError):
+                # may happen if format = '%d' and value = NaN;
+                # see issue 4139
+                return DEFAULT_FORMAT % value
+        else:
+            try:
+                return to_text_string(value)
+            except UnicodeDecodeError:
+                return encoding.to_unicode(value)
+
+    def get_column_texts(self, column):
+        """Return the texts of the cells of a column of a tile."""
+        dtype = column.dtype
+        if isinstance(dtype, np.dtype) and dtype.kind in 'biuO':
+            # These values are given as they are by iat. Columns of
+            # categorical and other extension dtypes go through iat
+            values = column.tolist()
+        elif dtype == np.float64:
+            values = column.tolist()
+            try:
+                return [self._format % value for value in values]
+            except (ValueError, TypeError, OverflowError):
+                pass
+        else:
+            values = [column.iat[i] for i in range(len(column))]
+        return [self.get_text(value) for value in values]
+
+    def get_column_bgcolors(self, column, position):
+        """Return the background colors of the cells of a column of a tile,
+        position being its position in the DataFrame."""
+        if not self.bgcolor_enabled:
+            return [None] * len(column)
+        if self.max_min_col[position] is None:
+            string_color = self.get_value_bgcolor('', position)
+            misc_color = self.get_value_bgcolor(None, position)
+            if isinstance(column.dtype, np.dtype):
+                values = column.tolist()
+            else:
+                values = [column.iat[i] for i in range(len(column))]
+            return [string_color if is_text_string(value) else misc_color
+                    for value in values]
+        else:
+            vmax, vmin = self.return_max(self.max_min_col, position)
+            try:
+                values = column.values
+                if column.dtype.kind == 'c':
+                    values = np.abs(values)
+                hues = np.abs(BACKGROUND_NUMBER_MINHUE +
+                              BACKGROUND_NUMBER_HUERANGE *
+                              (vmax - values.astype(float)) / (vmax - vmin))
+            except (TypeError, ValueError):
+                # e.g. a value of another type set by an edit
+                pass
+            else:
+                return self.hue_colors.get_colors(np.where(hues > 1, 1,
+                                                           hues))
+        return [self.get_value_bgcolor(column.iat[i], position)
+                for i in range(len(column))]
+
+    def make_tile(self, row_start, row_stop, col_start, col_stop):
+        """Compute the texts and colors of a tile of cells at once."""
+        block = self.get_block(row_start, row_stop, col_start, col_stop)
+        if block is None:
+            # Cells still to come from a kernel
+            return [[(LOADING_TEXT, None)] * (col_stop - col_start)
+                    for row in range(row_start, row_stop)]
+        columns = []
+        for k in range(block.shape[1]):
+            column = block.iloc[:, k]
+            columns.append(list(zip(
+                self.get_column_texts(column),
+                self.get_column_bgcolors(column, col_start + k))))
+        return [list(row) for row in zip(*columns)]
+
     def data(self, index, role=Qt.DisplayRole):
         """Cell content"""
         if not index.isValid():
             return to_qvariant()
         if role == Qt.DisplayRole or role == Qt.EditRole:
-            column = index.column()
-            row = index.row()
-            value = self.get_value(row, column)
-            if isinstance(value, float):
-                try:
-                    return to_qvariant(self._format % value)
-                except (ValueError, TypeError):
-                    # may happen if format = '%d' and value = NaN;
-                    # see issue 4139
-                    return to_qvariant(DEFAULT_FORMAT % value)
-            else:
-                try:
-                    return to_qvariant(to_text_string(value))
-                except UnicodeDecodeError:
-                    return to_qvariant(encoding.to_unicode(value))
+            return to_qvariant(self.tiles.get(index.row(),
+                                               index.column())[0])
         elif role == Qt.BackgroundColorRole:
             return to_qvariant(self.get_bgcolor(index))
         elif role == Qt.FontRole:
-            return to_qvariant(get_font(font_size_delta=DEFAULT_SMALL_DELTA))
+            return to_qvariant(self.font)
         return to_qvariant()
 
     def sort(self, column, order=Qt.AscendingOrder):
@@ -379,9 +474,9 @@ class DataFrameModel(QAbstractTableModel):
                 val = from_qvariant(value, str)
                 if change_type is bool:
                     val = bool_false_check(val)
-                self.df.iloc[row, column] = change_type(val)
+                self.set_value(row, column, change_type(val))
             except ValueError:
-                self.df.iloc[row, column] = change_type('0')
+                self.set_value(row, column, change_type('0'))
         else:
             val = from_qvariant(value, str)
             current_value = self.get_value(row, column)
@@ -391,7 +486,7 @@ class DataFrameModel(QAbstractTableModel):
             if (isinstance(current_value, supported_types) or
                     is_text_string(current_value)):
                 try:
-                    self.df.iloc[row, column] = current_value.__class__(val)
+                    self.set_value(row, column, current_value.__class__(val))
                 except (ValueError, OverflowError) as e:
                     QMessageBox.critical(self.dialog, "Error",
                                          str(type(e).__name__) + ": " + str(e))
@@ -402,6 +497,8 @@ class DataFrameModel(QAbstractTableModel):
                                      .format(type(current_value).__name__))
                 return False
         self.max_min_col_update()
+        # The colors of all the cells may have changed with the min/max
+        self.tiles.clear()
         return True
 
     def get_data(self):
@@ -435,7 +532,7 @@ class DataFrameModel(QAbstractTableModel):
     def columnCount(self, index=QModelIndex()):
         """DataFrame column number"""
         # This is done to implement series
-        if len(self.df.shape) == 1:
+        if len(self.shape) == 1:
             return 2
         elif self.total_cols <= self.cols_loaded:
             return self.total_cols
@@ -443,10 +540,297 @@ class DataFrameModel(QAbstractTableModel):
             return self.cols_loaded
 
     def reset(self):
+        self.tiles.clear()
         self.beginResetModel()
         self.endResetModel()
 
 
+class KernelDataFrameModel(DataFrameModel):
+    """
+    DataFrame model whose data stays in a kernel.
+
+    Only the windows of ROWS_TO_LOAD x COLS_TO_LOAD cells being shown are
+    requested from the kernel, which also sorts the rows and computes the
+    min/max of the columns (see RemoteDataFrame). Edits are kept here
+    until they are committed.
+
+    Windows and min/max are requested without waiting for them, so painting
+    never blocks on the kernel: LOADING_TEXT is shown until they arrive
+    through the sig_dataframe_reply signal of the client, and then
+    dataChanged and headerDataChanged are emitted.
+
+    client is an object with the methods and signals of
+    NamepaceBrowserWidget for kernel backed DataFrame editors and info the
+    structure returned by its open_dataframe method.
+    """
+
+    minmax_on_demand = True
+
+    def __init__(self, client, info, format=DEFAULT_FORMAT, parent=None):
+        QAbstractTableModel.__init__(self)
+        self.dialog = parent
+        self.client = client
+        self.info = info
+        self.df = None
+        self._format = format
+        self.complex_intran = None
+        # (row window, column window) -> (row positions, DataFrame)
+        self.windows = OrderedDict()
+        # Windows requested from the kernel and still to come
+        self.requested_windows = set()
+        self.minmax_requested = False
+        # (row position, column) -> value
+        self.edits = {}
+        self.client.sig_dataframe_reply.connect(self.handle_reply)
+        self.init_display()
+
+    @property
+    def shape(self):
+        """Return the shape of the dataframe."""
+        return self.info['shape']
+
+    @property
+    def header_shape(self):
+        """Return the levels for the columns and rows of the dataframe."""
+        return self.info['header_shape']
+
+    def get_window(self, row, column):
+        """
+        Return the (positions, frame) window containing a cell, or None if
+        it's still to come from the kernel, after requesting it.
+        """
+        key = (row // ROWS_TO_LOAD, column // COLS_TO_LOAD)
+        window = self.windows.pop(key, None)
+        if window is None:
+            if key not in self.requested_windows:
+                self.requested_windows.add(key)
+                row_start = key[0] * ROWS_TO_LOAD
+                col_start = key[1] * COLS_TO_LOAD
+                self.client.request_dataframe_window(
+                    self.info['id'], row_start, row_start + ROWS_TO_LOAD,
+                    col_start, col_start + COLS_TO_LOAD)
+            return None
+        self.windows[key] = window
+        return window
+
+    def store_window(self, key, window):
+        """Keep a window, dropping the least recently used one if needed"""
+        self.requested_windows.discard(key)
+        if len(self.windows) >= MAX_WINDOWS:
+            self.windows.popitem(last=False)
+        self.windows[key] = window
+
+    def load_window(self, row, column):
+        """
+        Return the window containing a cell, getting it from the kernel
+        right away if needed.
+
+        This is only done for edits, which need the current value of the
+        cell, e.g. when its window was dropped or requested again after a
+        sort. A reply to a pending request for it will be ignored.
+        """
+        key = (row // ROWS_TO_LOAD, column // COLS_TO_LOAD)
+        window = self.windows.get(key)
+        if window is None:
+            row_start = key[0] * ROWS_TO_LOAD
+            col_start = key[1] * COLS_TO_LOAD
+            window = self.client.get_dataframe_window(
+                self.info['id'], row_start, row_start + ROWS_TO_LOAD,
+                col_start, col_start + COLS_TO_LOAD)
+            self.store_window(key, window)
+            # Tiles may show the cells as still to come
+            self.tiles.clear()
+        return window
+
+    def handle_reply(self, reply):
+        """Show a window or the min/max sent by the kernel."""
+        if reply['id'] != self.info['id']:
+            return
+        if reply['kind'] == 'minmax':
+            if not self.minmax_requested:
+                return
+            self.minmax_requested = False
+            self.max_min_col = reply['value']
+            self.tiles.clear()
+            if self.rowCount() and self.columnCount():
+                self.dataChanged.emit(
+                    self.index(0, 0),
+                    self.index(self.rowCount() - 1, self.columnCount() - 1))
+            return
+        row_start, row_stop, col_start, col_stop = reply['window']
+        key = (row_start // ROWS_TO_LOAD, col_start // COLS_TO_LOAD)
+        if key not in self.requested_windows:
+            # e.g. the rows were sorted since it was requested
+            return
+        self.store_window(key, reply['value'])
+        self.tiles.clear()
+        row_last = min(row_stop, self.rowCount()) - 1
+        col_last = min(col_stop, self.columnCount()) - 1
+        if row_last >= row_start and col_last >= col_start:
+            self.dataChanged.emit(self.index(row_start, col_start),
+                                  self.index(row_last, col_last))
+        self.headerDataChanged.emit(Qt.Horizontal, col_start,
+                                    min(col_stop, self.total_cols) - 1)
+        self.headerDataChanged.emit(Qt.Vertical, row_start,
+                                    min(row_stop, self.total_rows) - 1)
+
+    def data(self, index, role=Qt.DisplayRole):
+        """Cell content, or LOADING_TEXT until its window arrives"""
+        if (index.isValid() and
+                self.get_window(index.row(), index.column()) is None):
+            if role == Qt.DisplayRole or role == Qt.EditRole:
+                return to_qvariant(LOADING_TEXT)
+            elif role == Qt.FontRole:
+                return to_qvariant(self.font)
+            return to_qvariant()
+        return DataFrameModel.data(self, index, role)
+
+    def header(self, axis, x, level=0):
+        """
+        Return the values of the labels for the header of columns or rows,
+        or LOADING_TEXT until their window arrives.
+        """
+        window = self.get_window(0, x) if axis == 0 else self.get_window(x, 0)
+        if window is None:
+            return LOADING_TEXT
+        if axis == 0:
+            labels = window[1].columns
+            x = x % COLS_TO_LOAD
+        else:
+            labels = window[1].index
+            x = x % ROWS_TO_LOAD
+        if self.header_shape[axis] <= 1:
+            return labels.values[x]
+        return labels.values[x][level]
+
+    def name(self, axis, level):
+        """Return the labels of the levels if any."""
+        names = self.info['names'][axis]
+        if len(names) > 1:
+            return names[level]
+        if names[0]:
+            return names[0]
+
+    def max_min_col_update(self):
+        """Request the min/max of the columns from the kernel, if shown."""
+        # Edits are only sent to the kernel when they are committed, so
+        # there is no need to ask again after them
+        if (self.max_min_col is None and self.bgcolor_enabled and
+                not self.minmax_requested):
+            self.minmax_requested = True
+            self.client.request_dataframe_minmax(self.info['id'])
+
+    def bgcolor(self, state):
+        """Toggle backgroundcolor"""
+        self.bgcolor_enabled = state > 0
+        self.max_min_col_update()
+        self.reset()
+
+    def get_bgcolor(self, index):
+        """Background color, once the min/max have arrived."""
+        if self.max_min_col is None:
+            # They are still to come or there are no rows
+            return
+        return DataFrameModel.get_bgcolor(self, index)
+
+    def get_value(self, row, column):
+        """Return the value of the DataFrame."""
+        window = self.get_window(row, column)
+        if window is None:
+            return None
+        positions, frame = window
+        row = row % ROWS_TO_LOAD
+        key = (positions[row], column)
+        if key in self.edits:
+            return self.edits[key]
+        column = column % COLS_TO_LOAD
+        try:
+            return frame.iat[row, column]
+        except:
+            return frame.iloc[row, column]
+
+    def setData(self, index, value, role=Qt.EditRole, change_type=None):
+        """Cell content change, once the window of the cell is loaded"""
+        if index.isValid():
+            self.load_window(index.row(), index.column())
+        return DataFrameModel.setData(self, index, value, role=role,
+                                      change_type=change_type)
+
+    def set_value(self, row, column, value):
+        """Set the value of a cell, until the edits are committed."""
+        positions, frame = self.load_window(row, column)
+        self.edits[(positions[row % ROWS_TO_LOAD], column)] = value
+
+    def get_frame(self, row_min, row_max, col_min, col_max):
+        """Return the DataFrame restricted to the given rows and columns."""
+        positions, frame = self.client.get_dataframe_window(
+            self.info['id'], row_min, row_max + 1, col_min, col_max + 1)
+        frame = frame.copy()
+        for (position, column), value in self.edits.items():
+            if position in positions and col_min <= column <= col_max:
+                frame.iloc[positions.index(position),
+                           column - col_min] = value
+        return frame
+
+    def get_block(self, row_start, row_stop, col_start, col_stop):
+        """
+        Return the DataFrame of the cells of a tile, with the edits, or
+        None if its window is still to come.
+        """
+        window = self.get_window(row_start, col_start)
+        if window is None:
+            return None
+        positions, frame = window
+        row_offset = row_start % ROWS_TO_LOAD
+        col_offset = col_start % COLS_TO_LOAD
+        block = frame.iloc[row_offset:row_offset + row_stop - row_start,
+                           col_offset:col_offset + col_stop - col_start]
+        rows = dict((position, i) for i, position in
+                    enumerate(positions[row_offset:row_offset +
+                                        block.shape[0]]))
+        edits = [(rows[position], column - col_start, value)
+                 for (position, column), value in self.edits.items()
+                 if position in rows and col_start <= column < col_stop]
+        if edits:
+            block = block.copy()
+            for row, column, value in edits:
+                block.iloc[row, column] = value
+        return block
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Sort the rows in the kernel."""
+        ascending = order == Qt.AscendingOrder
+        error = self.client.sort_dataframe(self.info['id'], column,
+                                           ascending)
+        if error is not None:
+            QMessageBox.critical(self.dialog, "Error", error)
+            return False
+        self.windows.clear()
+        self.requested_windows.clear()
+        self.reset()
+        return True
+
+    def get_data(self):
+        """Return data"""
+        return None
+
+    def commit(self):
+        """Send the edits to the kernel."""
+        if self.edits:
+            edits = [(position, column, value) for (position, column), value
+                     in self.edits.items()]
+            self.client.set_dataframe_values(self.info['id'], edits)
+            self.edits = {}
+
+    def close(self):
+        """Tell the kernel that the DataFrame is no longer shown."""
+        self.client.sig_dataframe_reply.disconnect(self.handle_reply)
+        self.windows.clear()
+        self.requested_windows.clear()
+        self.tiles.clear()
+        self.client.close_dataframe(self.info['id'])
+
+
 class DataFrameView(QTableView):
     """
     Data Frame view class.
@@ -544,9 +928,7 @@ class DataFrameView(QTableView):
         (row_min, row_max,
          col_min, col_max) = get_idx_rect(self.selectedIndexes())
         index = header = False
-        df = self.model().df
-        obj = df.iloc[slice(row_min, row_max + 1),
-                      slice(col_min, col_max + 1)]
+        obj = self.model().get_frame(row_min, row_max, col_min, col_max)
         output = io.StringIO()
         obj.to_csv(output, sep='\t', index=index, header=header)
         if not PY2:
@@ -595,6 +977,26 @@ class DataFrameHeaderModel(QAbstractTableModel):
                 self.rows_loaded = ROWS_TO_LOAD
             else:
                 self.rows_loaded = self.total_rows
+        # Labels of kernel backed models arrive after they are asked for
+        self.model.headerDataChanged.connect(self.update_labels)
+
+    def update_labels(self, orientation, first, last):
+        """Show the labels of sections which changed in the model."""
+        if (orientation == Qt.Horizontal) != (self.axis == 0):
+            return
+        if self.axis == 0:
+            last = min(last, self.columnCount() - 1)
+        else:
+            last = min(last, self.rowCount() - 1)
+        if last < first:
+            return
+        self.headerDataChanged.emit(orientation, first, last)
+        if self.axis == 0:
+            self.dataChanged.emit(self.index(0, first),
+                                  self.index(self.rowCount() - 1, last))
+        else:
+            self.dataChanged.emit(self.index(first, 0),
+                                  self.index(last, self.columnCount() - 1))
 
     def rowCount(self, index=None):
         """Get number of rows in the header."""
@@ -802,6 +1204,28 @@ class DataFrameEditor(QDialog):
         return False if data is not supported, True otherwise.
         Supported types for data are DataFrame, Series and Index.
         """
+        if isinstance(data, Series):
+            self.is_series = True
+            model_data = data.to_frame()
+        elif isinstance(data, Index):
+            model_data = DataFrame(data)
+        else:
+            model_data = data
+        return self.setup_model(DataFrameModel(model_data, parent=self),
+                                data.__class__.__name__, title)
+
+    def setup_and_check_kernel(self, client, info, title=''):
+        """
+        Setup DataFrameEditor for a DataFrame, Series or Index which stays
+        in a kernel (see KernelDataFrameModel): return True.
+        """
+        self.is_series = info['is_series']
+        return self.setup_model(KernelDataFrameModel(client, info,
+                                                     parent=self),
+                                info['type'], title)
+
+    def setup_model(self, model, type_name, title=''):
+        """Setup DataFrameEditor to show model: return True."""
         self._selection_rec = False
         self._model = None
 
@@ -811,14 +1235,9 @@ class DataFrameEditor(QDialog):
         self.setLayout(self.layout)
         self.setWindowIcon(ima.icon('arredit'))
         if title:
-            title = to_text_string(title) + " - %s" % data.__class__.__name__
+            title = to_text_string(title) + " - %s" % type_name
         else:
-            title = _("%s editor") % data.__class__.__name__
-        if isinstance(data, Series):
-            self.is_series = True
-            data = data.to_frame()
-        elif isinstance(data, Index):
-            data = DataFrame(data)
+            title = _("%s editor") % type_name
 
         self.setWindowTitle(title)
         self.resize(600, 500)
@@ -835,8 +1254,8 @@ class DataFrameEditor(QDialog):
         # Create the view for the vertical index
         self.create_table_index()
 
-        # Create the model and view of the data
-        self.dataModel = DataFrameModel(data, parent=self)
+        # Create the view of the data
+        self.dataModel = model
         self.create_data_table()
 
         self.layout.addWidget(self.hscroll, 2, 0, 1, 2)
@@ -867,7 +1286,8 @@ class DataFrameEditor(QDialog):
 
         bgcolor = QCheckBox(_('Background color'))
         bgcolor.setChecked(self.dataModel.bgcolor_enabled)
-        bgcolor.setEnabled(self.dataModel.bgcolor_enabled)
+        bgcolor.setEnabled(self.dataModel.bgcolor_enabled or
+                           self.dataModel.minmax_on_demand)
         bgcolor.stateChanged.connect(self.change_bgcolor_enable)
         btn_layout.addWidget(bgcolor)
 
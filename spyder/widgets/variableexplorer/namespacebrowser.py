@@ -18,7 +18,8 @@ from qtpy.compat import getsavefilename, getopenfilenames
 from qtpy.QtCore import Qt, Signal, Slot
 from qtpy.QtGui import QCursor
 from qtpy.QtWidgets import (QApplication, QHBoxLayout, QInputDialog, QMenu,
-                            QMessageBox, QToolButton, QVBoxLayout, QWidget)
+                            QMessageBox, QProgressBar, QToolButton,
+                            QVBoxLayout, QWidget)
 
 # Local imports
 from spyder.config.base import _, get_supported_types
@@ -66,6 +67,7 @@ class NamespaceBrowser(QWidget):
         self.dataframe_format = None
 
         self.editor = None
+        self.upload_bar = None
         self.exclude_private_action = None
         self.exclude_uppercase_action = None
         self.exclude_capitalized_action = None
@@ -80,13 +82,16 @@ class NamespaceBrowser(QWidget):
     def setup(self, check_all=None, exclude_private=None,
               exclude_uppercase=None, exclude_capitalized=None,
               exclude_unsupported=None, excluded_names=None,
-              minmax=None, dataframe_format=None):
+              minmax=None, dataframe_format=None,
+              confirm_transfer_size=None):
         """
         Setup the namespace browser with provided settings.
 
         Args:
             dataframe_format (string): default floating-point format for 
                 DataFrame editor
+            confirm_transfer_size (int): size in MB above which users have
+                to confirm getting values from the kernel
         """
         assert self.shellwidget is not None
         
@@ -102,6 +107,7 @@ class NamespaceBrowser(QWidget):
         if self.editor is not None:
             self.editor.setup_menu(minmax)
             self.editor.set_dataframe_format(dataframe_format)
+            self.editor.confirm_transfer_size = confirm_transfer_size
             self.exclude_private_action.setChecked(exclude_private)
             self.exclude_uppercase_action.setChecked(exclude_uppercase)
             self.exclude_capitalized_action.setChecked(exclude_capitalized)
@@ -115,6 +121,7 @@ class NamespaceBrowser(QWidget):
                         minmax=minmax,
                         shellwidget=self.shellwidget,
                         dataframe_format=dataframe_format)
+        self.editor.confirm_transfer_size = confirm_transfer_size
 
         self.editor.sig_option_changed.connect(self.sig_option_changed.emit)
         self.editor.sig_files_dropped.connect(self.import_data)
@@ -147,6 +154,14 @@ class NamespaceBrowser(QWidget):
         self.options_button.setMenu(self.menu)
 
         blayout.addStretch()
+
+        # Progress of the values sent to the kernel in several chunks
+        self.upload_bar = QProgressBar(self)
+        self.upload_bar.setRange(0, 100)
+        self.upload_bar.setMaximumWidth(150)
+        self.upload_bar.hide()
+        blayout.addWidget(self.upload_bar)
+
         blayout.addWidget(self.options_button)
 
         layout = create_plugin_layout(blayout, self.editor)
@@ -249,11 +264,44 @@ class NamespaceBrowser(QWidget):
         if remote_view is not None:
             self.set_data(remote_view)
 
+    def process_remote_view_delta(self, delta):
+        """Process the changes in the remote view since the last refresh"""
+        if delta is not None:
+            properties = delta.get('properties')
+            if delta['full']:
+                if properties is not None:
+                    self.editor.var_properties = properties
+                self.set_data(delta['changed'])
+            else:
+                if properties is not None:
+                    for name in delta['removed']:
+                        self.editor.var_properties.pop(name, None)
+                    self.editor.var_properties.update(properties)
+                self.editor.model.apply_delta(delta['changed'],
+                                              delta['removed'])
+
     def set_var_properties(self, properties):
         """Set properties of variables"""
         if properties is not None:
             self.editor.var_properties = properties
 
+    def set_upload_progress(self, progress):
+        """Show the progress of a value sent to the kernel"""
+        if progress['done']:
+            self.upload_bar.hide()
+            if progress['error'] is not None:
+                QMessageBox.critical(self, _("Error"),
+                                     _("Spyder was unable to set the value "
+                                       "of <b>%s</b> in the console.<br><br>"
+                                       "The error mesage was:<br>"
+                                       "<i>%s</i>"
+                                       ) % (progress['name'],
+                                            progress['error']))
+        else:
+            self.upload_bar.setValue(int(100 * progress['received'] /
+                                         max(progress['size'], 1)))
+            self.upload_bar.show()
+
     def set_data(self, data):
         """Set data."""
         if data != self.editor.model.get_data():
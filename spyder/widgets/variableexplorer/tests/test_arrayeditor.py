@@ -23,7 +23,8 @@ from qtpy.QtCore import Qt
 from flaky import flaky
 
 # Local imports
-from spyder.widgets.variableexplorer.arrayeditor import ArrayEditor, ArrayModel
+from spyder.widgets.variableexplorer.arrayeditor import (ArrayEditor, ArrayModel,
+                                                       TileCache)
 
 
 def launch_arrayeditor(data, title="", xlabels=None, ylabels=None):
@@ -208,6 +209,48 @@ def test_arraymodel_set_data_overflow(monkeypatch):
         assert np.sum(test_array == model._data) == len(test_array)
 
 
+def test_arraymodel_tiles(qtbot):
+    """Test that texts and colors computed by tiles match those of cells."""
+    arr = np.ma.masked_array(np.arange(-300, 300, 0.5).reshape(60, 20),
+                             mask=np.eye(60, 20))
+    arr[1, 2] = np.nan
+    model = ArrayModel(arr, format='%.2f')
+    for i in range(60):
+        for j in range(20):
+            index = model.createIndex(i, j)
+            value = model.get_value(index)
+            assert model.data(index) == model.get_text(value)
+            color = model.data(index, Qt.BackgroundColorRole)
+            expected = model.get_color(value)
+            assert (color is None and expected is None or
+                    color.rgba() == expected.rgba())
+    assert model.data(model.createIndex(0, 0)) == ''
+    assert model.data(model.createIndex(1, 2)) == 'nan'
+
+    # Edits and format changes are shown at once
+    color = model.data(model.createIndex(59, 19), Qt.BackgroundColorRole)
+    assert model.setData(model.createIndex(0, 1), '1000')
+    assert model.data(model.createIndex(0, 1)) == '1000.00'
+    assert model.data(model.createIndex(59, 19),
+                      Qt.BackgroundColorRole).rgba() != color.rgba()
+    model.set_format('%.1f')
+    assert model.data(model.createIndex(59, 19)) == '299.5'
+
+
+def test_tile_cache_short_tiles():
+    """Test that cells left out of a tile are computed on their own."""
+    def make_tile(row_start, row_stop, col_start, col_stop):
+        # Leaves out the last row of tiles of more than one row
+        rows = range(row_start, row_stop - 1 if row_stop - row_start > 1
+                     else row_stop)
+        return [[(i, j) for j in range(col_start, col_stop)] for i in rows]
+
+    tiles = TileCache(make_tile, rows=4, columns=3)
+    assert tiles.get(2, 1) == (2, 1)
+    assert tiles.get(3, 2) == (3, 2)
+    assert tiles.get(7, 5) == (7, 5)
+
+
 @flaky(max_runs=3)
 def test_arrayeditor_edit_overflow(qtbot, monkeypatch):
     """Int. test #6114: entry of an overflow int caught and handled properly"""
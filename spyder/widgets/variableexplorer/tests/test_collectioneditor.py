@@ -17,6 +17,7 @@ except ImportError:
     from mock import Mock, ANY  # Python 2
 
 # Third party imports
+import numpy
 import pandas
 import pytest
 from flaky import flaky
@@ -24,7 +25,7 @@ from flaky import flaky
 # Local imports
 from spyder.widgets.variableexplorer.collectionseditor import (
     CollectionsEditorTableView, CollectionsModel, CollectionsEditor,
-    LARGE_NROWS, ROWS_TO_LOAD)
+    LARGE_NROWS, RemoteCollectionsEditorTableView, ROWS_TO_LOAD)
 from spyder.widgets.variableexplorer.tests.test_dataframeeditor import \
     generate_pandas_indexes
 
@@ -137,6 +138,50 @@ def test_sort_collectionsmodel():
                                     ['3', '[1, 2]']]
 
 
+def test_apply_delta_collectionsmodel():
+    """Test updating a remote view without resetting the model."""
+    def entry(value):
+        return {'type': 'int', 'size': 1, 'color': '#0000ff',
+                'view': repr(value)}
+    coll = {'a': entry(1), 'c': entry(3)}
+    cm = CollectionsModel(None, coll, remote=True)
+    cm.sort(0)
+    cm.apply_delta({'a': entry(10), 'b': entry(2)}, ['c'])
+    assert cm.rowCount() == 2
+    assert data_table(cm, 2, 4) == [['a', 'b'],
+                                    ['int', 'int'],
+                                    ['1', '1'],
+                                    ['10', '2']]
+
+
+def test_remote_value_requested_asynchronously(qtbot):
+    """Test that dialogs are shown once the values they edit arrive."""
+    shellwidget = Mock()
+    shellwidget.request_value.return_value = 'transfer'
+    editor = RemoteCollectionsEditorTableView(None, None,
+                                              shellwidget=shellwidget)
+    qtbot.addWidget(editor)
+    editor.confirm_transfer_size = 1
+    editor.set_data({'arr': {'type': 'ndarray', 'size': (10,),
+                             'color': '#00ff00', 'view': 'Min: 0 Max: 9'}})
+    editor.var_properties = {'arr': {'is_array': True}}
+    assert editor.delegate.createEditor(
+        None, None, editor.model.createIndex(0, 3)) is None
+    shellwidget.request_value.assert_called_once_with('arr', 1024 ** 2)
+    assert not editor.delegate._editors
+
+    progress = dict(id='transfer', received=40, size=80, refused=False,
+                    done=False, value=None, error=None)
+    editor.value_download(progress)
+    assert editor.value_requests['transfer']['dialog'].value() == 50
+    progress.update(received=80, done=True, value=numpy.arange(10))
+    editor.value_download(progress)
+    assert not editor.value_requests
+    array_editor = next(iter(editor.delegate._editors.values()))['editor']
+    qtbot.addWidget(array_editor)
+    assert (array_editor.data.ravel() == numpy.arange(10)).all()
+
+
 def test_sort_collectionsmodel_with_many_rows():
     coll = list(range(2*LARGE_NROWS))
     cm = CollectionsModel(None, coll)
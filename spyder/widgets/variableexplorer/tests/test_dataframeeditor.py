@@ -19,10 +19,10 @@ import os
 
 # Third party imports
 from pandas import (DataFrame, date_range, read_csv, concat, Index, RangeIndex,
-                    DatetimeIndex, MultiIndex, CategoricalIndex)
+                    DatetimeIndex, MultiIndex, CategoricalIndex, Series)
 from qtpy import PYQT4
 from qtpy.QtGui import QColor
-from qtpy.QtCore import Qt, QTimer
+from qtpy.QtCore import QObject, Qt, QTimer, Signal
 import numpy
 import pytest
 from flaky import flaky
@@ -32,7 +32,8 @@ from spyder.utils.programs import is_module_installed
 from spyder.utils.test import close_message_box
 from spyder.widgets.variableexplorer import dataframeeditor
 from spyder.widgets.variableexplorer.dataframeeditor import (
-    DataFrameEditor, DataFrameModel)
+    DataFrameEditor, DataFrameModel, KernelDataFrameModel, LOADING_TEXT)
+from spyder.widgets.variableexplorer.utils import RemoteDataFrame
 
 FILES_PATH = os.path.dirname(os.path.realpath(__file__))
 
@@ -55,6 +56,60 @@ def data_header(dfh, i, j, role=Qt.DisplayRole):
     return dfh.data(dfh.createIndex(i, j), role)
 
 
+class FakeKernelClient(QObject):
+    """
+    Serve DataFrames as the kernel does for KernelDataFrameModel.
+
+    The windows and min/max requested are sent when reply is called.
+    """
+    sig_dataframe_reply = Signal(object)
+
+    def __init__(self):
+        QObject.__init__(self)
+        self.dataframes = {}
+        self.windows = 0
+        self.requests = []
+
+    def open_dataframe(self, value):
+        remote = RemoteDataFrame(value)
+        dataframe_id = len(self.dataframes)
+        self.dataframes[dataframe_id] = remote
+        info = remote.get_info()
+        info['id'] = dataframe_id
+        return info
+
+    def get_dataframe_window(self, dataframe_id, *window):
+        return self.dataframes[dataframe_id].get_window(*window)
+
+    def request_dataframe_window(self, dataframe_id, *window):
+        self.windows += 1
+        self.requests.append(dict(id=dataframe_id, kind='window',
+                                  window=list(window)))
+
+    def request_dataframe_minmax(self, dataframe_id):
+        self.requests.append(dict(id=dataframe_id, kind='minmax',
+                                  window=None))
+
+    def reply(self):
+        requests, self.requests = self.requests, []
+        for reply in requests:
+            remote = self.dataframes[reply['id']]
+            if reply['kind'] == 'window':
+                reply['value'] = remote.get_window(*reply['window'])
+            else:
+                reply['value'] = remote.get_minmax()
+            self.sig_dataframe_reply.emit(reply)
+
+    def sort_dataframe(self, dataframe_id, column, ascending):
+        return self.dataframes[dataframe_id].sort(column, ascending)
+
+    def set_dataframe_values(self, dataframe_id, edits):
+        self.dataframes[dataframe_id].set_values(edits)
+
+    def close_dataframe(self, dataframe_id):
+        self.dataframes.pop(dataframe_id)
+
+
 def generate_pandas_indexes():
     """ Creates a dictionnary of many possible pandas indexes """
     return {
@@ -218,6 +273,16 @@ def test_dataframemodel_with_categories(): # cf. issue 3308
     dfm = DataFrameModel(df)
     assert dfm.max_min_col == [[6, 1], None, None]
 
+def test_dataframemodel_categories_by_tiles():
+    """Test that categorical columns are shown by tiles as by cells."""
+    df = DataFrame({"grade": Series(list('abcde') * 30, dtype='category'),
+                    "id": range(150)})
+    dfm = DataFrameModel(df)
+    for i in (0, 49, 50, 149):
+        assert data(dfm, i, 0) == 'abcde'[i % 5]
+        assert data(dfm, i, 1) == str(i)
+        assert bgcolor(dfm, i, 0) == dfm.get_value_bgcolor('', 0)
+
 def test_dataframemodel_get_bgcolor_with_numbers():
     df = DataFrame([[0, 10], [1, 20], [2, 40]])
     dfm = DataFrameModel(df)
@@ -569,5 +634,107 @@ def test_dataframeeditor_edit_bool(qtbot, monkeypatch):
                 len(expected_df))
 
 
+def test_dataframemodel_tiles(qtbot):
+    """Test that texts and colors computed by tiles match those of cells."""
+    df = DataFrame({'colA': numpy.arange(120) * 1.5,
+                    'colB': ['s%d' % i for i in range(120)],
+                    'colC': numpy.arange(120) % 7 - 3,
+                    'colD': [1j * i for i in range(120)]})
+    df.iloc[5, 0] = numpy.nan
+    dfm = DataFrameModel(df)
+    for i in range(120):
+        for j in range(4):
+            value = dfm.get_value(i, j)
+            assert data(dfm, i, j) == dfm.get_text(value)
+            assert bgcolor(dfm, i, j).rgba() == \
+                dfm.get_value_bgcolor(value, j).rgba()
+    assert data(dfm, 5, 0) == 'nan'
+
+    # Edits are shown at once
+    assert dfm.setData(dfm.createIndex(3, 2), '10')
+    assert data(dfm, 3, 2) == '10'
+    assert colorclose(bgcolor(dfm, 3, 2), (.66, .7, 1, .6))
+
+
+def test_kernel_dataframemodel(monkeypatch):
+    """Test paging, sorting and editing DataFrames kept in the kernel."""
+    MockQMessageBox = Mock()
+    monkeypatch.setattr('spyder.widgets.variableexplorer'
+                        '.dataframeeditor.QMessageBox', MockQMessageBox)
+    df = DataFrame({'colA': numpy.arange(2000) % 7,
+                    'colB': numpy.arange(2000)},
+                   index=['row%d' % i for i in range(2000)])
+    monkeypatch.setattr(dataframeeditor, 'LARGE_SIZE', 100)
+    client = FakeKernelClient()
+    dfm = KernelDataFrameModel(client, client.open_dataframe(df))
+    assert dfm.rowCount() == 500 and dfm.columnCount() == 2
+    dfm.fetch_more(rows=True)
+    assert dfm.rowCount() == 1000
+
+    # Cells and labels are shown once their window arrives
+    assert data(dfm, 1999, 1) == LOADING_TEXT
+    assert dfm.header(1, 1999) == LOADING_TEXT
+    client.reply()
+    assert data(dfm, 1999, 1) == '1999'
+    assert dfm.header(1, 1999) == 'row1999'
+    assert client.windows == 1
+    changed = []
+    dfm.dataChanged.connect(lambda first, last, *roles: changed.append(
+        (first.row(), first.column(), last.row(), last.column())))
+    labels = []
+    dfm.headerDataChanged.connect(lambda *args: labels.append(args))
+    assert data(dfm, 0, 1) == LOADING_TEXT
+    assert data(dfm, 1, 0) == LOADING_TEXT
+    client.reply()
+    assert changed == [(0, 0, 499, 1)]
+    assert (Qt.Vertical, 0, 499) in labels
+    assert data(dfm, 0, 1) == '0'
+    assert dfm.header(0, 1) == 'colB'
+    assert client.windows == 2
+
+    # Windows requested before sorting are requested again
+    dfm.windows.clear()
+    assert data(dfm, 0, 1) == LOADING_TEXT
+    assert dfm.sort(0)
+    client.reply()
+    assert data(dfm, 0, 1) == LOADING_TEXT
+    client.reply()
+
+    # Sorting is stable and leaves the DataFrame untouched
+    assert [data(dfm, i, 1) for i in range(3)] == ['0', '7', '14']
+    assert dfm.header(1, 1) == 'row7'
+    assert df['colB'].iloc[1] == 1
+
+    # Edits are applied to the cells shown and sent on commit
+    assert dfm.setData(dfm.createIndex(1, 1), '-1')
+    assert data(dfm, 1, 1) == '-1'
+    assert df['colB'].iloc[7] == 7
+    dfm.commit()
+    assert df['colB'].iloc[7] == -1
+
+    # Cells can be edited while their window is still to come
+    dfm.windows.clear()
+    assert data(dfm, 2, 1) == LOADING_TEXT
+    assert dfm.setData(dfm.createIndex(2, 1), '-2')
+    assert data(dfm, 2, 1) == '-2'
+    client.reply()
+    assert data(dfm, 2, 1) == '-2'
+    assert dfm.make_tile(500, 550, 0, 2)[0] == [(LOADING_TEXT, None)] * 2
+    client.reply()
+
+    # Min/max are computed when background colors are enabled
+    assert dfm.max_min_col is None
+    dfm.bgcolor(1)
+    assert bgcolor(dfm, 0, 0) is None
+    client.reply()
+    assert dfm.max_min_col == [[6, 0], [1999, -1]]
+    assert bgcolor(dfm, 0, 0) is not None
+
+    # Sorting errors are reported
+    client.dataframes[0].df['colA'] = [1j, 'a'] * 1000
+    assert not dfm.sort(0)
+    assert MockQMessageBox.critical.called
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -18,9 +18,14 @@ import pytest
 # Local imports
 from spyder.config.base import get_supported_types
 from spyder.py3compat import PY2
+from spyder.widgets.variableexplorer import utils
 from spyder.widgets.variableexplorer.utils import (sort_against,
                                                    is_supported,
-                                                   value_to_display)
+                                                   value_to_display,
+                                                   make_remote_view_delta,
+                                                   ArraySummaries,
+                                                   COMPUTING_DISPLAY,
+                                                   RemoteDataFrame)
 
 def generate_complex_object():
     """Taken from issue #4221."""
@@ -241,5 +246,123 @@ def test_set_display():
     disp = '[' + ''.join('{0, 1, 2, 3, 4, ...}, '*10)[:-2] + ']'
     assert value_to_display([long_set] * 10) == disp[:70] + ' ...'
 
+
+def test_remote_view_delta():
+    """Test that only changed variables are part of a remote view delta."""
+    settings = {'check_all': False, 'exclude_private': True,
+                'exclude_uppercase': True, 'exclude_capitalized': False,
+                'exclude_unsupported': False, 'excluded_names': [],
+                'minmax': False}
+    big_array = np.zeros(10**6)
+    ns = {'a': 1, 'b': [1, 2], 'c': big_array}
+    cache = {}
+    changed, removed = make_remote_view_delta(ns, settings, cache)
+    assert sorted(changed) == ['a', 'b', 'c'] and removed == []
+
+    # Nothing changed
+    assert make_remote_view_delta(ns, settings, cache) == ({}, [])
+
+    # Modified, added and removed variables
+    ns['b'].append(3)
+    ns['d'] = 'spam'
+    del ns['a']
+    changed, removed = make_remote_view_delta(ns, settings, cache)
+    assert sorted(changed) == ['b', 'd'] and removed == ['a']
+    assert changed['b']['size'] == 3
+
+    # Big arrays are only summarized again if their structure changes
+    ns['c'] = big_array.reshape((1000, 1000))
+    changed, removed = make_remote_view_delta(ns, settings, cache)
+    assert list(changed) == ['c'] and changed['c']['size'] == (1000, 1000)
+
+    # or their values are changed in place
+    settings['minmax'] = True
+    cache.clear()
+    make_remote_view_delta(ns, settings, cache)
+    ns['c'][0, 0] = 5
+    changed, removed = make_remote_view_delta(ns, settings, cache)
+    assert changed['c']['view'] == 'Min: 0.0\nMax: 5.0'
+    ns['c'] *= 2
+    changed, removed = make_remote_view_delta(ns, settings, cache)
+    assert changed['c']['view'] == 'Min: 0.0\nMax: 10.0'
+
+    # Elements out of the sample change the displayed min and max too
+    ns['c'].flat[123457] = 1e9
+    changed, removed = make_remote_view_delta(ns, settings, cache)
+    assert changed['c']['view'] == 'Min: 0.0\nMax: 1000000000.0'
+
+
+def test_array_summaries(monkeypatch):
+    """Test that large arrays are reduced by chunks, within a budget."""
+    monkeypatch.setattr(utils, 'REDUCTION_CHUNK_SIZE', 1000)
+    summaries = ArraySummaries()
+    value = np.arange(10**6, dtype=float).reshape((1000, 1000))
+    value[500, 3] = -1
+
+    # The budget runs out after the first chunk
+    assert summaries.get_minmax(value, budget=-1) is None
+    assert summaries.has_pending()
+    assert summaries.finish_pending()
+    assert not summaries.has_pending()
+    assert summaries.get_minmax(value, budget=-1) == (-1, 10**6 - 1)
+
+    # NaNs are propagated as with value.min()
+    value = value.copy()
+    value[999, 0] = np.nan
+    assert np.isnan(summaries.get_minmax(value)[0])
+
+
+def test_budgeted_display(monkeypatch):
+    """Test displays of large objects which are cut short or deferred."""
+    monkeypatch.setattr(utils, 'ARRAY_SUMMARIES', ArraySummaries())
+    monkeypatch.setattr(utils, 'REDUCTION_CHUNK_SIZE', 1000)
+    monkeypatch.setattr(utils, 'DISPLAY_TIME_BUDGET', -1)
+    value = np.ones((1000, 1000))
+    assert (value_to_display(value, minmax=True, budgeted=True) ==
+            COMPUTING_DISPLAY)
+    utils.ARRAY_SUMMARIES.finish_pending()
+    assert (value_to_display(value, minmax=True, budgeted=True) ==
+            'Min: 1.0\nMax: 1.0')
+
+    # Without budget, as in local collection editors, the summary is
+    # computed right away
+    value = np.zeros((1000, 1000))
+    assert value_to_display(value, minmax=True) == 'Min: 0.0\nMax: 0.0'
+    assert not utils.ARRAY_SUMMARIES.has_pending()
+
+    columns = ['column_%d' % i for i in range(10**5)]
+    display = 'Column names: ' + ', '.join(columns[:10])
+    assert (value_to_display(pd.DataFrame(columns=columns)) ==
+            display[:70] + ' ...')
+
+    index = pd.Index(range(10**6))
+    assert (value_to_display(index) ==
+            type(index).__name__ + ': 1000000 entries, 0 to 999999')
+
+    # Large datetime indexes are displayed as Index.summary does
+    index = pd.date_range('1700-01-01', periods=10**5 + 1, freq='D')
+    assert (value_to_display(index) == 'DatetimeIndex: 100001 entries, '
+            '1700-01-01 to 1973-10-17\nFreq: D')
+
+
+def test_remote_dataframe():
+    """Test the kernel side of kernel backed DataFrame editors."""
+    series = pd.Series([2.0, np.nan, 3.0, 1.0], name='s')
+    remote = RemoteDataFrame(series)
+    info = remote.get_info()
+    assert info['type'] == 'Series' and info['is_series']
+    assert info['shape'] == (4, 1) and info['header_shape'] == (1, 1)
+
+    # NaNs are sorted last, as with sort_values
+    assert remote.sort(0, ascending=False) is None
+    positions, frame = remote.get_window(0, 2, 0, 1)
+    assert positions == [2, 0]
+    assert frame['s'].tolist() == [3.0, 2.0]
+    assert remote.get_window(3, 10, 0, 1)[0] == [1]
+
+    remote.set_values([(3, 0, 5.0)])
+    assert remote.get_value().tolist()[3] == 5.0
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -10,8 +10,11 @@ Utilities
 
 from __future__ import print_function
 
-from itertools import islice
+from itertools import chain, islice
 import re
+import threading
+import time
+import weakref
 
 # Local imports
 from spyder.config.base import get_supported_types
@@ -340,8 +343,199 @@ def collections_display(value, level):
     return display
 
 
-def value_to_display(value, minmax=False, level=0):
-    """Convert value for display purpose"""
+#==============================================================================
+# Budgeted summaries of large objects
+#==============================================================================
+# Maximum length of the text shown in the Value column
+MAX_DISPLAY_LENGTH = 70
+
+# Seconds value_to_display can spend reducing a single array
+DISPLAY_TIME_BUDGET = 0.05
+
+# Number of elements reduced at once for large arrays
+REDUCTION_CHUNK_SIZE = 2 ** 20
+
+# Display of summaries which are still being computed
+COMPUTING_DISPLAY = u'\u2026computing'
+
+
+class ArraySummaries(object):
+    """
+    Cache of the min/max of large arrays.
+
+    Entries are keyed by the id and version (see get_version) of arrays.
+    Large arrays are reduced chunk by chunk until a time budget runs out;
+    the remaining chunks are reduced later by finish_pending, which the
+    kernel calls when it's idle.
+
+    Finished summaries are only returned once: the version of an array
+    doesn't change with its elements out of a sample, so the next display
+    has to reduce the array again.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # id -> {'ref', 'version', 'position', 'min', 'max', 'busy'}
+        self.entries = {}
+
+    def get_minmax(self, value, budget=None):
+        """
+        Return the (min, max) of array value, or None if it couldn't be
+        computed within budget seconds (DISPLAY_TIME_BUDGET by default).
+        """
+        if budget is None:
+            budget = DISPLAY_TIME_BUDGET
+        if value.size <= LARGE_OBJECT_SIZE:
+            return value.min(), value.max()
+        _reference, version = get_version(value)
+        with self.lock:
+            self._purge()
+            entry = self.entries.get(id(value))
+            if entry is None or entry['version'] != version:
+                entry = {'ref': weakref.ref(value), 'version': version,
+                         'position': 0, 'min': None, 'max': None,
+                         'busy': False}
+                self.entries[id(value)] = entry
+            if entry['busy']:
+                return None
+            entry['busy'] = True
+        try:
+            done = self._reduce(value, entry, time.time() + budget)
+        except Exception:
+            self._discard(value)
+            raise
+        finally:
+            entry['busy'] = False
+        if done:
+            self._discard(value)
+            return entry['min'], entry['max']
+        return None
+
+    def has_pending(self):
+        """Return True if some reductions are unfinished."""
+        with self.lock:
+            self._purge()
+            return any(entry['position'] is not None
+                       for entry in self.entries.values())
+
+    def finish_pending(self):
+        """
+        Finish the pending reductions, without time budget.
+
+        Returns True if some of them were finished.
+        """
+        finished = False
+        with self.lock:
+            entries = [entry for entry in self.entries.values()
+                       if entry['position'] is not None
+                       and not entry['busy']]
+            for entry in entries:
+                entry['busy'] = True
+        for entry in entries:
+            value = entry['ref']()
+            try:
+                if value is None or get_version(value)[1] != \
+                  entry['version']:
+                    # The array changed, so its summary isn't pending
+                    # anymore: it will be computed again when displayed
+                    entry['position'] = None
+                else:
+                    finished = self._reduce(value, entry) or finished
+            except Exception:
+                # Its display will fall back to the one used for arrays
+                # which can't be reduced
+                self._discard(value)
+                finished = True
+            finally:
+                entry['busy'] = False
+        return finished
+
+    def _discard(self, value):
+        """Drop the entry of value."""
+        with self.lock:
+            self.entries.pop(id(value), None)
+
+    def _purge(self):
+        """Drop the entries of arrays which were garbage collected."""
+        for key in [key for key, entry in self.entries.items()
+                    if entry['ref']() is None]:
+            del self.entries[key]
+
+    def _reduce(self, value, entry, deadline=None):
+        """
+        Reduce value along its first axis, from entry['position'] on,
+        until deadline. Returns True if the reduction is complete.
+        """
+        import numpy as np
+        if entry['position'] is None:
+            return True
+        step = max(1, REDUCTION_CHUNK_SIZE * value.shape[0] // value.size)
+        while entry['position'] < value.shape[0]:
+            start = entry['position']
+            block = value[start:start + step]
+            block_min, block_max = block.min(), block.max()
+            if entry['min'] is None:
+                entry['min'], entry['max'] = block_min, block_max
+            else:
+                # np.minimum and np.maximum propagate NaNs, like min/max
+                entry['min'] = np.minimum(entry['min'], block_min)
+                entry['max'] = np.maximum(entry['max'], block_max)
+            entry['position'] = start + step
+            if deadline is not None and time.time() > deadline:
+                break
+        if entry['position'] >= value.shape[0]:
+            entry['position'] = None
+            return True
+        return False
+
+
+ARRAY_SUMMARIES = ArraySummaries()
+
+
+def join_display(prefix, items):
+    """
+    Join items after prefix, stopping once the result is too long to be
+    displayed.
+    """
+    display = prefix
+    for i, item in enumerate(items):
+        display += (', ' if i else '') + to_text_string(item)
+        if len(display) > MAX_DISPLAY_LENGTH:
+            break
+    return display
+
+
+def index_display(value):
+    """
+    Same display as Index.summary, formatting only the first and last
+    entries of the index.
+    """
+    # Datetime-like indexes format their entries and show their frequency
+    datetime_like = hasattr(value, 'freq')
+    display = '%s: %d entries' % (type(value).__name__, len(value))
+    if len(value) > 0:
+        if datetime_like:
+            formatter = value._formatter_func
+        else:
+            formatter = to_text_string
+        display += ', %s to %s' % (formatter(value[0]),
+                                   formatter(value[-1]))
+    if datetime_like:
+        if value.freq is not None:
+            display += '\nFreq: %s' % value.freqstr
+        # Entries are displayed as values, not quoted
+        display = display.replace("'", "")
+    return display
+
+
+def value_to_display(value, minmax=False, level=0, budgeted=False):
+    """
+    Convert value for display purpose
+
+    If budgeted is True, the min/max of large arrays is only computed
+    within DISPLAY_TIME_BUDGET and COMPUTING_DISPLAY is returned if it
+    ran out (see ArraySummaries).
+    """
     # To save current Numpy threshold
     np_threshold = FakeObject
 
@@ -356,8 +550,7 @@ def value_to_display(value, minmax=False, level=0):
             set_printoptions(threshold=10)
         if isinstance(value, recarray):
             if level == 0:
-                fields = value.names
-                display = 'Field names: ' + ', '.join(fields)
+                display = join_display('Field names: ', value.names)
             else:
                 display = 'Recarray'
         elif isinstance(value, MaskedArray):
@@ -366,7 +559,14 @@ def value_to_display(value, minmax=False, level=0):
             if level == 0:
                 if minmax:
                     try:
-                        display = 'Min: %r\nMax: %r' % (value.min(), value.max())
+                        if budgeted:
+                            minmax_values = ARRAY_SUMMARIES.get_minmax(value)
+                        else:
+                            minmax_values = value.min(), value.max()
+                        if minmax_values is None:
+                            display = COMPUTING_DISPLAY
+                        else:
+                            display = 'Min: %r\nMax: %r' % minmax_values
                     except (TypeError, ValueError):
                         if value.dtype.type in numeric_numpy_types:
                             display = repr(value)
@@ -398,10 +598,8 @@ def value_to_display(value, minmax=False, level=0):
                         ini_col = to_text_string(cols[0], encoding='utf-8-sig')
                     except:
                         ini_col = to_text_string(cols[0])
-                    cols = [ini_col] + [to_text_string(c) for c in cols[1:]]
-                else:
-                    cols = [to_text_string(c) for c in cols]
-                display = 'Column names: ' + ', '.join(list(cols))
+                    cols = chain([ini_col], islice(cols, 1, None))
+                display = join_display('Column names: ', cols)
             else:
                 display = 'Dataframe'
         elif isinstance(value, NavigableString):
@@ -411,7 +609,11 @@ def value_to_display(value, minmax=False, level=0):
                 display = u"'" + display + u"'"
         elif isinstance(value, Index):
             if level == 0:
-                display = value.summary()
+                if (len(value) <= LARGE_OBJECT_SIZE and
+                        hasattr(value, 'summary')):
+                    display = value.summary()
+                else:
+                    display = index_display(value)
             else:
                 display = 'Index'
         elif is_binary_string(value):
@@ -454,8 +656,8 @@ def value_to_display(value, minmax=False, level=0):
 
     # Truncate display at 70 chars to avoid freezing Spyder
     # because of large displays
-    if len(display) > 70:
-        display = display[:70].rstrip() + ' ...'
+    if len(display) > MAX_DISPLAY_LENGTH:
+        display = display[:MAX_DISPLAY_LENGTH].rstrip() + ' ...'
 
     # Restore Numpy threshold
     if np_threshold is not FakeObject:
@@ -633,6 +835,15 @@ def get_remote_data(data, settings, mode, more_excluded_names=None):
                          excluded_names=excluded_names)
 
 
+def make_remote_entry(value, minmax=False, budgeted=False):
+    """Make the entry of *value* in a remote view"""
+    return {'type':  get_human_readable_type(value),
+            'size':  get_size(value),
+            'color': get_color_name(value),
+            'view':  value_to_display(value, minmax=minmax,
+                                      budgeted=budgeted)}
+
+
 def make_remote_view(data, settings, more_excluded_names=None):
     """
     Make a remote view of dictionary *data*
@@ -642,9 +853,234 @@ def make_remote_view(data, settings, more_excluded_names=None):
                            more_excluded_names=more_excluded_names)
     remote = {}
     for key, value in list(data.items()):
-        view = value_to_display(value, minmax=settings['minmax'])
-        remote[key] = {'type':  get_human_readable_type(value),
-                       'size':  get_size(value),
-                       'color': get_color_name(value),
-                       'view':  view}
+        remote[key] = make_remote_entry(value, minmax=settings['minmax'])
     return remote
+
+
+#==============================================================================
+# Incremental remote views
+#==============================================================================
+# Objects of these types can't change without changing their id
+IMMUTABLE_TYPES = (NUMERIC_TYPES + TEXT_TYPES +
+                   (bool, type(None), datetime.date, datetime.datetime,
+                    datetime.timedelta))
+
+# Arrays and DataFrames with more elements than this are only summarized
+# again when their shape, type or memory buffer change, or, for arrays, the
+# values of a sample of their elements. Arrays are always summarized again
+# if their min and max are shown.
+LARGE_OBJECT_SIZE = 1e5
+
+# Number of elements evenly spread over large arrays in their sample
+ARRAY_SAMPLE_SIZE = 2 ** 12
+
+# Number of elements at each end of the axes of large arrays in their sample,
+# as shown by their repr, for arrays with up to ARRAY_SAMPLE_EDGE_NDIM axes
+ARRAY_SAMPLE_EDGE_ITEMS = 3
+ARRAY_SAMPLE_EDGE_NDIM = 4
+
+
+def get_array_sample_hash(value):
+    """
+    Return a hash of a sample of the elements of array *value*, to notice
+    cheaply when they are changed in place (e.g. by a *= 2 or a[0] = 5).
+
+    The sample is made of ARRAY_SAMPLE_SIZE elements evenly spread over the
+    array and the ones at the ends of its axes.
+    """
+    import numpy as np
+    step = max(1, value.size // ARRAY_SAMPLE_SIZE)
+    parts = [value.flat[::step]]
+    if value.ndim <= ARRAY_SAMPLE_EDGE_NDIM:
+        edges = [sorted(set(range(min(ARRAY_SAMPLE_EDGE_ITEMS, length))) |
+                        set(range(max(0, length - ARRAY_SAMPLE_EDGE_ITEMS),
+                                  length)))
+                 for length in value.shape]
+        parts.append(value[np.ix_(*edges)].ravel())
+    return hash(np.concatenate(parts).tobytes())
+
+
+def get_version(value, minmax=False):
+    """
+    Return a cheap fingerprint of *value*, used to decide if its entry in
+    a remote view has to be computed again.
+
+    Returns a tuple (reference, version), where reference is used to
+    check that the object is still the same one. version is None for
+    objects which have to be summarized every time, like arrays whose
+    min and max are shown if *minmax* is True.
+    """
+    if type(value) in IMMUTABLE_TYPES:
+        # Keeping a reference prevents its id from being reused
+        return value, ()
+    try:
+        if isinstance(value, ndarray) and value.size > LARGE_OBJECT_SIZE:
+            if minmax:
+                # Any element can change the min or max, while only the
+                # ones in the sample are part of the version
+                return None, None
+            version = (value.shape, value.strides, value.dtype.str,
+                       value.__array_interface__['data'][0],
+                       get_array_sample_hash(value))
+            return weakref.ref(value), version
+        if isinstance(value, DataFrame) and value.size > LARGE_OBJECT_SIZE:
+            version = (value.shape, id(value.index), id(value.columns),
+                       tuple(value.dtypes.values))
+            return weakref.ref(value), version
+    except Exception:
+        pass
+    return None, None
+
+
+def make_remote_view_delta(data, settings, cache, more_excluded_names=None):
+    """
+    Make a remote view of dictionary *data* with only the variables that
+    were added or changed since the view described by *cache* was made.
+
+    *cache* maps variable names to (reference, version, entry) tuples and
+    is updated in place. Returns a tuple (changed, removed), where changed
+    is a remote view (as returned by make_remote_view) and removed a list
+    of variable names.
+    """
+    data = get_remote_data(data, settings, mode='editable',
+                           more_excluded_names=more_excluded_names)
+    changed = {}
+    for key, value in list(data.items()):
+        reference, version = get_version(value, minmax=settings['minmax'])
+        cached = cache.get(key)
+        if cached is not None and version is not None:
+            cached_ref, cached_version, entry = cached
+            if isinstance(cached_ref, weakref.ref):
+                cached_ref = cached_ref()
+            if (cached_ref is value and cached_version == version and
+                    entry['view'] != COMPUTING_DISPLAY):
+                continue
+        entry = make_remote_entry(value, minmax=settings['minmax'],
+                                  budgeted=True)
+        if cached is None or cached[2] != entry:
+            changed[key] = entry
+        cache[key] = (reference, version, entry)
+    removed = [key for key in cache if key not in data]
+    for key in removed:
+        cache.pop(key)
+    return changed, removed
+
+
+#==============================================================================
+# DataFrames shown by kernel backed editors
+#==============================================================================
+def get_columns_minmax(df):
+    """
+    Return a list whose k-th entry is [vmax, vmin], the maximum and minimum
+    of the k-th column of *df* (ignoring NaN), or None if it's not numeric.
+
+    The absolute values of complex columns are used. If vmax equals vmin,
+    vmin is decreased by one. None is returned if df has no rows.
+    """
+    if df.shape[0] == 0:
+        return None
+    real_types = (float, int, int64, int32)
+    complex_types = (complex, complex64, complex128)
+    max_min_col = []
+    for dummy, col in df.iteritems():
+        if col.dtype in real_types + complex_types:
+            if col.dtype in real_types:
+                vmax = col.max(skipna=True)
+                vmin = col.min(skipna=True)
+            else:
+                vmax = col.abs().max(skipna=True)
+                vmin = col.abs().min(skipna=True)
+            if vmax != vmin:
+                max_min = [vmax, vmin]
+            else:
+                max_min = [vmax, vmin - 1]
+        else:
+            max_min = None
+        max_min_col.append(max_min)
+    return max_min_col
+
+
+class RemoteDataFrame(object):
+    """
+    Kernel side of a DataFrame, Series or Index shown by a kernel backed
+    DataFrameEditor.
+
+    The frontend only requests the windows of rows and columns it shows.
+    Sorting is done here and kept as a permutation of the rows, so the
+    DataFrame itself is never modified or copied.
+    """
+
+    def __init__(self, value):
+        self.type = type(value).__name__
+        self.is_series = isinstance(value, Series)
+        if self.is_series:
+            value = value.to_frame()
+        elif isinstance(value, Index):
+            value = DataFrame(value)
+        self.df = value
+        self.order = None
+
+    def get_info(self):
+        """Return the structure of the DataFrame."""
+        columns, index = self.df.columns, self.df.index
+        return {'type': self.type,
+                'is_series': self.is_series,
+                'shape': self.df.shape,
+                'header_shape': (columns.nlevels, index.nlevels),
+                'names': (list(columns.names), list(index.names))}
+
+    def get_window(self, row_start, row_stop, col_start, col_stop):
+        """
+        Return a tuple (positions, frame), where frame holds the rows
+        row_start to row_stop of the sorted DataFrame, restricted to the
+        columns col_start to col_stop, and positions are the positions of
+        these rows in the DataFrame.
+        """
+        if self.order is None:
+            positions = list(range(row_start,
+                                   min(row_stop, self.df.shape[0])))
+        else:
+            positions = self.order[row_start:row_stop].tolist()
+        frame = self.df.iloc[positions, col_start:col_stop]
+        return positions, frame
+
+    def sort(self, column, ascending=True):
+        """
+        Sort the rows by the values of a column, or by the index if column
+        is negative.
+
+        Returns None if successful or an error message.
+        """
+        import numpy as np
+        if column >= 0:
+            keys = self.df.iloc[:, column]
+        else:
+            keys = self.df.index
+        # Sort a Series indexed by position to get the permutation
+        keys = Series(keys.values)
+        try:
+            try:
+                keys = keys.sort_values(ascending=ascending, kind='mergesort')
+            except AttributeError:
+                # for pandas version < 0.17
+                keys = keys.order(ascending=ascending, kind='mergesort')
+        except (TypeError, ValueError, SystemError) as error:
+            return "%s: %s" % (type(error).__name__, to_text_string(error))
+        self.order = np.asarray(keys.index)
+        return None
+
+    def get_minmax(self):
+        """Return the min/max of the columns (see get_columns_minmax)."""
+        return get_columns_minmax(self.df)
+
+    def set_values(self, edits):
+        """Set the values of cells, given as (row, column, value) tuples."""
+        for row, column, value in edits:
+            self.df.iloc[row, column] = value
+
+    def get_value(self):
+        """Return the edited object, as DataFrameEditor.get_value does."""
+        if self.is_series:
+            return self.df.iloc[:, 0]
+        else:
+            return self.df